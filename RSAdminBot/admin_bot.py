@@ -45,11 +45,14 @@ from mirror_world_config import is_placeholder_secret, mask_secret
 from mirror_world_config import _deep_merge_dict
 from mirror_world_config import load_oracle_servers, pick_oracle_server, resolve_oracle_ssh_key_path
 from shared.whop_webhook_utils import verify_standard_webhook
+from shared.whop_webhook_raw_log import WhopWebhookRawLog
 
 from rsbots_manifest import compare_manifests as rs_compare_manifests
 from rsbots_manifest import generate_manifest as rs_generate_manifest
 from rsbots_manifest import DEFAULT_EXCLUDE_GLOBS as RS_DEFAULT_EXCLUDE_GLOBS
 
+from command_executor import CommandExecutor, CommandResult, LineCallback
+
 import discord
 from discord.ext import commands
 from discord import ui
@@ -581,15 +584,17 @@ class ServiceManager:
     Uses .sh scripts as single source of truth.
     """
     
-    def __init__(self, script_executor, bot_group_getter, bots_getter=None):
+    def __init__(self, script_executor, bot_group_getter, bots_getter=None, async_script_executor=None):
         """Initialize ServiceManager with script executor functions.
         
         Args:
             script_executor: Function to execute .sh scripts (script_name, action, bot_name, *args) -> (success, stdout, stderr)
             bot_group_getter: Function to get bot group (bot_name) -> group_name
             bots_getter: Optional callable returning the canonical BOTS dict for service->bot_key lookup
+            async_script_executor: Optional coroutine variant of script_executor (used by the *_async methods)
         """
         self._execute_script = script_executor
+        self._execute_script_async = async_script_executor
         self._get_bot_group = bot_group_getter
         self._bots_getter = bots_getter
 
@@ -624,6 +629,11 @@ class ServiceManager:
             return slug
         return None
 
+    async def _execute_async(self, script_name: str, action: str, bot_name: str, *args) -> Tuple[bool, Optional[str], Optional[str]]:
+        if self._execute_script_async is not None:
+            return await self._execute_script_async(script_name, action, bot_name, *args)
+        return await asyncio.to_thread(self._execute_script, script_name, action, bot_name, *args)
+
     def _script_for_bot(self, bot_name: str) -> Tuple[Optional[str], Optional[str]]:
         """Resolve the canonical management script for a bot name."""
         if not bot_name:
@@ -632,6 +642,53 @@ class ServiceManager:
         if not bot_group:
             return None, f"Unknown bot group for {bot_name}"
         return self._script_map.get(bot_group, "manage_bots.sh"), None
+
+    # Each action is resolved and parsed once; the sync and async methods only differ in which
+    # script executor runs the resolved call.
+    _BOTCTL_ACTIONS = ("details", "pid", "logs")
+
+    def _call_for(self, action: str, service_name: str, bot_name: Optional[str], *args) -> Tuple[Optional[tuple], Optional[str]]:
+        """(script executor args, error) for one action."""
+        if action in self._BOTCTL_ACTIONS:
+            inferred = self.infer_bot_name_from_service(service_name)
+            if not inferred:
+                return None, "Could not infer bot_name from service name"
+            return ("botctl.sh", action, inferred, *args), None
+        script_name, err = self._script_for_bot(bot_name or "")
+        if not script_name:
+            return None, err
+        return (script_name, action, bot_name), None
+
+    @classmethod
+    def _finish(cls, action: str, raw: Optional[Tuple[bool, Optional[str], Optional[str]]], err: Optional[str]) -> Any:
+        """Shape the script result (or the resolve error when `raw` is None) for `action`."""
+        if action == "status":
+            return (False, None, err) if raw is None else cls._parse_status(*raw)
+        if action == "details":
+            return (False, "", err) if raw is None else (raw[0], (raw[1] or ""), raw[2])
+        if action == "pid":
+            return None if raw is None else cls._parse_pid(raw[0], raw[1])
+        if action == "logs":
+            return "" if raw is None or not (raw[0] and raw[1]) else raw[1]
+        return (False, None, err) if raw is None else raw
+
+    def _run(self, action: str, service_name: str, bot_name: Optional[str] = None, *args) -> Any:
+        call, err = self._call_for(action, service_name, bot_name, *args)
+        return self._finish(action, None if call is None else self._execute_script(*call), err)
+
+    async def _run_async(self, action: str, service_name: str, bot_name: Optional[str] = None, *args) -> Any:
+        call, err = self._call_for(action, service_name, bot_name, *args)
+        return self._finish(action, None if call is None else await self._execute_async(*call), err)
+
+    @staticmethod
+    def _blocking(coro: Any) -> Any:
+        """Run a coroutine to completion from sync code (never from inside a running event loop)."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        coro.close()
+        raise RuntimeError("ServiceManager sync call from inside the event loop; await the *_async variant")
     
     def get_status(self, service_name: str, bot_name: str) -> Tuple[bool, Optional[str], Optional[str]]:
         """Get service status using .sh script.
@@ -646,18 +703,32 @@ class ServiceManager:
             - state: 'active', 'inactive', 'failed', 'not_found', or None if error
             - error_msg: Error message if status check failed
         """
-        script_name, err = self._script_for_bot(bot_name)
-        if not script_name:
-            return False, None, err
-        success, stdout, stderr = self._execute_script(script_name, "status", bot_name)
-        
+        return self._run("status", service_name, bot_name)
+
+    async def get_status_async(self, service_name: str, bot_name: str) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Non-blocking `get_status`."""
+        return await self._run_async("status", service_name, bot_name)
+
+    async def get_statuses_async(self, bots: Dict[str, Dict[str, Any]]) -> Dict[str, Tuple[bool, Optional[str], Optional[str]]]:
+        """Status for many bots at once ({bot_key: info}); concurrency is capped by the command executor."""
+        keys = list(bots.keys())
+        results = await asyncio.gather(
+            *(self.get_status_async(str((bots[k] or {}).get("service") or ""), k) for k in keys),
+            return_exceptions=True,
+        )
+        out: Dict[str, Tuple[bool, Optional[str], Optional[str]]] = {}
+        for k, r in zip(keys, results):
+            out[k] = (True, None, f"Status check failed: {r}") if isinstance(r, BaseException) else r
+        return out
+
+    @staticmethod
+    def _parse_status(success: bool, stdout: Optional[str], stderr: Optional[str]) -> Tuple[bool, Optional[str], Optional[str]]:
         if success:
             state = (stdout or "").strip().lower()
             if state == "not_found":
                 return False, None, None
             return True, state, None
-        else:
-            return True, None, stderr or "Status check failed"
+        return True, None, stderr or "Status check failed"
     
     
     def get_detailed_status(self, service_name: str) -> Tuple[bool, str, Optional[str]]:
@@ -667,11 +738,11 @@ class ServiceManager:
             (success, output, error_msg) where output is always a string (empty if error)
         """
         # Use canonical .sh scripts (single source of truth) instead of direct SSH/systemctl here.
-        bot_name = self.infer_bot_name_from_service(service_name)
-        if not bot_name:
-            return False, "", "Could not infer bot_name from service name"
-        success, stdout, stderr = self._execute_script("botctl.sh", "details", bot_name)
-        return success, (stdout or ""), stderr
+        return self._run("details", service_name)
+
+    async def get_detailed_status_async(self, service_name: str) -> Tuple[bool, str, Optional[str]]:
+        """Non-blocking `get_detailed_status`."""
+        return await self._run_async("details", service_name)
     
     def get_pid(self, service_name: str) -> Optional[int]:
         """Get service PID if running.
@@ -679,10 +750,14 @@ class ServiceManager:
         Returns:
             PID as int, or None if not running or error
         """
-        bot_name = self.infer_bot_name_from_service(service_name)
-        if not bot_name:
-            return None
-        success, stdout, _ = self._execute_script("botctl.sh", "pid", bot_name)
+        return self._run("pid", service_name)
+
+    async def get_pid_async(self, service_name: str) -> Optional[int]:
+        """Non-blocking `get_pid`."""
+        return await self._run_async("pid", service_name)
+
+    @staticmethod
+    def _parse_pid(success: bool, stdout: Optional[str]) -> Optional[int]:
         if not success:
             return None
         pid_str = (stdout or "").strip()
@@ -704,10 +779,11 @@ class ServiceManager:
         Returns:
             (success, stdout, stderr)
         """
-        script_name, err = self._script_for_bot(bot_name or "")
-        if not script_name:
-            return False, None, err
-        return self._execute_script(script_name, "start", bot_name)
+        return self._run("start", service_name, bot_name)
+
+    async def start_async(self, service_name: str, unmask: bool = True, bot_name: str = None) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Non-blocking `start`."""
+        return await self._run_async("start", service_name, bot_name)
     
     def stop(self, service_name: str, script_pattern: Optional[str] = None, bot_name: str = None) -> Tuple[bool, Optional[str], Optional[str]]:
         """Stop a service using .sh script.
@@ -720,10 +796,11 @@ class ServiceManager:
         Returns:
             (success, stdout, stderr)
         """
-        script_name, err = self._script_for_bot(bot_name or "")
-        if not script_name:
-            return False, None, err
-        return self._execute_script(script_name, "stop", bot_name)
+        return self._run("stop", service_name, bot_name)
+
+    async def stop_async(self, service_name: str, script_pattern: Optional[str] = None, bot_name: str = None) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Non-blocking `stop`."""
+        return await self._run_async("stop", service_name, bot_name)
     
     def restart(self, service_name: str, script_pattern: Optional[str] = None, bot_name: str = None) -> Tuple[bool, Optional[str], Optional[str]]:
         """Restart a service using .sh script.
@@ -736,10 +813,11 @@ class ServiceManager:
         Returns:
             (success, stdout, stderr)
         """
-        script_name, err = self._script_for_bot(bot_name or "")
-        if not script_name:
-            return False, None, err
-        return self._execute_script(script_name, "restart", bot_name)
+        return self._run("restart", service_name, bot_name)
+
+    async def restart_async(self, service_name: str, script_pattern: Optional[str] = None, bot_name: str = None) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Non-blocking `restart`."""
+        return await self._run_async("restart", service_name, bot_name)
     
     def get_failure_logs(self, service_name: str, lines: int = 50) -> str:
         """Get recent journalctl logs for service failures.
@@ -751,16 +829,14 @@ class ServiceManager:
         Returns:
             Log output as string (empty string if error)
         """
-        bot_name = self.infer_bot_name_from_service(service_name)
-        if not bot_name:
-            return ""
-        success, stdout, _ = self._execute_script("botctl.sh", "logs", bot_name, str(lines))
-        if success and stdout:
-            return stdout
-        return ""
+        return self._run("logs", service_name, None, str(lines))
+
+    async def get_failure_logs_async(self, service_name: str, lines: int = 50) -> str:
+        """Non-blocking `get_failure_logs`."""
+        return await self._run_async("logs", service_name, None, str(lines))
     
     def verify_started(self, service_name: str, max_wait: int = 10, bot_name: Optional[str] = None) -> Tuple[bool, Optional[str]]:
-        """Verify service started successfully with retry logic.
+        """Verify service started successfully with retry logic (sync wrapper over `verify_started_async`).
         
         Args:
             service_name: Systemd service name
@@ -770,37 +846,39 @@ class ServiceManager:
         Returns:
             (is_running, error_msg)
         """
-        import time
-        start_time = time.time()
-        
-        while time.time() - start_time < max_wait:
-            exists, state, error = self.get_status(service_name, bot_name=bot_name)
-            
+        return self._blocking(self.verify_started_async(service_name, max_wait=max_wait, bot_name=bot_name))
+
+    async def verify_started_async(self, service_name: str, max_wait: int = 10, bot_name: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+        """Poll status until active/failed or `max_wait` seconds pass (asyncio.sleep between polls)."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+
+        while loop.time() < deadline:
+            exists, state, error = await self.get_status_async(service_name, bot_name=bot_name)
+
             if not exists:
                 return False, "Service does not exist"
-            
+
             if state == "active":
                 return True, None
-            
+
             if state == "failed":
-                logs = self.get_failure_logs(service_name, lines=20)
+                logs = await self.get_failure_logs_async(service_name, lines=20)
                 error_msg = "Service failed to start"
                 if logs:
                     error_msg += f"\n\nRecent logs:\n{logs[-500:]}"
                 return False, error_msg
-            
-            # Wait before retry
-            time.sleep(1)
-        
-        # Timeout
-        exists, state, error = self.get_status(service_name, bot_name=bot_name)
+
+            await asyncio.sleep(1)
+
+        exists, state, error = await self.get_status_async(service_name, bot_name=bot_name)
         if exists:
-            logs = self.get_failure_logs(service_name, lines=20)
+            logs = await self.get_failure_logs_async(service_name, lines=20)
             error_msg = f"Service did not become active (state: {state})"
             if logs:
                 error_msg += f"\n\nRecent logs:\n{logs[-500:]}"
             return False, error_msg
-        
+
         return False, "Service does not exist"
 
 
@@ -1136,7 +1214,7 @@ class BotSelectView(ui.View):
             
             # Start RSAdminBot
             try:
-                success_rsadmin, stdout_rsadmin, stderr_rsadmin = self.admin_bot._execute_sh_script("manage_rsadminbot.sh", "start", "rsadminbot")
+                success_rsadmin, stdout_rsadmin, stderr_rsadmin = await self.admin_bot._execute_sh_script_async("manage_rsadminbot.sh", "start", "rsadminbot")
                 if success_rsadmin:
                     results.append("✅ **RSAdminBot**: Started successfully")
                 else:
@@ -1147,7 +1225,7 @@ class BotSelectView(ui.View):
             
             # Start all RS bots
             try:
-                success_rs, stdout_rs, stderr_rs = self.admin_bot._execute_sh_script("manage_rs_bots.sh", "start", "all")
+                success_rs, stdout_rs, stderr_rs = await self.admin_bot._execute_sh_script_async("manage_rs_bots.sh", "start", "all")
                 if success_rs:
                     results.append("✅ **RS Bots** (rsforwarder, rsonboarding, rsmentionpinger, rscheckerbot, rssuccessbot): Started successfully")
                 else:
@@ -1158,7 +1236,7 @@ class BotSelectView(ui.View):
             
             # Start all mirror-world bots
             try:
-                success_mirror, stdout_mirror, stderr_mirror = self.admin_bot._execute_sh_script("manage_mirror_bots.sh", "start", "all")
+                success_mirror, stdout_mirror, stderr_mirror = await self.admin_bot._execute_sh_script_async("manage_mirror_bots.sh", "start", "all")
                 if success_mirror:
                     results.append("✅ **Mirror-World Bots** (mirror_bots group): Started successfully")
                 else:
@@ -1203,16 +1281,16 @@ class BotSelectView(ui.View):
             ),
             ephemeral=True,
         )
-        before_exists, before_state, _ = self.admin_bot.service_manager.get_status(service_name, bot_name=bot_name)
-        before_pid = self.admin_bot.service_manager.get_pid(service_name)
+        before_exists, before_state, _ = await self.admin_bot.service_manager.get_status_async(service_name, bot_name=bot_name)
+        before_pid = await self.admin_bot.service_manager.get_pid_async(service_name)
 
-        success, stdout, stderr = self.admin_bot.service_manager.start(service_name, unmask=True, bot_name=bot_name)
+        success, stdout, stderr = await self.admin_bot.service_manager.start_async(service_name, unmask=True, bot_name=bot_name)
         
         if success:
-            is_running, verify_error = self.admin_bot.service_manager.verify_started(service_name, bot_name=bot_name)
+            is_running, verify_error = await self.admin_bot.service_manager.verify_started_async(service_name, bot_name=bot_name)
             if is_running:
-                after_exists, after_state, _ = self.admin_bot.service_manager.get_status(service_name, bot_name=bot_name)
-                after_pid = self.admin_bot.service_manager.get_pid(service_name)
+                after_exists, after_state, _ = await self.admin_bot.service_manager.get_status_async(service_name, bot_name=bot_name)
+                after_pid = await self.admin_bot.service_manager.get_pid_async(service_name)
                 pid_note = ""
                 if before_pid and after_pid and before_pid != after_pid:
                     pid_note = f" (pid {before_pid} -> {after_pid})"
@@ -1317,7 +1395,7 @@ class BotSelectView(ui.View):
             
             # Stop RSAdminBot
             try:
-                success_rsadmin, stdout_rsadmin, stderr_rsadmin = self.admin_bot._execute_sh_script("manage_rsadminbot.sh", "stop", "rsadminbot")
+                success_rsadmin, stdout_rsadmin, stderr_rsadmin = await self.admin_bot._execute_sh_script_async("manage_rsadminbot.sh", "stop", "rsadminbot")
                 if success_rsadmin:
                     results.append("✅ **RSAdminBot**: Stopped successfully")
                 else:
@@ -1328,7 +1406,7 @@ class BotSelectView(ui.View):
             
             # Stop all RS bots
             try:
-                success_rs, stdout_rs, stderr_rs = self.admin_bot._execute_sh_script("manage_rs_bots.sh", "stop", "all")
+                success_rs, stdout_rs, stderr_rs = await self.admin_bot._execute_sh_script_async("manage_rs_bots.sh", "stop", "all")
                 if success_rs:
                     results.append("✅ **RS Bots** (rsforwarder, rsonboarding, rsmentionpinger, rscheckerbot, rssuccessbot): Stopped successfully")
                 else:
@@ -1339,7 +1417,7 @@ class BotSelectView(ui.View):
             
             # Stop all mirror-world bots
             try:
-                success_mirror, stdout_mirror, stderr_mirror = self.admin_bot._execute_sh_script("manage_mirror_bots.sh", "stop", "all")
+                success_mirror, stdout_mirror, stderr_mirror = await self.admin_bot._execute_sh_script_async("manage_mirror_bots.sh", "stop", "all")
                 if success_mirror:
                     results.append("✅ **Mirror-World Bots** (mirror_bots group): Stopped successfully")
                 else:
@@ -1385,14 +1463,14 @@ class BotSelectView(ui.View):
             ),
             ephemeral=True,
         )
-        before_exists, before_state, _ = self.admin_bot.service_manager.get_status(service_name, bot_name=bot_name)
-        before_pid = self.admin_bot.service_manager.get_pid(service_name)
+        before_exists, before_state, _ = await self.admin_bot.service_manager.get_status_async(service_name, bot_name=bot_name)
+        before_pid = await self.admin_bot.service_manager.get_pid_async(service_name)
 
-        success, stdout, stderr = self.admin_bot.service_manager.stop(service_name, script_pattern=script_pattern, bot_name=bot_name)
+        success, stdout, stderr = await self.admin_bot.service_manager.stop_async(service_name, script_pattern=script_pattern, bot_name=bot_name)
         
         if success:
-            after_exists, after_state, _ = self.admin_bot.service_manager.get_status(service_name, bot_name=bot_name)
-            after_pid = self.admin_bot.service_manager.get_pid(service_name)
+            after_exists, after_state, _ = await self.admin_bot.service_manager.get_status_async(service_name, bot_name=bot_name)
+            after_pid = await self.admin_bot.service_manager.get_pid_async(service_name)
             pid_note = ""
             if before_pid and not after_pid:
                 pid_note = f" (pid {before_pid} -> 0)"
@@ -1477,7 +1555,7 @@ class BotSelectView(ui.View):
             
             # Restart RSAdminBot
             try:
-                success_rsadmin, stdout_rsadmin, stderr_rsadmin = self.admin_bot._execute_sh_script("manage_rsadminbot.sh", "restart", "rsadminbot")
+                success_rsadmin, stdout_rsadmin, stderr_rsadmin = await self.admin_bot._execute_sh_script_async("manage_rsadminbot.sh", "restart", "rsadminbot")
                 if success_rsadmin:
                     results.append("✅ **RSAdminBot**: Restarted successfully")
                 else:
@@ -1488,7 +1566,7 @@ class BotSelectView(ui.View):
             
             # Restart all RS bots
             try:
-                success_rs, stdout_rs, stderr_rs = self.admin_bot._execute_sh_script("manage_rs_bots.sh", "restart", "all")
+                success_rs, stdout_rs, stderr_rs = await self.admin_bot._execute_sh_script_async("manage_rs_bots.sh", "restart", "all")
                 if success_rs:
                     results.append("✅ **RS Bots** (rsforwarder, rsonboarding, rsmentionpinger, rscheckerbot, rssuccessbot): Restarted successfully")
                 else:
@@ -1499,7 +1577,7 @@ class BotSelectView(ui.View):
             
             # Restart all mirror-world bots
             try:
-                success_mirror, stdout_mirror, stderr_mirror = self.admin_bot._execute_sh_script("manage_mirror_bots.sh", "restart", "all")
+                success_mirror, stdout_mirror, stderr_mirror = await self.admin_bot._execute_sh_script_async("manage_mirror_bots.sh", "restart", "all")
                 if success_mirror:
                     results.append("✅ **Mirror-World Bots** (mirror_bots group): Restarted successfully")
                 else:
@@ -1545,16 +1623,16 @@ class BotSelectView(ui.View):
             ),
             ephemeral=True,
         )
-        before_exists, before_state, _ = self.admin_bot.service_manager.get_status(service_name, bot_name=bot_name)
-        before_pid = self.admin_bot.service_manager.get_pid(service_name)
+        before_exists, before_state, _ = await self.admin_bot.service_manager.get_status_async(service_name, bot_name=bot_name)
+        before_pid = await self.admin_bot.service_manager.get_pid_async(service_name)
 
-        success, stdout, stderr = self.admin_bot.service_manager.restart(service_name, script_pattern=script_pattern, bot_name=bot_name)
+        success, stdout, stderr = await self.admin_bot.service_manager.restart_async(service_name, script_pattern=script_pattern, bot_name=bot_name)
         
         if success:
-            is_running, verify_error = self.admin_bot.service_manager.verify_started(service_name, bot_name=bot_name)
+            is_running, verify_error = await self.admin_bot.service_manager.verify_started_async(service_name, bot_name=bot_name)
             if is_running:
-                after_exists, after_state, _ = self.admin_bot.service_manager.get_status(service_name, bot_name=bot_name)
-                after_pid = self.admin_bot.service_manager.get_pid(service_name)
+                after_exists, after_state, _ = await self.admin_bot.service_manager.get_status_async(service_name, bot_name=bot_name)
+                after_pid = await self.admin_bot.service_manager.get_pid_async(service_name)
                 pid_note = ""
                 if before_pid and after_pid and before_pid != after_pid:
                     pid_note = f" (pid {before_pid} -> {after_pid})"
@@ -1640,7 +1718,7 @@ class BotSelectView(ui.View):
         """Handle bot status check"""
         service_name = bot_info["service"]
         check_exists_cmd = f"systemctl list-unit-files {service_name} 2>/dev/null | grep -q {service_name} && echo 'exists' || echo 'not_found'"
-        exists_success, exists_output, _ = self.admin_bot._execute_ssh_command(check_exists_cmd, timeout=10)
+        exists_success, exists_output, _ = await self.admin_bot._execute_ssh_command_async(check_exists_cmd, timeout=10)
         service_exists = exists_success and "exists" in (exists_output or "").lower()
         
         embed = discord.Embed(
@@ -1652,13 +1730,13 @@ class BotSelectView(ui.View):
         if not service_exists:
             embed.add_field(name="Status", value="⚠️ Service not found", inline=False)
         else:
-            exists, state, error = self.admin_bot.service_manager.get_status(service_name, bot_name=bot_name)
+            exists, state, error = await self.admin_bot.service_manager.get_status_async(service_name, bot_name=bot_name)
             if exists and state:
                 is_active = state == "active"
                 status_icon = "✅" if is_active else "❌"
                 embed.add_field(name="Status", value=f"{status_icon} {'Running' if is_active else 'Stopped'}", inline=True)
                 if is_active:
-                    pid = self.admin_bot.service_manager.get_pid(service_name)
+                    pid = await self.admin_bot.service_manager.get_pid_async(service_name)
                     if pid:
                         embed.add_field(name="PID", value=str(pid), inline=True)
             else:
@@ -1682,7 +1760,7 @@ class BotSelectView(ui.View):
                 f"```\nPulling + copying tracked files from {code_root}\n```",
                 ephemeral=True,
             )
-            ok, result = self.admin_bot._botupdate_one_py_only(bot_key)
+            ok, result = await self.admin_bot._botupdate_one_py_only(bot_key)
         elif group == "mirror_bots":
             code_root = self.admin_bot._get_update_code_root_for_group("mirror_bots")
             await interaction.followup.send(
@@ -1690,7 +1768,7 @@ class BotSelectView(ui.View):
                 f"```\nPulling + copying tracked files from {code_root}\n```",
                 ephemeral=True,
             )
-            ok, result = self.admin_bot._mwupdate_one_py_only(bot_key)
+            ok, result = await self.admin_bot._mwupdate_one_py_only(bot_key)
         else:
             await interaction.followup.send(f"❌ `{bot_key}` is not in an updatable bot group.", ephemeral=True)
             return
@@ -1731,8 +1809,12 @@ class BotSelectView(ui.View):
         ok_count = 0
         fail_count = 0
         lines: List[str] = []
-        for bot_key in rs_keys:
-            ok, result = self.admin_bot._botupdate_one_py_only(bot_key)
+        # Fan out across bots (capped by command_exec.max_concurrency); results keep rs_keys order.
+        outcomes = await self.admin_bot._cmd_executor.fan_out(rs_keys, self.admin_bot._botupdate_one_py_only)
+        for bot_key, outcome in zip(rs_keys, outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = (False, {"error": f"{type(outcome).__name__}: {outcome}"})
+            ok, result = outcome
             if ok:
                 ok_count += 1
                 lines.append(f"✅ {bot_key}: changed={result.get('changed_count')} restart={result.get('restart')}")
@@ -1781,8 +1863,12 @@ class BotSelectView(ui.View):
         ok_count = 0
         fail_count = 0
         lines: List[str] = []
-        for bot_key in mw_keys:
-            ok, result = self.admin_bot._mwupdate_one_py_only(bot_key)
+        # Fan out across bots (capped by command_exec.max_concurrency); results keep mw_keys order.
+        outcomes = await self.admin_bot._cmd_executor.fan_out(mw_keys, self.admin_bot._mwupdate_one_py_only)
+        for bot_key, outcome in zip(mw_keys, outcomes):
+            if isinstance(outcome, BaseException):
+                outcome = (False, {"error": f"{type(outcome).__name__}: {outcome}"})
+            ok, result = outcome
             if ok:
                 ok_count += 1
                 lines.append(f"✅ {bot_key}: changed={result.get('changed_count')} restart={result.get('restart')}")
@@ -1875,8 +1961,8 @@ class BotSelectView(ui.View):
             fields.append({"name": "config.secrets.json", "value": "YES" if secrets_path.exists() else "NO", "inline": True})
 
         if self.admin_bot.service_manager and service:
-            exists, state, _ = self.admin_bot.service_manager.get_status(service, bot_name=bot_key)
-            pid = self.admin_bot.service_manager.get_pid(service)
+            exists, state, _ = await self.admin_bot.service_manager.get_status_async(service, bot_name=bot_key)
+            pid = await self.admin_bot.service_manager.get_pid_async(service)
             fields.append({"name": "Status", "value": str(state or "unknown") if exists else "not_found", "inline": True})
             if pid:
                 fields.append({"name": "PID", "value": str(pid), "inline": True})
@@ -1895,7 +1981,7 @@ class BotSelectView(ui.View):
         if not ok:
             await interaction.followup.send(err, ephemeral=True)
             return
-        result = self.admin_bot._build_botconfig_embed(bot_name, triggered_by=interaction.user)
+        result = await asyncio.to_thread(self.admin_bot._build_botconfig_embed, bot_name, triggered_by=interaction.user)
         view = BotConfigActionsView(self.admin_bot, bot_name)
         if isinstance(result, list):
             embeds = result
@@ -2070,13 +2156,13 @@ class BotSelectView(ui.View):
         )
         
         if self.admin_bot.service_manager:
-            exists, state, error = self.admin_bot.service_manager.get_status(service_name, bot_name=bot_name)
+            exists, state, error = await self.admin_bot.service_manager.get_status_async(service_name, bot_name=bot_name)
             if exists:
                 status_icon = "✅" if state == "active" else "❌"
                 embed.add_field(name="Service Status", value=f"{status_icon} {state.capitalize()}", inline=True)
                 
                 if state != "active":
-                    logs = self.admin_bot.service_manager.get_failure_logs(service_name, lines=30)
+                    logs = await self.admin_bot.service_manager.get_failure_logs_async(service_name, lines=30)
                     if logs:
                         error_lines = [line for line in logs.split('\n') if any(kw in line.lower() for kw in ['error', 'failed', 'exception'])]
                         if error_lines:
@@ -2097,7 +2183,7 @@ class BotSelectView(ui.View):
             return
         svc = str(bot_info.get("service") or "")
         await interaction.followup.send(f"🧾 **Details: {bot_info.get('name', bot_name)}**\nService: `{svc}`", ephemeral=True)
-        success, out, err = self.admin_bot._execute_sh_script("botctl.sh", "details", bot_name)
+        success, out, err = await self.admin_bot._execute_sh_script_async("botctl.sh", "details", bot_name)
         await interaction.followup.send(self.admin_bot._codeblock(out or err or ""), ephemeral=True)
 
     async def _handle_logs(self, interaction, bot_name, bot_info):
@@ -2110,7 +2196,7 @@ class BotSelectView(ui.View):
         lines = int(self.action_kwargs.get("lines") or 80)
         lines = max(10, min(lines, 400))
         await interaction.followup.send(f"📜 **Logs: {bot_info.get('name', bot_name)}**\nService: `{svc}`\nLines: `{lines}`", ephemeral=True)
-        success, out, err = self.admin_bot._execute_sh_script("botctl.sh", "logs", bot_name, str(lines))
+        success, out, err = await self.admin_bot._execute_sh_script_async("botctl.sh", "logs", bot_name, str(lines))
         await interaction.followup.send(self.admin_bot._codeblock(out or err or ""), ephemeral=True)
 
 
@@ -2199,7 +2285,7 @@ class BotConfigActionsView(ui.View):
         if not service or not self.admin_bot.service_manager:
             await self.admin_bot._interaction_reply(interaction, content="❌ ServiceManager not available or missing service mapping.", ephemeral=True)
             return
-        ok_r, out_r, err_r = self.admin_bot.service_manager.restart(service, bot_name=self.bot_key)
+        ok_r, out_r, err_r = await self.admin_bot.service_manager.restart_async(service, bot_name=self.bot_key)
         if not ok_r:
             msg = (err_r or out_r or "restart failed")[:500]
             await self.admin_bot._interaction_reply(interaction, content=f"❌ Restart failed: {msg}", ephemeral=True)
@@ -2331,11 +2417,11 @@ class StartBotView(ui.View):
             await interaction.followup.send("❌ ServiceManager not available", ephemeral=True)
             return
         
-        success, stdout, stderr = self.admin_bot.service_manager.start(service_name, unmask=True, bot_name=self.bot_name)
+        success, stdout, stderr = await self.admin_bot.service_manager.start_async(service_name, unmask=True, bot_name=self.bot_name)
         
         if success:
             # Verify service actually started
-            is_running, verify_error = self.admin_bot.service_manager.verify_started(service_name, bot_name=self.bot_name)
+            is_running, verify_error = await self.admin_bot.service_manager.verify_started_async(service_name, bot_name=self.bot_name)
             if is_running:
                 button.label = "✅ Started"
                 button.style = discord.ButtonStyle.success
@@ -2539,7 +2625,7 @@ class RSAdminSlashCog(commands.Cog):
             await self.admin_bot._interaction_reply(interaction, content="❌ command is required.", ephemeral=True)
             return
         await interaction.response.defer(ephemeral=True)
-        ok, out, err = self.admin_bot._execute_ssh_command(cmd, timeout=30)
+        ok, out, err = await self.admin_bot._execute_ssh_command_async(cmd, timeout=30)
         payload = (out or err or "").strip()
         if not payload:
             payload = "(no output)"
@@ -2612,7 +2698,7 @@ class RSAdminSlashCog(commands.Cog):
         if not await self._guard(interaction):
             return
         await interaction.response.defer(ephemeral=True)
-        ok, stats = self.admin_bot._oraclefiles_sync_once(trigger="manual")
+        ok, stats = await asyncio.to_thread(self.admin_bot._oraclefiles_sync_once, trigger="manual")
         if not ok:
             err = str((stats or {}).get("error") or "oraclefiles sync failed")[:900]
             await interaction.followup.send(
@@ -2658,12 +2744,10 @@ class RSAdminSlashCog(commands.Cog):
         stopped = 0
         unknown = 0
         if svc_ok:
-            for k, info in self.admin_bot.BOTS.items():
-                service = str((info or {}).get("service") or "").strip()
-                if not service:
-                    unknown += 1
-                    continue
-                exists, state, _ = self.admin_bot.service_manager.get_status(service, bot_name=k)
+            with_service = {k: info for k, info in self.admin_bot.BOTS.items() if str((info or {}).get("service") or "").strip()}
+            unknown += total - len(with_service)
+            statuses = await self.admin_bot.service_manager.get_statuses_async(with_service)
+            for exists, state, _ in statuses.values():
                 if not exists:
                     unknown += 1
                 elif state == "active":
@@ -2687,16 +2771,18 @@ class RSAdminSlashCog(commands.Cog):
         ]
 
         # Oracle health: RAM, disk, storage (same as legacy !systemcheck)
-        def _cmd(cmd: str, timeout_s: int = 8) -> str:
-            ok, out, err = self.admin_bot._execute_ssh_command(cmd, timeout=timeout_s, log_it=False)
+        async def _cmd(cmd: str, timeout_s: int = 8) -> str:
+            ok, out, err = await self.admin_bot._execute_ssh_command_async(cmd, timeout=timeout_s, log_it=False, label="systemcheck")
             return (out or err or "").strip()
 
-        uptime_txt = _cmd("uptime", timeout_s=5)
-        top_head = _cmd("top -bn1 | head -n 5", timeout_s=6)
-        mem_txt = _cmd("free -h | head -n 3", timeout_s=5)
-        disk_root = _cmd("df -h / | head -n 2", timeout_s=5)
-        journal_usage = _cmd("journalctl --disk-usage 2>/dev/null || true", timeout_s=6)
-        bots_du = _cmd("du -sh /home/rsadmin/bots 2>/dev/null | head -n 1 || true", timeout_s=10)
+        uptime_txt, top_head, mem_txt, disk_root, journal_usage, bots_du = await asyncio.gather(
+            _cmd("uptime", timeout_s=5),
+            _cmd("top -bn1 | head -n 5", timeout_s=6),
+            _cmd("free -h | head -n 3", timeout_s=5),
+            _cmd("df -h / | head -n 2", timeout_s=5),
+            _cmd("journalctl --disk-usage 2>/dev/null || true", timeout_s=6),
+            _cmd("du -sh /home/rsadmin/bots 2>/dev/null | head -n 1 || true", timeout_s=10),
+        )
 
         if uptime_txt or mem_txt or disk_root:
             fields.extend([
@@ -2718,9 +2804,10 @@ class RSAdminSlashCog(commands.Cog):
                 + "pid=$(systemctl show \"$s\" -p ExecMainPID --value 2>/dev/null || echo 0); "
                 + "echo \"$s $st pid=$pid\"; done"
             )
-            svc_txt = _cmd(svc_cmd, timeout_s=10)
+            svc_txt = await _cmd(svc_cmd, timeout_s=10)
             if svc_txt.strip():
                 fields.append({"name": "Services (systemd)", "value": f"```{_clip(svc_txt, 950)}```", "inline": False})
+        fields.append({"name": "Command exec", "value": f"```{_clip(self.admin_bot._command_exec_summary(), 950)}```", "inline": False})
 
         embed = MessageHelper.create_info_embed(
             title="System Check",
@@ -2881,7 +2968,7 @@ class RSAdminSlashCog(commands.Cog):
             ephemeral=True,
         )
 
-        ok, stats = self.admin_bot._stage_rsadminbot_selfupdate()
+        ok, stats = await asyncio.to_thread(self.admin_bot._stage_rsadminbot_selfupdate)
         if not ok:
             err = str((stats or {}).get("error") or "unknown error")[:1000]
             await status.edit(
@@ -3350,9 +3437,19 @@ class RSAdminBot:
         
         self.load_config()
 
+        # Canonical owner: command execution (local bash or SSH with connection reuse).
+        exec_cfg = self.config.get("command_exec") if isinstance(self.config.get("command_exec"), dict) else {}
+        self._cmd_executor = CommandExecutor(
+            max_concurrency=int(exec_cfg.get("max_concurrency", 4) or 4),
+            control_persist_s=int(exec_cfg.get("ssh_control_persist_s", 300) or 0),
+            control_dir=str(exec_cfg.get("ssh_control_dir") or ""),
+            connect_timeout_s=int(exec_cfg.get("ssh_connect_timeout_s", 10) or 10),
+        )
+
         self._whop_webhook_runner: Optional[web.AppRunner] = None
         self._whop_webhook_site: Optional[web.TCPSite] = None
         self._whop_webhook_lock: asyncio.Lock = asyncio.Lock()
+        self._whop_webhook_raw_log: Optional[WhopWebhookRawLog] = None
 
         # Load SSH server config (must exist before logger init; logger may reference current_server)
         self.servers: List[Dict[str, Any]] = []
@@ -3397,6 +3494,7 @@ class RSAdminBot:
                 self._execute_sh_script,
                 self._get_bot_group,
                 lambda: self.BOTS,
+                async_script_executor=self._execute_sh_script_async,
             )
         
         # Initialize bot inspector (pass BOTS dict as canonical source)
@@ -3441,8 +3539,17 @@ class RSAdminBot:
         self._journal_channel_ids: Dict[str, int] = {}
         self._journal_webhook_urls_by_bot: Dict[str, str] = {}
         self._systemd_events_webhook_url: str = ""
-        self._journal_tasks: Dict[str, asyncio.Task] = {}
+        # One multiplexed `journalctl -f -o json` over every followed unit + one ordered webhook sender.
+        self._journal_mux_task: Optional[asyncio.Task] = None
+        self._journal_sender_tasks: Dict[str, asyncio.Task] = {}
+        self._journal_pending_alerts: Dict[str, List[str]] = {}
+        self._journal_alert_wake: Optional[asyncio.Event] = None
+        self._journal_bots_by_unit: Dict[str, Dict[str, Any]] = {}
         self._journal_last_alert_ts: Dict[str, float] = {}
+        # Webhook rate gate (shared by every _send_webhook caller): global spacing + per-URL 429 blocks.
+        self._webhook_next_send_ts: Dict[str, float] = {}
+        self._webhook_blocked_until: Dict[str, float] = {}
+        self._webhook_global_until: float = 0.0
         # MWDataManagerBot journal-live: optional `stream=` routing (see journal_live.datamanager_* config).
         self._journal_datamanager_split: bool = False
         self._journal_datamanager_stream_webhooks: Dict[str, str] = {}
@@ -4567,7 +4674,7 @@ class RSAdminBot:
     def _ensure_remote_root_for_local_exec(self) -> None:
         """When ssh_server_name is unset or servers.json is missing, still set remote_root on the Ubuntu host.
 
-        /botupdate and /mwupdate use _execute_ssh_command; in local-exec mode that runs bash locally and only
+        /botupdate and /mwupdate use _execute_ssh_command_async; in local-exec mode that runs bash locally and only
         needs a real live tree path (remote_root). Windows/off-box installs still require ssh_server_name + SSH.
         """
         if os.name == "nt":
@@ -4939,7 +5046,7 @@ echo "STATUS=created"
 echo "LINK=$LINK"
 echo "TARGET=$TARGET"
 """
-            ok, out, err = self._execute_ssh_command(cmd, timeout=10)
+            ok, out, err = await self._execute_ssh_command_async(cmd, timeout=10)
             msg = (out or err or "").strip()
             if not msg:
                 msg = "STATUS=unknown"
@@ -5105,6 +5212,7 @@ echo "TARGET=$TARGET"
                 "startup_backfill_lines": int(cfg.get("startup_backfill_lines") or 20),
                 "flush_seconds": float(cfg.get("flush_seconds") or 1),
                 "max_chars": int(cfg.get("max_chars") or 1800),
+                "max_webhook_posts_per_second": float(cfg.get("max_webhook_posts_per_second") or 4),
                 # When true, MWDiscumBot stdout lines containing [FETCHALL] go to journal-discumbot-fetch; rest stay on journal-discumbot (D2D).
                 "discumbot_split_fetch_journal": bool(cfg.get("discumbot_split_fetch_journal", False)),
                 "datamanager_split_stream_journals": bool(cfg.get("datamanager_split_stream_journals", False)),
@@ -5141,6 +5249,7 @@ echo "TARGET=$TARGET"
                 "startup_backfill_lines": 20,
                 "flush_seconds": 1,
                 "max_chars": 1800,
+                "max_webhook_posts_per_second": 4.0,
                 "discumbot_split_fetch_journal": False,
                 "datamanager_split_stream_journals": False,
                 "datamanager_journal_streams": [],
@@ -5201,6 +5310,8 @@ echo "TARGET=$TARGET"
             "channel_name": _as_str(cfg.get("channel_name") or "whop-raw-logs") or "whop-raw-logs",
             "post_raw_payloads": _as_bool(cfg.get("post_raw_payloads", True)),
             "max_log_chars": _as_int(cfg.get("max_log_chars") or 1800),
+            "raw_log_max_segment_kb": _as_int(cfg.get("raw_log_max_segment_kb") or 4096),
+            "raw_log_max_segments": _as_int(cfg.get("raw_log_max_segments") or 8),
         }
 
     async def _ensure_test_server_channel(
@@ -5253,16 +5364,18 @@ echo "TARGET=$TARGET"
         except Exception:
             return None
 
-    async def _append_whop_webhook_raw(self, record: Dict[str, Any]) -> None:
-        """Append a raw webhook record to JSONL (best-effort)."""
+    async def _append_whop_webhook_raw(self, payload: dict, headers: dict) -> None:
+        """Append a raw webhook record to the segmented JSONL log (best-effort)."""
         try:
             async with self._whop_webhook_lock:
-                data_dir = self.base_path / "whop_data"
-                data_dir.mkdir(parents=True, exist_ok=True)
-                path = data_dir / "whop_webhook_raw_payloads.jsonl"
-                line = json.dumps(record, ensure_ascii=True)
-                with open(path, "a", encoding="utf-8") as f:
-                    f.write(line + "\n")
+                if self._whop_webhook_raw_log is None:
+                    cfg = self._get_whop_webhook_config()
+                    self._whop_webhook_raw_log = WhopWebhookRawLog(
+                        self.base_path / "whop_data" / "whop_webhook_raw",
+                        max_segment_bytes=int(cfg.get("raw_log_max_segment_kb") or 4096) * 1024,
+                        max_segments=int(cfg.get("raw_log_max_segments") or 8),
+                    )
+                self._whop_webhook_raw_log.append(payload, headers)
         except Exception:
             pass
 
@@ -5327,12 +5440,7 @@ echo "TARGET=$TARGET"
                 print("[WhopWebhook] Invalid JSON payload")
                 return web.Response(text="Invalid JSON payload", status=400)
 
-            record = {
-                "ts": datetime.now(timezone.utc).isoformat(),
-                "headers": headers,
-                "payload": payload,
-            }
-            await self._append_whop_webhook_raw(record)
+            await self._append_whop_webhook_raw(payload, headers)
             asyncio.create_task(self._post_whop_webhook_log(payload, headers, status="ok"))
 
             return web.Response(text="OK", status=200)
@@ -5431,14 +5539,56 @@ echo "TARGET=$TARGET"
             payload["allowed_mentions"] = {"parse": []}
         try:
             session = await self._get_http_session()
-            async with session.post(u, json=payload) as resp:
-                if 200 <= resp.status < 300:
-                    return True
-                # Best-effort: do not spam logs with webhook URL.
-                return False
+            for _attempt in range(3):
+                await self._webhook_gate_wait(u)
+                async with session.post(u, json=payload) as resp:
+                    self._webhook_gate_update(u, resp.status, resp.headers)
+                    if 200 <= resp.status < 300:
+                        return True
+                    if resp.status != 429:
+                        # Best-effort: do not spam logs with webhook URL.
+                        return False
+            return False
         except Exception:
             return False
 
+    async def _webhook_gate_wait(self, url: str) -> None:
+        """Space posts per webhook URL and wait out that URL's bucket block (and a global 429, if any)."""
+        try:
+            per_s = float(self._get_journal_live_config().get("max_webhook_posts_per_second") or 4)
+        except Exception:
+            per_s = 4.0
+        interval = 1.0 / max(0.2, min(per_s, 50.0))
+        now = time.monotonic()
+        slot = max(
+            now,
+            float(self._webhook_next_send_ts.get(url, 0.0)),
+            float(self._webhook_blocked_until.get(url, 0.0)),
+            self._webhook_global_until,
+        )
+        self._webhook_next_send_ts[url] = slot + interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _webhook_gate_update(self, url: str, status: int, headers: Any) -> None:
+        """Record Discord bucket state per URL (X-RateLimit-Remaining / Reset-After, 429 Retry-After, global)."""
+        try:
+            now = time.monotonic()
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset_after = float(headers.get("X-RateLimit-Reset-After") or 0)
+            if status == 429:
+                retry_after = float(headers.get("Retry-After") or reset_after or 1.0)
+                if str(headers.get("X-RateLimit-Global") or "").lower() == "true":
+                    self._webhook_global_until = max(self._webhook_global_until, now + retry_after)
+                else:
+                    self._webhook_blocked_until[url] = now + retry_after
+            elif remaining is not None and int(remaining) <= 0 and reset_after > 0:
+                self._webhook_blocked_until[url] = now + reset_after
+            else:
+                self._webhook_blocked_until.pop(url, None)
+        except Exception:
+            return
+
     async def _send_systemd_event(self, bot_key: str, text: str, *, severity: str = "info", should_ping: bool = False) -> None:
         """Send a structured systemd movement/event message to the systemd events webhook (test server only)."""
         cfg = self._get_systemd_events_config()
@@ -5790,22 +5940,9 @@ echo "TARGET=$TARGET"
                     content_max=1900,
                 )
 
-    async def _journal_follow_loop(
-        self,
-        bot_key: str,
-        unit_name: str,
-        webhook_url: str,
-        *,
-        fetch_webhook_url: Optional[str] = None,
-        monitordata_webhook_url: Optional[str] = None,
-    ) -> None:
-        """Follow journald for a unit and stream batched lines to the bot's journal channel webhook(s).
-
-        For discumbot with fetch_webhook_url set, lines containing [FETCHALL] go to the fetch webhook; others to the primary (D2D).
-        For rsforwarder with monitordata_webhook_url set, lines containing [MonitorData] go to the MonitorData webhook; others primary.
-        """
+    def _journal_bot_state(self, bot_key: str, webhook_url: str, *, fetch_webhook_url: str = "", monitordata_webhook_url: str = "") -> Dict[str, Any]:
+        """Per-bot batching state for the multiplexed follower (limits match the old per-unit follower)."""
         cfg = self._get_journal_live_config()
-        backfill = max(0, min(int(cfg.get("startup_backfill_lines") or 20), 200))
         flush_seconds = max(0.5, min(float(cfg.get("flush_seconds") or 1), 10))
         max_chars = max(400, min(int(cfg.get("max_chars") or 1800), 1900))
         if bot_key == "datamanagerbot" and getattr(self, "_journal_datamanager_split", False):
@@ -5822,109 +5959,259 @@ echo "TARGET=$TARGET"
             rc_fs = float(getattr(self, "_journal_rscheckerbot_flush_seconds", 0) or cfg.get("rscheckerbot_journal_flush_seconds") or 0)
             if rc_fs > 0:
                 flush_seconds = max(0.5, min(rc_fs, 15.0))
+        return {
+            "bot_key": bot_key,
+            "webhook_url": webhook_url,
+            "fetch_webhook_url": fetch_webhook_url or None,
+            "monitordata_webhook_url": monitordata_webhook_url or None,
+            "flush_seconds": flush_seconds,
+            "max_chars": max_chars,
+            # Context window for high-signal extraction
+            "ctx_window": deque(maxlen=6),
+            "skip_hint_lines": 0,
+            "buf": [],
+            "buf_chars": 0,
+            "last_flush": time.time(),
+            # One pending batch per bot: flushes merge into it while a send is in flight.
+            "pending": [],
+            "pending_chars": 0,
+            "pending_dropped": 0,
+            "wake": asyncio.Event(),
+        }
+
+    @staticmethod
+    def _journal_entry_unit(entry: Dict[str, Any], units: Dict[str, Any]) -> str:
+        """Demultiplex a `journalctl -o json` entry to one of our units (service stdout or systemd's own lines)."""
+        for field in ("_SYSTEMD_UNIT", "UNIT", "OBJECT_SYSTEMD_UNIT"):
+            u = str(entry.get(field) or "")
+            if u in units:
+                return u
+        return ""
+
+    @staticmethod
+    def _journal_entry_message(entry: Dict[str, Any]) -> str:
+        msg = entry.get("MESSAGE")
+        if isinstance(msg, list):
+            # journald emits non-UTF-8 messages as a byte array
+            try:
+                return bytes(int(b) & 0xFF for b in msg).decode("utf-8", errors="replace")
+            except Exception:
+                return ""
+        return str(msg or "")
+
+    def _journal_enqueue_flush(self, state: Dict[str, Any]) -> None:
+        """Move the bot's buffer into its pending batch and wake its sender (oldest lines drop past the cap)."""
+        if not state["buf"]:
+            return
+        state["pending"].extend(state["buf"])
+        state["pending_chars"] += state["buf_chars"]
+        state["buf"] = []
+        state["buf_chars"] = 0
+        state["last_flush"] = time.time()
+        cap = max(8 * int(state["max_chars"]), 16000)
+        pending = state["pending"]
+        drop = 0
+        while state["pending_chars"] > cap and drop < len(pending) - 1:
+            state["pending_chars"] -= len(pending[drop]) + 1
+            drop += 1
+        if drop:
+            del pending[:drop]
+            state["pending_dropped"] += drop
+        state["wake"].set()
+
+    def _journal_enqueue_alert(self, bot_key: str, context_lines: List[str]) -> None:
+        """Keep at most one pending alert per bot (the first trigger wins until it is sent)."""
+        if bot_key in self._journal_pending_alerts or self._journal_alert_wake is None:
+            return
+        self._journal_pending_alerts[bot_key] = context_lines
+        self._journal_alert_wake.set()
+
+    async def _journal_sender_loop(self, state: Dict[str, Any]) -> None:
+        """Ordered sender for one bot's journal posts (its partitioners run here, in arrival order)."""
+        wake: asyncio.Event = state["wake"]
+        while True:
+            try:
+                await wake.wait()
+                wake.clear()
+                lines = state["pending"]
+                dropped = state["pending_dropped"]
+                state["pending"] = []
+                state["pending_chars"] = 0
+                state["pending_dropped"] = 0
+                if dropped:
+                    lines.insert(0, f"...({dropped} older line(s) dropped while the webhook was rate-limited)")
+                # Resend in max_chars batches so the plain path does not truncate a merged backlog.
+                batch: List[str] = []
+                batch_chars = 0
+                for line in lines + [None]:
+                    if batch and (line is None or batch_chars + len(line) + 1 > int(state["max_chars"])):
+                        await self._flush_journal_batch(
+                            state["bot_key"],
+                            state["webhook_url"],
+                            batch,
+                            fetch_webhook_url=state["fetch_webhook_url"],
+                            monitordata_webhook_url=state["monitordata_webhook_url"],
+                        )
+                        batch = []
+                        batch_chars = 0
+                    if line is not None:
+                        batch.append(line)
+                        batch_chars += len(line) + 1
+            except asyncio.CancelledError:
+                return
+            except Exception:
+                continue
+
+    async def _journal_alert_loop(self) -> None:
+        """Send pending high-signal alerts (systemd events webhook) without holding up journal batches."""
+        wake = self._journal_alert_wake
+        while wake is not None:
+            try:
+                await wake.wait()
+                wake.clear()
+                while self._journal_pending_alerts:
+                    bot_key = next(iter(self._journal_pending_alerts))
+                    ctx_lines = self._journal_pending_alerts[bot_key]
+                    try:
+                        await self._maybe_send_journal_alert(bot_key, ctx_lines)
+                    finally:
+                        self._journal_pending_alerts.pop(bot_key, None)
+            except asyncio.CancelledError:
+                return
+            except Exception:
+                continue
+
+    def _journal_ingest_entry(self, entry: Any, units: Dict[str, Dict[str, Any]]) -> None:
+        """Route one `journalctl -o json` entry into its bot's batch buffer (and alert on high-signal lines)."""
+        unit = self._journal_entry_unit(entry, units) if isinstance(entry, dict) else ""
+        st = units.get(unit) if unit else None
+        if st is None:
+            return
+        for line in self._journal_entry_message(entry).split("\n"):
+            line = self._strip_ansi(line).rstrip()
+            if not line:
+                continue
+            # Drop the multi-line hint banner if it appears
+            if st["skip_hint_lines"] > 0:
+                st["skip_hint_lines"] -= 1
+                continue
+            if self._is_hint_banner_line(line):
+                st["skip_hint_lines"] = 2
+                continue
+            st["ctx_window"].append(line)
+            # High-signal mirror to systemd events (hybrid)
+            if self._looks_high_signal(line):
+                self._journal_enqueue_alert(st["bot_key"], list(st["ctx_window"]))
+            st["buf"].append(line)
+            st["buf_chars"] += len(line) + 1
+            if st["buf_chars"] >= st["max_chars"]:
+                self._journal_enqueue_flush(st)
+
+    async def _journal_backfill_unit(self, unit: str, lines: int) -> List[Dict[str, Any]]:
+        """Last `lines` entries of one unit (no follow), so every bot gets its own startup backfill."""
+        proc = await asyncio.create_subprocess_exec(
+            "journalctl", "-q", "--no-pager", "-o", "json", "-n", str(lines), "-u", unit,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=4 * 1024 * 1024,
+        )
+        try:
+            out, _ = await asyncio.wait_for(proc.communicate(), timeout=15)
+        except asyncio.TimeoutError:
+            proc.kill()
+            return []
+        entries: List[Dict[str, Any]] = []
+        for raw in (out or b"").splitlines():
+            try:
+                entry = json.loads(raw)
+            except Exception:
+                continue
+            if isinstance(entry, dict):
+                entries.append(entry)
+        return entries
 
-        # Context window for high-signal extraction
-        ctx_window = deque(maxlen=6)
-        skip_hint_lines = 0
-        buf: List[str] = []
-        buf_chars = 0
-        last_flush = time.time()
+    async def _journal_mux_loop(self) -> None:
+        """Follow journald for all followed units with one `journalctl -f -o json` and batch per bot."""
+        cfg = self._get_journal_live_config()
+        backfill = max(0, min(int(cfg.get("startup_backfill_lines") or 20), 200))
+        units = self._journal_bots_by_unit
+        tick = min(float(st["flush_seconds"]) for st in units.values())
+        # Where the follower resumes: after the last entry it saw, or (first start) from just before the backfill.
+        last_cursor = ""
+        since_unix = int(time.time()) - 1
+        backfill_cursors: Set[str] = set()
+        if backfill:
+            for unit in units:
+                try:
+                    for entry in await self._journal_backfill_unit(unit, backfill):
+                        backfill_cursors.add(str(entry.get("__CURSOR") or ""))
+                        self._journal_ingest_entry(entry, units)
+                except asyncio.CancelledError:
+                    return
+                except Exception:
+                    continue
+            for st in units.values():
+                self._journal_enqueue_flush(st)
 
         while True:
+            proc = None
             try:
-                # Start journalctl - follow unit
+                args = ["journalctl", "-q", "-f", "-o", "json", "--no-tail"]
+                if last_cursor:
+                    args += ["--after-cursor", last_cursor]
+                else:
+                    # Entries logged while the backfills ran; anything already backfilled is skipped by cursor.
+                    args += ["--since", f"@{since_unix}"]
+                for unit in units:
+                    args += ["-u", unit]
                 proc = await asyncio.create_subprocess_exec(
-                    "journalctl",
-                    "-q",
-                    "-f",
-                    "-o",
-                    "cat",
-                    "-n",
-                    str(backfill),
-                    "-u",
-                    unit_name,
+                    *args,
                     stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                    limit=4 * 1024 * 1024,
                 )
 
-                while True:
-                    if proc.stdout is None:
-                        break
+                while proc.stdout is not None:
                     # Flush on timer even if no new lines arrive (prevents "silent channels")
                     try:
-                        raw = await asyncio.wait_for(proc.stdout.readline(), timeout=flush_seconds)
+                        raw = await asyncio.wait_for(proc.stdout.readline(), timeout=tick)
                     except asyncio.TimeoutError:
-                        if buf:
-                            await self._flush_journal_batch(
-                                bot_key,
-                                webhook_url,
-                                buf,
-                                fetch_webhook_url=fetch_webhook_url,
-                                monitordata_webhook_url=monitordata_webhook_url,
-                            )
-                            buf = []
-                            buf_chars = 0
-                            last_flush = time.time()
-                        continue
-                    if not raw:
+                        raw = None
+                    if raw == b"":
                         break
-                    line = raw.decode(errors="replace").rstrip("\n")
-                    line = self._strip_ansi(line).rstrip()
-                    if not line:
-                        continue
-
-                    # Drop the multi-line hint banner if it appears
-                    if skip_hint_lines > 0:
-                        skip_hint_lines -= 1
-                        continue
-                    if self._is_hint_banner_line(line):
-                        skip_hint_lines = 2
-                        continue
-
-                    ctx_window.append(line)
-
-                    # High-signal mirror to systemd events (hybrid)
-                    if self._looks_high_signal(line):
-                        await self._maybe_send_journal_alert(bot_key, list(ctx_window))
-
-                    # Add to batch buffer
-                    buf.append(line)
-                    buf_chars += len(line) + 1
-
+                    if raw:
+                        try:
+                            entry = json.loads(raw)
+                        except Exception:
+                            entry = None
+                        if isinstance(entry, dict):
+                            cursor = str(entry.get("__CURSOR") or "")
+                            if cursor:
+                                last_cursor = cursor
+                            if cursor and cursor in backfill_cursors:
+                                backfill_cursors.discard(cursor)
+                            else:
+                                self._journal_ingest_entry(entry, units)
                     now = time.time()
-                    if buf and (buf_chars >= max_chars or (now - last_flush) >= flush_seconds):
-                        await self._flush_journal_batch(
-                            bot_key,
-                            webhook_url,
-                            buf,
-                            fetch_webhook_url=fetch_webhook_url,
-                            monitordata_webhook_url=monitordata_webhook_url,
-                        )
-                        buf = []
-                        buf_chars = 0
-                        last_flush = now
-
-                # Process ended; flush any remaining buffer
-                if buf:
-                    await self._flush_journal_batch(
-                        bot_key,
-                        webhook_url,
-                        buf,
-                        fetch_webhook_url=fetch_webhook_url,
-                        monitordata_webhook_url=monitordata_webhook_url,
-                    )
-                    buf = []
-                    buf_chars = 0
-                try:
-                    proc.kill()
-                except Exception:
-                    pass
+                    for st in units.values():
+                        if st["buf"] and (now - st["last_flush"]) >= st["flush_seconds"]:
+                            self._journal_enqueue_flush(st)
+
+                # Process ended; flush any remaining buffers
+                for st in units.values():
+                    self._journal_enqueue_flush(st)
                 await asyncio.sleep(2)
             except asyncio.CancelledError:
                 return
             except Exception:
                 # Backoff on unexpected errors
                 await asyncio.sleep(3)
+            finally:
+                if proc is not None and proc.returncode is None:
+                    try:
+                        proc.kill()
+                    except Exception:
+                        pass
 
     async def _flush_journal_batch(
         self,
@@ -6485,7 +6772,7 @@ echo "TARGET=$TARGET"
         # Start per-bot journal follow tasks
         self._start_journal_follow_tasks(all_keys)
         try:
-            print(f"{Colors.GREEN}[Journal Live] Follow tasks started: {len(self._journal_tasks)}{Colors.RESET}")
+            print(f"{Colors.GREEN}[Journal Live] Following {len(self._journal_bots_by_unit)} unit(s) via one journalctl{Colors.RESET}")
         except Exception:
             pass
 
@@ -6495,9 +6782,10 @@ echo "TARGET=$TARGET"
             return
         if not self._should_use_local_exec():
             return
+        if self._journal_mux_task is not None and not self._journal_mux_task.done():
+            return
+        units: Dict[str, Dict[str, Any]] = {}
         for bot_key in bot_keys:
-            if bot_key in self._journal_tasks:
-                continue
             info = self.BOTS.get(bot_key) or {}
             svc = str(info.get("service") or "")
             if not svc:
@@ -6514,16 +6802,18 @@ echo "TARGET=$TARGET"
             md_wh = ""
             if bot_key == "rsforwarder" and cfg.get("rsforwarder_split_monitordata_journal"):
                 md_wh = str(self._journal_webhook_urls_by_bot.get("rsforwarder_monitordata") or "").strip()
-            self._journal_tasks[bot_key] = asyncio.create_task(
-                self._journal_follow_loop(
-                    bot_key,
-                    svc,
-                    url,
-                    fetch_webhook_url=fetch_wh or None,
-                    monitordata_webhook_url=md_wh or None,
-                )
-            )
-    
+            unit = svc if svc.endswith(".service") else f"{svc}.service"
+            units[unit] = self._journal_bot_state(bot_key, url, fetch_webhook_url=fetch_wh, monitordata_webhook_url=md_wh)
+        if not units:
+            return
+        self._journal_bots_by_unit = units
+        self._journal_alert_wake = asyncio.Event()
+        self._journal_sender_tasks = {
+            unit: asyncio.create_task(self._journal_sender_loop(st)) for unit, st in units.items()
+        }
+        self._journal_sender_tasks["alerts"] = asyncio.create_task(self._journal_alert_loop())
+        self._journal_mux_task = asyncio.create_task(self._journal_mux_loop())
+
     def _get_bot_monitor_channel(self, bot_key: str) -> Optional[discord.TextChannel]:
         """Get the monitor channel for a bot key."""
         channel_id = self._bot_monitor_channel_ids.get(bot_key)
@@ -6661,8 +6951,8 @@ echo "TARGET=$TARGET"
                         svc = info.get("service", "")
                         if not svc:
                             continue
-                        exists, state, _ = self.service_manager.get_status(svc, bot_name=key)
-                        pid = self.service_manager.get_pid(svc) or 0
+                        exists, state, _ = await self.service_manager.get_status_async(svc, bot_name=key)
+                        pid = await self.service_manager.get_pid_async(svc) or 0
                         # Snapshot output: keep human-friendly (no PID lists unless explicitly needed)
                         state_txt = state or "unknown"
                         exists_txt = "exists" if exists else "missing"
@@ -6687,8 +6977,8 @@ echo "TARGET=$TARGET"
                                 svc = info.get("service", "")
                                 if not svc:
                                     continue
-                                exists, state, _ = self.service_manager.get_status(svc, bot_name=key)
-                                pid = self.service_manager.get_pid(svc) or 0
+                                exists, state, _ = await self.service_manager.get_status_async(svc, bot_name=key)
+                                pid = await self.service_manager.get_pid_async(svc) or 0
                                 state_txt = state or "unknown"
                                 exists_txt = "exists" if exists else "missing"
                                 lines_out.append(f"{key}: exists={exists_txt} state={state_txt}")
@@ -6704,8 +6994,8 @@ echo "TARGET=$TARGET"
                         svc = info.get("service", "")
                         if not svc:
                             continue
-                        exists, state, _ = self.service_manager.get_status(svc, bot_name=key)
-                        pid = self.service_manager.get_pid(svc) or 0
+                        exists, state, _ = await self.service_manager.get_status_async(svc, bot_name=key)
+                        pid = await self.service_manager.get_pid_async(svc) or 0
                         # Store as (state, pid) - normalize None state to "not_found"
                         snapshot_state = state if state else ("not_found" if not exists else "unknown")
                         current_snapshot[key] = (snapshot_state, pid)
@@ -6751,8 +7041,8 @@ echo "TARGET=$TARGET"
                         # Get full details for the change
                         info = self.BOTS.get(key) or {}
                         svc = info.get("service", "")
-                        exists, state, _ = self.service_manager.get_status(svc, bot_name=key)
-                        pid = self.service_manager.get_pid(svc) or 0
+                        exists, state, _ = await self.service_manager.get_status_async(svc, bot_name=key)
+                        pid = await self.service_manager.get_pid_async(svc) or 0
                         
                         # Build message based on change type
                         if is_pid_only:
@@ -6782,7 +7072,7 @@ echo "TARGET=$TARGET"
                                 msg_lines.insert(2, f"Previous: {prev_state} (pid: {prev_pid})")
                             
                             # Get detailed status (like !details command)
-                            details_success, details_out, _ = self.service_manager.get_detailed_status(svc)
+                            details_success, details_out, _ = await self.service_manager.get_detailed_status_async(svc)
                             if details_success and details_out:
                                 truncated_details = self._truncate_codeblock(details_out, limit=1800)
                                 msg_lines.append("\n**Details:**")
@@ -6790,7 +7080,7 @@ echo "TARGET=$TARGET"
                             
                             # Get logs (like !logs command)
                             failure_lines = monitor_cfg.get("failure_logs_lines", 80)
-                            logs = self.service_manager.get_failure_logs(svc, lines=failure_lines) or ""
+                            logs = await self.service_manager.get_failure_logs_async(svc, lines=failure_lines) or ""
                             if logs:
                                 truncated_logs = self._truncate_codeblock(logs, limit=1800)
                                 msg_lines.append(f"\n**logs (last {failure_lines})**")
@@ -7062,7 +7352,7 @@ echo \"CHANGED_END\"
             await asyncio.sleep(15)
             consecutive_failures = 0
             while True:
-                ok, stats = self._oraclefiles_sync_once(trigger="periodic")
+                ok, stats = await asyncio.to_thread(self._oraclefiles_sync_once, trigger="periodic")
                 try:
                     if ok:
                         consecutive_failures = 0  # Reset failure counter on success
@@ -7460,7 +7750,7 @@ echo "CHANGED_END"
         except Exception as e:
             return False, {"error": f"rsadminbot stage update failed ({type(e).__name__}): {str(e)[:300]}"}
     
-    def _github_py_only_update(self, bot_folder: str, *, code_root: Optional[str] = None) -> Tuple[bool, Dict[str, Any]]:
+    async def _github_py_only_update(self, bot_folder: str, *, code_root: Optional[str] = None) -> Tuple[bool, Dict[str, Any]]:
         """Pull python-only bot code from the server-side GitHub checkout and overwrite live code files.
 
         This is the canonical update path for `!selfupdate`, `!botupdate`, and `!mwupdate` when using GitHub as source of truth.
@@ -7508,6 +7798,9 @@ if [ ! -d "$LIVE_ROOT" ]; then
 fi
 
 cd "$CODE_ROOT"
+# Bulk updates run several bots at once against this one checkout; serialize pull + copy per checkout.
+exec 9>"$CODE_ROOT/.git/rsadmin_update.lock"
+flock 9
 OLD="$(git rev-parse HEAD 2>/dev/null || echo '')"
 git fetch origin
 git pull --ff-only origin main
@@ -7602,7 +7895,7 @@ echo "$CHANGED" | head -n 30 || true
 echo "CHANGED_END"
 """
 
-            ok, stdout, stderr = self._execute_ssh_command(cmd, timeout=180)
+            ok, stdout, stderr = await self._execute_ssh_command_async(cmd, timeout=180, label="py_only_update")
             out = (stdout or "").strip()
             err = (stderr or "").strip()
             if not ok:
@@ -7638,7 +7931,7 @@ echo "CHANGED_END"
         except Exception as e:
             return False, {"error": f"github py-only update failed: {str(e)[:300]}"}
 
-    def _update_one_py_only_from_checkout(
+    async def _update_one_py_only_from_checkout(
         self,
         bot_key: str,
         *,
@@ -7668,7 +7961,7 @@ echo "CHANGED_END"
         if not code_root:
             return False, {"error": f"Missing code_root for group: {allowed_group}"}
 
-        ok, stats = self._github_py_only_update(folder, code_root=code_root)
+        ok, stats = await self._github_py_only_update(folder, code_root=code_root)
         if not ok:
             return False, {"error": str((stats or {}).get("error") or "update failed")[:900]}
 
@@ -7676,11 +7969,12 @@ echo "CHANGED_END"
         restart_ok = False
         restart_err = ""
         if self.service_manager and service:
-            ok_r, out_r, err_r = self.service_manager.restart(service, bot_name=key)
+            # ServiceManager is synchronous (it polls); keep it off the event loop.
+            ok_r, out_r, err_r = await self.service_manager.restart_async(service, bot_name=key)
             if not ok_r:
                 restart_err = (err_r or out_r or "restart failed")[:800]
             else:
-                running, verify_err = self.service_manager.verify_started(service, bot_name=key)
+                running, verify_err = await self.service_manager.verify_started_async(service, bot_name=key)
                 restart_ok = bool(running)
                 if not restart_ok:
                     restart_err = (verify_err or "service did not become active")[:800]
@@ -7724,7 +8018,7 @@ echo "CHANGED_END"
             "summary": summary[:1900],
         }
 
-    def _botupdate_one_py_only(self, bot_key: str) -> Tuple[bool, Dict[str, Any]]:
+    async def _botupdate_one_py_only(self, bot_key: str) -> Tuple[bool, Dict[str, Any]]:
         """Update a single RS-group bot from rsbots-code (python-only) and restart the service.
 
         ``catalognavbot`` uses the same checkout as other RS bots: ``git pull`` in
@@ -7732,17 +8026,17 @@ echo "CHANGED_END"
         the live ``remote_root`` tree. The live tree does not need to be a git repo.
         """
         code_root = self._get_update_code_root_for_group("rs_bots")
-        return self._update_one_py_only_from_checkout(
+        return await self._update_one_py_only_from_checkout(
             bot_key,
             allowed_group="rs_bots",
             code_root=code_root,
             allow_rsadminbot=False,
         )
 
-    def _mwupdate_one_py_only(self, bot_key: str) -> Tuple[bool, Dict[str, Any]]:
+    async def _mwupdate_one_py_only(self, bot_key: str) -> Tuple[bool, Dict[str, Any]]:
         """Update a single Mirror-World bot from mwbots-code (python-only) and restart the service."""
         code_root = self._get_update_code_root_for_group("mirror_bots")
-        return self._update_one_py_only_from_checkout(
+        return await self._update_one_py_only_from_checkout(
             bot_key,
             allowed_group="mirror_bots",
             code_root=code_root,
@@ -8112,11 +8406,11 @@ echo "CHANGED_END"
         self.test_server_organizer.set_meta("commands_cards_hash", updated_hashes)
     
     
-    def _execute_ssh_command(self, command: str, timeout: int = 30, *, log_it: bool = True) -> Tuple[bool, str, str]:
-        """Execute SSH command and return (success, stdout, stderr)
-        
-        Uses shell=False to prevent PowerShell parsing on Windows.
-        Commands are executed inside remote bash shell.
+    def _prepare_command(self, command: str) -> Tuple[str, Optional[List[str]], str, str]:
+        """Resolve (cmd_txt, argv, tag, error) for a management command (local bash or SSH).
+
+        Shared by the sync and async execution paths so both use the same argv (and the same
+        SSH ControlMaster connection).
         """
         # Normalize newlines (CRLF -> LF) before execution.
         #
@@ -8129,53 +8423,12 @@ echo "CHANGED_END"
 
         # Local execution mode (Ubuntu host): run commands directly in bash without SSH.
         if self._should_use_local_exec():
-            try:
-                # Log SSH command before execution
-                if log_it and hasattr(self, 'logger') and self.logger:
-                    self.logger.log_ssh_command(cmd_txt, None, None, None, None)
-                
-                result = subprocess.run(
-                    ["bash", "-lc", cmd_txt],
-                    shell=False,
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                    encoding="utf-8",
-                    errors="replace",
-                )
-                stdout_clean = (result.stdout or "").strip()
-                stderr_clean = (result.stderr or "").strip()
-                success = result.returncode == 0
-                
-                # Log SSH command result
-                if log_it and hasattr(self, 'logger') and self.logger:
-                    self.logger.log_ssh_command(cmd_txt, success, stdout_clean, stderr_clean, None)
-                
-                if not success:
-                    print(f"{Colors.RED}[Local Exec Error] Command failed: {cmd_txt[:100]}{Colors.RESET}")
-                    if stderr_clean:
-                        print(f"{Colors.RED}[Local Exec Error] {stderr_clean[:200]}{Colors.RESET}")
-                return success, stdout_clean, stderr_clean
-            except subprocess.TimeoutExpired:
-                error_msg = f"Command timed out after {timeout}s"
-                print(f"{Colors.RED}[Local Exec Error] {error_msg}{Colors.RESET}")
-                if log_it and hasattr(self, 'logger') and self.logger:
-                    self.logger.log_ssh_command(command, False, None, error_msg, None)
-                return False, "", error_msg
-            except Exception as e:
-                error_msg = f"Unexpected error executing local command: {str(e)}"
-                print(f"{Colors.RED}[Local Exec Error] {error_msg}{Colors.RESET}")
-                if log_it and hasattr(self, 'logger') and self.logger:
-                    self.logger.log_ssh_command(command, False, None, error_msg, None)
-                return False, "", error_msg
+            return cmd_txt, self._cmd_executor.local_argv(cmd_txt), "Local Exec", ""
 
         # Remote SSH path requires a selected server (Windows or local_exec disabled).
         if not self.current_server:
-            error_msg = "No SSH server configured (missing ssh_server_name / servers.json selection)"
-            print(f"{Colors.RED}[SSH Error] {error_msg}{Colors.RESET}")
-            return False, "", error_msg
-        
-        # Build SSH command locally (self-contained)
+            return cmd_txt, None, "SSH", "No SSH server configured (missing ssh_server_name / servers.json selection)"
+
         # Check if SSH key exists (already resolved in _load_ssh_config)
         ssh_key = str(self.current_server.get("key") or "").strip()
         if ssh_key:
@@ -8184,89 +8437,99 @@ echo "CHANGED_END"
                 # Key is optional; allow SSH to fall back to default identities/agent.
                 self.current_server["key"] = ""
                 print(f"{Colors.YELLOW}[SSH] Warning: SSH key file not found: {key_path}; continuing without -i{Colors.RESET}")
-        
-        try:
-            # Log SSH command before execution
-            if log_it and hasattr(self, 'logger') and self.logger:
-                self.logger.log_ssh_command(cmd_txt, None, None, None, None)
-            
-            # Build SSH base command locally (self-contained)
-            base = self._build_ssh_base(self.current_server)
-            if not base:
-                error_msg = "Failed to build SSH base command (check server config)"
-                print(f"{Colors.RED}[SSH Error] {error_msg}{Colors.RESET}")
-                if log_it and hasattr(self, 'logger') and self.logger:
-                    self.logger.log_ssh_command(cmd_txt, False, None, error_msg, None)
-                return False, "", error_msg
-            
-            # Build command as list (no local shell parsing on Windows).
-            #
-            # IMPORTANT:
-            # - SSH options MUST come before the `user@host` target.
-            # - Do NOT shlex.quote() the bash -lc payload here; we're not going through a shell.
-            #   If we pass a literally quoted string, bash will treat the quotes as part of the
-            #   command text and fail (e.g., trying to execute a command named "set -euo ...").
-            host_target = base[-1]
-            base_no_host = base[:-1]
-            # Avoid forcing a TTY; it can add control chars and isn't required for our non-interactive sudo usage.
-            cmd = base_no_host + ["-o", "ConnectTimeout=10", host_target, "bash", "-lc", cmd_txt]
-            
-            # Suppress verbose output - only log errors
-            is_validation = cmd_txt.strip() == "sudo -n true"
-            
-            result = subprocess.run(
-                cmd,
-                shell=False,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                encoding='utf-8',
-                errors='replace'
-            )
-            
-            # Clean output (strip whitespace)
-            stdout_clean = (result.stdout or "").strip()
-            stderr_clean = (result.stderr or "").strip()
-            success = result.returncode == 0
-            
-            # Log SSH command result
-            if log_it and hasattr(self, 'logger') and self.logger:
-                self.logger.log_ssh_command(cmd_txt, success, stdout_clean, stderr_clean, None)
-            
-            # Only log errors, not every command execution
-            if not success:
-                if not is_validation:
-                    print(f"{Colors.RED}[SSH Error] Command failed: {cmd_txt[:100]}{Colors.RESET}")
-                    if stderr_clean:
-                        print(f"{Colors.RED}[SSH Error] {stderr_clean[:200]}{Colors.RESET}")
-                    if stdout_clean:
-                        print(f"{Colors.YELLOW}[SSH Error] {stdout_clean[:200]}{Colors.RESET}")
-            
-            return success, stdout_clean, stderr_clean
-        except subprocess.TimeoutExpired:
-            error_msg = f"Command timed out after {timeout}s"
-            print(f"{Colors.RED}[SSH Error] {error_msg}{Colors.RESET}")
-            print(f"{Colors.RED}[SSH Error] Command: {cmd_txt[:200]}{Colors.RESET}")
+
+        base = self._build_ssh_base(self.current_server)
+        if not base:
+            return cmd_txt, None, "SSH", "Failed to build SSH base command (check server config)"
+        # Avoid forcing a TTY; it can add control chars and isn't required for our non-interactive sudo usage.
+        return cmd_txt, self._cmd_executor.ssh_argv(base, cmd_txt), "SSH", ""
+
+    def _finish_command(self, cmd_txt: str, tag: str, res: CommandResult, *, log_it: bool) -> Tuple[bool, str, str]:
+        """Log/print one command result and return (success, stdout, stderr)."""
+        if res.error:
+            print(f"{Colors.RED}[{tag} Error] {res.error}{Colors.RESET}")
+            print(f"{Colors.RED}[{tag} Error] Command: {cmd_txt[:200]}{Colors.RESET}")
             if log_it and hasattr(self, 'logger') and self.logger:
-                self.logger.log_ssh_command(cmd_txt, False, None, error_msg, None)
-            return False, "", error_msg
-        except FileNotFoundError as e:
-            error_msg = f"SSH executable not found: {e}"
-            print(f"{Colors.RED}[SSH Error] {error_msg}{Colors.RESET}")
-            print(f"{Colors.YELLOW}[SSH Error] Make sure SSH is installed and in PATH{Colors.RESET}")
+                self.logger.log_ssh_command(cmd_txt, False, None, res.error, None)
+            return False, "", res.error
+
+        stdout_clean = res.stdout.strip()
+        stderr_clean = res.stderr.strip()
+        if log_it and hasattr(self, 'logger') and self.logger:
+            self.logger.log_ssh_command(cmd_txt, res.ok, stdout_clean, stderr_clean, None)
+
+        # Only log errors, not every command execution
+        if not res.ok and cmd_txt.strip() != "sudo -n true":
+            print(f"{Colors.RED}[{tag} Error] Command failed ({res.elapsed_s:.1f}s): {cmd_txt[:100]}{Colors.RESET}")
+            if stderr_clean:
+                print(f"{Colors.RED}[{tag} Error] {stderr_clean[:200]}{Colors.RESET}")
+            if stdout_clean:
+                print(f"{Colors.YELLOW}[{tag} Error] {stdout_clean[:200]}{Colors.RESET}")
+        return res.ok, stdout_clean, stderr_clean
+
+    def _execute_ssh_command(self, command: str, timeout: int = 30, *, log_it: bool = True, label: str = "") -> Tuple[bool, str, str]:
+        """Execute a management command and return (success, stdout, stderr). Blocking.
+
+        Only for synchronous callers (ServiceManager, sync helpers). Coroutines must use
+        `_execute_ssh_command_async` so the event loop is never blocked.
+        Uses shell=False; commands are executed inside (remote) bash -lc.
+        """
+        cmd_txt, argv, tag, err = self._prepare_command(command)
+        if argv is None:
+            print(f"{Colors.RED}[{tag} Error] {err}{Colors.RESET}")
             if log_it and hasattr(self, 'logger') and self.logger:
-                self.logger.log_ssh_command(cmd_txt, False, None, error_msg, None)
-            return False, "", error_msg
-        except Exception as e:
-            error_msg = f"Unexpected error executing SSH command: {str(e)}"
-            print(f"{Colors.RED}[SSH Error] {error_msg}{Colors.RESET}")
-            print(f"{Colors.RED}[SSH Error] Command: {cmd_txt[:200]}{Colors.RESET}")
-            import traceback
-            print(f"{Colors.RED}[SSH Error] Traceback: {traceback.format_exc()[:500]}{Colors.RESET}")
+                self.logger.log_ssh_command(cmd_txt, False, None, err, None)
+            return False, "", err
+        if log_it and hasattr(self, 'logger') and self.logger:
+            self.logger.log_ssh_command(cmd_txt, None, None, None, None)
+        res = self._cmd_executor.run_blocking(argv, timeout=timeout, label=label or "cmd")
+        return self._finish_command(cmd_txt, tag, res, log_it=log_it)
+
+    async def _execute_ssh_command_async(
+        self,
+        command: str,
+        timeout: int = 30,
+        *,
+        log_it: bool = True,
+        label: str = "",
+        on_line: Optional[LineCallback] = None,
+    ) -> Tuple[bool, str, str]:
+        """Async `_execute_ssh_command`: non-blocking, capped by command_exec.max_concurrency.
+
+        `on_line` (sync or async) receives each stdout line as it arrives.
+        """
+        cmd_txt, argv, tag, err = self._prepare_command(command)
+        if argv is None:
+            print(f"{Colors.RED}[{tag} Error] {err}{Colors.RESET}")
             if log_it and hasattr(self, 'logger') and self.logger:
-                self.logger.log_ssh_command(cmd_txt, False, None, error_msg, None)
-            return False, "", error_msg
+                self.logger.log_ssh_command(cmd_txt, False, None, err, None)
+            return False, "", err
+        if log_it and hasattr(self, 'logger') and self.logger:
+            self.logger.log_ssh_command(cmd_txt, None, None, None, None)
+        res = await self._cmd_executor.run(argv, timeout=timeout, label=label or "cmd", on_line=on_line)
+        return self._finish_command(cmd_txt, tag, res, log_it=log_it)
     
+    def _command_exec_summary(self, max_labels: int = 8) -> str:
+        """Text block of command executor timing metrics (for /systemcheck and !systemcheck)."""
+        m = self._cmd_executor.metrics_snapshot()
+        if self._should_use_local_exec():
+            mode = "local"
+        else:
+            mode = "ssh+controlmaster" if m.get("multiplexing") else "ssh"
+
+        def _row(name: str, st: Dict[str, Any]) -> str:
+            return (
+                f"{name}: n={st.get('count')} fail={st.get('failed')} timeout={st.get('timeouts')} "
+                f"avg={st.get('avg_ms')}ms p95={st.get('p95_ms')}ms max={st.get('max_ms')}ms"
+            )
+
+        lines = [f"mode={mode} in_flight={m.get('in_flight')} max_concurrency={m.get('max_concurrency')}"]
+        lines.append(_row("all", m.get("total") or {}))
+        by_label = m.get("by_label") or {}
+        for name in sorted(by_label, key=lambda k: -int(by_label[k].get("count") or 0))[: max(1, int(max_labels))]:
+            lines.append(_row(name, by_label[name]))
+        return "\n".join(lines)
+
     def _service_name_to_bot_name(self, service_name: str) -> Optional[str]:
         """Map service name to bot name.
         
@@ -8334,11 +8597,17 @@ echo "CHANGED_END"
         }
         return script_map.get(bot_group, "manage_bots.sh")
     
+    def _botctl_command(self, action: str, bot_name: str, *args) -> str:
+        # Canonical entrypoint: always call botctl.sh on the remote server.
+        botctl_path = "/home/rsadmin/bots/mirror-world/RSAdminBot/botctl.sh"
+        cmd_parts = [action, bot_name] + list(args)
+        return f"bash {botctl_path} {' '.join(shlex.quote(str(arg)) for arg in cmd_parts)}"
+
     def _execute_sh_script(self, script_name: str, action: str, bot_name: str, *args) -> Tuple[bool, Optional[str], Optional[str]]:
-        """Execute a .sh script via SSH.
+        """Execute botctl.sh (blocking). Used by ServiceManager; coroutines use `_execute_sh_script_async`.
         
         Args:
-            script_name: Script name (e.g., "manage_rs_bots.sh")
+            script_name: Script name (e.g., "manage_rs_bots.sh"); kept for compatibility, botctl.sh is always used
             action: Action (start, stop, restart, status)
             bot_name: Bot name
             *args: Additional arguments
@@ -8346,13 +8615,23 @@ echo "CHANGED_END"
         Returns:
             (success, stdout, stderr)
         """
-        # Canonical entrypoint: always call botctl.sh on the remote server.
-        # Keep signature for compatibility, but do not execute per-group scripts directly.
-        botctl_path = "/home/rsadmin/bots/mirror-world/RSAdminBot/botctl.sh"
-        cmd_parts = [action, bot_name] + list(args)
-        cmd = f"bash {botctl_path} {' '.join(shlex.quote(str(arg)) for arg in cmd_parts)}"
-        
-        return self._execute_ssh_command(cmd, timeout=120)
+        return self._execute_ssh_command(self._botctl_command(action, bot_name, *args), timeout=120, label=f"botctl:{action}")
+
+    async def _execute_sh_script_async(
+        self,
+        script_name: str,
+        action: str,
+        bot_name: str,
+        *args,
+        on_line: Optional[LineCallback] = None,
+    ) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Async `_execute_sh_script` (same botctl.sh entrypoint, non-blocking, optional stdout streaming)."""
+        return await self._execute_ssh_command_async(
+            self._botctl_command(action, bot_name, *args),
+            timeout=120,
+            label=f"botctl:{action}",
+            on_line=on_line,
+        )
     
     def load_config(self):
         """Load configuration from JSON file"""
@@ -9456,7 +9735,7 @@ echo "CHANGED_END"
                         total = changes.get("total")
                         py_total = changes.get("py_total")
 
-                        ok_j, out_j, _ = self._execute_ssh_command(
+                        ok_j, out_j, _ = await self._execute_ssh_command_async(
                             "journalctl -u mirror-world-rsadminbot.service -n 40 --no-pager | tail -n 40",
                             timeout=20,
                         )
@@ -9978,7 +10257,6 @@ echo "CHANGED_END"
             mode = _cw_mode()
             cdp_url_q = shlex.quote(_cw_cdp_url())
             cfg = _cw_cfg()
-            loop = asyncio.get_running_loop()
             try:
                 goto_timeout_ms = int(cfg.get("goto_timeout_ms") or 90000)
             except Exception:
@@ -10015,9 +10293,7 @@ echo "CHANGED_END"
                 cdp_base = str(_cw_cdp_url() or "http://127.0.0.1:9222").strip().rstrip("/")
                 probe_url = f"{cdp_base}/json/version"
                 probe_cmd = f"curl -sf --connect-timeout 2 --max-time 6 {shlex.quote(probe_url)} | head -c 40"
-                ok_p, out_p, _ = await loop.run_in_executor(
-                    None, lambda p=probe_cmd: self._execute_ssh_command(p, timeout=45, log_it=False)
-                )
+                ok_p, out_p, _ = await self._execute_ssh_command_async(probe_cmd, timeout=45, log_it=False, label="chromerrunner")
                 snippet = (out_p or "").strip()
                 cdp_ok = bool(ok_p) and snippet.startswith("{")
 
@@ -10034,13 +10310,9 @@ echo "CHANGED_END"
                         f"nohup env CHROME_BIN={chrome_q} bash ./start_chrome_oracle_cdp.sh --headed "
                         f">>/tmp/chromerrunner_cdp_autostart.log 2>&1 & echo started"
                     )
-                    await loop.run_in_executor(
-                        None, lambda c=autostart: self._execute_ssh_command(c, timeout=90, log_it=True)
-                    )
+                    await self._execute_ssh_command_async(autostart, timeout=90, log_it=True, label="chromerrunner")
                     await asyncio.sleep(_cw_auto_start_chrome_wait_s())
-                    ok_p2, out_p2, _ = await loop.run_in_executor(
-                        None, lambda p=probe_cmd: self._execute_ssh_command(p, timeout=45, log_it=False)
-                    )
+                    ok_p2, out_p2, _ = await self._execute_ssh_command_async(probe_cmd, timeout=45, log_it=False, label="chromerrunner")
                     snippet2 = (out_p2 or "").strip()
                     cdp_ok = bool(ok_p2) and snippet2.startswith("{")
                     if cdp_ok:
@@ -10088,7 +10360,7 @@ echo "CHANGED_END"
                 f" --auto-wait-s {auto_wait} --goto-timeout-ms {goto_timeout_ms} --networkidle-timeout-ms {networkidle_timeout_ms} {skip_flag}{extra_flags}"
             )
 
-            ok, out, err = await loop.run_in_executor(None, lambda: self._execute_ssh_command(cmd, timeout=timeout_s, log_it=True))
+            ok, out, err = await self._execute_ssh_command_async(cmd, timeout=timeout_s, log_it=True, label="chromerrunner")
             txt = ""
             if out:
                 txt += out.strip()
@@ -10937,7 +11209,7 @@ echo "CHANGED_END"
                     
                     # Use ServiceManager to restart
                     if self.admin_bot.service_manager:
-                        success, stdout, stderr = self.admin_bot.service_manager.restart(
+                        success, stdout, stderr = await self.admin_bot.service_manager.restart_async(
                             service_name, 
                             script_pattern=bot_info.get("script"),
                             bot_name="rsadminbot"
@@ -10946,7 +11218,7 @@ echo "CHANGED_END"
                         if success:
                             # Verify it started
                             await asyncio.sleep(2)
-                            exists, state, error = self.admin_bot.service_manager.get_status(service_name, bot_name="rsadminbot")
+                            exists, state, error = await self.admin_bot.service_manager.get_status_async(service_name, bot_name="rsadminbot")
                             
                             if exists and state == "active":
                                 await interaction.followup.send("✅ **RSAdminBot restarted successfully on remote server!**\nThe bot will sync files on next startup.", ephemeral=True)
@@ -11050,7 +11322,7 @@ echo "CHANGED_END"
                 await ctx.send(f"❌ Unknown bot: {bot_key}\nUse `!botlist`.")
                 return
             info = self.BOTS[bot_key]
-            success, out, err = self._execute_sh_script("botctl.sh", "details", bot_key)
+            success, out, err = await self._execute_sh_script_async("botctl.sh", "details", bot_key)
             svc = str(info.get("service") or "")
             output = out or err or ""
             embed = MessageHelper.create_status_embed(
@@ -11103,7 +11375,7 @@ echo "CHANGED_END"
                 n = 80
             n = max(10, min(n, 400))
             info = self.BOTS[bot_key]
-            success, out, err = self._execute_sh_script("botctl.sh", "logs", bot_key, str(n))
+            success, out, err = await self._execute_sh_script_async("botctl.sh", "logs", bot_key, str(n))
             svc = str(info.get("service") or "")
             output = out or err or ""
             embed = MessageHelper.create_status_embed(
@@ -11180,7 +11452,7 @@ echo "CHANGED_END"
                 
                 # First check if service exists
                 check_exists_cmd = f"systemctl list-unit-files {service_name} 2>/dev/null | grep -q {service_name} && echo 'exists' || echo 'not_found'"
-                exists_success, exists_output, _ = self._execute_ssh_command(check_exists_cmd, timeout=10)
+                exists_success, exists_output, _ = await self._execute_ssh_command_async(check_exists_cmd, timeout=10)
                 service_exists = exists_success and "exists" in (exists_output or "").lower()
                 
                 embed = discord.Embed(
@@ -11205,7 +11477,7 @@ echo "CHANGED_END"
                 else:
                     # Use ServiceManager for reliable status check
                     if self.service_manager:
-                        exists, state, error = self.service_manager.get_status(service_name, bot_name=bot_name)
+                        exists, state, error = await self.service_manager.get_status_async(service_name, bot_name=bot_name)
                         if exists and state:
                             is_active = state == "active"
                         status_icon = "✅" if is_active else "❌"
@@ -11217,12 +11489,12 @@ echo "CHANGED_END"
                         
                         # Get PID if running
                         if is_active:
-                            pid = self.service_manager.get_pid(service_name)
+                            pid = await self.service_manager.get_pid_async(service_name)
                             if pid:
                                 embed.add_field(name="PID", value=str(pid), inline=True)
                         
                         # Get detailed status
-                        detail_success, detail_output, detail_stderr = self.service_manager.get_detailed_status(service_name)
+                        detail_success, detail_output, detail_stderr = await self.service_manager.get_detailed_status_async(service_name)
                         if detail_success and detail_output:
                             status_lines = detail_output.split('\n')[-5:]
                             status_text = '\n'.join(status_lines)
@@ -11264,9 +11536,9 @@ echo "CHANGED_END"
                 
                 status_lines = []
                 if self.service_manager:
+                    statuses = await self.service_manager.get_statuses_async(self.BOTS)
                     for key, bot_info in self.BOTS.items():
-                        service_name = bot_info["service"]
-                        exists, state, error = self.service_manager.get_status(service_name, bot_name=key)
+                        exists, state, error = statuses[key]
                         
                         if exists and state:
                             is_active = state == "active"
@@ -11353,17 +11625,17 @@ echo "CHANGED_END"
                 return
 
             # Snapshot before action (so we can confirm PID/state changes)
-            before_exists, before_state, _ = self.service_manager.get_status(service_name, bot_name=bot_name_lower)
-            before_pid = self.service_manager.get_pid(service_name)
+            before_exists, before_state, _ = await self.service_manager.get_status_async(service_name, bot_name=bot_name_lower)
+            before_pid = await self.service_manager.get_pid_async(service_name)
             
-            success, stdout, stderr = self.service_manager.start(service_name, unmask=True, bot_name=bot_name_lower)
+            success, stdout, stderr = await self.service_manager.start_async(service_name, unmask=True, bot_name=bot_name_lower)
             
             if success:
                 # Verify service actually started
-                is_running, verify_error = self.service_manager.verify_started(service_name, bot_name=bot_name_lower)
+                is_running, verify_error = await self.service_manager.verify_started_async(service_name, bot_name=bot_name_lower)
                 if is_running:
-                    after_exists, after_state, _ = self.service_manager.get_status(service_name, bot_name=bot_name_lower)
-                    after_pid = self.service_manager.get_pid(service_name)
+                    after_exists, after_state, _ = await self.service_manager.get_status_async(service_name, bot_name=bot_name_lower)
+                    after_pid = await self.service_manager.get_pid_async(service_name)
                     print(f"{Colors.GREEN}[Success] {bot_info['name']} started successfully!{Colors.RESET}")
                     
                     # Create success embed
@@ -11525,14 +11797,14 @@ echo "CHANGED_END"
                     self.logger.clear_command_context()
                 return
 
-            before_exists, before_state, _ = self.service_manager.get_status(service_name, bot_name=bot_name_lower)
-            before_pid = self.service_manager.get_pid(service_name)
+            before_exists, before_state, _ = await self.service_manager.get_status_async(service_name, bot_name=bot_name_lower)
+            before_pid = await self.service_manager.get_pid_async(service_name)
             
-            success, stdout, stderr = self.service_manager.stop(service_name, script_pattern=script_pattern, bot_name=bot_name_lower)
+            success, stdout, stderr = await self.service_manager.stop_async(service_name, script_pattern=script_pattern, bot_name=bot_name_lower)
             
             if success:
-                after_exists, after_state, _ = self.service_manager.get_status(service_name, bot_name=bot_name_lower)
-                after_pid = self.service_manager.get_pid(service_name)
+                after_exists, after_state, _ = await self.service_manager.get_status_async(service_name, bot_name=bot_name_lower)
+                after_pid = await self.service_manager.get_pid_async(service_name)
                 print(f"{Colors.GREEN}[Success] {bot_info['name']} stopped successfully!{Colors.RESET}")
                 
                 # Create success embed
@@ -11666,17 +11938,17 @@ echo "CHANGED_END"
                     self.logger.clear_command_context()
                 return
 
-            before_exists, before_state, _ = self.service_manager.get_status(service_name, bot_name=bot_name_lower)
-            before_pid = self.service_manager.get_pid(service_name)
+            before_exists, before_state, _ = await self.service_manager.get_status_async(service_name, bot_name=bot_name_lower)
+            before_pid = await self.service_manager.get_pid_async(service_name)
             
-            success, stdout, stderr = self.service_manager.restart(service_name, script_pattern=script_pattern, bot_name=bot_name_lower)
+            success, stdout, stderr = await self.service_manager.restart_async(service_name, script_pattern=script_pattern, bot_name=bot_name_lower)
             
             if success:
                 # Verify service actually started
-                is_running, verify_error = self.service_manager.verify_started(service_name, bot_name=bot_name_lower)
+                is_running, verify_error = await self.service_manager.verify_started_async(service_name, bot_name=bot_name_lower)
                 if is_running:
-                    after_exists, after_state, _ = self.service_manager.get_status(service_name, bot_name=bot_name_lower)
-                    after_pid = self.service_manager.get_pid(service_name)
+                    after_exists, after_state, _ = await self.service_manager.get_status_async(service_name, bot_name=bot_name_lower)
+                    after_pid = await self.service_manager.get_pid_async(service_name)
                     print(f"{Colors.GREEN}[Success] {bot_info['name']} restarted successfully!{Colors.RESET}")
                     
                     # Create success embed
@@ -11822,8 +12094,8 @@ echo "CHANGED_END"
             progress_msg = None
             should_post_progress = not (await self._is_progress_channel(ctx.channel))
             if should_post_progress and self.service_manager and service_name:
-                before_exists, before_state, _ = self.service_manager.get_status(service_name, bot_name=bot_name)
-                before_pid = self.service_manager.get_pid(service_name)
+                before_exists, before_state, _ = await self.service_manager.get_status_async(service_name, bot_name=bot_name)
+                before_pid = await self.service_manager.get_pid_async(service_name)
                 progress_msg = await self._post_or_edit_progress(
                     progress_msg,
                     (
@@ -11832,7 +12104,7 @@ echo "CHANGED_END"
                     ),
                 )
             
-            success, stats = self._github_py_only_update(bot_folder)
+            success, stats = await self._github_py_only_update(bot_folder)
             if not success:
                 error_msg = stats.get("error", "Unknown error")
                 print(f"{Colors.RED}[Error] GitHub py-only update failed for {bot_info['name']}: {error_msg[:500]}{Colors.RESET}")
@@ -11849,8 +12121,8 @@ echo "CHANGED_END"
                 await status_msg.edit(embed=error_embed)
                 await self._log_to_discord(error_embed, ctx.channel)
                 if should_post_progress and self.service_manager and service_name:
-                    after_exists, after_state, _ = self.service_manager.get_status(service_name, bot_name=bot_name)
-                    after_pid = self.service_manager.get_pid(service_name)
+                    after_exists, after_state, _ = await self.service_manager.get_status_async(service_name, bot_name=bot_name)
+                    after_pid = await self.service_manager.get_pid_async(service_name)
                     await self._post_or_edit_progress(
                         progress_msg,
                         (
@@ -11884,11 +12156,11 @@ echo "CHANGED_END"
             elif not service_name:
                 restart_err = "Missing service mapping"
             else:
-                ok_r, out_r, err_r = self.service_manager.restart(service_name, bot_name=bot_name)
+                ok_r, out_r, err_r = await self.service_manager.restart_async(service_name, bot_name=bot_name)
                 if not ok_r:
                     restart_err = (err_r or out_r or "restart failed")[:800]
                 else:
-                    running, verify_err = self.service_manager.verify_started(service_name, bot_name=bot_name)
+                    running, verify_err = await self.service_manager.verify_started_async(service_name, bot_name=bot_name)
                     restart_ok = bool(running)
                     if not restart_ok:
                         restart_err = (verify_err or "service did not become active")[:800]
@@ -11948,8 +12220,8 @@ echo "CHANGED_END"
                 except Exception:
                     pass
             if should_post_progress and self.service_manager and service_name:
-                after_exists, after_state, _ = self.service_manager.get_status(service_name, bot_name=bot_name)
-                after_pid = self.service_manager.get_pid(service_name)
+                after_exists, after_state, _ = await self.service_manager.get_status_async(service_name, bot_name=bot_name)
+                after_pid = await self.service_manager.get_pid_async(service_name)
                 await self._post_or_edit_progress(
                     progress_msg,
                     (
@@ -11991,7 +12263,7 @@ echo "CHANGED_END"
 
             bot_info = self.BOTS[bot_name]
             await self._log_to_discord(f"📦 **Updating {bot_info.get('name', bot_name)} (MWBots GitHub python-only)**")
-            ok, result = self._mwupdate_one_py_only(bot_name)
+            ok, result = await self._mwupdate_one_py_only(bot_name)
             if not ok:
                 await ctx.send(f"❌ Update failed:\n```{str(result.get('error') or 'unknown error')[:900]}```")
                 return
@@ -12484,7 +12756,7 @@ echo "CHANGED_END"
                     f"[selfupdate] START",
                 )
             # First, sync RSAdminBot/*.py from rsbots-code to live tree
-            success, stats = self._github_py_only_update("RSAdminBot")
+            success, stats = await self._github_py_only_update("RSAdminBot")
             if not success:
                 err_txt = str(stats.get("error", "Unknown error"))[:800]
                 error_embed = MessageHelper.create_error_embed(
@@ -12511,7 +12783,7 @@ echo "CHANGED_END"
 
             # Also sync shared scripts/*.py so admin tooling commands (!oracledatasync, etc.) are available.
             try:
-                scripts_ok, scripts_stats = self._github_py_only_update("scripts")
+                scripts_ok, scripts_stats = await self._github_py_only_update("scripts")
                 if not scripts_ok:
                     warn_txt = str((scripts_stats or {}).get("error", "unknown error"))
                     print(f"{Colors.YELLOW}[selfupdate] Warning: failed to sync scripts/: {warn_txt}{Colors.RESET}")
@@ -12615,7 +12887,7 @@ echo "CHANGED_END"
                     )
 
                 try:
-                    ok, stats = self._oraclefiles_sync_once(trigger="manual")
+                    ok, stats = await asyncio.to_thread(self._oraclefiles_sync_once, trigger="manual")
                 except Exception as e:
                     ok, stats = False, {"error": f"oraclefiles sync crashed: {str(e)[:300]}"}
 
@@ -12821,20 +13093,20 @@ echo "CHANGED_END"
                 mode_txt = "Ubuntu local-exec (no SSH key needed)" if local_exec else "SSH mode (key required if not local)"
 
                 # --- System health stats (Ubuntu local-exec preferred; fall back to SSH if needed)
-                def _cmd(cmd: str, timeout_s: int = 8) -> str:
-                    ok, out, err = self._execute_ssh_command(cmd, timeout=timeout_s)
+                async def _cmd(cmd: str, timeout_s: int = 8) -> str:
+                    ok, out, err = await self._execute_ssh_command_async(cmd, timeout=timeout_s, label="systemcheck")
                     return (out or err or "").strip()
 
                 # CPU/load snapshot
-                uptime_txt = _cmd("uptime", timeout_s=5)
-                top_head = _cmd("top -bn1 | head -n 5", timeout_s=6)
+                uptime_txt = await _cmd("uptime", timeout_s=5)
+                top_head = await _cmd("top -bn1 | head -n 5", timeout_s=6)
 
                 # Memory + disk
-                mem_txt = _cmd("free -h | head -n 3", timeout_s=5)
-                disk_root = _cmd("df -h / | head -n 2", timeout_s=5)
+                mem_txt = await _cmd("free -h | head -n 3", timeout_s=5)
+                disk_root = await _cmd("df -h / | head -n 2", timeout_s=5)
 
                 # journald size (good for catching runaway logs)
-                journal_usage = _cmd("journalctl --disk-usage 2>/dev/null || true", timeout_s=6)
+                journal_usage = await _cmd("journalctl --disk-usage 2>/dev/null || true", timeout_s=6)
 
                 # RSAdminBot file-logging folder size (if configured)
                 log_base = ""
@@ -12844,10 +13116,10 @@ echo "CHANGED_END"
                     log_base = ""
                 log_du = ""
                 if log_base:
-                    log_du = _cmd(f"du -sh {shlex.quote(log_base)} 2>/dev/null || true", timeout_s=6)
+                    log_du = await _cmd(f"du -sh {shlex.quote(log_base)} 2>/dev/null || true", timeout_s=6)
 
                 # Total size of bots folder (fast-ish, bounded)
-                bots_du = _cmd("du -sh /home/rsadmin/bots 2>/dev/null | head -n 1 || true", timeout_s=10)
+                bots_du = await _cmd("du -sh /home/rsadmin/bots 2>/dev/null | head -n 1 || true", timeout_s=10)
 
                 # Systemd services snapshot (all configured bots)
                 svc_list = sorted({str((v or {}).get("service") or "").strip() for v in (self.BOTS or {}).values() if (v or {}).get("service")})
@@ -12863,10 +13135,10 @@ echo "CHANGED_END"
                         + "echo \"$s $st pid=$pid\"; "
                         + "done"
                     )
-                    svc_txt = _cmd(svc_cmd, timeout_s=10)
+                    svc_txt = await _cmd(svc_cmd, timeout_s=10)
 
                 # Top 10 largest files under /home/rsadmin/bots (xdev avoids scanning mounted volumes)
-                top_files = _cmd(
+                top_files = await _cmd(
                     "find /home/rsadmin/bots -xdev -type f -printf '%s\\t%p\\n' 2>/dev/null | sort -nr | head -n 10 | "
                     "awk -F'\\t' '{printf \"%8.1f MB\\t%s\\n\", ($1/1024/1024), $2}'",
                     timeout_s=12,
@@ -12905,6 +13177,7 @@ echo "CHANGED_END"
                 )
                 if svc_txt.strip():
                     embed.add_field(name="Services (systemd)", value=f"```{_clip(svc_txt, 950)}```", inline=False)
+                embed.add_field(name="Command exec", value=f"```{_clip(self._command_exec_summary(), 950)}```", inline=False)
 
                 await ctx.send(embed=embed)
 
@@ -12998,6 +13271,16 @@ echo "CHANGED_END"
             bot_groups = self.config.get("bot_groups") or {}
             rs_keys = ["rsadminbot"] + list(bot_groups.get("rs_bots") or [])
             lines = ["🧾 **RS Bots: state + PID**", "```"]
+
+            async def _probe(key: str) -> Tuple[Tuple[bool, Optional[str], Optional[str]], Optional[int]]:
+                svc_k = str((self.BOTS.get(key) or {}).get("service") or "")
+                return await asyncio.gather(
+                    self.service_manager.get_status_async(svc_k, bot_name=key),
+                    self.service_manager.get_pid_async(svc_k),
+                )
+
+            mapped = [k for k in rs_keys if (self.BOTS.get(k) or {}).get("service")]
+            probes = dict(zip(mapped, await asyncio.gather(*(_probe(k) for k in mapped))))
             for key in rs_keys:
                 info = self.BOTS.get(key) or {}
                 svc = info.get("service", "")
@@ -13005,8 +13288,8 @@ echo "CHANGED_END"
                 if not svc:
                     lines.append(f"{key}: missing service mapping")
                     continue
-                exists, state, _ = self.service_manager.get_status(svc, bot_name=key)
-                pid = self.service_manager.get_pid(svc) or 0
+                (exists, state, _), pid = probes[key]
+                pid = pid or 0
                 state_txt = state or "unknown"
                 prefix = "OK" if exists and state == "active" else "NO"
                 lines.append(f"{prefix} {name} ({key}) state={state_txt} pid={pid}")
@@ -13146,7 +13429,7 @@ PY
 .venv/bin/python /tmp/mw_check_runtime_json.py 2>&1 | tail -n 50
 """
             cmd = cmd.replace("__REMOTE_ROOT__", shlex.quote(remote_root))
-            ok, stdout, stderr = self._execute_ssh_command(cmd, timeout=60)
+            ok, stdout, stderr = await self._execute_ssh_command_async(cmd, timeout=60)
             output = (stdout or stderr or "").strip()
             if not output:
                 output = "(no output)"
@@ -13194,7 +13477,7 @@ cd {shlex.quote(remote_root)}
 echo "=== codehash ({bot_key}) ==="
 sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
 """
-            ok, stdout, stderr = self._execute_ssh_command(cmd, timeout=30)
+            ok, stdout, stderr = await self._execute_ssh_command_async(cmd, timeout=30)
             output = (stdout or stderr or "").strip() or "(no output)"
             if len(output) > 1800:
                 output = output[-1800:]
@@ -13295,7 +13578,7 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
             
             # Validate archive exists on remote
             check_cmd = f"test -f {shlex.quote(archive_path)} && echo OK || echo MISSING"
-            ok, stdout, stderr = self._execute_ssh_command(check_cmd, timeout=10)
+            ok, stdout, stderr = await self._execute_ssh_command_async(check_cmd, timeout=10)
             if not ok or "OK" not in (stdout or ""):
                 await status_msg.edit(content=f"❌ Archive not found on server:\n```{archive_path}```")
                 return
@@ -13303,7 +13586,23 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
             # Canonical deploy path: deploy_apply (deploy_unpack + venv + systemd).
             # This avoids "messed up" states where code updates land but the shared venv is missing dependencies.
             await status_msg.edit(content="📦 **Deploying archive...**\n```\nApplying deploy (code + venv + systemd)...\n```")
-            success, out, err = self._execute_sh_script("botctl.sh", "deploy_apply", archive_path)
+            # Stream deploy_apply progress into the status message (tail, edits throttled to one per 3s).
+            deploy_tail: deque = deque(maxlen=12)
+            last_edit = [0.0]
+
+            async def _on_deploy_line(line: str) -> None:
+                if not line.strip():
+                    return
+                deploy_tail.append(line[:160])
+                now = time.monotonic()
+                if now - last_edit[0] < 3.0:
+                    return
+                last_edit[0] = now
+                body = "\n".join(deploy_tail)[-1500:]
+                with suppress(Exception):
+                    await status_msg.edit(content=f"📦 **Deploying archive...**\n```\n{body}\n```")
+
+            success, out, err = await self._execute_sh_script_async("botctl.sh", "deploy_apply", archive_path, on_line=_on_deploy_line)
             if not success:
                 error_text = (err or out or "Unknown error")[:800]
                 await status_msg.edit(content=f"❌ Deploy failed:\n```{error_text}```")
@@ -13317,11 +13616,15 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
                 await status_msg.edit(content="⚠️ Deploy applied, but ServiceManager is not available to restart bots. Use `bash botctl.sh restart all` on the server.")
                 return
             
-            for bot_key, bot_info in self.BOTS.items():
-                if bot_key == "rsadminbot":
-                    continue
-                service_name = bot_info.get("service", "")
-                ok_restart, stdout_r, stderr_r = self.service_manager.restart(service_name, bot_name=bot_key)
+            restart_keys = [k for k in self.BOTS if k != "rsadminbot"]
+            outcomes = await self._cmd_executor.fan_out(
+                restart_keys,
+                lambda k: self.service_manager.restart_async(self.BOTS[k].get("service", ""), bot_name=k),
+            )
+            for bot_key, outcome in zip(restart_keys, outcomes):
+                if isinstance(outcome, BaseException):
+                    outcome = (False, None, f"{type(outcome).__name__}: {outcome}")
+                ok_restart, stdout_r, stderr_r = outcome
                 if ok_restart:
                     restarted.append(bot_key)
                 else:
@@ -13354,7 +13657,7 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
             print(f"{Colors.YELLOW}[SSH] Executing: {command}{Colors.RESET}")
             await ctx.send(f"🔄 Executing command...")
             
-            success, stdout, stderr = self._execute_ssh_command(command, timeout=60)
+            success, stdout, stderr = await self._execute_ssh_command_async(command, timeout=60)
             
             # Log output to terminal
             if stdout:
@@ -13418,8 +13721,8 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
                 pid = 0
                 try:
                     if self.service_manager and service:
-                        exists, state, _ = self.service_manager.get_status(service, bot_name=bot_key)
-                        pid = int(self.service_manager.get_pid(service) or 0)
+                        exists, state, _ = await self.service_manager.get_status_async(service, bot_name=bot_key)
+                        pid = int(await self.service_manager.get_pid_async(service) or 0)
                 except Exception:
                     exists = False
 
@@ -13433,7 +13736,7 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
                         f'test -f {shlex.quote(config_dir + "/" + fn)} && echo OK:{fn} || echo MISSING:{fn}'
                         for fn in required
                     )
-                    ok, out, err = self._execute_ssh_command(cmd, timeout=10)
+                    ok, out, err = await self._execute_ssh_command_async(cmd, timeout=10)
                     for ln in (out or err or "").splitlines():
                         ln = (ln or "").strip()
                         if ln.startswith("OK:"):
@@ -13647,7 +13950,7 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
                 await ctx.send(embed=embed, view=view)
                 return
             
-            result = self._build_botconfig_embed(bot_name, triggered_by=ctx.author)
+            result = await asyncio.to_thread(self._build_botconfig_embed, bot_name, triggered_by=ctx.author)
             if isinstance(result, list):
                 for i in range(0, len(result), 10):
                     await ctx.send(embeds=result[i : i + 10])
@@ -14461,13 +14764,12 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
 
             def _membership_id_from_history(discord_id: int) -> str:
                 try:
-                    hist_path = _REPO_ROOT / "RSCheckerbot" / "member_history.json"
+                    from RSCheckerbot.member_history_store import get_member_history_store  # type: ignore
+
+                    hist_path = _REPO_ROOT / "RSCheckerbot" / "member_history.sqlite3"
                     if not hist_path.exists():
                         return ""
-                    data = json.loads(hist_path.read_text(encoding="utf-8") or "{}")
-                    if not isinstance(data, dict):
-                        return ""
-                    rec = data.get(str(discord_id), {})
+                    rec = get_member_history_store(hist_path, legacy_json_path=None).get(str(discord_id))
                     wh = rec.get("whop") if isinstance(rec, dict) else None
                     if isinstance(wh, dict):
                         mid = str(wh.get("last_membership_id") or wh.get("last_whop_key") or "").strip()
@@ -14484,19 +14786,18 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
                 if isinstance(wh, dict):
                     api_key = str(wh.get("api_key") or "").strip()
                     company_id = str(wh.get("company_id") or "").strip()
-                    base_url = str(wh.get("base_url") or "https://api.whop.com/api/v1").strip()
                     if api_key and company_id:
-                        client = WhopAPIClient(api_key=api_key, base_url=base_url, company_id=company_id)
                         if not membership_id_used:
                             membership_id_used = _membership_id_from_history(target_member.id)
                         mid = membership_id_used
                         whop_fetch["membership_id"] = mid or ""
                         if mid:
-                            whop_brief = await fetch_whop_brief(
-                                client,
-                                mid,
-                                enable_enrichment=bool(wh.get("enable_enrichment", True)),
-                            )
+                            async with WhopAPIClient.from_config(api_key, wh) as client:
+                                whop_brief = await fetch_whop_brief(
+                                    client,
+                                    mid,
+                                    enable_enrichment=bool(wh.get("enable_enrichment", True)),
+                                )
                             whop_fetch["status"] = "ok"
                         else:
                             whop_fetch["status"] = "missing_membership_id"
@@ -15483,7 +15784,7 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
             
             # Check service status
             if self.service_manager:
-                exists, state, error = self.service_manager.get_status(service_name, bot_name=bot_name)
+                exists, state, error = await self.service_manager.get_status_async(service_name, bot_name=bot_name)
                 if exists:
                     status_icon = "✅" if state == "active" else "❌"
                     embed.add_field(
@@ -15494,12 +15795,12 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
                     
                     # Get PID if running
                     if state == "active":
-                        pid = self.service_manager.get_pid(service_name)
+                        pid = await self.service_manager.get_pid_async(service_name)
                         if pid:
                             embed.add_field(name="PID", value=str(pid), inline=True)
                     
                     # Get detailed status
-                    detail_success, detail_output, detail_stderr = self.service_manager.get_detailed_status(service_name)
+                    detail_success, detail_output, detail_stderr = await self.service_manager.get_detailed_status_async(service_name)
                     if detail_success and detail_output:
                         # Extract key info from status
                         status_lines = detail_output.split('\n')
@@ -15517,7 +15818,7 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
                     
                     # Get failure logs if stopped
                     if state != "active":
-                        logs = self.service_manager.get_failure_logs(service_name, lines=30)
+                        logs = await self.service_manager.get_failure_logs_async(service_name, lines=30)
                         if logs:
                             # Extract error lines
                             error_lines = [line for line in logs.split('\n') if any(keyword in line.lower() for keyword in ['error', 'failed', 'exception', 'traceback', 'failed to'])]
@@ -15555,7 +15856,7 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
                 
                 # Check if script exists
                 check_script_cmd = f"test -f {script_path} && echo 'exists' || echo 'missing'"
-                script_exists_success, script_exists_output, _ = self._execute_ssh_command(check_script_cmd, timeout=10)
+                script_exists_success, script_exists_output, _ = await self._execute_ssh_command_async(check_script_cmd, timeout=10)
                 script_exists = script_exists_success and "exists" in (script_exists_output or "").lower()
                 
                 embed.add_field(
@@ -15566,7 +15867,7 @@ sha256sum {quoted_files} 2>&1 | sed 's#^#sha256 #'
                 
                 # Check folder
                 check_folder_cmd = f"test -d {remote_base}/{bot_folder} && echo 'exists' || echo 'missing'"
-                folder_exists_success, folder_exists_output, _ = self._execute_ssh_command(check_folder_cmd, timeout=10)
+                folder_exists_success, folder_exists_output, _ = await self._execute_ssh_command_async(check_folder_cmd, timeout=10)
                 folder_exists = folder_exists_success and "exists" in (folder_exists_output or "").lower()
                 
                 embed.add_field(
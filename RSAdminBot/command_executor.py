@@ -0,0 +1,344 @@
+"""
+Command executor for RSAdminBot (local bash or SSH).
+
+- Async path: `asyncio.create_subprocess_exec`, so botctl/status/update commands never block the
+  Discord event loop. A semaphore caps how many commands run at once (`max_concurrency`).
+- SSH connection reuse: remote argv gets OpenSSH ControlMaster options, so the first command opens
+  a master connection and later commands (sync or async) ride it for `control_persist_s` seconds.
+  Not used on Windows (OpenSSH for Windows has no ControlMaster support).
+- Streaming: `run(..., on_line=cb)` calls `cb(line)` for each stdout line as it arrives.
+- Metrics: per-label count / failures / timeouts / last / avg / p95 / max wall time, plus in-flight.
+
+The sync `run_blocking` exists for the few callers that are still synchronous (ServiceManager);
+it shares the argv builder and metrics with the async path.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import inspect
+import os
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Sequence, TypeVar, Union
+
+_LATENCY_WINDOW = 200
+_POSIX = os.name != "nt"
+_STREAM_LIMIT = 4 * 1024 * 1024
+
+T = TypeVar("T")
+R = TypeVar("R")
+LineCallback = Callable[[str], Union[None, Awaitable[None]]]
+
+
+class CommandResult:
+    __slots__ = ("ok", "returncode", "stdout", "stderr", "elapsed_s", "timed_out", "error")
+
+    def __init__(
+        self,
+        ok: bool,
+        returncode: Optional[int],
+        stdout: str,
+        stderr: str,
+        *,
+        elapsed_s: float,
+        timed_out: bool = False,
+        error: str = "",
+    ) -> None:
+        self.ok = bool(ok)
+        self.returncode = returncode
+        self.stdout = str(stdout or "")
+        self.stderr = str(stderr or "")
+        self.elapsed_s = float(elapsed_s or 0.0)
+        self.timed_out = bool(timed_out)
+        self.error = str(error or "")
+
+
+class _LabelStats:
+    __slots__ = ("count", "failed", "timeouts", "last_ms", "max_ms", "window")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self.window: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.window)
+        return {
+            "count": self.count,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "last_ms": self.last_ms,
+            "avg_ms": round(sum(ordered) / len(ordered), 1) if ordered else 0.0,
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0,
+            "max_ms": self.max_ms,
+        }
+
+
+class CommandExecutor:
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 4,
+        control_persist_s: int = 300,
+        control_dir: str = "",
+        connect_timeout_s: int = 10,
+    ) -> None:
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.control_persist_s = max(0, int(control_persist_s))
+        self.connect_timeout_s = max(1, int(connect_timeout_s))
+        # Unix socket paths are capped near 104 bytes; %C (hash of host/user/port) keeps it short.
+        self.control_dir = Path(control_dir).expanduser() if control_dir else Path(tempfile.gettempdir()) / "rsadminbot-ssh"
+        self.multiplexing = _POSIX and self.control_persist_s > 0
+
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._sem_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _LabelStats] = {}
+        self._in_flight = 0
+
+    # -------------------------
+    # argv
+    # -------------------------
+    def ssh_argv(self, ssh_base: Sequence[str], command: str) -> List[str]:
+        """`ssh [opts] user@host bash -lc <command>` with connection-reuse options before the target."""
+        base = list(ssh_base)
+        host_target = base[-1]
+        opts = ["-o", f"ConnectTimeout={self.connect_timeout_s}"]
+        if self.multiplexing:
+            try:
+                self.control_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+                opts += [
+                    "-o", "ControlMaster=auto",
+                    "-o", f"ControlPath={self.control_dir / '%C'}",
+                    "-o", f"ControlPersist={self.control_persist_s}s",
+                ]
+            except OSError:
+                pass
+        # Do NOT shlex.quote() the payload: no local shell is involved, bash -lc gets it verbatim.
+        return base[:-1] + opts + [host_target, "bash", "-lc", command]
+
+    @staticmethod
+    def local_argv(command: str) -> List[str]:
+        return ["bash", "-lc", command]
+
+    # -------------------------
+    # Async
+    # -------------------------
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+            self._sem_loop = loop
+        return self._sem
+
+    async def run(
+        self,
+        argv: Sequence[str],
+        *,
+        timeout: float = 30,
+        label: str = "",
+        on_line: Optional[LineCallback] = None,
+    ) -> CommandResult:
+        """Run argv (no shell) under the concurrency cap; stream stdout lines to `on_line` if given."""
+        async with self._semaphore():
+            self._begin()
+            t0 = time.monotonic()
+            res: Optional[CommandResult] = None
+            try:
+                res = await self._run_process(list(argv), float(timeout), on_line, t0)
+                return res
+            finally:
+                if res is None:
+                    # Cancelled (e.g. the awaiting command timed out) or raised: still close out in_flight.
+                    res = CommandResult(False, None, "", "", elapsed_s=time.monotonic() - t0, error="cancelled")
+                self._record(label or (argv[0] if argv else "?"), res)
+
+    async def fan_out(
+        self,
+        items: Iterable[T],
+        fn: Callable[[T], Awaitable[R]],
+        *,
+        limit: Optional[int] = None,
+    ) -> List[Union[R, BaseException]]:
+        """Run `fn(item)` for every item, at most `limit` (default max_concurrency) at a time; results keep input order."""
+        gate = asyncio.Semaphore(max(1, int(limit or self.max_concurrency)))
+
+        async def _one(item: T) -> R:
+            async with gate:
+                return await fn(item)
+
+        return await asyncio.gather(*(_one(i) for i in items), return_exceptions=True)
+
+    async def _run_process(
+        self,
+        argv: List[str],
+        timeout: float,
+        on_line: Optional[LineCallback],
+        t0: float,
+    ) -> CommandResult:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *argv,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=_STREAM_LIMIT,
+                start_new_session=_POSIX,
+            )
+        except FileNotFoundError as e:
+            return CommandResult(False, None, "", "", elapsed_s=time.monotonic() - t0, error=f"executable not found: {e}")
+        except Exception as e:
+            return CommandResult(False, None, "", "", elapsed_s=time.monotonic() - t0, error=str(e))
+
+        out_lines: List[str] = []
+
+        async def _read_stdout() -> None:
+            assert proc.stdout is not None
+            while True:
+                raw = await proc.stdout.readline()
+                if not raw:
+                    return
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                out_lines.append(line)
+                if on_line is not None:
+                    try:
+                        r = on_line(line)
+                        if inspect.isawaitable(r):
+                            await r
+                    except Exception:
+                        pass
+
+        async def _read_stderr() -> bytes:
+            assert proc.stderr is not None
+            return await proc.stderr.read()
+
+        stdout_task = asyncio.ensure_future(_read_stdout())
+        stderr_task = asyncio.ensure_future(_read_stderr())
+        timed_out = False
+        try:
+            await asyncio.wait_for(asyncio.gather(stdout_task, stderr_task, proc.wait()), timeout=timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+        except asyncio.CancelledError:
+            self._kill(proc, argv)
+            raise
+        if timed_out:
+            self._kill(proc, argv)
+            for t in (stdout_task, stderr_task):
+                t.cancel()
+            try:
+                await asyncio.wait_for(proc.wait(), timeout=5)
+            except Exception:
+                pass
+            return CommandResult(
+                False,
+                proc.returncode,
+                "\n".join(out_lines),
+                "",
+                elapsed_s=time.monotonic() - t0,
+                timed_out=True,
+                error=f"Command timed out after {timeout:g}s",
+            )
+        stderr_b = stderr_task.result() or b""
+        rc = proc.returncode
+        return CommandResult(
+            rc == 0,
+            rc,
+            "\n".join(out_lines),
+            stderr_b.decode("utf-8", errors="replace"),
+            elapsed_s=time.monotonic() - t0,
+        )
+
+    @staticmethod
+    def _kill(proc: Any, argv: Sequence[str]) -> None:
+        """Kill a timed-out command so its pipes close.
+
+        Local commands take their whole session (grandchildren would otherwise hold stdout open).
+        ssh only gets the client killed: a ControlMaster it forked shares the session and must survive.
+        """
+        is_ssh = bool(argv) and Path(str(argv[0])).name in ("ssh", "ssh.exe")
+        try:
+            if _POSIX and not is_ssh:
+                os.killpg(proc.pid, signal.SIGKILL)
+            elif proc.returncode is None:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    # -------------------------
+    # Sync
+    # -------------------------
+    def run_blocking(self, argv: Sequence[str], *, timeout: float = 30, label: str = "") -> CommandResult:
+        """Synchronous variant for non-async callers. Same argv, same metrics (no concurrency cap)."""
+        self._begin()
+        t0 = time.monotonic()
+        try:
+            proc = subprocess.Popen(
+                list(argv),
+                shell=False,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                encoding="utf-8",
+                errors="replace",
+                start_new_session=_POSIX,
+            )
+            try:
+                out, err = proc.communicate(timeout=timeout)
+                res = CommandResult(proc.returncode == 0, proc.returncode, out, err, elapsed_s=time.monotonic() - t0)
+            except subprocess.TimeoutExpired:
+                self._kill(proc, argv)
+                with contextlib.suppress(Exception):
+                    proc.communicate(timeout=5)
+                res = CommandResult(False, None, "", "", elapsed_s=time.monotonic() - t0, timed_out=True, error=f"Command timed out after {timeout:g}s")
+        except FileNotFoundError as e:
+            res = CommandResult(False, None, "", "", elapsed_s=time.monotonic() - t0, error=f"executable not found: {e}")
+        except Exception as e:
+            res = CommandResult(False, None, "", "", elapsed_s=time.monotonic() - t0, error=str(e))
+        self._record(label or (argv[0] if argv else "?"), res)
+        return res
+
+    # -------------------------
+    # Metrics
+    # -------------------------
+    def _begin(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+
+    def _record(self, label: str, res: CommandResult) -> None:
+        ms = round(res.elapsed_s * 1000.0, 1)
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            for key in (label, "*"):
+                st = self._stats.get(key)
+                if st is None:
+                    st = _LabelStats()
+                    self._stats[key] = st
+                st.count += 1
+                st.failed += 0 if res.ok else 1
+                st.timeouts += 1 if res.timed_out else 0
+                st.last_ms = ms
+                st.max_ms = max(st.max_ms, ms)
+                st.window.append(ms)
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """{'in_flight', 'max_concurrency', 'multiplexing', 'total': {...}, 'by_label': {label: {...}}}"""
+        with self._lock:
+            by_label = {k: v.snapshot() for k, v in self._stats.items() if k != "*"}
+            total = self._stats["*"].snapshot() if "*" in self._stats else _LabelStats().snapshot()
+            return {
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "multiplexing": self.multiplexing,
+                "total": total,
+                "by_label": by_label,
+            }
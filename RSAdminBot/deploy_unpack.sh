@@ -106,11 +106,11 @@ preserve_and_replace_folder() {
          -o -name '*.db' -o -name '*.sqlite' -o -name '*.sqlite3' \
          -o -name '*.log' -o -name '*.lock' -o -name '*.migrated' -o -name '*.txt' \
          -o -name '.rs_onboarding_bot.lock' \
-         -o -name 'tickets.json' \
-         -o -name 'success_points.json' \
+         -o -name 'tickets.json' -o -name 'tickets.journal.jsonl' \
+         -o -name 'success_points.json' -o -name 'image_phash_index.bin' \
          -o -name 'vouches.json' \
          -o -name 'points_history.txt' \
-         -o -name 'queue.json' \
+         -o -name 'queue.json' -o -name 'queue_recipients.json' -o -name 'send_logs.jsonl' \
          -o -name 'registry.json' \
          -o -name 'invites.json' \
          -o -name 'missed_onboarding_report.json' \
@@ -61,7 +61,7 @@ async def run(admin_bot):
                     service_exists = service_base in all_remote_services
                     
                     if service_exists and admin_bot.service_manager:
-                        exists, state, error = admin_bot.service_manager.get_status(service_name, bot_name=bot_key)
+                        exists, state, error = await admin_bot.service_manager.get_status_async(service_name, bot_name=bot_key)
                         if exists and state:
                             is_active = state == "active"
                             status_icon = "🟢" if is_active else "🟡"
@@ -15,6 +15,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from cashout_store import JsonStore, ProfileStore, TicketStore
 from panel_builder import (
     PanelAdminView,
     build_cashout_admin_hub_embed,
@@ -104,11 +105,6 @@ class ConfigError(RuntimeError):
     pass
 
 
-TICKET_TYPE_OPEN_EQUIV: Dict[str, frozenset[str]] = {
-    'request_submit': frozenset({'request_submit', 'request_custom_quote'}),
-}
-
-
 @dataclass(frozen=True)
 class ButtonDefinition:
     key: str
@@ -133,6 +129,7 @@ class TicketSettings:
     support_role_ids: List[int]
     admin_role_ids: List[int]
     close_delay_seconds: int
+    store_flush_ms: int
     topic_template: str
     panel_embed_color: int
     ticket_embed_color: int
@@ -330,6 +327,7 @@ class ConfigLoader:
             support_role_ids=[int(x) for x in ticket_cfg.get('support_role_ids', [])],
             admin_role_ids=[int(x) for x in ticket_cfg.get('admin_role_ids', [])],
             close_delay_seconds=int(ticket_cfg.get('close_delay_seconds', 10)),
+            store_flush_ms=int(ticket_cfg.get('store_flush_ms', 500)),
             topic_template=str(ticket_cfg.get('topic_template', 'ticket_type={ticket_type};owner={user_id};username={username}')),
             panel_embed_color=int(str(ticket_cfg.get('panel_embed_color', '0x5865F2')), 16),
             ticket_embed_color=int(str(ticket_cfg.get('ticket_embed_color', '0x5865F2')), 16),
@@ -359,86 +357,6 @@ class ConfigLoader:
         return RuntimeConfig(token=token, ticket=ticket, sheet=sheet)
 
 
-class JsonStore:
-    def __init__(self, path: Path, default_payload: Dict[str, Any]) -> None:
-        self.path = path
-        self.default_payload = default_payload
-        self._lock = asyncio.Lock()
-        if not self.path.exists():
-            self.path.write_text(json.dumps(default_payload, indent=2), encoding='utf-8')
-
-    async def read(self) -> Dict[str, Any]:
-        async with self._lock:
-            return json.loads(self.path.read_text(encoding='utf-8'))
-
-    async def write(self, payload: Dict[str, Any]) -> None:
-        async with self._lock:
-            self.path.write_text(json.dumps(payload, indent=2), encoding='utf-8')
-
-
-class TicketStore(JsonStore):
-    def __init__(self, path: Path) -> None:
-        super().__init__(path, {'tickets': {}})
-
-    async def upsert_ticket(self, channel_id: int, record: Dict[str, Any]) -> None:
-        data = await self.read()
-        data.setdefault('tickets', {})[str(channel_id)] = record
-        await self.write(data)
-
-    async def delete_ticket(self, channel_id: int) -> Optional[Dict[str, Any]]:
-        data = await self.read()
-        removed = data.setdefault('tickets', {}).pop(str(channel_id), None)
-        await self.write(data)
-        return removed
-
-    async def count_open_tickets(self, guild_id: int, user_id: int, ticket_type: str) -> int:
-        equiv = TICKET_TYPE_OPEN_EQUIV.get(ticket_type, frozenset({ticket_type}))
-        data = await self.read()
-        count = 0
-        for _, record in data.get('tickets', {}).items():
-            if (
-                int(record.get('guild_id', 0)) == guild_id
-                and int(record.get('owner_id', 0)) == user_id
-                and str(record.get('ticket_type')) in equiv
-                and bool(record.get('is_open', False))
-            ):
-                count += 1
-        return count
-
-    async def find_open_ticket(self, guild_id: int, user_id: int, ticket_type: str) -> Optional[Dict[str, Any]]:
-        equiv = TICKET_TYPE_OPEN_EQUIV.get(ticket_type, frozenset({ticket_type}))
-        data = await self.read()
-        for channel_id, record in data.get('tickets', {}).items():
-            if (
-                int(record.get('guild_id', 0)) == guild_id
-                and int(record.get('owner_id', 0)) == user_id
-                and str(record.get('ticket_type')) in equiv
-                and bool(record.get('is_open', False))
-            ):
-                found = dict(record)
-                found['channel_id'] = int(channel_id)
-                return found
-        return None
-
-
-class ProfileStore(JsonStore):
-    def __init__(self, path: Path) -> None:
-        super().__init__(path, {'profiles': {}})
-
-    async def get_profile(self, user_id: int) -> Dict[str, Any]:
-        data = await self.read()
-        return dict(data.get('profiles', {}).get(str(user_id), {}))
-
-    async def upsert_profile(self, user_id: int, patch: Dict[str, Any]) -> Dict[str, Any]:
-        data = await self.read()
-        profiles = data.setdefault('profiles', {})
-        existing = dict(profiles.get(str(user_id), {}))
-        existing.update(patch)
-        profiles[str(user_id)] = existing
-        await self.write(data)
-        return existing
-
-
 class SheetClient:
     def __init__(self, config: SheetIntegration) -> None:
         self.config = config
@@ -636,9 +554,10 @@ class RSTicketBot(commands.Bot):
         intents.presences = False
         super().__init__(command_prefix='!', intents=intents)
         self.runtime = runtime
-        self.store = TicketStore(TICKETS_PATH)
-        self.profile_store = ProfileStore(PROFILES_PATH)
-        self.panel_overrides = JsonStore(PANEL_OVERRIDES_PATH, {})
+        flush_ms = runtime.ticket.store_flush_ms
+        self.store = TicketStore(TICKETS_PATH, flush_delay_ms=flush_ms)
+        self.profile_store = ProfileStore(PROFILES_PATH, flush_delay_ms=flush_ms)
+        self.panel_overrides = JsonStore(PANEL_OVERRIDES_PATH, {}, flush_delay_ms=flush_ms)
         self.sheet_client = SheetClient(runtime.sheet)
         self._auto_panel_posted_once = False
         # Used to bridge multi-step modal state across modal submit -> button click.
@@ -734,6 +653,14 @@ class RSTicketBot(commands.Bot):
         )
         FLOW.rule()
 
+    async def close(self) -> None:
+        for store in (self.store, self.profile_store, self.panel_overrides):
+            try:
+                await store.flush()
+            except Exception as exc:
+                LOG.error('Could not save %s on shutdown: %s', store.path.name, exc)
+        await super().close()
+
     async def on_ready(self) -> None:
         if not self.user:
             return
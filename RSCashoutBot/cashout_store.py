@@ -0,0 +1,171 @@
+"""In-memory JSON stores for RSCashoutBot (tickets.json, profiles.json, panel_overrides.json)."""
+
+import asyncio
+import copy
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+LOG = logging.getLogger('rscashoutbot')
+
+# Ticket types that count as the same open ticket (one open request per member).
+TICKET_TYPE_OPEN_EQUIV: Dict[str, frozenset[str]] = {
+    'request_submit': frozenset({'request_submit', 'request_custom_quote'}),
+}
+
+
+class JsonStore:
+    """JSON file held in memory, saved write-behind.
+
+    The file is parsed once at startup; read() is a copy of the in-memory payload.
+    write() replaces the payload and schedules one atomic save (temp file + replace)
+    `flush_delay_ms` later, so a burst of writes costs one save and no button click
+    waits on the disk. flush() saves immediately (RSTicketBot.close calls it).
+    """
+
+    def __init__(self, path: Path, default_payload: Dict[str, Any], *, flush_delay_ms: int = 500) -> None:
+        self.path = path
+        self.default_payload = default_payload
+        self.flush_delay = max(0, int(flush_delay_ms)) / 1000.0
+        self._lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()  # one save at a time (they share the .tmp path)
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        if not self.path.exists():
+            self.path.write_text(json.dumps(default_payload, indent=2), encoding='utf-8')
+        self._data: Dict[str, Any] = json.loads(self.path.read_text(encoding='utf-8'))
+
+    async def read(self) -> Dict[str, Any]:
+        async with self._lock:
+            return copy.deepcopy(self._data)
+
+    async def write(self, payload: Dict[str, Any]) -> None:
+        async with self._lock:
+            self._data = copy.deepcopy(payload)
+            self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        # Loop: a write that lands while a save is in flight is picked up by the next pass.
+        while self._dirty:
+            await asyncio.sleep(self.flush_delay)
+            try:
+                await self.flush()
+            except Exception as exc:
+                LOG.error('Could not save %s (will retry on next change): %s', self.path.name, exc)
+                return
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            async with self._lock:
+                if not self._dirty:
+                    return
+                text = json.dumps(self._data, indent=2)
+                self._dirty = False
+            try:
+                await asyncio.to_thread(self._replace_file, text)
+            except Exception:
+                self._dirty = True
+                raise
+
+    def _replace_file(self, text: str) -> None:
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        tmp.write_text(text, encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+OpenTicketKey = Tuple[int, int, str]  # (guild_id, owner_id, ticket_type)
+
+
+class TicketStore(JsonStore):
+    """tickets.json plus an index of open tickets by (guild, owner, ticket type)."""
+
+    def __init__(self, path: Path, *, flush_delay_ms: int = 500) -> None:
+        super().__init__(path, {'tickets': {}}, flush_delay_ms=flush_delay_ms)
+        self._data.setdefault('tickets', {})
+        self._open: Dict[OpenTicketKey, Dict[int, None]] = {}
+        for channel_id, record in self._data['tickets'].items():
+            self._index_add(int(channel_id), record)
+
+    @staticmethod
+    def _open_key(record: Dict[str, Any]) -> Optional[OpenTicketKey]:
+        if not bool(record.get('is_open', False)):
+            return None
+        return (int(record.get('guild_id', 0)), int(record.get('owner_id', 0)), str(record.get('ticket_type')))
+
+    def _index_add(self, channel_id: int, record: Dict[str, Any]) -> None:
+        key = self._open_key(record)
+        if key is not None:
+            self._open.setdefault(key, {})[channel_id] = None
+
+    def _index_remove(self, channel_id: int, record: Optional[Dict[str, Any]]) -> None:
+        key = self._open_key(record) if record else None
+        if key is None:
+            return
+        channels = self._open.get(key)
+        if channels is not None:
+            channels.pop(channel_id, None)
+            if not channels:
+                del self._open[key]
+
+    async def upsert_ticket(self, channel_id: int, record: Dict[str, Any]) -> None:
+        async with self._lock:
+            tickets = self._data['tickets']
+            self._index_remove(int(channel_id), tickets.get(str(channel_id)))
+            tickets[str(channel_id)] = copy.deepcopy(record)
+            self._index_add(int(channel_id), record)
+            self._mark_dirty()
+
+    async def delete_ticket(self, channel_id: int) -> Optional[Dict[str, Any]]:
+        async with self._lock:
+            removed = self._data['tickets'].pop(str(channel_id), None)
+            if removed is not None:
+                self._index_remove(int(channel_id), removed)
+                self._mark_dirty()
+            return removed
+
+    def _open_channels(self, guild_id: int, user_id: int, ticket_type: str) -> List[int]:
+        equiv = TICKET_TYPE_OPEN_EQUIV.get(ticket_type, frozenset({ticket_type}))
+        channels: List[int] = []
+        for t in equiv:
+            channels.extend(self._open.get((guild_id, user_id, t), {}))
+        return channels
+
+    async def count_open_tickets(self, guild_id: int, user_id: int, ticket_type: str) -> int:
+        async with self._lock:
+            return len(self._open_channels(guild_id, user_id, ticket_type))
+
+    async def find_open_ticket(self, guild_id: int, user_id: int, ticket_type: str) -> Optional[Dict[str, Any]]:
+        async with self._lock:
+            channels = self._open_channels(guild_id, user_id, ticket_type)
+            if not channels:
+                return None
+            channel_id = min(channels)  # snowflakes: the oldest ticket channel
+            found = copy.deepcopy(self._data['tickets'][str(channel_id)])
+        found['channel_id'] = channel_id
+        return found
+
+
+class ProfileStore(JsonStore):
+    def __init__(self, path: Path, *, flush_delay_ms: int = 500) -> None:
+        super().__init__(path, {'profiles': {}}, flush_delay_ms=flush_delay_ms)
+        self._data.setdefault('profiles', {})
+
+    async def get_profile(self, user_id: int) -> Dict[str, Any]:
+        async with self._lock:
+            return copy.deepcopy(self._data['profiles'].get(str(user_id), {}))
+
+    async def upsert_profile(self, user_id: int, patch: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._lock:
+            profiles = self._data['profiles']
+            existing = dict(profiles.get(str(user_id), {}))
+            existing.update(copy.deepcopy(patch))
+            profiles[str(user_id)] = existing
+            self._mark_dirty()
+            return copy.deepcopy(existing)
@@ -3,18 +3,26 @@ Standalone relay: mirror messages from configured source channels into destinati
 channels (same or other guild). Preserves message content, embeds, and attachments;
 redacts external URLs in text (and embed title links). Discord message links and
 embed images/thumbnails are kept so the post still looks like the original.
+
+Delivery: the gateway handler only filters and enqueues. Each source channel (one mirror
+destination per source) has its own ordered queue + worker, so mirrors keep source order
+while different destinations proceed in parallel. Attachments are never read into memory:
+each file is streamed from Discord's CDN straight into the multipart upload, and a global
+byte budget (attachment_inflight_budget_mb) caps how many attachment bytes are in flight.
 """
 from __future__ import annotations
 
 import asyncio
-import io
+import contextlib
 import json
 import os
 import re
 import sys
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
+import aiohttp
 import discord
 from discord.errors import PrivilegedIntentsRequired
 from discord.ext import commands
@@ -383,6 +391,51 @@ def _build_multiimage_grid_embeds(
     return out, redactions
 
 
+_API_BASE = "https://discord.com/api/v10"
+_ATTACHMENT_MAX_BYTES = 8 * 1024 * 1024
+_STREAM_CHUNK = 64 * 1024
+_MAX_SEND_ATTEMPTS = 3
+
+
+class _ByteBudget:
+    """Global cap on attachment bytes being relayed at once; a reservation is held for a whole upload."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, int(limit))
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, n: int) -> AsyncIterator[None]:
+        # One message may exceed the budget on its own; it then waits for the budget to be empty.
+        n = min(max(0, int(n)), self.limit)
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight + n <= self.limit)
+            self.in_flight += n
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.in_flight -= n
+                self._cond.notify_all()
+
+
+class _CdnStream(aiohttp.payload.AsyncIterablePayload):
+    """Multipart part fed chunk by chunk from a CDN response; known size so the upload has a Content-Length.
+
+    The size is reported through the public `size` property (the same override aiohttp's own
+    BytesIOPayload / BufferedReaderPayload use), so MultipartWriter can compute the body length.
+    """
+
+    def __init__(self, resp: aiohttp.ClientResponse, *, size: int, content_type: str) -> None:
+        super().__init__(resp.content.iter_chunked(_STREAM_CHUNK), content_type=content_type)
+        self._stream_size = int(size)
+
+    @property
+    def size(self) -> int:
+        return self._stream_size
+
+
 def _atomic_write_json(path: Path, data: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(path.suffix + ".tmp")
@@ -432,8 +485,16 @@ class RelayBot(commands.Bot):
         self._human_log = bool(cfg.get("human_readable_logging", True))
         self._log_bot_skips = bool(cfg.get("log_skip_bot_messages", False))
         self._technical = bool(cfg.get("show_technical_trace", False))
+        self._attach_budget = _ByteBudget(int(float(cfg.get("attachment_inflight_budget_mb") or 32) * 1024 * 1024))
+        self._queues: Dict[int, asyncio.Queue[discord.Message]] = {}
+        self._workers: Dict[int, asyncio.Task[None]] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Discord buckets for our own REST posts (webhook execute and bot-account fallback), per URL.
+        self._route_blocked_until: Dict[str, float] = {}
+        self._route_global_until = 0.0
 
     async def setup_hook(self) -> None:
+        self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=300, sock_connect=15))
         if self._channel_map_path.is_file():
             try:
                 raw = _load_json(self._channel_map_path)
@@ -468,6 +529,19 @@ class RelayBot(commands.Bot):
                     flush=True,
                 )
 
+    async def close(self) -> None:
+        # Let queued and in-flight mirrors finish (bounded), then stop the workers.
+        # join() also waits for an item a worker already took, so join every queue.
+        pending = [q.join() for q in self._queues.values()]
+        if pending:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(asyncio.gather(*pending), timeout=15)
+        for task in self._workers.values():
+            task.cancel()
+        if self._session is not None:
+            await self._session.close()
+        await super().close()
+
     def _webhook_display_name(self, author: discord.abc.User) -> str:
         n = getattr(author, "display_name", None) or getattr(author, "name", None) or "User"
         n = str(n)
@@ -666,51 +740,122 @@ class RelayBot(commands.Bot):
         *,
         content: Optional[str],
         embeds: List[discord.Embed],
-        files: list[discord.File],
-    ) -> tuple[bool, bool, Optional[str]]:
-        """Returns (success, used_webhook_impersonation, error_detail)."""
-        if not content and not embeds and not files:
+        attachments: List[discord.Attachment],
+    ) -> tuple[bool, bool, Optional[str], List[str]]:
+        """Returns (success, used_webhook_impersonation, error_detail, attachment notes)."""
+        if not content and not embeds and not attachments:
             content = "_[no content]_"
-
-        if self._use_webhook:
-            try:
+        payload: dict[str, Any] = {
+            "content": content,
+            "allowed_mentions": {"parse": []},
+        }
+        if embeds:
+            payload["embeds"] = [e.to_dict() for e in embeds]
+
+        async with self._attach_budget.reserve(sum(int(a.size or 0) for a in attachments)):
+            if self._use_webhook:
                 wh = await self._ensure_relay_webhook(dest)
-                if wh is not None:
-                    kwargs: dict[str, Any] = {
-                        "content": content,
-                        "username": self._webhook_display_name(message.author),
-                        "avatar_url": message.author.display_avatar.url,
-                        "allowed_mentions": discord.AllowedMentions.none(),
-                    }
-                    if embeds:
-                        kwargs["embeds"] = embeds
-                    if files:
-                        kwargs["files"] = files
-                    await wh.send(**kwargs)
-                    return True, True, None
-            except discord.HTTPException as e:
-                print(
-                    f"[relay] WARNING: webhook execute failed (HTTP {e.status}): "
-                    f"{getattr(e, 'text', None) or str(e)!r} — falling back to bot account",
-                    flush=True,
-                )
-            except Exception as e:
-                print(f"[relay] WARNING: webhook execute {type(e).__name__}: {e} — falling back to bot", flush=True)
+                wurl = str(getattr(wh, "url", "") or "").strip() if wh is not None else ""
+                if wurl:
+                    wh_payload = dict(payload)
+                    wh_payload["username"] = self._webhook_display_name(message.author)
+                    wh_payload["avatar_url"] = str(message.author.display_avatar.url)
+                    ok, err, notes = await self._send_streamed(wurl, headers={}, payload=wh_payload, attachments=attachments)
+                    if ok:
+                        return True, True, None, notes
+                    print(f"[relay] WARNING: webhook execute failed: {err!r} — falling back to bot account", flush=True)
+            ok, err, notes = await self._send_streamed(
+                f"{_API_BASE}/channels/{dest.id}/messages",
+                headers={"Authorization": f"Bot {self.http.token}"},
+                payload=payload,
+                attachments=attachments,
+            )
+            return ok, False, err, notes
+
+    async def _route_gate_wait(self, url: str) -> None:
+        """Wait out this route's exhausted bucket (and a global 429, if any) before posting to it."""
+        delay = max(float(self._route_blocked_until.get(url, 0.0)), self._route_global_until) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(min(delay, 60.0))
+
+    def _route_gate_update(self, url: str, status: int, headers: Any) -> Optional[float]:
+        """Record Discord bucket state per URL (X-RateLimit-Remaining / Reset-After, 429 Retry-After, global).
+
+        Returns the retry delay for a 429, else None.
+        """
         try:
-            kwargs2: dict[str, Any] = {
-                "content": content,
-                "allowed_mentions": discord.AllowedMentions.none(),
-            }
-            if embeds:
-                kwargs2["embeds"] = embeds
-            if files:
-                kwargs2["files"] = files
-            await dest.send(**kwargs2)
-            return True, False, None
-        except discord.HTTPException as e:
-            return False, False, getattr(e, "text", None) or str(e)
-        except Exception as e:
-            return False, False, f"{type(e).__name__}: {e}"
+            now = time.monotonic()
+            remaining = headers.get("X-RateLimit-Remaining")
+            reset_after = float(headers.get("X-RateLimit-Reset-After") or 0)
+            if status == 429:
+                retry_after = float(headers.get("Retry-After") or reset_after or 1.0)
+                if str(headers.get("X-RateLimit-Global") or "").lower() == "true":
+                    self._route_global_until = max(self._route_global_until, now + retry_after)
+                else:
+                    self._route_blocked_until[url] = now + retry_after
+                return retry_after
+            if remaining is not None and int(remaining) <= 0 and reset_after > 0:
+                self._route_blocked_until[url] = now + reset_after
+            else:
+                self._route_blocked_until.pop(url, None)
+        except Exception:
+            return 1.0 if status == 429 else None
+        return None
+
+    async def _send_streamed(
+        self,
+        url: str,
+        *,
+        headers: Dict[str, str],
+        payload: dict[str, Any],
+        attachments: List[discord.Attachment],
+    ) -> tuple[bool, Optional[str], List[str]]:
+        """
+        POST a message as multipart (payload_json + files[n]); each file is piped from its CDN
+        response into the request body, so no attachment is ever held in memory. Each attempt first
+        waits for the route's Discord bucket (see _route_gate_update); a 429 is retried once the
+        bucket resets, re-opening the CDN streams. Returns (ok, error, notes).
+        """
+        assert self._session is not None
+        err: Optional[str] = None
+        notes: List[str] = []
+        for _attempt in range(_MAX_SEND_ATTEMPTS):
+            notes = []
+            await self._route_gate_wait(url)
+            async with contextlib.AsyncExitStack() as stack:
+                mp = aiohttp.MultipartWriter("form-data")
+                parts: List[Tuple[str, _CdnStream]] = []
+                for att in attachments:
+                    name = att.filename or "file.bin"
+                    try:
+                        src = await stack.enter_async_context(self._session.get(att.url))
+                        src.raise_for_status()
+                    except Exception as e:
+                        notes.append(f"FAILED {name!r}: {type(e).__name__}: {e}")
+                        continue
+                    size = src.content_length if src.content_length is not None else int(att.size or 0)
+                    ctype = att.content_type or src.content_type or "application/octet-stream"
+                    parts.append((name, _CdnStream(src, size=size, content_type=ctype)))
+                    notes.append(f"ok {name!r} ({size} bytes, streamed)")
+                body = dict(payload)
+                if parts:
+                    body["attachments"] = [{"id": i, "filename": name} for i, (name, _p) in enumerate(parts)]
+                mp.append_json(body).set_content_disposition("form-data", name="payload_json")
+                for i, (name, part) in enumerate(parts):
+                    mp.append_payload(part).set_content_disposition("form-data", name=f"files[{i}]", filename=name)
+                try:
+                    resp = await stack.enter_async_context(self._session.post(url, data=mp, headers=headers))
+                    retry_after = self._route_gate_update(url, resp.status, resp.headers)
+                    if retry_after is not None:
+                        # The next attempt's _route_gate_wait sleeps until the bucket resets.
+                        err = f"HTTP 429 (retry_after={retry_after:g}s)"
+                        continue
+                    if resp.status >= 400:
+                        return False, f"HTTP {resp.status}: {(await resp.text())[:300]}", notes
+                    return True, None, notes
+                except Exception as e:
+                    return False, f"{type(e).__name__}: {e}", notes
+        return False, err, notes
 
     def _log_mirror_blocked(self, message: discord.Message, *, reason: str, hints: List[str]) -> None:
         if not self._human_log:
@@ -808,6 +953,29 @@ class RelayBot(commands.Bot):
                     flush=True,
                 )
             return
+        self._enqueue(message)
+
+    def _enqueue(self, message: discord.Message) -> None:
+        """Hand the message to its source channel's ordered queue (worker started on first use)."""
+        cid = message.channel.id
+        q = self._queues.get(cid)
+        if q is None:
+            q = asyncio.Queue()
+            self._queues[cid] = q
+            self._workers[cid] = asyncio.create_task(self._drain_queue(q), name=f"relay-queue-{cid}")
+        q.put_nowait(message)
+
+    async def _drain_queue(self, q: asyncio.Queue[discord.Message]) -> None:
+        while True:
+            message = await q.get()
+            try:
+                await self._relay_message(message)
+            except Exception as e:
+                print(f"[relay] ERROR: relay of message_id={message.id} crashed: {type(e).__name__}: {e}", flush=True)
+            finally:
+                q.task_done()
+
+    async def _relay_message(self, message: discord.Message) -> None:
         dest = await self._ensure_destination(message.channel.id)
         if dest is None:
             if self._human_log:
@@ -831,7 +999,7 @@ class RelayBot(commands.Bot):
             return
         content, embeds, n_red, body_trunc, used_grid = self._build_mirror_payload(message)
         out, out_trunc = self._finalize_content(content, jump_url=message.jump_url or "")
-        files: list[discord.File] = []
+        to_send: list[discord.Attachment] = []
         attach_notes: list[str] = []
         atts = list(message.attachments or [])[:8]
         for att in atts:
@@ -841,18 +1009,14 @@ class RelayBot(commands.Bot):
             if not self._mirror_attach:
                 attach_notes.append(f"skipped {att.filename!r}: mirror_attachments is false in config")
                 continue
-            if att.size > 8 * 1024 * 1024:
+            if att.size > _ATTACHMENT_MAX_BYTES:
                 attach_notes.append(f"skipped {att.filename!r}: size {att.size} bytes exceeds 8 MiB cap")
                 continue
-            try:
-                data = await att.read()
-                files.append(discord.File(io.BytesIO(data), filename=att.filename or "file.bin"))
-                attach_notes.append(f"ok {att.filename!r} ({len(data)} bytes)")
-            except Exception as e:
-                attach_notes.append(f"FAILED {att.filename!r}: {type(e).__name__}: {e}")
-        ok, used_wh, err = await self._post_mirror(
-            dest, message, content=out, embeds=embeds, files=files
+            to_send.append(att)
+        ok, used_wh, err, sent_notes = await self._post_mirror(
+            dest, message, content=out, embeds=embeds, attachments=to_send
         )
+        attach_notes.extend(sent_notes)
         if ok:
             self._log_mirror_success(
                 message,
@@ -863,7 +1027,7 @@ class RelayBot(commands.Bot):
                 out_chars=len(out or ""),
                 out_truncated=out_trunc,
                 attachment_lines=attach_notes,
-                mirrored_files=len(files),
+                mirrored_files=sum(1 for n in sent_notes if n.startswith("ok ")),
                 total_attachments=len(atts),
                 mirrored_embeds=len(embeds),
                 posted_via_webhook=used_wh,
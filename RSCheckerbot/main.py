@@ -175,7 +175,9 @@ from rschecker_utils import (
     load_json,
     save_json,
     append_jsonl,
-    iter_jsonl,
+    iter_jsonl_tail,
+    JsonlLedgerIndex,
+    run_ordered_pool,
     roles_plain,
     access_roles_plain,
     coerce_role_ids,
@@ -190,6 +192,7 @@ from staff_embeds import (
     build_member_status_detailed_embed as _build_member_status_detailed_embed,
 )
 from whop_brief import fetch_whop_brief
+from member_history_store import MemberHistoryStore, get_member_history_store, max_events_from_config
 from whop_brief import enrich_whop_brief_from_membership_logs as _enrich_whop_brief_from_membership_logs
 from whop_native_membership_cache import get_summary as _get_native_summary_by_mid
 from staff_channels import (
@@ -232,6 +235,7 @@ import waitlist_logging
 # Import Whop API client
 from whop_api_client import WhopAPIClient, WhopAPIError
 from shared.whop_webhook_utils import verify_standard_webhook
+from shared.whop_webhook_raw_log import WhopWebhookRawLog
 
 # Reporting store (runtime JSON; persisted only for member-status-logs output)
 try:
@@ -2359,9 +2363,7 @@ def _whop_event_seen(event_id: str) -> bool:
 def _load_whop_event_dedupe_cache() -> None:
     if WHOP_EVENTS_DEDUPE_MAX <= 0:
         return
-    rows = iter_jsonl(WHOP_EVENTS_FILE)
-    tail = rows[-WHOP_EVENTS_DEDUPE_MAX:] if len(rows) > WHOP_EVENTS_DEDUPE_MAX else rows
-    for rec in tail:
+    for rec in iter_jsonl_tail(WHOP_EVENTS_FILE, WHOP_EVENTS_DEDUPE_MAX):
         eid = str(rec.get("event_id") or "").strip()
         if not eid:
             continue
@@ -2369,6 +2371,17 @@ def _load_whop_event_dedupe_cache() -> None:
         _WHOP_EVENT_DEDUPE_QUEUE.append(eid)
 
 
+_WHOP_EVENTS_INDEX: JsonlLedgerIndex | None = None
+
+
+def _whop_events_index() -> JsonlLedgerIndex:
+    """Day / membership_id offset index over whop_events.jsonl (append-only sidecar whop_events.jsonl.idx.jsonl)."""
+    global _WHOP_EVENTS_INDEX
+    if _WHOP_EVENTS_INDEX is None:
+        _WHOP_EVENTS_INDEX = JsonlLedgerIndex(WHOP_EVENTS_FILE, day_field="occurred_at", key_field="membership_id")
+    return _WHOP_EVENTS_INDEX
+
+
 async def _record_whop_event(event: dict) -> bool:
     if not WHOP_EVENTS_ENABLED:
         return False
@@ -2615,9 +2628,7 @@ def record_member_status_baseline(
         return
     try:
         now = _history_now_ts()
-        db = _load_member_history()
-        key = str(did)
-        rec = db.get(key, {})
+        rec = _member_history_get_record(did)
         rec = _ensure_member_history_shape(rec, now=now)
         wh = rec.get("whop") if isinstance(rec.get("whop"), dict) else {}
 
@@ -2679,8 +2690,7 @@ def record_member_status_baseline(
 
         wh["member_status_logs_latest"] = ms
         rec["whop"] = wh
-        db[key] = rec
-        _save_member_history(db)
+        _member_history_put_record(did, rec)
     except Exception:
         return
 
@@ -3833,11 +3843,7 @@ OUTPUT_WHOP_CHANNEL_NAME = str(LOG_CONTROLS.get("output_whop_channel_name") or "
 
 # Member history controls (bounded storage; human-auditable)
 MEMBER_HISTORY_CONFIG = config.get("member_history", {}) if isinstance(config, dict) else {}
-try:
-    MEMBER_HISTORY_MAX_EVENTS_PER_USER = int(MEMBER_HISTORY_CONFIG.get("max_events_per_user", 50))
-except Exception:
-    MEMBER_HISTORY_MAX_EVENTS_PER_USER = 50
-MEMBER_HISTORY_MAX_EVENTS_PER_USER = max(0, MEMBER_HISTORY_MAX_EVENTS_PER_USER)
+MEMBER_HISTORY_MAX_EVENTS_PER_USER = max_events_from_config(config)
 
 # Whop enrichment controls (post-then-edit behavior)
 WHOP_ENRICHMENT_CONFIG = config.get("whop_enrichment", {}) if isinstance(config, dict) else {}
@@ -3925,8 +3931,9 @@ REGISTRY_FILE = BASE_DIR / "registry.json"
 INVITES_FILE = BASE_DIR / "invites.json"
 MESSAGES_FILE = BASE_DIR / "messages.json"
 SETTINGS_FILE = BASE_DIR / "settings.json"
-MEMBER_HISTORY_FILE = BASE_DIR / "member_history.json"
-WHOP_WEBHOOK_RAW_LOG_FILE = BASE_DIR / "whop_webhook_raw_payloads.json"
+MEMBER_HISTORY_FILE = BASE_DIR / "member_history.json"  # legacy; imported once into MEMBER_HISTORY_DB_FILE
+MEMBER_HISTORY_DB_FILE = BASE_DIR / "member_history.sqlite3"
+WHOP_WEBHOOK_RAW_LOG_DIR = BASE_DIR / "whop_webhook_raw"
 BOOT_STATE_FILE = BASE_DIR / "boot_state.json"
 PAYMENT_CACHE_FILE = BASE_DIR / "payment_cache.json"
 WHOP_API_EVENTS_STATE_FILE = BASE_DIR / "whop_api_events_state.json"
@@ -4524,56 +4531,117 @@ async def _flush_role_update(user_id: int) -> None:
         e.add_field(name="Added", value=(", ".join(added_list)[:1024] or "—"), inline=False)
     await log_role_event(embed=e)
 
+_WHOP_WEBHOOK_RAW_LOG: WhopWebhookRawLog | None = None
+
+def _whop_webhook_raw_log() -> WhopWebhookRawLog:
+    global _WHOP_WEBHOOK_RAW_LOG
+    if _WHOP_WEBHOOK_RAW_LOG is None:
+        wh_cfg = config.get("whop_webhook", {}) if isinstance(config, dict) else {}
+        wh_cfg = wh_cfg if isinstance(wh_cfg, dict) else {}
+        _WHOP_WEBHOOK_RAW_LOG = WhopWebhookRawLog(
+            WHOP_WEBHOOK_RAW_LOG_DIR,
+            max_segment_bytes=int(wh_cfg.get("raw_log_max_segment_kb") or 4096) * 1024,
+            max_segments=int(wh_cfg.get("raw_log_max_segments") or 8),
+        )
+    return _WHOP_WEBHOOK_RAW_LOG
+
 def _save_raw_webhook_payload(payload: dict, headers: dict = None):
-    """Save raw webhook payload to JSON file for inspection"""
+    """Append the raw webhook payload to the segmented JSONL log (O(1), bounded ring)."""
     try:
-        # Load existing payloads
-        if WHOP_WEBHOOK_RAW_LOG_FILE.exists():
-            with open(WHOP_WEBHOOK_RAW_LOG_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        else:
-            data = {"payloads": []}
-        
-        # Add new payload with timestamp
-        entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "payload": payload,
-            "headers": dict(headers) if headers else {}
-        }
-        data["payloads"].append(entry)
-        
-        # Keep last 1000 entries to avoid file bloat
-        data["payloads"] = data["payloads"][-1000:]
-        
-        # Save to file
-        with open(WHOP_WEBHOOK_RAW_LOG_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        log.info(f"Saved raw webhook payload to {WHOP_WEBHOOK_RAW_LOG_FILE.name}")
+        _whop_webhook_raw_log().append(payload, headers)
     except Exception as e:
         log.error(f"Failed to save raw webhook payload: {e}")
 
 # -----------------------------
 # Member History Helpers
 # -----------------------------
-def _load_member_history() -> dict:
-    """Load member history from JSON file"""
-    try:
-        if not MEMBER_HISTORY_FILE.exists() or MEMBER_HISTORY_FILE.stat().st_size == 0:
-            return {}
-        return json.loads(MEMBER_HISTORY_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+def _member_history_store() -> MemberHistoryStore:
+    return get_member_history_store(
+        MEMBER_HISTORY_DB_FILE,
+        legacy_json_path=MEMBER_HISTORY_FILE,
+        max_events=MEMBER_HISTORY_MAX_EVENTS_PER_USER,
+    )
 
 def _save_member_history(db: dict) -> None:
-    """Save member history to JSON file"""
+    """Persist a whole member-history dict (only changed records are written)."""
     try:
         if not isinstance(db, dict):
             return
-        # Atomic write (tmp + replace) to avoid truncated JSON on crash.
-        save_json(MEMBER_HISTORY_FILE, db)
-    except Exception:
-        pass
+        _member_history_store().save_all(db)
+    except Exception as e:
+        log.error(f"[MemberHistory] save failed: {e}")
+
+def _member_history_get_record(discord_id: int, *, with_events: bool = True) -> dict:
+    """Load one member's history record (O(1) I/O)."""
+    try:
+        rec = _member_history_store().get(str(discord_id), with_events=with_events)
+    except Exception as e:
+        log.error(f"[MemberHistory] get failed for {discord_id}: {e}")
+        return {}
+    return rec if isinstance(rec, dict) else {}
+
+def _member_history_put_record(discord_id: int, rec: dict) -> None:
+    """Persist one member's history record without touching other rows."""
+    try:
+        _member_history_store().put(str(discord_id), rec)
+    except Exception as e:
+        log.error(f"[MemberHistory] put failed for {discord_id}: {e}")
+
+
+# Top-level record fields the join / leave / role-change paths maintain (the rest, e.g. `whop`, is
+# never rewritten by an event).
+_MEMBER_HISTORY_SUMMARY_FIELDS = (
+    "first_join_ts",
+    "last_join_ts",
+    "last_leave_ts",
+    "join_count",
+    "identity",
+    "discord",
+    "access",
+)
+
+
+def _member_history_record_event(discord_id: int, rec: dict, new_event: dict | None) -> None:
+    """Persist a member event: append it to the event log and patch only the summary fields."""
+    try:
+        fields = {f: rec.get(f) for f in _MEMBER_HISTORY_SUMMARY_FIELDS if f in rec}
+        _member_history_store().update_fields(str(discord_id), fields, event=new_event)
+    except Exception as e:
+        log.error(f"[MemberHistory] event write failed for {discord_id}: {e}")
+
+
+class _MemberHistorySlice(dict):
+    """Legacy-shaped member history dict that reads rows from the store on first access.
+
+    Ingest helpers written against the whole-file dict (`db.get(key)` / `db[key] = rec`) only
+    touch a handful of keys; this loads just those, and `_save_member_history(slice)` then
+    writes back only the rows that changed.
+    """
+
+    def _pull(self, key: object) -> str:
+        k = str(key)
+        if not dict.__contains__(self, k):
+            rec = None
+            try:
+                rec = _member_history_store().get(k)
+            except Exception as e:
+                log.error(f"[MemberHistory] get failed for {k}: {e}")
+            if rec is not None:
+                dict.__setitem__(self, k, rec)
+        return k
+
+    def get(self, key, default=None):
+        k = self._pull(key)
+        return dict.get(self, k, default)
+
+    def __getitem__(self, key):
+        return dict.__getitem__(self, self._pull(key))
+
+    def __contains__(self, key) -> bool:
+        return dict.__contains__(self, self._pull(key))
+
+    def __setitem__(self, key, value) -> None:
+        dict.__setitem__(self, str(key), value)
 
 
 # -----------------------------
@@ -5059,10 +5127,7 @@ async def _ingest_whop_logs_live(message: discord.Message) -> None:
             if getattr(message, "created_at", None):
                 created_iso = message.created_at.astimezone(timezone.utc).isoformat()  # type: ignore[union-attr]
         mid = int(getattr(message, "id", 0) or 0)
-        db = _load_member_history()
-        if not isinstance(db, dict):
-            db = {}
-        db = _ensure_whop_users_shape(db)
+        db = _MemberHistorySlice()
         _apply_whop_logs_to_history(
             db,
             channel_id=cid,
@@ -5201,10 +5266,7 @@ async def member_history_ingest_loop() -> None:
             return
 
         st = _ingest_state_load()
-        db = _load_member_history()
-        if not isinstance(db, dict):
-            db = {}
-        db = _ensure_whop_users_shape(db)
+        db = _ensure_whop_users_shape(_MemberHistorySlice())
 
         async def _tail_membership_logs_channel(cid: int) -> int:
             if cid <= 0:
@@ -5436,9 +5498,14 @@ def _history_append_event(
     note: str = "",
     max_events: int | None = None,
     access_role_ids: list[int] | None = None,
-) -> None:
+    last_event: dict | None = None,
+) -> dict | None:
+    """Append an event to rec["events"] (bounded); returns the new event, or None when deduped.
+
+    `last_event` is the member's newest stored event, for records loaded without their events.
+    """
     if not isinstance(rec, dict):
-        return
+        return None
     rec = _ensure_member_history_shape(rec, now=now)
     events = rec.get("events")
     if not isinstance(events, list):
@@ -5455,8 +5522,8 @@ def _history_append_event(
 
     # Deduplicate immediate duplicates (role updates can fire rapidly)
     try:
-        if events:
-            last = events[-1] if isinstance(events[-1], dict) else {}
+        last = events[-1] if events else last_event
+        if last:
             if (
                 isinstance(last, dict)
                 and last.get("kind") == ev["kind"]
@@ -5465,7 +5532,7 @@ def _history_append_event(
                 and abs(int(ev["ts"]) - int(last.get("ts") or 0)) <= 2
             ):
                 rec["events"] = events
-                return
+                return None
     except Exception:
         pass
 
@@ -5475,13 +5542,12 @@ def _history_append_event(
     if cap and len(events) > cap:
         events = events[-cap:]
     rec["events"] = events
+    return ev
 
 def _touch_join(discord_id: int, member: discord.Member | None = None) -> dict:
     """Record member join event, return history record (in-place; bounded)."""
     now = _history_now_ts()
-    db = _load_member_history()
-    key = str(discord_id)
-    rec = db.get(key, {})
+    rec = _member_history_get_record(discord_id, with_events=False)
     rec = _ensure_member_history_shape(rec, now=now)
 
     rec["last_join_ts"] = now
@@ -5490,28 +5556,36 @@ def _touch_join(discord_id: int, member: discord.Member | None = None) -> dict:
         rec["first_join_ts"] = now
 
     _history_update_identity_and_snapshot(rec, member=member, now=now)
-    _history_append_event(rec, kind="join", now=now, access_role_ids=_history_access_role_ids(member))
+    ev = _history_append_event(
+        rec,
+        kind="join",
+        now=now,
+        access_role_ids=_history_access_role_ids(member),
+        last_event=_member_history_store().last_event(str(discord_id)),
+    )
 
-    db[key] = rec
-    _save_member_history(db)
+    _member_history_record_event(discord_id, rec, ev)
     return rec
 
 def _touch_leave(discord_id: int, member: discord.Member | None = None) -> dict:
     """Record member leave event, return history record (in-place; bounded)."""
     now = _history_now_ts()
-    db = _load_member_history()
-    key = str(discord_id)
-    rec = db.get(key, {})
+    rec = _member_history_get_record(discord_id, with_events=False)
     rec = _ensure_member_history_shape(rec, now=now)
 
     # User left but we never tracked a join (edge case): keep legacy fields as None.
     rec["last_leave_ts"] = now
 
     _history_update_identity_and_snapshot(rec, member=member, now=now)
-    _history_append_event(rec, kind="leave", now=now, access_role_ids=_history_access_role_ids(member))
+    ev = _history_append_event(
+        rec,
+        kind="leave",
+        now=now,
+        access_role_ids=_history_access_role_ids(member),
+        last_event=_member_history_store().last_event(str(discord_id)),
+    )
 
-    db[key] = rec
-    _save_member_history(db)
+    _member_history_record_event(discord_id, rec, ev)
     return rec
 
 def _touch_role_change(
@@ -5523,13 +5597,11 @@ def _touch_role_change(
 ) -> dict:
     """Record a role change event (filtered by caller); updates access timelines."""
     now = _history_now_ts()
-    db = _load_member_history()
-    key = str(int(member.id))
-    rec = db.get(key, {})
+    rec = _member_history_get_record(int(member.id), with_events=False)
     rec = _ensure_member_history_shape(rec, now=now)
 
     _history_update_identity_and_snapshot(rec, member=member, now=now)
-    _history_append_event(
+    ev = _history_append_event(
         rec,
         kind="role_change",
         now=now,
@@ -5537,10 +5609,10 @@ def _touch_role_change(
         roles_removed=sorted({int(x) for x in (roles_removed or set())}),
         note=note,
         access_role_ids=_history_access_role_ids(member),
+        last_event=_member_history_store().last_event(str(member.id)),
     )
 
-    db[key] = rec
-    _save_member_history(db)
+    _member_history_record_event(int(member.id), rec, ev)
     return rec
 
 def _fmt_ts(ts: int | None, style: str = "D") -> str:
@@ -5810,8 +5882,7 @@ async def _retry_whop_enrich_and_edit(
 
 def get_member_history(discord_id: int) -> dict:
     """Get member history record (exposed for whop_webhook_handler and support cards)"""
-    db = _load_member_history()
-    return db.get(str(discord_id), {})
+    return _member_history_get_record(discord_id)
 
 
 def record_member_whop_summary(
@@ -5829,9 +5900,7 @@ def record_member_whop_summary(
         return
     try:
         now = _history_now_ts()
-        db = _load_member_history()
-        key = str(did)
-        rec = db.get(key, {})
+        rec = _member_history_get_record(did)
         rec = _ensure_member_history_shape(rec, now=now)
         wh = rec.get("whop") if isinstance(rec.get("whop"), dict) else {}
         if isinstance(summary, dict) and summary:
@@ -5870,10 +5939,9 @@ def record_member_whop_summary(
         if whop_key and str(whop_key).strip().startswith(("mem_", "R-")):
             wh["last_whop_key"] = str(whop_key).strip()
         rec["whop"] = wh
-        db[key] = rec
-        _save_member_history(db)
-    except Exception:
-        return
+        _member_history_put_record(did, rec)
+    except Exception as e:
+        log.error(f"[MemberHistory] whop summary update failed for {did}: {e}")
 
 
 def _whop_summary_for_member(discord_id: int) -> dict:
@@ -5896,6 +5964,20 @@ def _whop_summary_for_member(discord_id: int) -> dict:
                 with suppress(Exception):
                     base = _enrich_whop_brief_from_membership_logs(base, membership_id=str(mid or "").strip())
                 return base if isinstance(base, dict) else {}
+        # Next: the latest whop_events.jsonl entry for this membership (index seeks straight to its lines).
+        if mid and WHOP_EVENTS_ENABLED:
+            evs = _whop_events_index().records_for(mid)
+            if evs:
+                ev = evs[-1]
+                base = {
+                    k: str(ev.get(k) or "").strip()
+                    for k in ("membership_id", "status", "product", "trial_days", "pricing", "total_spent", "cancel_at_period_end")
+                    if str(ev.get(k) or "").strip()
+                }
+                if base:
+                    with suppress(Exception):
+                        base = _enrich_whop_brief_from_membership_logs(base, membership_id=str(mid or "").strip())
+                    return base if isinstance(base, dict) else {}
         # Fallback: if we only have a timeline/status (from whop_history backfill),
         # expose at least status so staff cards aren't blank.
         if isinstance(wh, dict):
@@ -5985,8 +6067,8 @@ def _backfill_whop_timeline_from_whop_history() -> None:
             log.info("No membership events in whop_history.json")
             return
         
-        # Load existing member_history
-        member_history = _load_member_history()
+        # Only the members named in whop_history are loaded (and written back if changed).
+        member_history = _MemberHistorySlice()
         backfilled_count = 0
         
         for event in events:
@@ -6913,12 +6995,8 @@ def _consume_repeat_trial_bypass_once(discord_id: int) -> bool:
     except Exception:
         return False
     try:
-        db = _load_member_history()
-        if not isinstance(db, dict):
-            return False
-        key = str(did)
-        rec = db.get(key)
-        if not isinstance(rec, dict):
+        rec = _member_history_get_record(did)
+        if not rec:
             return False
         wh = rec.get("whop") if isinstance(rec.get("whop"), dict) else {}
         bypass = wh.get("repeat_trial_bypass_once")
@@ -6930,8 +7008,7 @@ def _consume_repeat_trial_bypass_once(discord_id: int) -> bool:
         with suppress(Exception):
             wh.pop("repeat_trial_bypass_set_ts", None)
         rec["whop"] = wh
-        db[key] = rec
-        _save_member_history(db)
+        _member_history_put_record(did, rec)
         return True
     except Exception:
         return False
@@ -8317,7 +8394,7 @@ async def handle_whop_webhook_receiver(request):
 
         # Log the raw payload
         _save_raw_webhook_payload(payload, headers)
-        log.info(f"Received Whop webhook payload (saved to {WHOP_WEBHOOK_RAW_LOG_FILE.name})")
+        log.info(f"Received Whop webhook payload (saved to {WHOP_WEBHOOK_RAW_LOG_DIR.name}/)")
         with suppress(Exception):
             evt = _normalize_whop_std_event_type(_whop_std_event_type(payload))
             mid = _whop_std_membership_id(payload)
@@ -8331,7 +8408,7 @@ async def handle_whop_webhook_receiver(request):
                 membership_id=mid or "",
                 reads=[
                     "Received HTTP POST /whop-webhook",
-                    f"Saved raw payload → {WHOP_WEBHOOK_RAW_LOG_FILE.name}",
+                    f"Saved raw payload → {WHOP_WEBHOOK_RAW_LOG_DIR.name}/",
                 ],
                 decisions=["signature verified"],
                 actions=["Queued immediate processing (standard webhook path)"],
@@ -8983,13 +9060,31 @@ async def sync_whop_memberships():
                     return (mid2, m2)
         return ("", {})
     
-    for idx, member in enumerate(members_to_check, start=1):
+    try:
+        sync_concurrency = max(1, int(WHOP_API_CONFIG.get("sync_concurrency", 1) or 1))
+    except Exception:
+        sync_concurrency = 1
+
+    def _new_tally() -> dict[str, int]:
+        return dict.fromkeys(
+            ("linked", "errors", "would_remove", "removed", "relinked", "cancel_scheduled", "missing_membership_data"),
+            0,
+        )
+
+    def _new_outcome() -> dict:
+        # Status buckets and staff log lines are applied by the ordered consumer, not the worker.
+        return {"status": "", "actual_status": "", "logs": []}
+
+    async def _sync_one_member(member: discord.Member) -> tuple[list[dict[str, str]], dict[str, int], dict]:
+        """Check one member end-to-end (lookups + role change); returns (audit rows, counter deltas, outcome)."""
+        tally = _new_tally()
+        outcome = _new_outcome()
         try:
             # Check membership status via API (membership_id-based; avoids mismatched users)
             membership_id = _membership_id_from_history(member.id)
             if not membership_id:
-                continue
-            checked_with_mid += 1
+                return ([], tally, outcome)
+            tally["linked"] += 1
             verification = await whop_api_client.verify_membership_status(membership_id, "active")
 
             # Cancellation scheduled signal (active/trialing but cancel_at_period_end=true).
@@ -9006,37 +9101,40 @@ async def sync_whop_memberships():
                 row_renew_end = str(membership_data.get("renewal_period_end") or "").strip()
             if isinstance(membership_data, dict):
                 status_now = str(membership_data.get("status") or "").strip().lower()
-                status_counts[status_now or "unknown"] = int(status_counts.get(status_now or "unknown", 0)) + 1
+                outcome["status"] = status_now or "unknown"
                 cape_now = membership_data.get("cancel_at_period_end")
                 if cape_now is True and status_now in ("active", "trialing"):
-                    cancel_scheduled_count += 1
+                    tally["cancel_scheduled"] += 1
                     if not row_action or row_action == "none":
                         row_action = "set_to_cancel"
                     # Sync job is report-only for cancellation scheduling; real-time cards come from Whop webhooks.
-                    report_rows.append(
-                        {
-                            "discord_id": str(member.id),
-                            "membership_id": str(membership_id),
-                            "status": row_status or status_now,
-                            "actual_status": "",
-                            "cancel_at_period_end": row_cape,
-                            "renewal_period_end": row_renew_end,
-                            "action": row_action,
-                        }
+                    return (
+                        [
+                            {
+                                "discord_id": str(member.id),
+                                "membership_id": str(membership_id),
+                                "status": row_status or status_now,
+                                "actual_status": "",
+                                "cancel_at_period_end": row_cape,
+                                "renewal_period_end": row_renew_end,
+                                "action": row_action,
+                            }
+                        ],
+                        tally,
+                        outcome,
                     )
-                    continue
             
             if not verification["matches"]:
                 actual_status = verification["actual_status"]
                 st = str(actual_status or "").strip().lower() or "unknown"
-                actual_status_counts[st] = int(actual_status_counts.get(st, 0)) + 1
+                outcome["actual_status"] = st
                 row_actual_status = st
                 
                 # If API says canceled but user has Member role, remove it
                 if actual_status in ("canceled", "completed", "past_due", "unpaid"):
                     # Lifetime members keep access indefinitely.
                     if _has_lifetime_role(member):
-                        continue
+                        return ([], tally, outcome)
 
                     # Fail-closed: only attempt "relink to active membership" when we can strongly
                     # verify the membership belongs to this Discord ID.
@@ -9060,13 +9158,13 @@ async def sync_whop_memberships():
                             did = extract_discord_id_from_whop_member_record(rec) if isinstance(rec, dict) else ""
                             if did and did.isdigit() and int(did) != int(member.id):
                                 if not sync_silent:
-                                    await log_other(
+                                    outcome["logs"].append(
                                         f"⚠️ **Whop Sync skipped removal (mismatch)** {_fmt_user(member)}\n"
                                         f"   membership_id: `{membership_id}`\n"
                                         f"   whop_member_id: `{whop_member_id}`\n"
                                         f"   whop_discord_id: `{did}`"
                                     )
-                                continue
+                                return ([], tally, outcome)
                             if did and did.isdigit() and int(did) == int(member.id):
                                 link_verified = True
                     except Exception:
@@ -9092,15 +9190,15 @@ async def sync_whop_memberships():
                                 event_type="sync.relink_active_membership",
                                 membership_id=mid2,
                             )
-                            relinked_count += 1
+                            tally["relinked"] += 1
                             row_action = "relinked_keep_access"
                             if not sync_silent:
-                                await log_other(
+                                outcome["logs"].append(
                                     f"✅ **Whop Sync kept access (newer active membership)** {_fmt_user(member)}\n"
                                     f"   old_membership_id: `{membership_id}` (status `{actual_status}`)\n"
                                     f"   new_membership_id: `{mid2}` (status `{st2}`)"
                                 )
-                            continue
+                            return ([], tally, outcome)
                     except Exception:
                         pass
 
@@ -9113,51 +9211,82 @@ async def sync_whop_memberships():
                         now=_now(),
                     )
                     if entitled:
-                        continue
+                        return ([], tally, outcome)
                     if not enforce_removals:
-                        would_remove_count += 1
+                        tally["would_remove"] += 1
                         row_action = "would_remove_role"
                         if not sync_silent:
-                            await log_other(
+                            outcome["logs"].append(
                                 f"⚠️ **Whop Sync would remove role (enforcement disabled)** {_fmt_user(member)}\n"
                                 f"   API Status: `{actual_status}`\n"
                                 f"   membership_id: `{membership_id}`\n"
                                 f"   Removed: {_fmt_role(ROLE_CANCEL_A, guild)}"
                             )
-                        continue
+                        return ([], tally, outcome)
                     await member.remove_roles(
                         member_role, 
                         reason=f"Whop sync: Status is {actual_status}"
                     )
                     if not sync_silent:
-                        await log_other(
+                        outcome["logs"].append(
                             f"🔄 **Sync Removed Role:** {_fmt_user(member)}\n"
                             f"   API Status: `{actual_status}`\n"
                             f"   Removed: {_fmt_role(ROLE_CANCEL_A, guild)}"
                         )
-                    synced_count += 1
+                    tally["removed"] += 1
                     row_action = "removed_role"
         except Exception as e:
-            error_count += 1
+            tally["errors"] += 1
             log.error(f"Error syncing member <@{member.id}>: {e}")
-            continue
+            return ([], tally, outcome)
 
         if membership_data is None:
-            missing_membership_data += 1
+            tally["missing_membership_data"] += 1
 
         # Record one audit row per checked membership.
-        report_rows.append(
-            {
-                "discord_id": str(member.id),
-                "membership_id": str(membership_id),
-                "status": row_status,
-                "actual_status": row_actual_status,
-                "cancel_at_period_end": row_cape,
-                "renewal_period_end": row_renew_end,
-                "action": row_action,
-            }
+        return (
+            [
+                {
+                    "discord_id": str(member.id),
+                    "membership_id": str(membership_id),
+                    "status": row_status,
+                    "actual_status": row_actual_status,
+                    "cancel_at_period_end": row_cape,
+                    "renewal_period_end": row_renew_end,
+                    "action": row_action,
+                }
+            ],
+            tally,
+            outcome,
         )
 
+    async def _commit_member_result(idx: int, result: object) -> None:
+        """Commit results in member order (report_rows, status counts, staff logs and progress stay deterministic)."""
+        nonlocal last_progress_edit, synced_count, error_count, relinked_count, would_remove_count
+        nonlocal checked_with_mid, cancel_scheduled_count, missing_membership_data
+        if isinstance(result, tuple):
+            rows, tally, outcome = result
+            report_rows.extend(rows)
+        else:
+            # Unexpected worker crash (the per-member path already catches its own errors).
+            tally = _new_tally()
+            tally["errors"] = 1
+            outcome = _new_outcome()
+        if outcome["status"]:
+            status_counts[outcome["status"]] = int(status_counts.get(outcome["status"], 0)) + 1
+        if outcome["actual_status"]:
+            actual_status_counts[outcome["actual_status"]] = int(actual_status_counts.get(outcome["actual_status"], 0)) + 1
+        for line in outcome["logs"]:
+            with suppress(Exception):
+                await log_other(line)
+        checked_with_mid += tally["linked"]
+        error_count += tally["errors"]
+        would_remove_count += tally["would_remove"]
+        synced_count += tally["removed"]
+        relinked_count += tally["relinked"]
+        cancel_scheduled_count += tally["cancel_scheduled"]
+        missing_membership_data += tally["missing_membership_data"]
+
         # Periodic progress (console + Neo progress message).
         if idx % 50 == 0 or idx == len(members_to_check):
             log.info(
@@ -9191,13 +9320,24 @@ async def sync_whop_memberships():
                         )
                         await progress_msg.edit(content=txt, embed=None)
 
+    if sync_concurrency > 1:
+        log.info(f"[Whop Sync] bounded worker pool: concurrency={sync_concurrency}")
+    await run_ordered_pool(
+        members_to_check,
+        _sync_one_member,
+        concurrency=sync_concurrency,
+        on_result=_commit_member_result,
+    )
+
     # Auto-heal: add Member role for users missing it, when Whop shows active+entitled access and paid (>$1).
     if auto_heal_enabled:
         healed = 0
         try:
-            hist_db = _load_member_history()
-            ids = [k for k in (hist_db.keys() if isinstance(hist_db, dict) else []) if str(k).isdigit()]
+            # Rows only (no events): the heal pass reads `whop.last_membership_id` per member.
+            hist_db = {k: v for k, v in _member_history_store().iter_records() if str(k).isdigit()}
+            ids = list(hist_db.keys())
         except Exception:
+            hist_db = {}
             ids = []
 
         # Compute duplicate membership_ids once; skip them (fail-closed).
@@ -10053,33 +10193,6 @@ async def on_ready():
     except Exception:
         tz_name = "UTC"
 
-    _MH_LINK_CACHE: dict[str, object] = {"db": None, "at": 0.0, "mtime": 0.0}
-
-    def _mh_db_cached(*, ttl_seconds: int = 15) -> dict:
-        """Load member_history.json once per short window (it can be large)."""
-        try:
-            ttl = max(1, min(int(ttl_seconds or 15), 120))
-        except Exception:
-            ttl = 15
-        now = time.time()
-        try:
-            mtime = float(MEMBER_HISTORY_FILE.stat().st_mtime) if MEMBER_HISTORY_FILE.exists() else 0.0
-        except Exception:
-            mtime = 0.0
-        try:
-            db0 = _MH_LINK_CACHE.get("db")
-            at0 = float(_MH_LINK_CACHE.get("at") or 0.0)
-            mt0 = float(_MH_LINK_CACHE.get("mtime") or 0.0)
-        except Exception:
-            db0, at0, mt0 = None, 0.0, 0.0
-        if isinstance(db0, dict) and (now - at0) <= float(ttl) and float(mtime) == float(mt0):
-            return db0
-        db_new = _load_member_history()
-        _MH_LINK_CACHE["db"] = db_new if isinstance(db_new, dict) else {}
-        _MH_LINK_CACHE["at"] = float(now)
-        _MH_LINK_CACHE["mtime"] = float(mtime)
-        return _MH_LINK_CACHE["db"] if isinstance(_MH_LINK_CACHE.get("db"), dict) else {}
-
     # Linked detection mode:
     # - strict: require explicit "Connected Discord" proof (original behavior)
     # - loose: treat "has Whop membership activity" as linked (requested; can be inaccurate by design)
@@ -10118,9 +10231,7 @@ async def on_ready():
             except Exception:
                 return False
 
-        db_hist = _mh_db_cached(ttl_seconds=15)
-        hist = db_hist.get(str(did_i)) if isinstance(db_hist, dict) else {}
-        hist = hist if isinstance(hist, dict) else {}
+        hist = _member_history_get_record(did_i)
         wh = hist.get("whop") if isinstance(hist.get("whop"), dict) else {}
 
         # 1) Strongest signal: member-status-logs baseline "Connected Discord".
@@ -10148,6 +10259,7 @@ async def on_ready():
             mid = ""
         if mid:
             try:
+                db_hist = _member_history_store().get_cached(["whop_membership_index", "whop_users"])
                 midx = db_hist.get("whop_membership_index") if isinstance(db_hist.get("whop_membership_index"), dict) else {}
                 whop_uid = str(midx.get(str(mid).strip()) or "").strip() if isinstance(midx, dict) else ""
                 wu = db_hist.get("whop_users") if isinstance(db_hist.get("whop_users"), dict) else {}
@@ -10253,6 +10365,11 @@ async def on_ready():
             WHOP_EVENTS_FILE.touch(exist_ok=True)
         except Exception as e:
             log.warning(f"[WhopEvents] Failed to create ledger file: {e}")
+        # Catch the sidecar index up with lines appended since it was last saved.
+        try:
+            await asyncio.to_thread(_whop_events_index().refresh)
+        except Exception as e:
+            log.warning(f"[WhopEvents] Failed to refresh ledger index: {e}")
     guild = bot.get_guild(GUILD_ID)
     if guild:
         log.info(f"[Bot] Connected to: {guild.name}")
@@ -10456,10 +10573,10 @@ async def on_ready():
     if WHOP_API_KEY and WhopAPIClient:
         try:
             if not is_placeholder_secret(WHOP_API_KEY):
-                base_url = WHOP_API_CONFIG.get("base_url", "https://api.whop.com/api/v1")
-                company_id = WHOP_API_CONFIG.get("company_id", "")
-                whop_api_client = WhopAPIClient(WHOP_API_KEY, base_url, company_id)
-                log.info("[Whop API] Client initialized")
+                # on_ready can fire again after a reconnect: keep the pooled client (and its session).
+                if whop_api_client is None:
+                    whop_api_client = WhopAPIClient.from_config(WHOP_API_KEY, WHOP_API_CONFIG)
+                    log.info("[Whop API] Client initialized")
             else:
                 whop_api_client = None
                 log.info("[Whop API] Client disabled (placeholder key)")
@@ -10491,6 +10608,7 @@ async def on_ready():
             whop_api_config=WHOP_API_CONFIG,
             lifetime_role_ids=list(LIFETIME_ROLE_IDS),
             trial_abuse_alert_func=_trial_abuse_workflow_alert,
+            whop_api_client=whop_api_client,
         )
         log.info("[WhopDiscord] Native/workflow handler initialized")
     except Exception as e:
@@ -10537,7 +10655,7 @@ async def on_ready():
 
             # Collect runtime file health
             runtime_files: list[tuple[str, Path]] = [
-                ("member_history.json", MEMBER_HISTORY_FILE),
+                ("member_history.sqlite3", MEMBER_HISTORY_DB_FILE),
                 ("payment_cache.json", PAYMENT_CACHE_FILE),
                 ("staff_alerts.json", STAFF_ALERTS_FILE),
                 ("reporting_store.json", BASE_DIR / "reporting_store.json"),
@@ -11691,19 +11809,14 @@ async def trial_bypass(ctx, discord_id: str):
         await ctx.send("❌ Provide a valid Discord user ID (or mention).", delete_after=10)
         return
     try:
-        db = _load_member_history()
-        if not isinstance(db, dict):
-            db = {}
-        key = str(did)
         now = _history_now_ts()
-        rec = db.get(key, {})
+        rec = _member_history_get_record(did)
         rec = _ensure_member_history_shape(rec, now=now)
         wh = rec.get("whop") if isinstance(rec.get("whop"), dict) else {}
         wh["repeat_trial_bypass_once"] = True
         wh["repeat_trial_bypass_set_ts"] = int(now)
         rec["whop"] = wh
-        db[key] = rec
-        _save_member_history(db)
+        _member_history_put_record(did, rec)
         await ctx.send(f"✅ One-time repeat-trial bypass set for `<@{did}>`.", delete_after=10)
         with suppress(Exception):
             await ctx.message.delete()
@@ -11721,20 +11834,16 @@ async def trial_bypass_clear(ctx, discord_id: str):
         await ctx.send("❌ Provide a valid Discord user ID (or mention).", delete_after=10)
         return
     try:
-        db = _load_member_history()
-        key = str(did)
-        rec = db.get(key, {}) if isinstance(db, dict) else {}
-        wh = rec.get("whop") if isinstance(rec, dict) and isinstance(rec.get("whop"), dict) else {}
+        rec = _member_history_get_record(did)
+        wh = rec.get("whop") if isinstance(rec.get("whop"), dict) else {}
         had = bool(wh.get("repeat_trial_bypass_once"))
         with suppress(Exception):
             wh.pop("repeat_trial_bypass_once", None)
         with suppress(Exception):
             wh.pop("repeat_trial_bypass_set_ts", None)
-        if isinstance(rec, dict):
+        if rec:
             rec["whop"] = wh
-            if isinstance(db, dict):
-                db[key] = rec
-                _save_member_history(db)
+            _member_history_put_record(did, rec)
         await ctx.send(
             f"✅ Cleared bypass for `<@{did}>`." if had else f"ℹ️ No bypass was set for `<@{did}>`.",
             delete_after=10,
@@ -13226,7 +13335,8 @@ async def _report_scan_whop(ctx, start: str, end: str, *, sample_csv: bool = Fal
 
     try:
         await _progress("read ledger", force=True)
-        events = iter_jsonl(WHOP_EVENTS_FILE)
+        # Index jumps straight to the byte span covering the requested UTC days.
+        events = await asyncio.to_thread(_whop_events_index().records_between, start_utc, end_utc)
         for idx, ev in enumerate(events):
             scanned = idx + 1
             if not isinstance(ev, dict):
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Member History Store
+SQLite (WAL) storage engine for member history.
+
+Canonical Owner: This module owns member history persistence.
+
+Layout:
+- `members`:        one row per top-level key (Discord ID records, plus the `whop_users` /
+                    `whop_user_index` / `whop_membership_index` baseline slices), JSON-encoded,
+                    without the per-member `events` list.
+- `member_events`:  append-only event log (join / leave / role_change ...). Reads return the
+                    newest `max_events` per Discord ID as the record's `events` list.
+- `meta`:           migration markers.
+
+A join / leave / role event is one event insert plus a field-level patch of the member's summary
+fields (`update_fields`); other single-member updates are one row upsert. Neither rewrites the whole
+legacy `member_history.json`. The JSON file is imported once on first open and left in place
+(untouched) as a rollback copy; `export_json()` / the CLI writes a fresh snapshot for tooling.
+
+CLI:
+  python member_history_store.py stats
+  python member_history_store.py export --out member_history.export.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+log = logging.getLogger("rs-checker")
+
+_BASE_DIR = Path(__file__).resolve().parent
+MEMBER_HISTORY_DB_FILE = _BASE_DIR / "member_history.sqlite3"
+MEMBER_HISTORY_LEGACY_JSON = _BASE_DIR / "member_history.json"
+DEFAULT_MAX_EVENTS = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS members (
+    key TEXT PRIMARY KEY,
+    record TEXT NOT NULL,
+    updated_at INTEGER NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS member_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_member_events_key ON member_events(key, id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _dumps(obj: object) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+class MemberHistoryStore:
+    """Per-member rows + append-only events (thread-safe; one connection per process)."""
+
+    def __init__(self, db_path: Path, *, legacy_json_path: Path | None = None, max_events: int = DEFAULT_MAX_EVENTS):
+        self.db_path = Path(db_path)
+        self.legacy_json_path = Path(legacy_json_path) if legacy_json_path else None
+        self.max_events = max(0, int(max_events))
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        # Large shared rows (whop_users / indexes) cached by row version.
+        self._row_cache: dict[str, tuple[int, object]] = {}
+        # Serialized rows as last read/written (lets save_all() write only changed keys).
+        self._known: dict[str, str] = {}
+
+    # -----------------------------
+    # Connection / migration
+    # -----------------------------
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+        self._migrate_legacy_json()
+        return conn
+
+    def _migrate_legacy_json(self) -> None:
+        """One-time import of the legacy whole-file JSON (no-op once the marker is set)."""
+        conn = self._conn
+        if conn is None:
+            return
+        row = conn.execute("SELECT value FROM meta WHERE key='migrated_from_json'").fetchone()
+        if row:
+            return
+        src = self.legacy_json_path
+        raw: dict = {}
+        if src and src.exists() and src.stat().st_size > 0:
+            try:
+                obj = json.loads(src.read_text(encoding="utf-8") or "{}")
+                raw = obj if isinstance(obj, dict) else {}
+            except Exception as e:
+                # Leave the marker unset so a fixed file is picked up on the next start.
+                log.error(f"[MemberHistory] legacy JSON migration failed ({src.name}): {e}")
+                return
+        now = int(time.time())
+        n_events = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for key, rec in raw.items():
+                events = []
+                if isinstance(rec, dict):
+                    rec = dict(rec)
+                    ev_list = rec.pop("events", None)
+                    events = ev_list if isinstance(ev_list, list) else []
+                conn.execute(
+                    "INSERT OR REPLACE INTO members(key, record, updated_at) VALUES (?, ?, ?)",
+                    (str(key), _dumps(rec), now),
+                )
+                for ev in events:
+                    if not isinstance(ev, dict):
+                        continue
+                    conn.execute(
+                        "INSERT INTO member_events(key, ts, kind, event) VALUES (?, ?, ?, ?)",
+                        (str(key), int(ev.get("ts") or 0), str(ev.get("kind") or "event"), _dumps(ev)),
+                    )
+                    n_events += 1
+            conn.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('migrated_from_json', ?)",
+                (_dumps({"source": str(src) if src else "", "members": len(raw), "events": n_events, "ts": now}),),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if raw:
+            log.info(f"[MemberHistory] migrated {len(raw)} record(s), {n_events} event(s) from {src.name if src else '?'}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                finally:
+                    self._conn = None
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+    def versions(self, keys: list[str]) -> dict[str, int]:
+        """Per-row write versions (cheap cache key for readers of a few large rows)."""
+        ks = [str(k) for k in (keys or [])]
+        if not ks:
+            return {}
+        with self._lock:
+            conn = self._connect()
+            q = "SELECT key, version FROM members WHERE key IN (%s)" % ",".join("?" for _ in ks)
+            return {str(k): int(v) for k, v in conn.execute(q, ks).fetchall()}
+
+    def get_cached(self, keys: list[str]) -> dict:
+        """Return {key: dict} for a few large shared rows, re-parsing a row only when its version changed."""
+        out: dict = {}
+        vers = self.versions(keys)
+        with self._lock:
+            for k in [str(x) for x in keys]:
+                v = vers.get(k, 0)
+                hit = self._row_cache.get(k)
+                if hit is None or hit[0] != v:
+                    val = self.get(k) if v else {}
+                    hit = (v, val if isinstance(val, dict) else {})
+                    self._row_cache[k] = hit
+                out[k] = hit[1]
+        return out
+
+    def _events_for(self, conn: sqlite3.Connection, key: str) -> list[dict]:
+        if not self.max_events:
+            return []
+        rows = conn.execute(
+            "SELECT event FROM member_events WHERE key=? ORDER BY id DESC LIMIT ?",
+            (key, self.max_events),
+        ).fetchall()
+        out: list[dict] = []
+        for (ev_raw,) in reversed(rows):
+            try:
+                ev = json.loads(ev_raw)
+            except Exception:
+                continue
+            if isinstance(ev, dict):
+                out.append(ev)
+        return out
+
+    def get(self, key: object, *, with_events: bool = True) -> object:
+        """Return one record (dict records get their recent `events` attached unless `with_events=False`), or None."""
+        k = str(key)
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT record FROM members WHERE key=?", (k,)).fetchone()
+            if not row:
+                return None
+            self._known[k] = row[0]
+            try:
+                rec = json.loads(row[0])
+            except Exception:
+                return None
+            if with_events and isinstance(rec, dict) and k.isdigit():
+                rec["events"] = self._events_for(conn, k)
+            return rec
+
+    def last_event(self, key: object) -> dict | None:
+        """Newest event for one member (one indexed row), or None."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT event FROM member_events WHERE key=? ORDER BY id DESC LIMIT 1", (str(key),)).fetchone()
+        if not row:
+            return None
+        try:
+            ev = json.loads(row[0])
+        except Exception:
+            return None
+        return ev if isinstance(ev, dict) else None
+
+    def iter_records(self) -> list[tuple[str, object]]:
+        """All (key, record) pairs without events (cheap bulk scan for read-only reports)."""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute("SELECT key, record FROM members").fetchall()
+        out: list[tuple[str, object]] = []
+        for k, raw in rows:
+            try:
+                out.append((str(k), json.loads(raw)))
+            except Exception:
+                continue
+        return out
+
+    def max_version(self) -> tuple[int, int]:
+        """(row count, sum of row versions): changes whenever any record is written."""
+        with self._lock:
+            conn = self._connect()
+            n, v = conn.execute("SELECT COUNT(*), COALESCE(SUM(version), 0) FROM members").fetchone()
+        return (int(n), int(v))
+
+    def load_all(self) -> dict:
+        """Return every record as the legacy dict shape (bulk paths only; O(total members))."""
+        with self._lock:
+            conn = self._connect()
+            out: dict = {}
+            for k, raw in conn.execute("SELECT key, record FROM members"):
+                self._known[k] = raw
+                try:
+                    out[k] = json.loads(raw)
+                except Exception:
+                    continue
+            if self.max_events:
+                grouped: dict[str, list[dict]] = {}
+                for k, ev_raw in conn.execute("SELECT key, event FROM member_events ORDER BY id"):
+                    try:
+                        ev = json.loads(ev_raw)
+                    except Exception:
+                        continue
+                    lst = grouped.setdefault(k, [])
+                    lst.append(ev)
+                    if len(lst) > self.max_events:
+                        del lst[0]
+            else:
+                grouped = {}
+            for k, rec in out.items():
+                if isinstance(rec, dict) and k.isdigit():
+                    rec["events"] = grouped.get(k, [])
+            return out
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+    def put(self, key: object, rec: object) -> None:
+        """Upsert one record (its `events` list is not stored here; use append_event)."""
+        k = str(key)
+        if isinstance(rec, dict):
+            rec = {kk: vv for kk, vv in rec.items() if kk != "events"}
+        raw = _dumps(rec)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO members(key, record, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET record=excluded.record, updated_at=excluded.updated_at, version=members.version+1",
+                (k, raw, int(time.time())),
+            )
+            self._known[k] = raw
+
+    def _insert_event(self, conn: sqlite3.Connection, k: str, event: dict) -> None:
+        conn.execute(
+            "INSERT INTO member_events(key, ts, kind, event) VALUES (?, ?, ?, ?)",
+            (k, int(event.get("ts") or 0), str(event.get("kind") or "event"), _dumps(event)),
+        )
+        # Per-member cap: keep only the newest `max_events` rows for this key.
+        conn.execute(
+            "DELETE FROM member_events WHERE key=? AND id NOT IN "
+            "(SELECT id FROM member_events WHERE key=? ORDER BY id DESC LIMIT ?)",
+            (k, k, self.max_events),
+        )
+
+    def append_event(self, key: object, event: dict) -> None:
+        """Append one event to the member's append-only log (trimmed to the newest `max_events`)."""
+        if not isinstance(event, dict):
+            return
+        with self._lock:
+            self._insert_event(self._connect(), str(key), event)
+
+    def update_fields(self, key: object, fields: dict, *, event: dict | None = None) -> None:
+        """Set a few top-level fields of one record (+ append `event`) in one transaction.
+
+        Only `fields` are serialized (SQLite `json_set` patches them into the stored row), so the
+        per-event cost does not depend on the rest of the record. A missing row is created from `fields`.
+        """
+        k = str(key)
+        items = [(str(f), _dumps(v)) for f, v in (fields or {}).items() if str(f) != "events"]
+        if not items and not isinstance(event, dict):
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if items:
+                    paths = ", ".join("?, json(?)" for _ in items)
+                    args: list = []
+                    for f, raw in items:
+                        args += [f'$."{f}"', raw]
+                    conn.execute(
+                        "INSERT INTO members(key, record, updated_at) VALUES (?, ?, ?) "
+                        f"ON CONFLICT(key) DO UPDATE SET record=json_set(members.record, {paths}), "
+                        "updated_at=excluded.updated_at, version=members.version+1",
+                        [k, _dumps({f: json.loads(raw) for f, raw in items}), int(time.time())] + args,
+                    )
+                if isinstance(event, dict):
+                    self._insert_event(conn, k, event)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            # The stored row no longer matches what save_all() last saw for this key.
+            self._known.pop(k, None)
+
+    def save_all(self, db: dict) -> int:
+        """Persist a whole legacy-shaped dict, writing only keys whose content changed.
+
+        Keys missing from `db` are left alone (bulk callers only ever add/update).
+        Returns the number of rows written.
+        """
+        if not isinstance(db, dict):
+            return 0
+        now = int(time.time())
+        changed: list[tuple[str, str]] = []
+        with self._lock:
+            conn = self._connect()
+            for key, rec in db.items():
+                k = str(key)
+                if isinstance(rec, dict):
+                    rec = {kk: vv for kk, vv in rec.items() if kk != "events"}
+                raw = _dumps(rec)
+                if self._known.get(k) != raw:
+                    changed.append((k, raw))
+            if not changed:
+                return 0
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO members(key, record, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET record=excluded.record, updated_at=excluded.updated_at, version=members.version+1",
+                    [(k, raw, now) for k, raw in changed],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            for k, raw in changed:
+                self._known[k] = raw
+        return len(changed)
+
+    def export_json(self, out_path: Path) -> int:
+        """Write a legacy-shaped JSON snapshot (for tooling / offline review). Returns record count."""
+        data = self.load_all()
+        p = Path(out_path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(p.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(p)
+        return len(data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            conn = self._connect()
+            members = int(conn.execute("SELECT COUNT(*) FROM members").fetchone()[0])
+            events = int(conn.execute("SELECT COUNT(*) FROM member_events").fetchone()[0])
+            row = conn.execute("SELECT value FROM meta WHERE key='migrated_from_json'").fetchone()
+        return {"db": str(self.db_path), "members": members, "events": events, "migration": json.loads(row[0]) if row else {}}
+
+
+_STORES: dict[str, MemberHistoryStore] = {}
+_STORES_MAX_EVENTS_SET: dict[str, bool] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def max_events_from_config(config: dict | None) -> int:
+    """`member_history.max_events_per_user` from an RSCheckerbot config dict (default 50)."""
+    mh = config.get("member_history") if isinstance(config, dict) else None
+    try:
+        return max(0, int((mh or {}).get("max_events_per_user", DEFAULT_MAX_EVENTS)))
+    except Exception:
+        return DEFAULT_MAX_EVENTS
+
+
+def get_member_history_store(
+    db_path: Path = MEMBER_HISTORY_DB_FILE,
+    *,
+    legacy_json_path: Path | None = MEMBER_HISTORY_LEGACY_JSON,
+    max_events: int | None = None,
+) -> MemberHistoryStore:
+    """Process-wide store per DB path (main.py, support_tickets, whop_brief share one connection).
+
+    `max_events=None` reuses whatever the process configured (DEFAULT_MAX_EVENTS until a caller
+    passes one). The first explicit value is kept; a different explicit value raises ValueError.
+    """
+    key = str(Path(db_path).resolve())
+    with _STORES_LOCK:
+        st = _STORES.get(key)
+        if st is None:
+            st = MemberHistoryStore(
+                Path(db_path),
+                legacy_json_path=legacy_json_path,
+                max_events=DEFAULT_MAX_EVENTS if max_events is None else max_events,
+            )
+            _STORES[key] = st
+            _STORES_MAX_EVENTS_SET[key] = max_events is not None
+        elif max_events is not None:
+            want = max(0, int(max_events))
+            if not _STORES_MAX_EVENTS_SET.get(key):
+                st.max_events = want
+                _STORES_MAX_EVENTS_SET[key] = True
+            elif st.max_events != want:
+                raise ValueError(f"member history store {key} already uses max_events={st.max_events}, got {want}")
+        return st
+
+
+def _load_config() -> dict:
+    try:
+        obj = json.loads((_BASE_DIR / "config.json").read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    return obj if isinstance(obj, dict) else {}
+
+
+def _main() -> int:
+    ap = argparse.ArgumentParser(description="Member history SQLite store tools")
+    ap.add_argument("--db", default=str(MEMBER_HISTORY_DB_FILE), help="SQLite path (default: RSCheckerbot/member_history.sqlite3)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="Row/event counts and migration marker")
+    ex = sub.add_parser("export", help="Write a legacy-shaped member_history JSON snapshot")
+    ex.add_argument("--out", required=True, help="Output JSON path")
+    args = ap.parse_args()
+
+    store = get_member_history_store(Path(args.db), max_events=max_events_from_config(_load_config()))
+    if args.cmd == "stats":
+        print(json.dumps(store.stats(), indent=2))
+    elif args.cmd == "export":
+        n = store.export_json(Path(args.out))
+        print(f"Exported {n} record(s) -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
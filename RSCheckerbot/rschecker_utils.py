@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import json
 import logging
+import mmap
 import os
 import asyncio
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Awaitable, Callable
 
 import discord
 
@@ -271,27 +274,282 @@ async def append_jsonl(path: Path, record: dict) -> None:
             f.write(line + "\n")
 
 
-def iter_jsonl(path: Path) -> list[dict]:
-    """Read a JSONL file and return records (best-effort)."""
+def _jsonl_decode(line: bytes) -> dict | None:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        obj = json.loads(line)
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def iter_jsonl_tail(path: Path, max_records: int) -> list[dict]:
+    """Return the last `max_records` records of a JSONL file (file order), reading backwards from EOF.
+
+    Cost is proportional to the tail size, not the file size.
+    """
     out: list[dict] = []
     p = Path(path)
-    if not p.exists():
+    if max_records <= 0 or not p.exists():
         return out
     try:
-        with open(p, "r", encoding="utf-8") as f:
+        with open(p, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return out
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = len(mm)
+                while end > 0 and len(out) < max_records:
+                    start = mm.rfind(b"\n", 0, end - 1) + 1
+                    obj = _jsonl_decode(mm[start:end])
+                    if obj is not None:
+                        out.append(obj)
+                    end = start
+    except Exception:
+        return out
+    out.reverse()
+    return out
+
+
+class JsonlLedgerIndex:
+    """Sidecar offset index (by UTC day and by `key_field`) for an append-only JSONL ledger.
+
+    Sidecar file `<ledger>.idx.jsonl` is itself append-only:
+    - first line: {"version", "day_field", "key_field"} header
+    - then one line per refresh that indexed something:
+      {"size": end_offset, "days": {"YYYY-MM-DD": [[start, end), ...]}, "keys": {key: [offset, ...]}}
+      covering only the lines appended in that refresh.
+
+    Days are stored as runs of contiguous lines, so a late/replayed event adds one short run
+    instead of stretching the day's span across the file. Loading folds the lines (last `size`
+    wins); once the sidecar passes `compact_lines` lines it is rewritten as one folded snapshot,
+    so startup does not grow with the number of refreshes. `refresh()` parses only bytes
+    appended since the last indexed size. A shrunk ledger (or a header mismatch) forces a rebuild.
+    Thread-safe: callers use it from `asyncio.to_thread`.
+    """
+
+    VERSION = 3
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        day_field: str = "occurred_at",
+        key_field: str = "membership_id",
+        compact_lines: int = 256,
+    ) -> None:
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx.jsonl")
+        self.day_field = day_field
+        self.key_field = key_field
+        self.compact_lines = max(2, int(compact_lines))
+        self._days: dict[str, list[list[int]]] = {}
+        self._keys: dict[str, list[int]] = {}
+        self._size = 0
+        self._lines = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _header(self) -> dict:
+        return {"version": self.VERSION, "day_field": self.day_field, "key_field": self.key_field}
+
+    @staticmethod
+    def _add_run(runs: list[list[int]], start: int, end: int) -> None:
+        if runs and runs[-1][1] == start:
+            runs[-1][1] = end
+        else:
+            runs.append([start, end])
+
+    def _fold(self, days: dict, keys: dict) -> None:
+        for day, runs in days.items():
+            mine = self._days.setdefault(str(day), [])
+            for start, end in runs:
+                self._add_run(mine, int(start), int(end))
+        for key, offsets in keys.items():
+            self._keys.setdefault(str(key), []).extend(int(o) for o in offsets)
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            with open(self.index_path, "rb") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        if not lines or _jsonl_decode(lines[0]) != self._header():
+            return
+        good = len(lines[0])
+        for raw in lines[1:]:
+            rec = _jsonl_decode(raw) if raw.endswith(b"\n") else None
+            if rec is None:
+                # Torn write: drop it and re-index the ledger from the last good size.
+                with open(self.index_path, "r+b") as f:
+                    f.truncate(good)
+                break
+            self._fold(rec.get("days") or {}, rec.get("keys") or {})
+            self._size = int(rec.get("size") or 0)
+            self._lines += 1
+            good += len(raw)
+
+    def _write_snapshot(self) -> None:
+        """Rewrite the sidecar as header + one folded line (atomic replace)."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self._header(), separators=(",", ":")) + "\n")
+            if self._size:
+                f.write(json.dumps({"size": self._size, "days": self._days, "keys": self._keys}, separators=(",", ":")) + "\n")
+        os.replace(tmp, self.index_path)
+        self._lines = 1 if self._size else 0
+
+    def _reset(self) -> None:
+        self._days, self._keys, self._size = {}, {}, 0
+        self._write_snapshot()
+
+    def refresh(self) -> int:
+        """Index any newly appended lines; append one sidecar line if anything changed. Returns lines indexed."""
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> int:
+        if not self._loaded:
+            self._load()
+            if not self._size:
+                self._reset()
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            if self._size:
+                self._reset()
+            return 0
+        if size < self._size:
+            self._reset()
+        if size == self._size:
+            return 0
+        added = 0
+        days: dict[str, list[list[int]]] = {}
+        keys: dict[str, list[int]] = {}
+        with open(self.path, "rb") as f:
+            f.seek(self._size)
+            pos = self._size
             for raw in f:
-                line = raw.strip()
-                if not line:
+                if not raw.endswith(b"\n"):
+                    break  # partial line still being written; pick it up next refresh
+                off, pos = pos, pos + len(raw)
+                obj = _jsonl_decode(raw)
+                if obj is None:
                     continue
-                try:
-                    obj = json.loads(line)
-                except Exception:
-                    continue
-                if isinstance(obj, dict):
+                added += 1
+                dt = parse_dt_any(obj.get(self.day_field))
+                if dt is not None:
+                    self._add_run(days.setdefault(dt.strftime("%Y-%m-%d"), []), off, pos)
+                key = str(obj.get(self.key_field) or "").strip()
+                if key:
+                    keys.setdefault(key, []).append(off)
+        if pos == self._size:
+            return 0
+        self._fold(days, keys)
+        self._size = pos
+        if self._lines >= self.compact_lines:
+            self._write_snapshot()
+        else:
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"size": pos, "days": days, "keys": keys}, separators=(",", ":")) + "\n")
+            self._lines += 1
+        return added
+
+    def _read_runs(self, runs: list[list[int]]) -> list[dict]:
+        out: list[dict] = []
+        with open(self.path, "rb") as f:
+            for start, end in runs:
+                f.seek(start)
+                for raw in f.read(max(0, end - start)).splitlines():
+                    obj = _jsonl_decode(raw)
+                    if obj is not None:
+                        out.append(obj)
+        return out
+
+    def records_between(self, start: datetime, end: datetime) -> list[dict]:
+        """Records whose `day_field` falls in [start, end] (file order). Reads only the indexed runs."""
+        start_key = start.astimezone(timezone.utc).strftime("%Y-%m-%d")
+        end_key = end.astimezone(timezone.utc).strftime("%Y-%m-%d")
+        with self._lock:
+            self._refresh_locked()
+            runs = sorted(r for k, v in self._days.items() if start_key <= k <= end_key for r in v)
+        merged: list[list[int]] = []
+        for s0, e0 in runs:
+            if merged and s0 <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], e0)
+            else:
+                merged.append([s0, e0])
+        out: list[dict] = []
+        for obj in self._read_runs(merged):
+            dt = parse_dt_any(obj.get(self.day_field))
+            if dt is not None and start <= dt <= end:
+                out.append(obj)
+        return out
+
+    def records_for(self, key: str) -> list[dict]:
+        """Records whose `key_field` equals `key` (file order). Seeks straight to each indexed line."""
+        k = str(key or "").strip()
+        if not k:
+            return []
+        with self._lock:
+            self._refresh_locked()
+            offsets = list(self._keys.get(k) or [])
+        out: list[dict] = []
+        if not offsets:
+            return out
+        with open(self.path, "rb") as f:
+            for off in offsets:
+                f.seek(off)
+                obj = _jsonl_decode(f.readline())
+                if obj is not None and str(obj.get(self.key_field) or "").strip() == k:
                     out.append(obj)
-    except Exception:
         return out
-    return out
+
+
+async def run_ordered_pool(
+    items: list,
+    worker: Callable[[Any], Awaitable[Any]],
+    *,
+    concurrency: int,
+    on_result: Callable[[int, Any], Awaitable[None]],
+) -> None:
+    """Run `worker(item)` with at most `concurrency` in flight, committing results in input order.
+
+    Each item is handled start-to-finish by one coroutine (per-item ordering is preserved).
+    `on_result(idx, result)` is awaited strictly in 1-based input order, so callers that build
+    reports or progress counters from it stay deterministic regardless of completion order.
+    Worker exceptions are passed to `on_result` as the result object.
+    """
+    total = len(items)
+    if total <= 0:
+        return
+    width = max(1, min(int(concurrency or 1), total))
+    it = iter(enumerate(items, start=1))
+    done: dict[int, Any] = {}
+    next_idx = 1
+    commit_lock = asyncio.Lock()
+
+    async def _commit() -> None:
+        nonlocal next_idx
+        async with commit_lock:
+            while next_idx in done:
+                res = done.pop(next_idx)
+                idx = next_idx
+                next_idx += 1
+                await on_result(idx, res)
+
+    async def _run() -> None:
+        for idx, item in it:
+            try:
+                done[idx] = await worker(item)
+            except Exception as e:
+                done[idx] = e
+            await _commit()
+
+    await asyncio.gather(*[_run() for _ in range(width)])
 
 
 def roles_plain(member: discord.Member) -> str:
@@ -0,0 +1,123 @@
+"""Benchmark: Whop membership sync sweep wall-time vs member count (mocked Whop API).
+
+Starts a local aiohttp stub that mimics the Whop endpoints the sweep hits
+(`/memberships/{id}` and `/payments?membership_id=...`) with a fixed per-request
+latency, then runs the same per-member lookups as `sync_whop_memberships`
+through `run_ordered_pool` at several concurrency levels.
+
+No Discord or Whop credentials are needed; nothing leaves localhost.
+
+Usage:
+  py -3 RSCheckerbot/scripts/bench_whop_sync_sweep.py
+  py -3 RSCheckerbot/scripts/bench_whop_sync_sweep.py --members 100 500 --concurrency 1 8 --latency-ms 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from aiohttp import web
+
+_RS_CHECKERBOT_DIR = Path(__file__).resolve().parents[1]
+if str(_RS_CHECKERBOT_DIR) not in sys.path:
+    sys.path.insert(0, str(_RS_CHECKERBOT_DIR))
+
+from rschecker_utils import run_ordered_pool  # noqa: E402
+from whop_api_client import WhopAPIClient  # noqa: E402
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Whop sync sweep wall-time benchmark (mocked Whop API)")
+    p.add_argument("--members", type=int, nargs="+", default=[50, 200, 800], help="Member counts to sweep")
+    p.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16], help="Worker pool sizes")
+    p.add_argument("--latency-ms", type=float, default=40.0, help="Stub latency per request (default 40ms)")
+    p.add_argument("--port", type=int, default=8799, help="Local stub port")
+    return p.parse_args()
+
+
+async def _start_stub(port: int, latency_s: float) -> web.AppRunner:
+    async def membership(req: web.Request) -> web.Response:
+        await asyncio.sleep(latency_s)
+        mid = req.match_info["mid"]
+        n = int(mid.split("_")[-1])
+        # Every 5th membership is canceled without an end date (forces the payments fallback).
+        status = "canceled" if n % 5 == 0 else "active"
+        body = {"id": mid, "status": status, "cancel_at_period_end": False}
+        if status == "active":
+            body["renewal_period_end"] = "2099-01-01T00:00:00Z"
+        return web.json_response(body, headers={"X-RateLimit-Remaining": "1000"})
+
+    async def payments(_req: web.Request) -> web.Response:
+        await asyncio.sleep(latency_s)
+        return web.json_response({"data": [{"status": "paid", "paid_at": "2020-01-01T00:00:00Z"}]})
+
+    app = web.Application()
+    app.router.add_get("/memberships/{mid}", membership)
+    app.router.add_get("/payments", payments)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+async def _sweep(client: WhopAPIClient, n_members: int, concurrency: int) -> tuple[float, int]:
+    now_dt = datetime.now(timezone.utc)
+
+    async def _one(mid: str) -> str:
+        verification = await client.verify_membership_status(mid, "active")
+        if verification.get("matches"):
+            return "ok"
+        entitled, _until, _why = await client.is_entitled_until_end(
+            mid, verification.get("membership_data"), cache_path=None, now=now_dt
+        )
+        return "keep" if entitled else "would_remove"
+
+    rows: list[str] = []
+
+    async def _commit(_idx: int, res: object) -> None:
+        rows.append(str(res))
+
+    t0 = time.perf_counter()
+    await run_ordered_pool(
+        [f"mem_{i}" for i in range(1, n_members + 1)],
+        _one,
+        concurrency=concurrency,
+        on_result=_commit,
+    )
+    return (time.perf_counter() - t0, len(rows))
+
+
+async def main() -> int:
+    args = _parse_args()
+    runner = await _start_stub(int(args.port), float(args.latency_ms) / 1000.0)
+    try:
+        print(f"stub latency={args.latency_ms:.0f}ms per request")
+        print(f"{'members':>8} {'conc':>5} {'wall_s':>8} {'members/s':>10}")
+        for n in args.members:
+            for c in args.concurrency:
+                # Limiter opened wide so the numbers show the sweep, not the production rate limit.
+                client = WhopAPIClient(
+                    "bench",
+                    f"http://127.0.0.1:{args.port}",
+                    "biz_bench",
+                    max_connections_per_host=max(1, c),
+                    rate_limit_per_second=10000,
+                    rate_limit_burst=10000,
+                )
+                try:
+                    wall, done = await _sweep(client, int(n), int(c))
+                finally:
+                    await client.close()
+                print(f"{n:>8} {c:>5} {wall:>8.2f} {done / wall if wall else 0.0:>10.1f}")
+    finally:
+        await runner.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
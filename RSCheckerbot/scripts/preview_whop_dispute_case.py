@@ -40,6 +40,19 @@ def _load_secrets() -> dict:
     return json.loads(p.read_text(encoding="utf-8")) if p.exists() else {}
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def _run(*, membership_id: str, dispute_id: str) -> int:
     cfg = _load_config()
     sec = _load_secrets()
@@ -49,6 +62,7 @@ async def _run(*, membership_id: str, dispute_id: str) -> int:
         print("Missing Whop API key in config.secrets.json", file=sys.stderr)
         return 2
     client = WhopAPIClient(api_key=api_key, company_id=str(whop_cfg.get("company_id") or ""))
+    _OPEN_CLIENTS.append(client)
     enrich = bool(whop_cfg.get("enable_enrichment", True))
 
     async def _fetch_brief(mid: str) -> dict:
@@ -94,7 +108,7 @@ def main() -> int:
     ap.add_argument("--membership-id", default="", help="Whop membership id (mem_...)")
     ap.add_argument("--dispute-id", default="", help="Whop dispute id (dspt_...)")
     args = ap.parse_args()
-    return asyncio.run(_run(membership_id=str(args.membership_id or ""), dispute_id=str(args.dispute_id or "")))
+    return asyncio.run(_run_closing(_run(membership_id=str(args.membership_id or ""), dispute_id=str(args.dispute_id or ""))))
 
 
 if __name__ == "__main__":
@@ -24,6 +24,7 @@ from staff_embeds import build_member_status_detailed_embed as _build_member_sta
 from ticket_channels import ensure_ticket_like_channel as _ensure_ticket_like_channel
 from ticket_channels import slug_channel_name as _slug_channel_name
 from whop_brief import fetch_whop_brief as _fetch_whop_brief
+from member_history_store import get_member_history_store, max_events_from_config
 from whop_brief import enrich_whop_brief_from_membership_logs as _enrich_whop_brief_from_membership_logs
 
 
@@ -31,16 +32,14 @@ BASE_DIR = Path(__file__).resolve().parent
 INDEX_PATH = BASE_DIR / "data" / "tickets_index.json"
 PENDING_STARTUP_PATH = BASE_DIR / "data" / "pending_ticket_startup_messages.json"
 MIGRATIONS_STATE_PATH = BASE_DIR / "data" / "support_tickets_migrations.json"
-MEMBER_HISTORY_PATH = BASE_DIR / "member_history.json"
+MEMBER_HISTORY_PATH = BASE_DIR / "member_history.json"  # legacy; imported once into MEMBER_HISTORY_DB_PATH
+MEMBER_HISTORY_DB_PATH = BASE_DIR / "member_history.sqlite3"
 WHOP_LOGS_EVENTS_PATH = BASE_DIR / "data" / "whop_logs_events.json"
 WHOP_IDENTITY_CACHE_PATH = BASE_DIR / "whop_identity_cache.json"
 MEMBER_LOOKUP_PANEL_STATE_PATH = BASE_DIR / "data" / "support_member_lookup_panel.json"
 CANCELLATION_COUNTDOWN_STATE_PATH = BASE_DIR / "data" / "cancellation_countdown_state.json"
 
 _INDEX_LOCK: asyncio.Lock = asyncio.Lock()
-_MH_DB_CACHE: dict | None = None
-_MH_DB_CACHE_AT: float = 0.0
-_MH_DB_CACHE_MTIME: float = 0.0
 
 
 @dataclass(frozen=True)
@@ -129,6 +128,7 @@ class SupportTicketConfig:
 
 _BOT: commands.Bot | None = None
 _CFG: SupportTicketConfig | None = None
+_MH_MAX_EVENTS: int | None = None  # member_history.max_events_per_user (set in initialize)
 _LOG_FUNC = None  # async callable(str) -> None
 _IS_WHOP_LINKED = None  # callable(discord_id:int) -> bool
 _TZ_NAME = "UTC"
@@ -335,7 +335,7 @@ def initialize(
     This is called from RSCheckerbot/main.py after config load.
     run_membership_report_callback: async (user, start_str, end_str) -> (success, message)
     """
-    global _BOT, _CFG, _LOG_FUNC, _IS_WHOP_LINKED, _TZ_NAME, _WHOP_API_CLIENT, _RUN_MEMBERSHIP_REPORT_CALLBACK
+    global _BOT, _CFG, _LOG_FUNC, _IS_WHOP_LINKED, _TZ_NAME, _WHOP_API_CLIENT, _RUN_MEMBERSHIP_REPORT_CALLBACK, _MH_MAX_EVENTS
     _BOT = bot
     _RUN_MEMBERSHIP_REPORT_CALLBACK = run_membership_report_callback
     _LOG_FUNC = log_func
@@ -344,6 +344,7 @@ def initialize(
     _WHOP_API_CLIENT = whop_api_client
 
     root = config if isinstance(config, dict) else {}
+    _MH_MAX_EVENTS = max_events_from_config(root)
     st = root.get("support_tickets") if isinstance(root.get("support_tickets"), dict) else {}
 
     perms = st.get("permissions") if isinstance(st.get("permissions"), dict) else {}
@@ -501,34 +502,33 @@ def _short_iso(ts: str) -> str:
     return dt.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
 
 
+def _member_history_store():
+    return get_member_history_store(MEMBER_HISTORY_DB_PATH, legacy_json_path=MEMBER_HISTORY_PATH, max_events=_MH_MAX_EVENTS)
+
+
 def _member_history_get(discord_id: int) -> dict:
     did = int(discord_id or 0)
     if did <= 0:
         return {}
-    db = _member_history_db_cached()
-    rec = db.get(str(did)) if isinstance(db, dict) else None
+    try:
+        rec = _member_history_store().get(str(did))
+    except Exception:
+        return {}
     return rec if isinstance(rec, dict) else {}
 
 
-def _member_history_db_cached(*, ttl_seconds: int = 15) -> dict:
-    """Load member_history.json once per short window (it can be large)."""
-    global _MH_DB_CACHE, _MH_DB_CACHE_AT, _MH_DB_CACHE_MTIME
-    try:
-        ttl = max(1, min(int(ttl_seconds or 15), 120))
-    except Exception:
-        ttl = 15
-    now = datetime.now(timezone.utc).timestamp()
+_MH_SHARED_KEYS = ["whop_users", "whop_user_index", "whop_membership_index"]
+
+
+def _member_history_db_cached() -> dict:
+    """Shared Whop baseline slices (whop_users + indexes); re-parsed only when those rows change.
+
+    Per-member records are not included; use `_member_history_get(discord_id)`.
+    """
     try:
-        mtime = float(MEMBER_HISTORY_PATH.stat().st_mtime) if MEMBER_HISTORY_PATH.exists() else 0.0
+        return _member_history_store().get_cached(_MH_SHARED_KEYS)
     except Exception:
-        mtime = 0.0
-    if _MH_DB_CACHE is not None and (now - float(_MH_DB_CACHE_AT)) <= float(ttl) and float(mtime) == float(_MH_DB_CACHE_MTIME):
-        return _MH_DB_CACHE if isinstance(_MH_DB_CACHE, dict) else {}
-    raw = _load_json(MEMBER_HISTORY_PATH)
-    _MH_DB_CACHE = raw if isinstance(raw, dict) else {}
-    _MH_DB_CACHE_AT = float(now)
-    _MH_DB_CACHE_MTIME = float(mtime)
-    return _MH_DB_CACHE if isinstance(_MH_DB_CACHE, dict) else {}
+        return {}
 
 
 def _snowflake_created_at_utc(snowflake_id: int) -> datetime | None:
@@ -739,8 +739,7 @@ def _build_member_lookup_result_embeds(*, guild: discord.Guild, did: int) -> lis
     did_i = int(did or 0)
     member = guild.get_member(did_i) if did_i > 0 else None
     db = _member_history_db_cached()
-    rec = db.get(str(did_i)) if isinstance(db, dict) else {}
-    rec = rec if isinstance(rec, dict) else {}
+    rec = _member_history_get(did_i)
     wh = rec.get("whop") if isinstance(rec.get("whop"), dict) else {}
 
     # Basic identity
@@ -1632,8 +1631,7 @@ async def _build_member_lookup_category_embeds(*, guild: discord.Guild, did: int
     member = guild.get_member(did_i) if did_i > 0 else None
 
     db = _member_history_db_cached()
-    rec = db.get(str(did_i)) if isinstance(db, dict) else {}
-    rec = rec if isinstance(rec, dict) else {}
+    rec = _member_history_get(did_i)
 
     base_brief = _lookup_best_whop_brief(db=db, rec=rec) if rec else {}
 
@@ -5506,15 +5504,9 @@ def _scan_state_set(key: str, value: dict) -> None:
 
 
 def _membership_id_from_member_history(discord_id: int) -> str:
-    """Best-effort: return last_membership_id/whop_key for a Discord user from member_history.json."""
-    did = int(discord_id or 0)
-    if did <= 0:
-        return ""
-    raw = _load_json(MEMBER_HISTORY_PATH)
-    if not isinstance(raw, dict):
-        return ""
-    rec = raw.get(str(did))
-    if not isinstance(rec, dict):
+    """Best-effort: return last_membership_id/whop_key for a Discord user from member history."""
+    rec = _member_history_get(int(discord_id or 0))
+    if not rec:
         return ""
     wh = rec.get("whop") if isinstance(rec.get("whop"), dict) else {}
     if not isinstance(wh, dict):
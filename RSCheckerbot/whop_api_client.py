@@ -11,6 +11,7 @@ import asyncio
 import logging
 import json
 import os
+import time
 from contextlib import suppress
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -28,10 +29,101 @@ class WhopAPIError(Exception):
     pass
 
 
+def _header_float(headers: object, *names: str) -> Optional[float]:
+    """Read the first parseable numeric header (case-insensitive via aiohttp CIMultiDict)."""
+    if headers is None:
+        return None
+    for name in names:
+        try:
+            raw = headers.get(name)  # type: ignore[attr-defined]
+        except Exception:
+            raw = None
+        if raw is None or str(raw).strip() == "":
+            continue
+        try:
+            return float(str(raw).strip())
+        except Exception:
+            continue
+    return None
+
+
+class _WhopRateLimiter:
+    """Token bucket shared by every request made through one WhopAPIClient.
+
+    Refills at `rate_per_second` up to `burst` tokens. Whop's `X-RateLimit-*` headers
+    tighten the bucket when the server reports fewer remaining calls than we think we
+    have, and a 429 (or remaining == 0) pauses all callers until the reset time.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate = max(0.1, float(rate_per_second))
+        self.capacity = float(max(1, int(burst)))
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+    def block_for(self, seconds: float) -> None:
+        """Pause every caller for `seconds` (used for 429 / exhausted windows)."""
+        until = time.monotonic() + max(0.0, float(seconds))
+        if until > self._blocked_until:
+            self._blocked_until = until
+        self.tokens = 0.0
+
+    def update_from_headers(self, headers: object) -> None:
+        """Sync the bucket with Whop's rate-limit headers (best-effort; missing headers are ignored)."""
+        remaining = _header_float(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        if remaining is None:
+            return
+        if remaining < self.tokens:
+            self.tokens = max(0.0, remaining)
+        if remaining <= 0:
+            reset = _header_float(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+            self.block_for(_reset_delay_seconds(reset, default=1.0))
+
+
+def _reset_delay_seconds(reset: Optional[float], *, default: float) -> float:
+    """Interpret a reset header as either seconds-from-now or a unix timestamp."""
+    if reset is None:
+        return default
+    if reset > 1.0e9:
+        return max(0.0, reset - time.time())
+    return max(0.0, reset)
+
+
 class WhopAPIClient:
     """Client for Whop Developer API (Company API)"""
     
-    def __init__(self, api_key: str, base_url: str = "https://api.whop.com/api/v1", company_id: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.whop.com/api/v1",
+        company_id: Optional[str] = None,
+        *,
+        max_connections_per_host: int = 8,
+        rate_limit_per_second: float = 5.0,
+        rate_limit_burst: int = 10,
+        max_rate_limit_retries: int = 4,
+        request_timeout_seconds: float = 10.0,
+    ):
         """
         Initialize Whop API client.
         
@@ -39,6 +131,11 @@ class WhopAPIClient:
             api_key: Whop Company API key (from dashboard)
             base_url: Base URL for Whop API (from config, defaults to v1)
             company_id: Whop Company ID (biz_...) required for Company API list endpoints
+            max_connections_per_host: Keep-alive pool size for the shared aiohttp session
+            rate_limit_per_second: Token-bucket refill rate (tightened by Whop's rate-limit headers)
+            rate_limit_burst: Token-bucket capacity
+            max_rate_limit_retries: How many times a 429 is retried (with backoff) before raising
+            request_timeout_seconds: Total timeout per HTTP request
         """
         if not api_key:
             raise ValueError("Whop API key is required")
@@ -53,6 +150,65 @@ class WhopAPIClient:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
+        self.max_connections_per_host = max(1, int(max_connections_per_host))
+        self.max_rate_limit_retries = max(0, int(max_rate_limit_retries))
+        self.request_timeout_seconds = float(request_timeout_seconds)
+        self._rate_limiter = _WhopRateLimiter(rate_limit_per_second, rate_limit_burst)
+        # One pooled keep-alive session per client (created lazily inside the running loop).
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def from_config(cls, api_key: str, whop_cfg: Optional[Dict]) -> "WhopAPIClient":
+        """Build a client from a `whop_api` config block (base_url/company_id + pool/limiter knobs)."""
+        cfg = whop_cfg if isinstance(whop_cfg, dict) else {}
+
+        def _num(key: str, default: float) -> float:
+            try:
+                v = cfg.get(key)
+                return float(v) if v is not None and str(v).strip() != "" else float(default)
+            except Exception:
+                return float(default)
+
+        return cls(
+            api_key,
+            str(cfg.get("base_url") or "https://api.whop.com/api/v1").strip(),
+            str(cfg.get("company_id") or "").strip(),
+            max_connections_per_host=int(_num("max_connections_per_host", 8)),
+            rate_limit_per_second=_num("rate_limit_per_second", 5.0),
+            rate_limit_burst=int(_num("rate_limit_burst", 10)),
+            max_rate_limit_retries=int(_num("max_rate_limit_retries", 4)),
+            request_timeout_seconds=_num("request_timeout_seconds", 10.0),
+        )
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session and not self._session.closed:
+            return self._session
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections_per_host * 2,
+            limit_per_host=self.max_connections_per_host,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout_seconds),
+        )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session (safe to call multiple times)."""
+        sess = self._session
+        self._session = None
+        if sess and not sess.closed:
+            with suppress(Exception):
+                await sess.close()
+
+    async def __aenter__(self) -> "WhopAPIClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
 
     def _parse_dt_any(self, ts_str: object) -> Optional[datetime]:
         """Parse ISO/unix-ish timestamps into UTC datetime (best-effort)."""
@@ -241,23 +397,34 @@ class WhopAPIClient:
             WhopAPIError: If request fails
         """
         url = f"{self.base_url}{endpoint}"
+        attempt = 0
         
-        try:
-            async with aiohttp.ClientSession() as session:
+        while True:
+            await self._rate_limiter.acquire()
+            try:
+                session = await self._get_session()
                 async with session.request(
                     method=method,
                     url=url,
-                    headers=self.headers,
                     params=params,
                     json=json_data,
-                    timeout=aiohttp.ClientTimeout(total=10)
                 ) as resp:
+                    self._rate_limiter.update_from_headers(resp.headers)
+                    if resp.status == 429:
+                        retry_after = _header_float(resp.headers, "Retry-After")
+                        if retry_after is None:
+                            reset = _header_float(resp.headers, "X-RateLimit-Reset", "RateLimit-Reset")
+                            retry_after = _reset_delay_seconds(reset, default=min(30.0, 2.0 ** attempt))
+                        self._rate_limiter.block_for(retry_after)
+                        if attempt >= self.max_rate_limit_retries:
+                            raise WhopAPIError("Rate limit exceeded - retries exhausted")
+                        attempt += 1
+                        log.debug(f"[Whop API] 429 on {endpoint}; retry {attempt}/{self.max_rate_limit_retries} in {retry_after:.1f}s")
+                        continue
                     if resp.status == 401:
                         raise WhopAPIError("Invalid API key or expired token")
                     if resp.status == 403:
                         raise WhopAPIError("API key lacks required permissions")
-                    if resp.status == 429:
-                        raise WhopAPIError("Rate limit exceeded - wait before retrying")
                     
                     try:
                         data = await resp.json()
@@ -270,8 +437,8 @@ class WhopAPIClient:
                         raise WhopAPIError(self._extract_error_message(data, resp.status))
                     
                     return data
-        except aiohttp.ClientError as e:
-            raise WhopAPIError(f"Network error: {e}")
+            except aiohttp.ClientError as e:
+                raise WhopAPIError(f"Network error: {e}")
 
     async def list_waitlist_entries_page(
         self,
@@ -29,6 +29,7 @@ except Exception:  # pragma: no cover
     ZoneInfo = None  # type: ignore[assignment]
 
 from whop_api_client import WhopAPIClient
+from member_history_store import get_member_history_store, max_events_from_config
 from rschecker_utils import extract_discord_id_from_whop_member_record
 from rschecker_utils import access_roles_plain, coerce_role_ids, fmt_date_any, usd_amount, save_json
 from staff_embeds import build_case_minimal_embed, build_member_status_detailed_embed
@@ -40,12 +41,36 @@ from whop_webhook_handler import _build_whop_summary_from_native_kv as _build_wh
 
 BASE_DIR = Path(__file__).resolve().parent
 _PROBE_STAFFCARDS_DEDUPE_FILE = BASE_DIR / ".probe_staffcards_sent.json"
-_MEMBER_HISTORY_FILE = BASE_DIR / "member_history.json"
+_MEMBER_HISTORY_FILE = BASE_DIR / "member_history.json"  # legacy; imported once into _MEMBER_HISTORY_DB_FILE
+_MEMBER_HISTORY_DB_FILE = BASE_DIR / "member_history.sqlite3"
 _WHOP_IDENTITY_CACHE_FILE = BASE_DIR / "whop_identity_cache.json"
 _PROBE_WHOPLOGS_STATE_FILE = BASE_DIR / ".probe_whoplogs_baseline_state.json"
 _PROBE_MEMBERSTATUS_STATE_FILE = BASE_DIR / ".probe_memberstatus_cards_state.json"
 
 
+# Clients built during one probe run; `_run_probe` closes their pooled sessions on exit.
+_PROBE_CLIENTS: list[WhopAPIClient] = []
+
+
+def _new_client(api_key: str, base_url: str, company_id: str) -> WhopAPIClient:
+    client = WhopAPIClient(api_key, base_url, company_id)
+    _PROBE_CLIENTS.append(client)
+    return client
+
+
+def _run_probe(coro) -> int:
+    """asyncio.run a probe coroutine, then close every Whop client it opened."""
+
+    async def _runner() -> int:
+        try:
+            return await coro
+        finally:
+            while _PROBE_CLIENTS:
+                await _PROBE_CLIENTS.pop().close()
+
+    return asyncio.run(_runner())
+
+
 def _backup_path(prefix: str, *, suffix: str = ".json") -> Path:
     """Return a timestamped path under RSCheckerbot/backups/."""
     ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
@@ -202,7 +227,7 @@ def _rebuild_merge_from_observed(report: dict) -> dict:
 
 
 def _view_member_history_for_discord_id(did: int) -> str:
-    db = _load_json_file(_MEMBER_HISTORY_FILE)
+    db = _load_member_history_db()
     rec = db.get(str(int(did))) if isinstance(db, dict) else None
     if not isinstance(rec, dict):
         return "No record in member_history.json for this Discord ID."
@@ -979,7 +1004,7 @@ def _update_member_history_from_member_status_hit(
     did = int(discord_id or 0)
     if did <= 0:
         return False
-    db = _load_json_file(_MEMBER_HISTORY_FILE)
+    db = _load_member_history_db()
     if not isinstance(db, dict):
         db = {}
     rec = db.get(str(did), {})
@@ -1018,10 +1043,7 @@ def _update_member_history_from_member_status_hit(
     wh["member_status_logs_latest"] = latest
     rec["whop"] = wh
     db[str(did)] = rec
-    try:
-        save_json(Path(_MEMBER_HISTORY_FILE), db)
-    except Exception:
-        _save_json_file(Path(_MEMBER_HISTORY_FILE), db)
+    _save_member_history_db(db)
     return True
 
 
@@ -1268,6 +1290,30 @@ def _load_json_file(p: Path) -> dict:
         return {}
 
 
+def _member_history_store():
+    return get_member_history_store(
+        _MEMBER_HISTORY_DB_FILE,
+        legacy_json_path=_MEMBER_HISTORY_FILE,
+        max_events=max_events_from_config(load_config()),
+    )
+
+
+def _load_member_history_db() -> dict:
+    """Whole member history (probe tooling is bulk by nature)."""
+    try:
+        return _member_history_store().load_all()
+    except Exception:
+        return {}
+
+
+def _save_member_history_db(db: dict) -> None:
+    """Persist changed member-history records (unchanged rows are not rewritten)."""
+    try:
+        _member_history_store().save_all(db)
+    except Exception:
+        return
+
+
 def _save_json_file(p: Path, data: dict) -> None:
     try:
         p.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -1293,7 +1339,7 @@ def load_config() -> dict:
 
 
 def _mid_from_member_history(did: int) -> str:
-    raw = _load_json_file(_MEMBER_HISTORY_FILE)
+    raw = _load_member_history_db()
     if not isinstance(raw, dict):
         return ""
     rec = raw.get(str(int(did))) if did else None
@@ -1366,7 +1412,7 @@ def _update_member_history_from_whop_log_hit(
     if did <= 0:
         return False
     if db is None:
-        db = _load_json_file(_MEMBER_HISTORY_FILE)
+        db = _load_member_history_db()
     if not isinstance(db, dict):
         db = {}
     rec = db.get(str(did), {})
@@ -1411,10 +1457,7 @@ def _update_member_history_from_whop_log_hit(
     rec["whop"] = wh
     db[str(did)] = rec
     if save:
-        try:
-            save_json(Path(_MEMBER_HISTORY_FILE), db)
-        except Exception:
-            _save_json_file(Path(_MEMBER_HISTORY_FILE), db)
+        _save_member_history_db(db)
     return True
 
 
@@ -1597,7 +1640,7 @@ def _update_member_history_from_whop_membership_log_hit(
     if not key:
         return False
     if db is None:
-        db = _load_json_file(_MEMBER_HISTORY_FILE)
+        db = _load_member_history_db()
     db = _ensure_whop_users_shape(db)
     wu = db.get("whop_users")
     if not isinstance(wu, dict):
@@ -1650,10 +1693,7 @@ def _update_member_history_from_whop_membership_log_hit(
     wu[str(key)] = rec
     db["whop_users"] = wu
     if save:
-        try:
-            save_json(Path(_MEMBER_HISTORY_FILE), db)
-        except Exception:
-            _save_json_file(Path(_MEMBER_HISTORY_FILE), db)
+        _save_member_history_db(db)
     return True
 
 
@@ -1822,7 +1862,7 @@ async def _probe_whoplogs_baseline(args: argparse.Namespace) -> int:
         mh_db: dict | None = None
         mh_dirty = 0
         if do_record:
-            mh_db = _load_json_file(_MEMBER_HISTORY_FILE)
+            mh_db = _load_member_history_db()
             if not isinstance(mh_db, dict):
                 mh_db = {}
             # Ensure optional top-level shapes exist early.
@@ -1873,13 +1913,8 @@ async def _probe_whoplogs_baseline(args: argparse.Namespace) -> int:
                     _save_probe_state(state_path, state)
                     # Also flush member_history periodically if we're recording (keeps long scans safe).
                     if do_record and mh_db is not None and mh_dirty:
-                        try:
-                            save_json(Path(_MEMBER_HISTORY_FILE), mh_db)
-                            mh_dirty = 0
-                        except Exception:
-                            with suppress(Exception):
-                                _save_json_file(Path(_MEMBER_HISTORY_FILE), mh_db)
-                                mh_dirty = 0
+                        _save_member_history_db(mh_db)
+                        mh_dirty = 0
 
                 e0 = msg.embeds[0] if msg.embeds else None
                 if not isinstance(e0, discord.Embed):
@@ -2084,9 +2119,8 @@ async def _probe_whoplogs_baseline(args: argparse.Namespace) -> int:
             print(f"member_history_updates: {updated}")
             # Final flush of member_history.json
             if mh_db is not None and mh_dirty:
-                with suppress(Exception):
-                    save_json(Path(_MEMBER_HISTORY_FILE), mh_db)
-                    mh_dirty = 0
+                _save_member_history_db(mh_db)
+                mh_dirty = 0
 
         # Optional inventory report
         if out_path:
@@ -3313,7 +3347,7 @@ async def _probe_joined(args: argparse.Namespace) -> int:
     prefixes: list[str] = [p.strip() for p in (args.product_prefix or []) if str(p).strip()]
     allowed_statuses: set[str] = {s.strip().lower() for s in (args.status or []) if str(s).strip()}
 
-    client = WhopAPIClient(api_key, base_url, company_id)
+    client = _new_client(api_key, base_url, company_id)
     rows: list[JoinedRow] = []
     pages = 0
     after: str | None = None
@@ -3867,7 +3901,7 @@ async def _probe_canceling(args: argparse.Namespace) -> int:
         print("Missing `whop_api.api_key` or `whop_api.company_id` in config.")
         return 2
 
-    client = WhopAPIClient(api_key, base_url, company_id)
+    client = _new_client(api_key, base_url, company_id)
     per_page = int(args.per_page)
     max_pages = int(args.max_pages)
     max_rows = int(args.limit)
@@ -4000,7 +4034,7 @@ def _init_client_from_local_config() -> tuple[WhopAPIClient | None, dict]:
     company_id = str(wh.get("company_id") or "").strip()
     if not api_key or not company_id:
         return (None, {})
-    return (WhopAPIClient(api_key, base_url, company_id), wh)
+    return (_new_client(api_key, base_url, company_id), wh)
 
 
 def _parse_kv_params(kvs: list[str]) -> dict[str, str]:
@@ -4101,7 +4135,7 @@ async def _probe_nowhop_debug(args: argparse.Namespace) -> int:
 
     print("=== no_whop_link debug (local) ===")
     print(f"discord_ids: {', '.join(str(d) for d in dids)}")
-    print(f"member_history_file: {str(_MEMBER_HISTORY_FILE)} (exists={_MEMBER_HISTORY_FILE.exists()})")
+    print(f"member_history_db: {str(_MEMBER_HISTORY_DB_FILE)} (exists={_MEMBER_HISTORY_DB_FILE.exists()})")
     print(f"identity_cache_file: {str(_WHOP_IDENTITY_CACHE_FILE)} (exists={_WHOP_IDENTITY_CACHE_FILE.exists()})")
     print(f"whop_api_ready: {api_ready}")
     if not api_ready:
@@ -4783,7 +4817,7 @@ async def _probe_nowhop_purge(args: argparse.Namespace) -> int:
         return 2
 
     # Load member_history baseline once.
-    mh = _load_json_file(_MEMBER_HISTORY_FILE)
+    mh = _load_member_history_db()
     if not isinstance(mh, dict):
         mh = {}
 
@@ -4795,7 +4829,7 @@ async def _probe_nowhop_purge(args: argparse.Namespace) -> int:
     print(f"skip_role_remove: {skip_role_remove}  skip_delete_channels: {skip_delete_channels}  skip_delete_category: {skip_delete_category}")
     print(f"scan_members: {scan_members} (max_pages={members_max_pages} per_page={members_per_page})")
     print(f"sleep_ms: {sleep_ms}")
-    print(f"member_history_file: {str(_MEMBER_HISTORY_FILE)} (exists={_MEMBER_HISTORY_FILE.exists()})")
+    print(f"member_history_db: {str(_MEMBER_HISTORY_DB_FILE)} (exists={_MEMBER_HISTORY_DB_FILE.exists()})")
 
     intents = discord.Intents.none()
     intents.guilds = True
@@ -5821,7 +5855,7 @@ async def _probe_staffcards(args: argparse.Namespace) -> int:
         sent_map = {}
 
     # Member history fallback: discord_id -> last_membership_id
-    hist_db = _load_json_file(BASE_DIR / "member_history.json")
+    hist_db = _load_member_history_db()
     if not isinstance(hist_db, dict):
         hist_db = {}
 
@@ -5926,7 +5960,7 @@ async def _probe_staffcards(args: argparse.Namespace) -> int:
         mid = str(pool[0].get("id") or pool[0].get("membership_id") or "").strip()
         return mid
 
-    client = WhopAPIClient(api_key, base_url, company_id)
+    client = _new_client(api_key, base_url, company_id)
 
     intents = discord.Intents.none()
     intents.guilds = True
@@ -6016,7 +6050,7 @@ async def _probe_staffcards(args: argparse.Namespace) -> int:
                 if len(work) >= int(args.limit):
                     break
         else:
-            hist = _load_json_file(BASE_DIR / "member_history.json")
+            hist = _load_member_history_db()
             if isinstance(hist, dict):
                 for did_s, rec in hist.items():
                     if not str(did_s).strip().isdigit():
@@ -6388,43 +6422,43 @@ def main() -> int:
     if args.mode == "joined":
         if not args.end:
             args.end = args.start
-        return asyncio.run(_probe_joined(args))
+        return _run_probe(_probe_joined(args))
     if args.mode == "canceling":
-        return asyncio.run(_probe_canceling(args))
+        return _run_probe(_probe_canceling(args))
     if args.mode == "raw":
-        return asyncio.run(_probe_raw(args))
+        return _run_probe(_probe_raw(args))
     if args.mode == "resolve-discord":
-        return asyncio.run(_probe_resolve_discord(args))
+        return _run_probe(_probe_resolve_discord(args))
     if args.mode == "memberstatus-fix-unlinked":
-        return asyncio.run(_probe_memberstatus_fix_unlinked(args))
+        return _run_probe(_probe_memberstatus_fix_unlinked(args))
     if args.mode == "alerts":
-        return asyncio.run(_probe_alerts(args))
+        return _run_probe(_probe_alerts(args))
     if args.mode == "compare-csv":
         if not args.end:
             args.end = args.start
-        return asyncio.run(_probe_compare_csv(args))
+        return _run_probe(_probe_compare_csv(args))
     if args.mode == "joined-summary":
         if not args.end:
             args.end = args.start
-        return asyncio.run(_probe_joined_summary(args))
+        return _run_probe(_probe_joined_summary(args))
     if args.mode == "staffcards":
-        return asyncio.run(_probe_staffcards(args))
+        return _run_probe(_probe_staffcards(args))
     if args.mode == "nowhop-debug":
-        return asyncio.run(_probe_nowhop_debug(args))
+        return _run_probe(_probe_nowhop_debug(args))
     if args.mode == "nowhop-purge":
-        return asyncio.run(_probe_nowhop_purge(args))
+        return _run_probe(_probe_nowhop_purge(args))
     if args.mode == "memberstatus-cards":
-        return asyncio.run(_probe_memberstatus_cards(args))
+        return _run_probe(_probe_memberstatus_cards(args))
     if args.mode == "memberstatus-view":
         return _probe_memberstatus_view(args)
     if args.mode == "memberstatus-codeview":
         return _probe_memberstatus_codeview(args)
     if args.mode == "whoplogs-baseline":
-        return asyncio.run(_probe_whoplogs_baseline(args))
+        return _run_probe(_probe_whoplogs_baseline(args))
     if args.mode == "whop-logs-events-scan":
-        return asyncio.run(_probe_whop_logs_events_scan(args))
+        return _run_probe(_probe_whop_logs_events_scan(args))
     if args.mode == "whop-membership-logs-events-scan":
-        return asyncio.run(_probe_whop_membership_logs_events_scan(args))
+        return _run_probe(_probe_whop_membership_logs_events_scan(args))
     return 2
 
 
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import logging
-import json
 import re
 from contextlib import suppress
 from datetime import datetime, timezone
@@ -9,56 +8,26 @@ from math import ceil
 from pathlib import Path
 
 from whop_api_client import WhopAPIClient
+from member_history_store import get_member_history_store
 from rschecker_utils import extract_discord_id_from_whop_member_record
 from rschecker_utils import fmt_date_any as _fmt_date_any, parse_dt_any as _parse_dt_any, usd_amount
 
 log = logging.getLogger("rs-checker")
 
 _BASE_DIR = Path(__file__).resolve().parent
-_MEMBER_HISTORY_PATH = _BASE_DIR / "member_history.json"
-_MH_CACHE: dict | None = None
-_MH_CACHE_MTIME: float = 0.0
-_MH_CACHE_AT: float = 0.0
+_MEMBER_HISTORY_PATH = _BASE_DIR / "member_history.json"  # legacy; imported once into _MEMBER_HISTORY_DB_PATH
+_MEMBER_HISTORY_DB_PATH = _BASE_DIR / "member_history.sqlite3"
+_MH_BASELINE_KEYS = ["whop_users", "whop_user_index", "whop_membership_index"]
 
 
-def _now_ts() -> float:
+def _load_membership_baseline_cached() -> dict:
+    """Load only the membership baseline slices from member history (re-parsed only when they change)."""
     try:
-        return float(datetime.now(timezone.utc).timestamp())
+        # Baseline rows only (no events): reuse the process store with whatever max_events main.py configured.
+        store = get_member_history_store(_MEMBER_HISTORY_DB_PATH, legacy_json_path=_MEMBER_HISTORY_PATH, max_events=None)
+        return store.get_cached(_MH_BASELINE_KEYS)
     except Exception:
-        return 0.0
-
-
-def _load_membership_baseline_cached(*, max_age_seconds: int = 30) -> dict:
-    """Load only the membership baseline slices from member_history.json (cached)."""
-    global _MH_CACHE, _MH_CACHE_MTIME, _MH_CACHE_AT
-    now = _now_ts()
-    if _MH_CACHE is not None and _MH_CACHE_AT and (now - _MH_CACHE_AT) < float(max_age_seconds):
-        return _MH_CACHE
-    mtime = 0.0
-    try:
-        mtime = float(_MEMBER_HISTORY_PATH.stat().st_mtime)
-    except Exception:
-        mtime = 0.0
-    if _MH_CACHE is not None and mtime and _MH_CACHE_MTIME and mtime == _MH_CACHE_MTIME:
-        _MH_CACHE_AT = now
-        return _MH_CACHE
-    data: dict = {}
-    try:
-        raw = json.loads(_MEMBER_HISTORY_PATH.read_text(encoding="utf-8") or "{}")
-        if isinstance(raw, dict):
-            data = raw
-    except Exception:
-        data = {}
-    # Keep only what we need (reduces memory churn).
-    out = {
-        "whop_users": data.get("whop_users") if isinstance(data.get("whop_users"), dict) else {},
-        "whop_user_index": data.get("whop_user_index") if isinstance(data.get("whop_user_index"), dict) else {},
-        "whop_membership_index": data.get("whop_membership_index") if isinstance(data.get("whop_membership_index"), dict) else {},
-    }
-    _MH_CACHE = out
-    _MH_CACHE_MTIME = mtime
-    _MH_CACHE_AT = now
-    return out
+        return {k: {} for k in _MH_BASELINE_KEYS}
 
 
 def _extract_user_id_from_dashboard_url(raw: str) -> str:
@@ -1099,6 +1099,7 @@ def initialize(
     whop_api_config=None,
     lifetime_role_ids=None,
     trial_abuse_alert_func=None,
+    whop_api_client=None,
 ):
     """
     Initialize handler with configuration and logging functions.
@@ -1165,14 +1166,16 @@ def initialize(
     
     # Initialize Whop API client if key provided
     _whop_api_config = whop_api_config or {}
-    if whop_api_key and WhopAPIClient:
+    if whop_api_client is not None:
+        # Share the caller's pooled client (one keep-alive session + rate limiter per process).
+        _whop_api_client = whop_api_client
+        log.info("Whop API client initialized (shared)")
+    elif whop_api_key and WhopAPIClient:
         try:
             # Check if key is placeholder
             from mirror_world_config import is_placeholder_secret
             if not is_placeholder_secret(whop_api_key):
-                base_url = _whop_api_config.get("base_url", "https://api.whop.com/api/v1")
-                company_id = _whop_api_config.get("company_id", "")
-                _whop_api_client = WhopAPIClient(whop_api_key, base_url, company_id)
+                _whop_api_client = WhopAPIClient.from_config(whop_api_key, _whop_api_config)
                 log.info("Whop API client initialized")
             else:
                 _whop_api_client = None
@@ -11,7 +11,9 @@ Implements the same rewrite behavior as Instorebotforwarder:
 Debug logging (stdout, prefix [AffiliateDebug]): config `affiliate_rewrite_debug` or env
 AFFILIATE_REWRITE_DEBUG=1 (compact: one compute summary line per batch). Hop-by-hop noise:
 `affiliate_rewrite_debug_verbose` or AFFILIATE_REWRITE_DEBUG_VERBOSE=1. RSForwarder attaches
-`_affiliate_compute_memo` so identical URLs across content + multiple embeds run the network/Mavely work once per message.
+`_affiliate_compute_memo` so identical URLs across content + multiple embeds run the network/Mavely work once per message,
+and `_affiliate_resolve_cache` (url_resolve_cache.UrlResolveCache) so a URL resolved for an earlier message (or another
+channel) reuses its final merchant URL until the entry expires.
 
 Step timing + outcome lines (stdout, prefix [AffiliateFlow]): config `affiliate_rewrite_flow_log` or env
 AFFILIATE_REWRITE_FLOW_LOG (default off). Set to `1` to enable batch summaries and Mavely API failures.
@@ -37,6 +39,7 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import contextlib
 import html as _html
 import json
 import os
@@ -1282,6 +1285,32 @@ def _b64_decode_text(data: str) -> Optional[str]:
         return None
 
 
+_http_expand_inflight: Dict[str, Tuple["asyncio.Future[str]", Optional[List[str]]]] = {}
+
+
+def _shared_http_expand(
+    session: aiohttp.ClientSession,
+    start_u: str,
+    *,
+    timeout_s: float,
+    max_redirects: int,
+    chain: Optional[List[str]],
+) -> Tuple["asyncio.Future[str]", Optional[List[str]]]:
+    """
+    Start `_http_expand_resolve_url` as a task, or join the one already running for `start_u`
+    (the same link arriving in several channels at once is fetched once). Returns (task, chain).
+    """
+    job = _http_expand_inflight.get(start_u)
+    if job is not None:
+        return job
+    task = asyncio.ensure_future(
+        _http_expand_resolve_url(session, start_u, timeout_s=timeout_s, max_redirects=max_redirects, dbg_chain=chain)
+    )
+    _http_expand_inflight[start_u] = (task, chain)
+    task.add_done_callback(lambda _t, key=start_u: _http_expand_inflight.pop(key, None))
+    return task, chain
+
+
 def _normalize_expanded_url(url: str) -> str:
     u = (url or "").strip()
     if not u:
@@ -1982,6 +2011,7 @@ async def _http_expand_resolve_url(
 ) -> str:
     """
     Canonical outbound resolve: RSForwarder/outbound_url_resolve.py (chain-best pick, heuristic shorteners).
+    Runs on the resolver's shared pooled session, not the caller's hub-HTML session.
     """
     del session, max_redirects
     try:
@@ -1993,11 +2023,8 @@ async def _http_expand_resolve_url(
     if dbg_chain is not None and start:
         dbg_chain.append(start)
 
-    def _run() -> str:
-        return resolve_outbound_url(start, timeout_s=max(5, int(timeout_s)))
-
     try:
-        out = await asyncio.to_thread(_run)
+        out = await resolve_outbound_url(start, timeout_s=max(5, int(timeout_s)))
     except Exception:
         out = start
     out = _normalize_expanded_url(_expand_gatekeeper_url(out) or out)
@@ -2090,6 +2117,37 @@ def _import_mavely_client():
         return None
 
 
+_mavely_mint_limiter_obj = None
+_mavely_mint_cache_obj = None
+_mavely_mint_cache_loaded = False
+
+
+def _mavely_mint_limiter(min_seconds: float):
+    """Process-wide async gap between Mavely mints (concurrent messages queue; the loop never sleeps)."""
+    global _mavely_mint_limiter_obj
+    if _mavely_mint_limiter_obj is None:
+        from .mavely_client import AsyncRateLimiter
+
+        _mavely_mint_limiter_obj = AsyncRateLimiter(min_seconds)
+    _mavely_mint_limiter_obj.min_seconds = max(0.0, float(min_seconds))
+    return _mavely_mint_limiter_obj
+
+
+def mavely_mint_cache(cfg: Optional[dict]):
+    """Process-wide MavelyMintCache from config `mavely_mint_cache` (opened once); None when disabled."""
+    global _mavely_mint_cache_obj, _mavely_mint_cache_loaded
+    if not _mavely_mint_cache_loaded:
+        _mavely_mint_cache_loaded = True
+        try:
+            from .mavely_mint_cache import MavelyMintCache
+
+            _mavely_mint_cache_obj = MavelyMintCache.from_config(cfg or {}, Path(__file__).parent)
+        except Exception as e:
+            print(f"[MavelyMintCache] disabled: {e}", flush=True)
+            _mavely_mint_cache_obj = None
+    return _mavely_mint_cache_obj
+
+
 def _apply_env_from_cfg(cfg: dict) -> None:
     """
     RSForwarder loads secrets into a JSON config dict, but some underlying helpers
@@ -2157,14 +2215,15 @@ async def mavely_create_link(cfg: dict, url: str) -> Tuple[Optional[str], Option
     except Exception:
         min_seconds = 2.0
 
-    def _do() -> Tuple[Optional[str], str, int]:
+    def _do() -> Tuple[Optional[str], str, int, str]:
+        # Spacing between mints is the async limiter's job; the client must not sleep in the thread.
         client = MavelyClient(
             session_token=session_token,
             auth_token=auth_token or None,
             graphql_endpoint=graphql_endpoint or None,
             timeout_s=timeout_s,
             max_retries=max_retries,
-            min_seconds_between_requests=min_seconds,
+            min_seconds_between_requests=0.0,
         )
         # If persistence is enabled via MAVELY_REFRESH_TOKEN_FILE and we don't have a refresh token yet,
         # sync from /api/auth/session once so token rotation is handled automatically.
@@ -2181,19 +2240,44 @@ async def mavely_create_link(cfg: dict, url: str) -> Tuple[Optional[str], Option
         link = res.mavely_link if getattr(res, "ok", False) else None
         err = "" if link else (getattr(res, "error", None) or "Failed to generate Mavely link.")
         status = int(getattr(res, "status_code", 0) or 0)
-        return link, str(err), status
+        return link, str(err), status, client.account_id()
 
+    cache = mavely_mint_cache(cfg)
+    limiter = _mavely_mint_limiter(min_seconds)
     t_ml0 = time.perf_counter()
-    link, err, status = await asyncio.to_thread(_do)
+    hit = cache.get(url) if cache is not None else None
+    if hit is None:
+        async with limiter:
+            # Another message may have minted this URL while we queued.
+            hit = cache.get(url, count=False) if cache is not None else None
+            if hit is None:
+                await limiter.wait()
+                link, err, status, account = await asyncio.to_thread(_do)
+    if hit is not None:
+        _aff_flow(
+            cfg,
+            "mavely_mint cache_hit input=%r ok=%s" % (_aff_dbg_clip((url or "").strip(), 88), bool(hit[0])),
+        )
+        return hit
+    if cache is not None:
+        cache.note_account(account)
     if link:
+        if cache is not None:
+            cache.put(url, link, account=account)
         return link, None
 
     err_l = (err or "").lower()
     auth_fail = ("token expired" in err_l) or ("not logged in" in err_l) or ("unauthorized" in err_l) or (status == 401)
     if auth_fail:
         if await _maybe_refresh_mavely_cookies(reason=err or "auth", cfg=cfg):
-            link2, err2, status2 = await asyncio.to_thread(_do)
+            async with limiter:
+                await limiter.wait()
+                link2, err2, status2, account2 = await asyncio.to_thread(_do)
+            if cache is not None:
+                cache.note_account(account2)
             if link2:
+                if cache is not None:
+                    cache.put(url, link2, account=account2)
                 return link2, None
             err = err2 or err
             try:
@@ -2206,6 +2290,8 @@ async def mavely_create_link(cfg: dict, url: str) -> Tuple[Optional[str], Option
     else:
         hint = ""
     err_out = f"{err} (status={status}){hint}"
+    if cache is not None and _is_mavely_unsupported(err):
+        cache.put_failure(url, err_out, account=account)
     _aff_flow(
         cfg,
         "mavely_graphql failed input=%r (%.2fs) %r"
@@ -2259,9 +2345,13 @@ async def mavely_preflight(cfg: dict) -> Tuple[bool, int, Optional[str]]:
         ok = bool(getattr(res, "ok", False))
         status = int(getattr(res, "status_code", 0) or 0)
         err = getattr(res, "error", None)
-        return ok, status, (str(err) if err else None)
+        return ok, status, (str(err) if err else None), client.account_id()
 
-    ok, status, err = await asyncio.to_thread(_do)
+    ok, status, err, account = await asyncio.to_thread(_do)
+    cache = mavely_mint_cache(cfg)
+    if ok and cache is not None:
+        # Cookies/login may now belong to another account; links minted for the old one are dropped.
+        cache.note_account(account)
     return ok, status, err
 
 
@@ -2447,6 +2537,8 @@ async def compute_affiliate_rewrites(cfg: dict, urls: List[str]) -> Tuple[Dict[s
     )
 
     resolved: Dict[str, str] = {u: normalized.get(u) or u for u in candidates}
+    # Shared across messages (RSForwarder attaches it); keyed by the normalized posted URL.
+    resolve_cache = (cfg or {}).get("_affiliate_resolve_cache")
 
     for u in candidates:
         before = (resolved.get(u) or u).strip()
@@ -2461,187 +2553,226 @@ async def compute_affiliate_rewrites(cfg: dict, urls: List[str]) -> Tuple[Dict[s
     if expand_enabled:
         _apply_env_from_cfg(cfg)
         sync_mavely_cookies_from_file()
+        verbose_chain = affiliate_rewrite_debug_on(cfg) and affiliate_rewrite_debug_verbose_on(cfg)
         async with aiohttp.ClientSession() as session:
+            # HTTP expand is the slow part and independent per URL: start every uncached one now,
+            # then run the (sequential) hub / Playwright steps below as each result is needed.
+            expand_jobs: Dict[str, Tuple["asyncio.Future[str]", Optional[List[str]]]] = {}
             for u in candidates:
+                if resolve_cache is not None and resolve_cache.contains((normalized.get(u) or u).strip()):
+                    continue
                 start_u = (resolved.get(u) or u).strip()
-                dbg_chain: Optional[List[str]] = (
-                    [start_u] if affiliate_rewrite_debug_on(cfg) and affiliate_rewrite_debug_verbose_on(cfg) else None
-                )
-                final_u = await _http_expand_resolve_url(
+                expand_jobs[u] = _shared_http_expand(
                     session,
                     start_u,
                     timeout_s=timeout_s,
                     max_redirects=max_redirects,
-                    dbg_chain=dbg_chain,
+                    chain=[start_u] if verbose_chain else ([] if resolve_cache is not None else None),
                 )
-                resolved[u] = final_u
-                if dbg_chain is not None and len(dbg_chain) > 1:
-                    _aff_dbg_verbose(
-                        cfg,
-                        "  expand %r: %s"
-                        % (_aff_dbg_clip(u, 72), " -> ".join(_aff_dbg_clip(x, 88) for x in dbg_chain)),
-                    )
-                elif dbg_chain is not None:
-                    _aff_dbg_verbose(
-                        cfg,
-                        "  expand %r: resolved -> %r"
-                        % (_aff_dbg_clip(u, 72), _aff_dbg_clip(final_u, 88)),
-                    )
-
-                special_html_hosts = {
-                        "deals.pennyexplorer.com",
-                        "ringinthedeals.com",
-                        "dmflip.com",
-                        "trackcm.com",
-                        "joylink.io",
-                        "fkd.deals",
-                        "pricedoffers.com",
-                        "saveyourdeals.com",
-                        "go.sylikes.com",
-                        "rd.bizrate.com",
-                        "go.skimresources.com",
-                        "howl.link",
-                        "howl.me",
-                        # dealshacks.com -> 302 -> hiddendealsociety.com/deal/... (Next.js RSC; outbound URL in payload)
-                        "hiddendealsociety.com",
-                        "www.hiddendealsociety.com",
-                    }
-
-                # Some hubs require 2 steps:
-                # pricedoffers.com -> saveyourdeals.com -> amazon.com (Go to Deal)
-                candidate = final_u
-                # Mavely: same as Mavelytest — headless Chromium only (no aiohttp hub fetch / persistent browser).
+            for u in candidates:
+                start_u = (resolved.get(u) or u).strip()
                 short_norm = (normalized.get(u) or u).strip()
-                if _mavely_bridge_playwright_enabled():
-                    try_urls: List[str] = []
-                    if is_mavely_app_short_link(short_norm):
-                        try_urls.append(short_norm)
-                    try:
-                        _cand_host = (urlparse(candidate).netloc or "").lower()
-                    except Exception:
-                        _cand_host = ""
-                    if _mavely_bridge_host(_cand_host) and candidate not in try_urls:
-                        try_urls.append(candidate)
-                    for try_u in try_urls:
-                        if affiliate_rewrite_debug_verbose_on(cfg):
-                            _aff_dbg_verbose(
-                                cfg,
-                                "  mavely_playwright try %r timeout_s=%s"
-                                % (_aff_dbg_clip(try_u, 72), int(hub_html_timeout_s)),
-                            )
-                        async with _playwright_mavely_async_lock():
-                            pw_html = await asyncio.to_thread(
-                                _fetch_mavely_html_via_playwright_sync,
-                                try_u,
-                                int(hub_html_timeout_s),
-                                flow_log=flow_on,
-                                label="unwrap",
-                                flow_cfg=cfg,
-                            )
-                        out_m = (
-                            _first_production_outbound_from_hub_html(pw_html)
-                            if pw_html
-                            else None
+                claim = resolve_cache.claim(short_norm) if resolve_cache is not None else contextlib.nullcontext()
+                async with claim:
+                    cached = resolve_cache.get(short_norm) if resolve_cache is not None else None
+                    if cached is not None:
+                        resolved[u] = cached[0]
+                        _aff_dbg_verbose(
+                            cfg,
+                            "  resolve_cache hit %r -> %r (ok=%s)"
+                            % (_aff_dbg_clip(short_norm, 72), _aff_dbg_clip(cached[0], 88), cached[2]),
+                        )
+                        continue
+                    _t_resolve0 = time.perf_counter()
+                    job = expand_jobs.get(u)
+                    if job is not None:
+                        dbg_chain = job[1]
+                        final_u = await asyncio.shield(job[0])
+                    else:
+                        dbg_chain = [start_u] if verbose_chain else ([] if resolve_cache is not None else None)
+                        final_u = await _http_expand_resolve_url(
+                            session,
+                            start_u,
+                            timeout_s=timeout_s,
+                            max_redirects=max_redirects,
+                            dbg_chain=dbg_chain,
                         )
-                        if out_m:
-                            out_abs_m = out_m
-                            if out_abs_m.startswith("/"):
-                                out_abs_m = urljoin(try_u, out_abs_m)
-                            out_abs_m = _iterative_resolve_unwrap(unwrap_known_query_redirects(out_abs_m) or out_abs_m)
-                            candidate = out_abs_m
+                    resolved[u] = final_u
+                    if dbg_chain is not None and len(dbg_chain) > 1:
+                        _aff_dbg_verbose(
+                            cfg,
+                            "  expand %r: %s"
+                            % (_aff_dbg_clip(u, 72), " -> ".join(_aff_dbg_clip(x, 88) for x in dbg_chain)),
+                        )
+                    elif dbg_chain is not None:
+                        _aff_dbg_verbose(
+                            cfg,
+                            "  expand %r: resolved -> %r"
+                            % (_aff_dbg_clip(u, 72), _aff_dbg_clip(final_u, 88)),
+                        )
+
+                    special_html_hosts = {
+                            "deals.pennyexplorer.com",
+                            "ringinthedeals.com",
+                            "dmflip.com",
+                            "trackcm.com",
+                            "joylink.io",
+                            "fkd.deals",
+                            "pricedoffers.com",
+                            "saveyourdeals.com",
+                            "go.sylikes.com",
+                            "rd.bizrate.com",
+                            "go.skimresources.com",
+                            "howl.link",
+                            "howl.me",
+                            # dealshacks.com -> 302 -> hiddendealsociety.com/deal/... (Next.js RSC; outbound URL in payload)
+                            "hiddendealsociety.com",
+                            "www.hiddendealsociety.com",
+                        }
+
+                    # Some hubs require 2 steps:
+                    # pricedoffers.com -> saveyourdeals.com -> amazon.com (Go to Deal)
+                    candidate = final_u
+                    # Mavely: same as Mavelytest — headless Chromium only (no aiohttp hub fetch / persistent browser).
+                    if _mavely_bridge_playwright_enabled():
+                        try_urls: List[str] = []
+                        if is_mavely_app_short_link(short_norm):
+                            try_urls.append(short_norm)
+                        try:
+                            _cand_host = (urlparse(candidate).netloc or "").lower()
+                        except Exception:
+                            _cand_host = ""
+                        if _mavely_bridge_host(_cand_host) and candidate not in try_urls:
+                            try_urls.append(candidate)
+                        for try_u in try_urls:
                             if affiliate_rewrite_debug_verbose_on(cfg):
                                 _aff_dbg_verbose(
                                     cfg,
-                                    "  mavely_playwright ok %r -> %r"
-                                    % (_aff_dbg_clip(try_u, 72), _aff_dbg_clip(candidate, 88)),
+                                    "  mavely_playwright try %r timeout_s=%s"
+                                    % (_aff_dbg_clip(try_u, 72), int(hub_html_timeout_s)),
+                                )
+                            async with _playwright_mavely_async_lock():
+                                pw_html = await asyncio.to_thread(
+                                    _fetch_mavely_html_via_playwright_sync,
+                                    try_u,
+                                    int(hub_html_timeout_s),
+                                    flow_log=flow_on,
+                                    label="unwrap",
+                                    flow_cfg=cfg,
                                 )
+                            out_m = (
+                                _first_production_outbound_from_hub_html(pw_html)
+                                if pw_html
+                                else None
+                            )
+                            if out_m:
+                                out_abs_m = out_m
+                                if out_abs_m.startswith("/"):
+                                    out_abs_m = urljoin(try_u, out_abs_m)
+                                out_abs_m = _iterative_resolve_unwrap(unwrap_known_query_redirects(out_abs_m) or out_abs_m)
+                                candidate = out_abs_m
+                                if affiliate_rewrite_debug_verbose_on(cfg):
+                                    _aff_dbg_verbose(
+                                        cfg,
+                                        "  mavely_playwright ok %r -> %r"
+                                        % (_aff_dbg_clip(try_u, 72), _aff_dbg_clip(candidate, 88)),
+                                    )
+                                break
+                    for _ in range(3):
+                        try:
+                            parsed = urlparse(candidate)
+                            host = (parsed.netloc or "").lower()
+                        except Exception:
+                            host = ""
+                        if host not in special_html_hosts:
                             break
-                for _ in range(3):
-                    try:
-                        parsed = urlparse(candidate)
-                        host = (parsed.netloc or "").lower()
-                    except Exception:
-                        host = ""
-                    if host not in special_html_hosts:
-                        break
-                    try:
-                        _hub_headers = _html_fetch_headers_for_hub(candidate)
-                        async with session.get(
-                            candidate,
-                            headers=_hub_headers,
-                            timeout=aiohttp.ClientTimeout(total=float(hub_html_timeout_s)),
-                        ) as resp:
-                            status = int(resp.status or 0)
-                            txt = await resp.text(errors="ignore")
-                        out = _first_production_outbound_from_hub_html(txt)
-                        if not out:
+                        try:
+                            _hub_headers = _html_fetch_headers_for_hub(candidate)
+                            async with session.get(
+                                candidate,
+                                headers=_hub_headers,
+                                timeout=aiohttp.ClientTimeout(total=float(hub_html_timeout_s)),
+                            ) as resp:
+                                status = int(resp.status or 0)
+                                txt = await resp.text(errors="ignore")
+                            out = _first_production_outbound_from_hub_html(txt)
+                            if not out:
+                                break
+                            # Resolve relative links found in HTML against the current page.
+                            out_abs = out
+                            if out_abs.startswith("/"):
+                                out_abs = urljoin(candidate, out_abs)
+                            out_abs = _iterative_resolve_unwrap(unwrap_known_query_redirects(out_abs) or out_abs)
+                            candidate = out_abs
+                            _aff_dbg_verbose(
+                                cfg,
+                                "  html_unwrap %r: host=%r -> %r"
+                                % (_aff_dbg_clip(u, 72), _aff_dbg_clip(host, 48), _aff_dbg_clip(candidate, 88)),
+                            )
+                        except Exception:
                             break
-                        # Resolve relative links found in HTML against the current page.
-                        out_abs = out
-                        if out_abs.startswith("/"):
-                            out_abs = urljoin(candidate, out_abs)
-                        out_abs = _iterative_resolve_unwrap(unwrap_known_query_redirects(out_abs) or out_abs)
-                        candidate = out_abs
-                        _aff_dbg_verbose(
-                            cfg,
-                            "  html_unwrap %r: host=%r -> %r"
-                            % (_aff_dbg_clip(u, 72), _aff_dbg_clip(host, 48), _aff_dbg_clip(candidate, 88)),
-                        )
-                    except Exception:
-                        break
 
-                if _outbound_persistent_playwright_enabled(cfg) and (
-                    not _affiliate_merchant_resolution_acceptable(candidate)
-                ):
-                    entry = short_norm if short_norm.startswith("http") else candidate
-                    profile = _outbound_playwright_profile_dir_resolved(cfg)
-                    headed = _outbound_playwright_headed_from_cfg(cfg)
-                    settle = _outbound_playwright_settle_ms(cfg)
-                    poll = _outbound_playwright_poll_s(cfg)
-                    t_ms_pw = _outbound_playwright_navigation_timeout_ms(cfg, hub_html_timeout_s)
-                    if flow_on:
-                        print(
-                            "[OutboundResolve] resolver_unresolved_wrapper in=%r candidate=%r "
-                            "-> resolver_playwright_persistent_started profile=%s headed=%s"
-                            % (
-                                _aff_dbg_clip(entry, 88),
-                                _aff_dbg_clip(candidate, 88),
-                                profile,
-                                headed,
-                            ),
-                            flush=True,
-                        )
-                    async with _playwright_mavely_async_lock():
-                        pw_out = await asyncio.to_thread(
-                            _mavely_resolve.playwright_resolve_outbound_persistent_sync,
-                            entry,
-                            timeout_ms=t_ms_pw,
-                            profile_dir=profile,
-                            headed=headed,
-                            settle_ms=settle,
-                            poll_s=poll,
-                            accept_merchant=_affiliate_merchant_resolution_acceptable,
-                        )
-                    if flow_on:
-                        print(
-                            "[OutboundResolve] resolver_playwright_persistent_result out=%r"
-                            % (_aff_dbg_clip(pw_out or "", 120),),
-                            flush=True,
+                    if _outbound_persistent_playwright_enabled(cfg) and (
+                        not _affiliate_merchant_resolution_acceptable(candidate)
+                    ):
+                        entry = short_norm if short_norm.startswith("http") else candidate
+                        profile = _outbound_playwright_profile_dir_resolved(cfg)
+                        headed = _outbound_playwright_headed_from_cfg(cfg)
+                        settle = _outbound_playwright_settle_ms(cfg)
+                        poll = _outbound_playwright_poll_s(cfg)
+                        t_ms_pw = _outbound_playwright_navigation_timeout_ms(cfg, hub_html_timeout_s)
+                        if flow_on:
+                            print(
+                                "[OutboundResolve] resolver_unresolved_wrapper in=%r candidate=%r "
+                                "-> resolver_playwright_persistent_started profile=%s headed=%s"
+                                % (
+                                    _aff_dbg_clip(entry, 88),
+                                    _aff_dbg_clip(candidate, 88),
+                                    profile,
+                                    headed,
+                                ),
+                                flush=True,
+                            )
+                        async with _playwright_mavely_async_lock():
+                            pw_out = await asyncio.to_thread(
+                                _mavely_resolve.playwright_resolve_outbound_persistent_sync,
+                                entry,
+                                timeout_ms=t_ms_pw,
+                                profile_dir=profile,
+                                headed=headed,
+                                settle_ms=settle,
+                                poll_s=poll,
+                                accept_merchant=_affiliate_merchant_resolution_acceptable,
+                            )
+                        if flow_on:
+                            print(
+                                "[OutboundResolve] resolver_playwright_persistent_result out=%r"
+                                % (_aff_dbg_clip(pw_out or "", 120),),
+                                flush=True,
+                            )
+                        if pw_out:
+                            cand_pw = _iterative_resolve_unwrap(unwrap_known_query_redirects(pw_out) or pw_out)
+                            if _affiliate_merchant_resolution_acceptable(cand_pw):
+                                candidate = cand_pw
+                                if flow_on:
+                                    print(
+                                        "[OutboundResolve] resolver_merchant_accepted url=%r"
+                                        % (_aff_dbg_clip(candidate, 120),),
+                                        flush=True,
+                                    )
+
+                    if _is_cloudflare_or_cdn_error_landing(candidate):
+                        candidate = start_u
+                    resolved[u] = candidate
+                    if resolve_cache is not None:
+                        chain = list(dict.fromkeys([short_norm, start_u, *(dbg_chain or []), candidate]))
+                        resolve_cache.put(
+                            short_norm,
+                            candidate,
+                            chain,
+                            ok=_affiliate_merchant_resolution_acceptable(candidate),
+                            elapsed_s=time.perf_counter() - _t_resolve0,
                         )
-                    if pw_out:
-                        cand_pw = _iterative_resolve_unwrap(unwrap_known_query_redirects(pw_out) or pw_out)
-                        if _affiliate_merchant_resolution_acceptable(cand_pw):
-                            candidate = cand_pw
-                            if flow_on:
-                                print(
-                                    "[OutboundResolve] resolver_merchant_accepted url=%r"
-                                    % (_aff_dbg_clip(candidate, 120),),
-                                    flush=True,
-                                )
-
-                if _is_cloudflare_or_cdn_error_landing(candidate):
-                    candidate = start_u
-                resolved[u] = candidate
     elif affiliate_rewrite_debug_on(cfg) and affiliate_rewrite_debug_verbose_on(cfg):
         _aff_dbg_verbose(
             cfg,
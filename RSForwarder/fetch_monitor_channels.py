@@ -17,6 +17,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import sys
 import time
@@ -31,6 +32,7 @@ if str(_REPO_ROOT) not in sys.path:
 import requests
 
 from mirror_world_config import load_config_with_secrets
+from RSForwarder.monitor_data_search import get_monitor_index
 
 DISCORD_API = "https://discord.com/api/v10"
 _URL_RE = re.compile(r"https?://\S+")
@@ -382,9 +384,12 @@ def _load_json_file(path: Path) -> dict:
 
 
 def _save_json_file(path: Path, data: dict) -> None:
+    # Write to a sibling temp file and swap it in, so readers never see a half-written store.
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
 
 
 def _load_checkpoint(path: Path) -> dict:
@@ -400,6 +405,112 @@ def _save_checkpoint(path: Path, data: dict) -> None:
     _save_json_file(path, data)
 
 
+def _norm_title_key(title: str) -> str:
+    t = str(title or "").strip().lower()
+    t = re.sub(r"\s+", " ", t)
+    t = re.sub(r"[^a-z0-9\s]+", "", t)
+    t = t.strip()
+    if len(t) > 140:
+        t = t[:140].strip()
+    return t
+
+
+def _item_key_for_message(m: dict) -> Tuple[str, dict, str]:
+    """(item_key, product_id, title_key) for a stored message snapshot."""
+    ex = m.get("extracted") or {}
+    pid = ex.get("product_id") if isinstance(ex, dict) else {}
+    title = ""
+    if isinstance(ex, dict):
+        human = ex.get("human") if isinstance(ex.get("human"), dict) else {}
+        title = str(human.get("title") or ex.get("title") or "")
+    title_key = _norm_title_key(title) or f"msg-{str(m.get('id') or '')}"
+
+    if isinstance(pid, dict) and pid.get("kind") in {"field", "derived"} and pid.get("value"):
+        nm = str(pid.get("name") or "ID").strip()
+        val = str(pid.get("value") or "").strip()
+        key = f"{nm}:{val}"
+        return key, pid, title_key
+    return f"TITLE:{title_key}", {"kind": "title", "name": "TITLE", "value": title_key}, title_key
+
+
+def _item_record(m: dict, items_by_key: dict) -> Tuple[str, dict]:
+    """(item_key, new items_by_key entry) for message `m`; first_seen carries over from the existing entry."""
+    mid = str(m.get("id") or "").strip()
+    ts = str(m.get("timestamp") or "").strip()
+    item_key, product_id, title_key = _item_key_for_message(m)
+    prev = items_by_key.get(item_key)
+    if isinstance(prev, dict):
+        first_seen = str(prev.get("first_seen_timestamp") or ts or "")
+    else:
+        first_seen = ts
+    return item_key, {
+        "item_key": item_key,
+        "product_id": product_id,
+        "title_key": title_key,
+        "first_seen_timestamp": first_seen,
+        "last_seen_timestamp": ts,
+        "last_message_id": mid,
+        "latest": m,
+    }
+
+
+def _item_sort_key(item_key: str, item: Optional[dict]) -> Tuple[str, str]:
+    """Store order is newest-first by (last_seen_timestamp, item_key)."""
+    ts = str((item or {}).get("last_seen_timestamp") or "").strip()
+    return (ts, item_key)
+
+
+def _channel_store_payload(channel_key: str, channel_id: int, items_by_key: dict, keys: List[str]) -> dict:
+    return {
+        "channel_key": channel_key,
+        "channel_id": int(channel_id),
+        "updated_at_unix": time.time(),
+        "items_by_key": items_by_key,
+        "item_keys_sorted": keys,
+    }
+
+
+def _load_channel_items(store_path: Path) -> dict:
+    """items_by_key from a channel store file ({} when missing, unreadable or in the old per-message format)."""
+    data = _load_json_file(store_path)
+    # Back-compat: if older format exists, start fresh to avoid dual storage.
+    if "messages_by_id" in data or "message_ids_sorted" in data:
+        return {}
+    items_by_key = data.get("items_by_key")
+    return items_by_key if isinstance(items_by_key, dict) else {}
+
+
+def _file_stat(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (int(st.st_size), int(st.st_mtime_ns))
+
+
+def _write_channel_store(
+    store_path: Path,
+    out: dict,
+    *,
+    changed_keys: set,
+    removed_keys: set,
+    prev_stat: Optional[Tuple[int, int]],
+) -> None:
+    """Atomically write a channel store and keep the monitor_data search index in step."""
+    _save_json_file(store_path, out)
+    # Best-effort: the next search re-syncs stale files.
+    try:
+        get_monitor_index(store_path.parent).apply_channel_update(
+            store_path,
+            out,
+            changed_keys=changed_keys,
+            removed_keys=removed_keys,
+            prev_stat=prev_stat,
+        )
+    except Exception as e:
+        print(f"WARN: monitor_data search index update failed for {store_path.name}: {e}")
+
+
 def _upsert_channel_messages(store_path: Path, *, channel_key: str, channel_id: int, new_messages: List[dict], max_store: int) -> dict:
     """
     Store format (canonical; upsert by product identity, not by Discord message-id):
@@ -420,84 +531,35 @@ def _upsert_channel_messages(store_path: Path, *, channel_key: str, channel_id:
         },
         "item_keys_sorted": ["<item_key>", ...]   # newest-first by last_seen_timestamp
       }
-    """
-    data = _load_json_file(store_path)
-
-    # Back-compat: if older format exists, start fresh to avoid dual storage.
-    if "messages_by_id" in data or "message_ids_sorted" in data:
-        data = {}
 
-    items_by_key = data.get("items_by_key")
-    if not isinstance(items_by_key, dict):
-        items_by_key = {}
-
-    def _norm_title_key(title: str) -> str:
-        t = str(title or "").strip().lower()
-        t = re.sub(r"\s+", " ", t)
-        t = re.sub(r"[^a-z0-9\s]+", "", t)
-        t = t.strip()
-        if len(t) > 140:
-            t = t[:140].strip()
-        return t
-
-    def _item_key_for_message(m: dict) -> Tuple[str, dict, str]:
-        ex = m.get("extracted") or {}
-        pid = ex.get("product_id") if isinstance(ex, dict) else {}
-        title = ""
-        if isinstance(ex, dict):
-            human = ex.get("human") if isinstance(ex.get("human"), dict) else {}
-            title = str(human.get("title") or ex.get("title") or "")
-        title_key = _norm_title_key(title) or f"msg-{str(m.get('id') or '')}"
-
-        if isinstance(pid, dict) and pid.get("kind") in {"field", "derived"} and pid.get("value"):
-            nm = str(pid.get("name") or "ID").strip()
-            val = str(pid.get("value") or "").strip()
-            key = f"{nm}:{val}"
-            return key, pid, title_key
-        return f"TITLE:{title_key}", {"kind": "title", "name": "TITLE", "value": title_key}, title_key
+    The running bot keeps these files in memory instead (monitor_capture_store.MonitorCaptureStore);
+    this is the one-shot path used by the backfill CLI.
+    """
+    prev_stat = _file_stat(store_path)
+    items_by_key = _load_channel_items(store_path)
+    prev_keys = set(items_by_key.keys())
+    changed_keys: set = set()
 
     # Upsert items
     for m in new_messages:
-        mid = str(m.get("id") or "").strip()
-        ts = str(m.get("timestamp") or "").strip()
-        item_key, product_id, title_key = _item_key_for_message(m)
-
-        prev = items_by_key.get(item_key)
-        if isinstance(prev, dict):
-            first_seen = str(prev.get("first_seen_timestamp") or ts or "")
-        else:
-            first_seen = ts
-
-        items_by_key[item_key] = {
-            "item_key": item_key,
-            "product_id": product_id,
-            "title_key": title_key,
-            "first_seen_timestamp": first_seen,
-            "last_seen_timestamp": ts,
-            "last_message_id": mid,
-            "latest": m,
-        }
+        item_key, item = _item_record(m, items_by_key)
+        changed_keys.add(item_key)
+        items_by_key[item_key] = item
 
-    # Sort newest-first by last_seen_timestamp
-    def _sort_key_item(k: str) -> Tuple[str, str]:
-        it = items_by_key.get(k) or {}
-        ts = str(it.get("last_seen_timestamp") or "").strip()
-        return (ts, k)
-
-    keys = sorted(items_by_key.keys(), key=_sort_key_item, reverse=True)
+    keys = sorted(items_by_key.keys(), key=lambda k: _item_sort_key(k, items_by_key.get(k)), reverse=True)
     if max_store > 0 and len(keys) > max_store:
         keep = set(keys[:max_store])
         items_by_key = {k: v for (k, v) in items_by_key.items() if k in keep}
         keys = keys[:max_store]
 
-    out = {
-        "channel_key": channel_key,
-        "channel_id": int(channel_id),
-        "updated_at_unix": time.time(),
-        "items_by_key": items_by_key,
-        "item_keys_sorted": keys,
-    }
-    _save_json_file(store_path, out)
+    out = _channel_store_payload(channel_key, channel_id, items_by_key, keys)
+    _write_channel_store(
+        store_path,
+        out,
+        changed_keys=changed_keys,
+        removed_keys=prev_keys - set(items_by_key.keys()),
+        prev_stat=prev_stat,
+    )
     return out
 
 
@@ -5,6 +5,7 @@ This is copied in directly so RSForwarder does NOT depend on Instorebotforwarder
 being present on the deployment host.
 """
 
+import asyncio
 import os
 import time
 import json
@@ -224,6 +225,29 @@ class SimpleRateLimiter:
         self._last_ts = time.time()
 
 
+class AsyncRateLimiter:
+    # Async counterpart of SimpleRateLimiter for the bot's event loop. `async with limiter:`
+    # takes the single request slot (callers queue FIFO); `await limiter.wait()` inside it
+    # awaits the remaining gap instead of sleeping the thread, so other messages keep flowing.
+    def __init__(self, min_seconds: float):
+        self.min_seconds = max(0.0, float(min_seconds))
+        self._last_ts = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        delay = self._last_ts + self.min_seconds - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self._last_ts = time.monotonic()
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self._lock.acquire()
+        return self
+
+    async def __aexit__(self, *_exc) -> None:
+        self._lock.release()
+
+
 class MavelyClient:
     def __init__(
         self,
@@ -339,6 +363,16 @@ class MavelyClient:
                 return aud.strip()
         return ""
 
+    def account_id(self) -> str:
+        """Account identity from the id/access JWT (`sub`, else `email`); '' when unknown."""
+        for t in (self.id_token, self.auth_token):
+            p = _jwt_payload(t) or {}
+            for key in ("sub", "email"):
+                v = p.get(key)
+                if isinstance(v, str) and v.strip():
+                    return v.strip()
+        return ""
+
     def _auth_token_expiring_soon(self) -> bool:
         """
         Best-effort preemptive refresh:
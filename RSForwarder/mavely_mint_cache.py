@@ -0,0 +1,146 @@
+"""
+Durable Mavely mint cache: normalized merchant URL -> minted affiliate link.
+
+Minting (GraphQL createAffiliateLink) is the slowest forwarding step and the same product is
+posted over and over, so a minted link is reused until `ttl_s` expires. Merchants Mavely
+refuses ("merchant not supported" / "brand not found") are cached for `negative_ttl_s`.
+
+Keys go through outbound_url_resolve.normalize_merchant_url (interstitial decode) with the
+fragment dropped. Each link is tagged with the Mavely account that minted it; when a preflight
+or mint reports a different account (cookies/login switched), every cached link is dropped so
+forwarded posts never credit the old account.
+
+Storage: SQLite (`db_file`, next to the bot) — survives restarts.
+"""
+from __future__ import annotations
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse, urlunparse
+
+try:
+    from RSForwarder.outbound_url_resolve import normalize_merchant_url
+except ImportError:
+    from outbound_url_resolve import normalize_merchant_url
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS mint_cache (
+        url TEXT PRIMARY KEY,
+        link TEXT NOT NULL,
+        error TEXT NOT NULL,
+        account TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS mint_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+
+def mint_cache_key(url: str) -> str:
+    u = normalize_merchant_url((url or "").strip())
+    try:
+        p = urlparse(u)
+    except Exception:
+        return u
+    if not p.scheme or not p.netloc:
+        return u
+    return urlunparse((p.scheme.lower(), p.netloc.lower(), p.path or "/", p.params, p.query, ""))
+
+
+class MavelyMintCache:
+    def __init__(self, path: Path, *, ttl_s: float = 604800.0, negative_ttl_s: float = 3600.0) -> None:
+        self.path = Path(path)
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.negative_ttl_s = max(0.0, float(negative_ttl_s))
+        self.account = ""
+        self.counters: Dict[str, int] = {"hits": 0, "negative_hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for stmt in _SCHEMA:
+            self._db.execute(stmt)
+        self._db.execute("DELETE FROM mint_cache WHERE expires_at <= ?", (time.time(),))
+        self._db.commit()
+        row = self._db.execute("SELECT value FROM mint_meta WHERE key = 'account'").fetchone()
+        self.account = str(row[0]) if row else ""
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], base_dir: Path) -> Optional["MavelyMintCache"]:
+        """Build from `mavely_mint_cache` in config.json; None when disabled."""
+        raw = (config or {}).get("mavely_mint_cache")
+        section: Dict[str, Any] = raw if isinstance(raw, dict) else {}
+        if section.get("enabled") is False:
+            return None
+        path = Path(str(section.get("db_file") or "mavely_mint_cache.sqlite3").strip())
+        if not path.is_absolute():
+            path = Path(base_dir) / path
+        return cls(
+            path,
+            ttl_s=float(section.get("ttl_s", 604800) or 0),
+            negative_ttl_s=float(section.get("negative_ttl_s", 3600) or 0),
+        )
+
+    def get(self, url: str, *, count: bool = True) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """(link, None) or (None, error) for a live entry of the current account; None on miss.
+        `count=False` is a re-check after queueing for the limiter (a miss was already counted)."""
+        key = mint_cache_key(url)
+        row = self._db.execute(
+            "SELECT link, error, account, expires_at FROM mint_cache WHERE url = ?", (key,)
+        ).fetchone() if key else None
+        if row is None or float(row[3]) <= time.time() or (self.account and row[2] and row[2] != self.account):
+            if count:
+                self.counters["misses"] += 1
+            return None
+        if row[0]:
+            self.counters["hits"] += 1
+            return str(row[0]), None
+        self.counters["negative_hits"] += 1
+        return None, str(row[1])
+
+    def put(self, url: str, link: str, *, account: str = "") -> None:
+        self._store(url, link, "", account, self.ttl_s)
+
+    def put_failure(self, url: str, error: str, *, account: str = "") -> None:
+        self._store(url, "", error or "failed", account, self.negative_ttl_s)
+
+    def _store(self, url: str, link: str, error: str, account: str, ttl: float) -> None:
+        key = mint_cache_key(url)
+        if not key or ttl <= 0:
+            return
+        self.note_account(account)
+        self._db.execute(
+            "INSERT OR REPLACE INTO mint_cache (url, link, error, account, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (key, link, error, account or self.account, time.time() + ttl),
+        )
+        self._db.commit()
+        self.counters["stores"] += 1
+
+    def note_account(self, account: str) -> bool:
+        """Record the Mavely account in use; a change drops every cached link. True if invalidated."""
+        acct = (account or "").strip()
+        if not acct or acct == self.account:
+            return False
+        invalidated = bool(self.account)
+        if invalidated:
+            self._db.execute("DELETE FROM mint_cache")
+            self.counters["invalidations"] += 1
+            print("[MavelyMintCache] Mavely account changed; cleared cached links", flush=True)
+        self._db.execute("INSERT OR REPLACE INTO mint_meta (key, value) VALUES ('account', ?)", (acct,))
+        self._db.commit()
+        self.account = acct
+        return invalidated
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self.counters)
+        out["entries"] = int(self._db.execute("SELECT COUNT(*) FROM mint_cache").fetchone()[0])
+        return out
+
+    def close(self) -> None:
+        try:
+            self._db.close()
+        except Exception:
+            pass
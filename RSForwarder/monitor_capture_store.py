@@ -0,0 +1,223 @@
+"""
+In-memory monitor_data store for RSForwarder live capture (write-behind).
+
+Each monitor channel's `monitor_data/<channel_key>.json` is read once, then kept in memory:
+- items:  item_key -> item (same records as fetch_monitor_channels._upsert_channel_messages)
+- order:  ascending list of (last_seen_timestamp, item_key); newest-first `item_keys_sorted` is
+          its reverse, so an upsert is a bisect remove + insort instead of a full re-sort
+
+Changed channels are flushed in a worker thread every `flush_interval_s`, or as soon as
+`flush_dirty_items` unflushed upserts pile up. A flush writes the same file format atomically
+(tmp + os.replace) and applies the changed / evicted keys to the monitor_data search index.
+If the file changed behind the store's back (backfill CLI run), the flush re-reads it, lays the
+unflushed items on top and adopts the merged result.
+
+`unflushed_items()` feeds `monitor_data_search.search_monitor_data(unflushed=...)`, so a lookup
+sees captures that are not on disk yet without re-reading any file.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    from RSForwarder import fetch_monitor_channels as _fmc
+except ImportError:
+    import fetch_monitor_channels as _fmc
+
+
+class _ChannelState:
+    __slots__ = ("channel_key", "channel_id", "path", "items", "order", "dirty", "removed", "disk_stat")
+
+    def __init__(self, channel_key: str, channel_id: int, path: Path) -> None:
+        self.channel_key = channel_key
+        self.channel_id = int(channel_id)
+        self.path = path
+        self.items: Dict[str, dict] = {}
+        self.order: List[Tuple[str, str]] = []
+        self.dirty: Set[str] = set()
+        self.removed: Set[str] = set()
+        self.disk_stat: Optional[Tuple[int, int]] = None
+
+    def adopt(self, items: Dict[str, dict]) -> None:
+        self.items = items
+        self.order = sorted(_fmc._item_sort_key(k, v) for (k, v) in items.items())
+
+    def upsert(self, message: dict, max_store: int) -> bool:
+        """Returns True if the item was already stored (UPDATE) rather than new."""
+        item_key, item = _fmc._item_record(message, self.items)
+        prev = self.items.get(item_key)
+        if prev is not None:
+            pos = bisect.bisect_left(self.order, _fmc._item_sort_key(item_key, prev))
+            if pos < len(self.order) and self.order[pos][1] == item_key:
+                del self.order[pos]
+        self.items[item_key] = item
+        bisect.insort(self.order, _fmc._item_sort_key(item_key, item))
+        self.dirty.add(item_key)
+        self.removed.discard(item_key)
+        while max_store > 0 and len(self.order) > max_store:
+            _ts, old_key = self.order.pop(0)
+            self.items.pop(old_key, None)
+            self.dirty.discard(old_key)
+            self.removed.add(old_key)
+        return prev is not None
+
+    def keys_sorted(self) -> List[str]:
+        return [k for (_ts, k) in reversed(self.order)]
+
+
+class MonitorCaptureStore:
+    def __init__(
+        self,
+        monitor_dir: Path,
+        *,
+        max_store: int = 5000,
+        flush_interval_s: float = 5.0,
+        flush_dirty_items: int = 50,
+    ) -> None:
+        self.monitor_dir = Path(monitor_dir)
+        self.max_store = int(max_store)
+        self.flush_interval_s = max(0.5, float(flush_interval_s))
+        self.flush_dirty_items = max(1, int(flush_dirty_items))
+        self._channels: Dict[str, _ChannelState] = {}
+        self._pending = 0
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._early_flush: Optional[asyncio.Task] = None
+        self._closed = False
+        self.counters: Dict[str, int] = {"upserts": 0, "flushes": 0, "files_written": 0, "merged_external": 0, "flush_errors": 0}
+
+    async def _channel(self, channel_key: str, channel_id: int) -> _ChannelState:
+        state = self._channels.get(channel_key)
+        if state is not None:
+            return state
+        path = self.monitor_dir / f"{channel_key}.json"
+
+        def _load() -> Tuple[Dict[str, dict], Optional[Tuple[int, int]]]:
+            stat = _fmc._file_stat(path)
+            return _fmc._load_channel_items(path), stat
+
+        items, stat = await asyncio.to_thread(_load)
+        state = self._channels.get(channel_key)
+        if state is None:
+            state = _ChannelState(channel_key, channel_id, path)
+            state.adopt(items)
+            state.disk_stat = stat
+            self._channels[channel_key] = state
+        return state
+
+    async def upsert_message(self, channel_key: str, channel_id: int, message: dict) -> Tuple[bool, int]:
+        """Upsert one stored-message snapshot. Returns (already_had_item, unique_items)."""
+        state = await self._channel(channel_key, channel_id)
+        state.channel_id = int(channel_id)
+        existed = state.upsert(message, self.max_store)
+        self.counters["upserts"] += 1
+        self._pending += 1
+        self._ensure_flusher()
+        if self._pending >= self.flush_dirty_items and (self._early_flush is None or self._early_flush.done()):
+            self._early_flush = asyncio.create_task(self.flush())
+        return existed, len(state.items)
+
+    def _ensure_flusher(self) -> None:
+        if self._closed or (self._flusher is not None and not self._flusher.done()):
+            return
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_s)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write every channel with unflushed changes. Returns files written."""
+        async with self._flush_lock:
+            self._pending = 0
+            written = 0
+            for state in list(self._channels.values()):
+                if not state.dirty and not state.removed:
+                    continue
+                changed, removed = set(state.dirty), set(state.removed)
+                state.dirty.clear()
+                state.removed.clear()
+                out = _fmc._channel_store_payload(state.channel_key, state.channel_id, dict(state.items), state.keys_sorted())
+                try:
+                    stat, merged = await asyncio.to_thread(self._write, state.path, out, changed, removed, state.disk_stat)
+                except Exception as e:
+                    self.counters["flush_errors"] += 1
+                    state.dirty |= changed - state.removed
+                    state.removed |= removed - set(state.items)
+                    print(f"[MonitorData] flush failed for {state.path.name}: {e}", flush=True)
+                    continue
+                state.disk_stat = stat
+                if merged is not None:
+                    # Keep anything captured while the merge was being written.
+                    for k in state.dirty:
+                        if k in state.items:
+                            merged[k] = state.items[k]
+                    for k in state.removed:
+                        merged.pop(k, None)
+                    state.adopt(merged)
+                    self.counters["merged_external"] += 1
+                written += 1
+            self.counters["flushes"] += 1
+            self.counters["files_written"] += written
+            return written
+
+    def _write(
+        self,
+        path: Path,
+        out: dict,
+        changed: Set[str],
+        removed: Set[str],
+        known_stat: Optional[Tuple[int, int]],
+    ) -> Tuple[Optional[Tuple[int, int]], Optional[Dict[str, dict]]]:
+        """Runs in a worker thread. Returns (new file stat, merged items if the file had changed on disk)."""
+        merged: Optional[Dict[str, dict]] = None
+        disk_stat = _fmc._file_stat(path)
+        if disk_stat is not None and disk_stat != known_stat:
+            merged = _fmc._load_channel_items(path)
+            disk_keys = set(merged.keys())
+            for k in removed:
+                merged.pop(k, None)
+            for k in changed:
+                if k in out["items_by_key"]:
+                    merged[k] = out["items_by_key"][k]
+            keys = sorted(merged.keys(), key=lambda k: _fmc._item_sort_key(k, merged.get(k)), reverse=True)
+            if self.max_store > 0 and len(keys) > self.max_store:
+                for k in keys[self.max_store :]:
+                    merged.pop(k, None)
+                keys = keys[: self.max_store]
+            out = _fmc._channel_store_payload(out["channel_key"], out["channel_id"], merged, keys)
+            changed, removed = set(merged.keys()), disk_keys - set(merged.keys())
+        _fmc._write_channel_store(path, out, changed_keys=changed, removed_keys=removed, prev_stat=disk_stat)
+        return _fmc._file_stat(path), merged
+
+    def unflushed_items(self) -> Iterator[Tuple[str, str, int, str, Optional[dict]]]:
+        """(channel_key, file_name, channel_id, item_key, item or None if evicted) not yet on disk."""
+        for state in self._channels.values():
+            for k in state.dirty:
+                item = state.items.get(k)
+                if item is not None:
+                    yield state.channel_key, state.path.name, state.channel_id, k, item
+            for k in state.removed:
+                yield state.channel_key, state.path.name, state.channel_id, k, None
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self.counters)
+        out["channels"] = len(self._channels)
+        out["items"] = sum(len(s.items) for s in self._channels.values())
+        out["unflushed"] = sum(len(s.dirty) + len(s.removed) for s in self._channels.values())
+        return out
+
+    async def close(self) -> None:
+        """Stop the background flusher and write whatever is still pending."""
+        self._closed = True
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
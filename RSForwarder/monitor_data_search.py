@@ -1,9 +1,16 @@
 """
 Search RSForwarder/monitor_data/*.json for a product id (ASIN, SKU, TCIN, UPC, etc.) or substring.
 
+Queries go through a persistent SQLite FTS5 (trigram) index at monitor_data/_search_index.sqlite3
+over product id, title, store (channel key) and URL. `fetch_monitor_channels._upsert_channel_messages`
+(and the bot's write-behind MonitorCaptureStore flush) updates it per changed item; files changed
+behind its back (size/mtime) are re-indexed on the next query, and `--rebuild-index` rebuilds it
+from the JSON files. The bot also passes its not-yet-flushed captures (`unflushed=`).
+
 CLI:
   py -3 -m RSForwarder.monitor_data_search B0DN4LQL4Y
   py -3 -m RSForwarder.monitor_data_search --dir RSForwarder/monitor_data "6665448" --limit 20
+  py -3 -m RSForwarder.monitor_data_search --rebuild-index
 
 Interactive: use RSForwarder/run_monitor_data_search.bat (no args).
 """
@@ -12,9 +19,11 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import sqlite3
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 try:
     from zoneinfo import ZoneInfo
@@ -229,7 +238,19 @@ def _title_url_from_item(item: Dict[str, Any]) -> Tuple[str, str]:
     return title, url
 
 
-def _item_matches(query: str, item_key: str, item: Dict[str, Any]) -> bool:
+def _match_fields(item_key: str, item: Dict[str, Any]) -> Dict[str, str]:
+    """The item fields `_fields_match` compares against (stored per row in the index)."""
+    pid = item.get("product_id") if isinstance(item.get("product_id"), dict) else {}
+    title, _ = _title_url_from_item(item)
+    return {
+        "item_key": str(item_key or ""),
+        "pid_value": str(pid.get("value") or "").strip(),
+        "title": title,
+        "title_key": str(item.get("title_key") or "").strip(),
+    }
+
+
+def _fields_match(query: str, fields: Dict[str, str]) -> bool:
     q = (query or "").strip()
     if not q:
         return False
@@ -237,14 +258,13 @@ def _item_matches(query: str, item_key: str, item: Dict[str, Any]) -> bool:
     q_digits = "".join(c for c in q if c.isdigit())
     q_alnum = _norm_alnum(q)
 
-    pid = item.get("product_id") if isinstance(item.get("product_id"), dict) else {}
-    pid_val = str(pid.get("value") or "").strip()
+    item_key = fields.get("item_key") or ""
+    pid_val = fields.get("pid_value") or ""
     pid_digits = "".join(c for c in pid_val if c.isdigit())
+    title = fields.get("title") or ""
+    title_key = fields.get("title_key") or ""
 
-    title, _ = _title_url_from_item(item)
-    title_key = str(item.get("title_key") or "").strip()
-
-    if q_lower == (item_key or "").lower():
+    if q_lower == item_key.lower():
         return True
     if q_alnum and q_alnum in _norm_alnum(item_key):
         return True
@@ -270,73 +290,326 @@ def _load_channel_json(path: Path) -> Tuple[str, Dict[str, Any]]:
     return ck, obj
 
 
+def _hit_for_item(channel_key: str, file_name: str, channel_id: int, ik: str, item: Dict[str, Any]) -> Dict[str, Any]:
+    title, url = _title_url_from_item(item)
+    latest = item.get("latest") if isinstance(item.get("latest"), dict) else {}
+    ex = latest.get("extracted") if isinstance(latest.get("extracted"), dict) else {}
+    human = ex.get("human") if isinstance(ex.get("human"), dict) else {}
+    last_raw = str(item.get("last_seen_timestamp") or latest.get("timestamp") or "").strip()
+    dt = _parse_ts(last_raw)
+    stock = _clean_ws(_extract_stock_display(human))
+    embed_type = _clean_ws(_extract_type_field(human))
+    source_message_id = str(item.get("last_message_id") or latest.get("id") or "").strip()
+    pid = item.get("product_id") if isinstance(item.get("product_id"), dict) else {}
+    pid_label = ""
+    if str(pid.get("kind") or "") in {"field", "derived"} and str(pid.get("value") or "").strip():
+        pid_label = f"{pid.get('name') or 'ID'}={pid.get('value')}"
+    elif str(pid.get("kind") or "") == "title":
+        pid_label = f"TITLE={pid.get('value') or ''}"
+
+    unix = int(dt.timestamp()) if dt else 0
+    return {
+        "channel": channel_key,
+        "file": file_name,
+        "item_key": str(ik),
+        "source_channel_id": channel_id,
+        "source_message_id": source_message_id,
+        "product_id": pid_label,
+        "title": title,
+        "url": url,
+        "stock": stock,
+        "embed_type": embed_type,
+        "last_seen_iso": last_raw,
+        "last_seen_unix": unix,
+    }
+
+
+# -------------------------
+# Persistent FTS5 index
+# -------------------------
+INDEX_FILE_NAME = "_search_index.sqlite3"
+_INDEX_SCHEMA_VERSION = "1"
+_MIN_TRIGRAM_LEN = 3
+
+
+def _fts_phrase(s: str) -> str:
+    return '"' + s.replace('"', '""') + '"'
+
+
+class MonitorDataIndex:
+    """
+    items:       one row per (file, item_key) with the precomputed hit + match fields
+    items_fts:   trigram FTS5 over pid / title / store / url / keys (rowid == items.rowid)
+    files:       size + mtime_ns per indexed channel file (stale files get re-indexed)
+    """
+
+    def __init__(self, monitor_dir: Path) -> None:
+        self.monitor_dir = Path(monitor_dir)
+        self.db_path = self.monitor_dir / INDEX_FILE_NAME
+        self._lock = threading.RLock()
+        self.monitor_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self._lock:
+            c = self._conn
+            c.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT NOT NULL)")
+            row = c.execute("SELECT v FROM meta WHERE k='schema'").fetchone()
+            if row is not None and row[0] != _INDEX_SCHEMA_VERSION:
+                c.execute("DROP TABLE IF EXISTS items_fts")
+                c.execute("DROP TABLE IF EXISTS items")
+                c.execute("DROP TABLE IF EXISTS files")
+            c.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                " rowid INTEGER PRIMARY KEY,"
+                " file TEXT NOT NULL, channel TEXT NOT NULL, item_key TEXT NOT NULL, ord INTEGER NOT NULL,"
+                " fields_json TEXT NOT NULL, hit_json TEXT NOT NULL,"
+                " UNIQUE(file, item_key))"
+            )
+            c.execute("CREATE INDEX IF NOT EXISTS items_order ON items(file, ord)")
+            c.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+                "pid, title, store, url, keys, tokenize='trigram')"
+            )
+            c.execute("CREATE TABLE IF NOT EXISTS files (file TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL)")
+            c.execute("INSERT OR REPLACE INTO meta(k, v) VALUES('schema', ?)", (_INDEX_SCHEMA_VERSION,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- writes ----
+    def _delete_rows(self, rowids: Iterable[int]) -> None:
+        ids = [(int(r),) for r in rowids]
+        if ids:
+            self._conn.executemany("DELETE FROM items_fts WHERE rowid=?", ids)
+            self._conn.executemany("DELETE FROM items WHERE rowid=?", ids)
+
+    def _put_item(self, file_name: str, channel_key: str, channel_id: int, ik: str, item: Dict[str, Any], ord_: int) -> None:
+        fields = _match_fields(ik, item)
+        hit = _hit_for_item(channel_key, file_name, channel_id, ik, item)
+        row = self._conn.execute("SELECT rowid FROM items WHERE file=? AND item_key=?", (file_name, ik)).fetchone()
+        if row is not None:
+            self._delete_rows([row[0]])
+        cur = self._conn.execute(
+            "INSERT INTO items(file, channel, item_key, ord, fields_json, hit_json) VALUES(?,?,?,?,?,?)",
+            (file_name, channel_key, ik, int(ord_), json.dumps(fields, ensure_ascii=False), json.dumps(hit, ensure_ascii=False)),
+        )
+        pid_digits = "".join(c for c in fields["pid_value"] if c.isdigit())
+        keys = " ".join(
+            x for x in (_norm_alnum(ik), _norm_alnum(fields["title_key"]), _norm_alnum(fields["pid_value"]), pid_digits) if x
+        )
+        self._conn.execute(
+            "INSERT INTO items_fts(rowid, pid, title, store, url, keys) VALUES(?,?,?,?,?,?)",
+            (cur.lastrowid, fields["pid_value"], fields["title"], channel_key, hit.get("url") or "", keys),
+        )
+
+    def _record_file_stat(self, path: Path) -> None:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._conn.execute("DELETE FROM files WHERE file=?", (path.name,))
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files(file, size, mtime_ns) VALUES(?,?,?)",
+            (path.name, int(st.st_size), int(st.st_mtime_ns)),
+        )
+
+    def index_file(self, path: Path) -> int:
+        """(Re)index one channel file from disk. Returns rows written."""
+        channel_key, obj = _load_channel_json(path)
+        items = obj.get("items_by_key") if isinstance(obj, dict) else None
+        try:
+            channel_id = int(obj.get("channel_id") or 0) if isinstance(obj, dict) else 0
+        except Exception:
+            channel_id = 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                old = [r[0] for r in self._conn.execute("SELECT rowid FROM items WHERE file=?", (path.name,))]
+                self._delete_rows(old)
+                n = 0
+                if isinstance(items, dict):
+                    for ord_, (ik, item) in enumerate(items.items()):
+                        if isinstance(item, dict):
+                            self._put_item(path.name, channel_key, channel_id, str(ik), item, ord_)
+                            n += 1
+                self._record_file_stat(path)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return n
+
+    def apply_channel_update(
+        self,
+        path: Path,
+        data: Dict[str, Any],
+        *,
+        changed_keys: Iterable[str],
+        removed_keys: Iterable[str],
+        prev_stat: Optional[Tuple[int, int]],
+    ) -> None:
+        """
+        Incremental update after `_upsert_channel_messages` rewrote `path` with `data`.
+        `prev_stat` is (size, mtime_ns) of the file before the rewrite; if the index was not
+        current for that version, the whole file is re-indexed instead.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT size, mtime_ns FROM files WHERE file=?", (path.name,)).fetchone()
+        current = (int(row[0]), int(row[1])) if row is not None else None
+        if current != (tuple(prev_stat) if prev_stat is not None else None):
+            self.index_file(path)
+            return
+        items = data.get("items_by_key") if isinstance(data.get("items_by_key"), dict) else {}
+        channel_key = str(data.get("channel_key") or path.stem)
+        try:
+            channel_id = int(data.get("channel_id") or 0)
+        except Exception:
+            channel_id = 0
+        changed = {str(k) for k in changed_keys if str(k) in items}
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for ik in removed_keys:
+                    row = self._conn.execute("SELECT rowid FROM items WHERE file=? AND item_key=?", (path.name, str(ik))).fetchone()
+                    if row is not None:
+                        self._delete_rows([row[0]])
+                if changed:
+                    for ord_, ik in enumerate(items.keys()):
+                        if ik in changed and isinstance(items[ik], dict):
+                            self._put_item(path.name, channel_key, channel_id, ik, items[ik], ord_)
+                self._record_file_stat(path)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def sync(self) -> int:
+        """Re-index channel files whose size/mtime differ from the index; drop rows for deleted files."""
+        on_disk = {p.name: p for p in self.monitor_dir.glob("*.json") if not p.name.startswith("_")}
+        with self._lock:
+            known = {r[0]: (int(r[1]), int(r[2])) for r in self._conn.execute("SELECT file, size, mtime_ns FROM files")}
+            for gone in set(known) - set(on_disk):
+                self._conn.execute("BEGIN")
+                old = [r[0] for r in self._conn.execute("SELECT rowid FROM items WHERE file=?", (gone,))]
+                self._delete_rows(old)
+                self._conn.execute("DELETE FROM files WHERE file=?", (gone,))
+                self._conn.execute("COMMIT")
+        n = 0
+        for name, path in sorted(on_disk.items()):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            if known.get(name) != (int(st.st_size), int(st.st_mtime_ns)):
+                self.index_file(path)
+                n += 1
+        return n
+
+    def rebuild(self) -> int:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM items_fts")
+            self._conn.execute("DELETE FROM items")
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("COMMIT")
+        return self.sync()
+
+    # ---- reads ----
+    def search(self, query: str, *, limit: int, exclude_channels: Optional[set[str]] = None) -> List[Dict[str, Any]]:
+        q = (query or "").strip()
+        if not q:
+            return []
+        q_alnum = _norm_alnum(q)
+        q_digits = "".join(c for c in q if c.isdigit())
+        excl = sorted(exclude_channels or set())
+        excl_sql = f" AND i.channel NOT IN ({','.join('?' for _ in excl)})" if excl else ""
+
+        # Trigram FTS needs >= 3 chars per phrase; shorter queries scan the index rows instead.
+        # Every matcher rule must be expressible as a phrase, and the alnum rule is the shortest one.
+        phrases = []
+        if len(q_alnum) >= _MIN_TRIGRAM_LEN:
+            phrases.append(f"title:{_fts_phrase(q)}")
+            phrases.append(f"pid:{_fts_phrase(q)}")
+            phrases.append(f"keys:{_fts_phrase(q_alnum)}")
+            if len(q_digits) >= 4:
+                phrases.append(f"keys:{_fts_phrase(q_digits)}")
+        with self._lock:
+            if phrases:
+                rows = self._conn.execute(
+                    "SELECT i.fields_json, i.hit_json FROM items_fts f JOIN items i ON i.rowid=f.rowid"
+                    f" WHERE items_fts MATCH ?{excl_sql} ORDER BY i.file, i.ord",
+                    [" OR ".join(phrases), *excl],
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT i.fields_json, i.hit_json FROM items i WHERE 1=1{excl_sql} ORDER BY i.file, i.ord",
+                    excl,
+                ).fetchall()
+        hits: List[Dict[str, Any]] = []
+        for fields_json, hit_json in rows:
+            # FTS narrows candidates; the canonical matcher decides.
+            if not _fields_match(q, json.loads(fields_json)):
+                continue
+            hits.append(json.loads(hit_json))
+            if len(hits) >= limit:
+                break
+        return hits
+
+
+_INDEXES: Dict[str, MonitorDataIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_monitor_index(monitor_dir: Path) -> MonitorDataIndex:
+    key = str(Path(monitor_dir).resolve())
+    with _INDEXES_LOCK:
+        idx = _INDEXES.get(key)
+        if idx is None:
+            idx = MonitorDataIndex(Path(monitor_dir))
+            _INDEXES[key] = idx
+        return idx
+
+
 def search_monitor_data(
     *,
     monitor_dir: Path,
     query: str,
     limit: int,
     exclude_channels: Optional[set[str]] = None,
+    unflushed: Optional[Iterable[Tuple[str, str, int, str, Optional[Dict[str, Any]]]]] = None,
 ) -> List[Dict[str, Any]]:
-    hits: List[Dict[str, Any]] = []
+    """
+    `unflushed`: (channel_key, file_name, channel_id, item_key, item or None if evicted) the running
+    bot captured but has not written yet (MonitorCaptureStore.unflushed_items); they override the index.
+    """
     if not monitor_dir.is_dir():
-        return hits
+        return []
+    idx = get_monitor_index(monitor_dir)
+    idx.sync()
     excl = exclude_channels or set()
-
-    for path in sorted(monitor_dir.glob("*.json")):
-        if path.name.startswith("_"):
-            continue
-        channel_key, obj = _load_channel_json(path)
-        if channel_key in excl:
-            continue
-        # Saved file metadata
-        try:
-            channel_id = int(obj.get("channel_id") or 0) if isinstance(obj, dict) else 0
-        except Exception:
-            channel_id = 0
-        items = obj.get("items_by_key")
-        if not isinstance(items, dict):
+    live = {(file_name, ik): (ck, cid, item) for (ck, file_name, cid, ik, item) in (unflushed or ()) if ck not in excl}
+    if not live:
+        return idx.search(query, limit=limit, exclude_channels=exclude_channels)
+    hits: List[Dict[str, Any]] = []
+    for h in idx.search(query, limit=limit + len(live), exclude_channels=exclude_channels):
+        key = (h.get("file"), h.get("item_key"))
+        if key not in live:
+            hits.append(h)
             continue
-        for ik, item in items.items():
-            if not isinstance(item, dict):
-                continue
-            if not _item_matches(query, str(ik), item):
-                continue
-            title, url = _title_url_from_item(item)
-            latest = item.get("latest") if isinstance(item.get("latest"), dict) else {}
-            ex = latest.get("extracted") if isinstance(latest.get("extracted"), dict) else {}
-            human = ex.get("human") if isinstance(ex.get("human"), dict) else {}
-            last_raw = str(item.get("last_seen_timestamp") or latest.get("timestamp") or "").strip()
-            dt = _parse_ts(last_raw)
-            stock = _clean_ws(_extract_stock_display(human))
-            embed_type = _clean_ws(_extract_type_field(human))
-            source_message_id = str(item.get("last_message_id") or latest.get("id") or "").strip()
-            pid = item.get("product_id") if isinstance(item.get("product_id"), dict) else {}
-            pid_label = ""
-            if str(pid.get("kind") or "") in {"field", "derived"} and str(pid.get("value") or "").strip():
-                pid_label = f"{pid.get('name') or 'ID'}={pid.get('value')}"
-            elif str(pid.get("kind") or "") == "title":
-                pid_label = f"TITLE={pid.get('value') or ''}"
-
-            unix = int(dt.timestamp()) if dt else 0
-            hits.append(
-                {
-                    "channel": channel_key,
-                    "file": path.name,
-                    "item_key": str(ik),
-                    "source_channel_id": channel_id,
-                    "source_message_id": source_message_id,
-                    "product_id": pid_label,
-                    "title": title,
-                    "url": url,
-                    "stock": stock,
-                    "embed_type": embed_type,
-                    "last_seen_iso": last_raw,
-                    "last_seen_unix": unix,
-                }
-            )
-            if len(hits) >= limit:
-                return hits
-    return hits
+        ck, cid, item = live[key]
+        if item is not None and _fields_match(query, _match_fields(h["item_key"], item)):
+            hits.append(_hit_for_item(ck, h["file"], cid, h["item_key"], item))
+    seen = {(h.get("file"), h.get("item_key")) for h in hits}
+    for (file_name, ik), (ck, cid, item) in live.items():
+        if item is not None and (file_name, ik) not in seen and _fields_match(query, _match_fields(ik, item)):
+            hits.append(_hit_for_item(ck, file_name, cid, ik, item))
+    hits.sort(key=lambda h: str(h.get("file") or ""))
+    return hits[:limit]
 
 
 def _print_hits(hits: List[Dict[str, Any]], *, as_json: bool) -> None:
@@ -378,6 +651,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     )
     ap.add_argument("--limit", type=int, default=50, help="Max hits to return (default 50)")
     ap.add_argument("--json", action="store_true", help="Machine-readable JSON output")
+    ap.add_argument("--rebuild-index", action="store_true", help="Rebuild the search index from the JSON files")
     ap.add_argument(
         "--include-aio",
         action="store_true",
@@ -385,13 +659,19 @@ def main(argv: Optional[List[str]] = None) -> int:
     )
     args = ap.parse_args(argv)
 
+    base = Path(__file__).resolve().parent
+    root = Path(args.dir).resolve() if args.dir else (base / "monitor_data")
+    if args.rebuild_index:
+        n = get_monitor_index(root).rebuild()
+        print(f"Rebuilt {root / INDEX_FILE_NAME} from {n} channel file(s).")
+        if not (args.query or "").strip():
+            return 0
+
     q = (args.query or "").strip()
     if not q:
-        print("Usage: py -3 -m RSForwarder.monitor_data_search <query> [--dir PATH] [--limit N] [--json]")
+        print("Usage: py -3 -m RSForwarder.monitor_data_search <query> [--dir PATH] [--limit N] [--json] [--rebuild-index]")
         return 2
 
-    base = Path(__file__).resolve().parent
-    root = Path(args.dir).resolve() if args.dir else (base / "monitor_data")
     default_excludes = {"needoh-aio"}
     excludes = set() if bool(args.include_aio) else set(default_excludes)
     hits = search_monitor_data(
@@ -0,0 +1,172 @@
+"""
+Offline benchmark for outbound_url_resolve (run: `python rs_forwarder_bot.py --benchmark-resolve`).
+
+Replays the redirect chains in `outbound_resolve_corpus.json` from a local aiohttp stub server.
+Every hostname resolves to the stub (custom connector resolver), so host-based scoring sees the
+real shortener / merchant hosts while nothing leaves the machine. The stub adds `latency_ms` per
+request and `connect_ms` per new connection (stands in for DNS + TLS on real hosts), and streams
+bodies at `bandwidth_kib_s`; "body KiB" counts what it got to send before the client hung up.
+
+Modes, each over all corpus URLs as one "message":
+- baseline: GET-only, full bodies, new connection per request, one URL at a time
+  (what the requests-based resolver did)
+- shared: HEAD-first + capped bodies on one pooled connector, still one URL at a time
+- concurrent: shared + all URLs resolved together (resolve_outbound_urls)
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from aiohttp import web
+from aiohttp.abc import AbstractResolver
+
+try:
+    from RSForwarder import outbound_url_resolve as _resolve
+except ImportError:
+    import outbound_url_resolve as _resolve
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "outbound_resolve_corpus.json"
+_PAD_LINE = '<div class="product-grid-item"><span>Recommended for you</span><img src="/static/p.png"></div>\n'
+
+
+class _StubResolver(AbstractResolver):
+    def __init__(self, port: int) -> None:
+        self.port = port
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[Dict[str, Any]]:
+        return [{"hostname": host, "host": "127.0.0.1", "port": self.port, "family": socket.AF_INET, "proto": 0, "flags": 0}]
+
+    async def close(self) -> None:
+        return None
+
+
+class _StubServer:
+    def __init__(self, corpus: Dict[str, Any]) -> None:
+        self.latency_s = float(corpus.get("latency_ms", 50)) / 1000.0
+        self.connect_s = float(corpus.get("connect_ms", 0)) / 1000.0
+        self.bandwidth = max(1.0, float(corpus.get("bandwidth_kib_s", 4096))) * 1024.0
+        self.routes: Dict[str, Dict[str, Any]] = {}
+        for case in corpus.get("cases") or []:
+            for route in case.get("routes") or []:
+                self.routes[route["url"].split("://", 1)[-1]] = route
+        self.counts = {"HEAD": 0, "GET": 0, "connections": 0, "body_bytes": 0}
+        self._transports: set = set()
+        self._runner: Optional[web.AppRunner] = None
+        self.port = 0
+
+    def _body(self, route: Dict[str, Any]) -> bytes:
+        pad = int(route.get("pad_kb", 0) or 0) * 1024
+        text = str(route.get("html") or "")
+        if pad:
+            text = text.replace("</body>", (_PAD_LINE * (pad // len(_PAD_LINE) + 1))[:pad] + "</body>")
+        return text.encode("utf-8")
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        transport = request.transport
+        if transport is not None and id(transport) not in self._transports:
+            self._transports.add(id(transport))
+            self.counts["connections"] += 1
+            await asyncio.sleep(self.connect_s)
+        await asyncio.sleep(self.latency_s)
+        method = request.method.upper()
+        self.counts[method] = self.counts.get(method, 0) + 1
+        route = self.routes.get(f"{request.host}{request.path_qs}")
+        if route is None:
+            return web.Response(status=404, text="not found", content_type="text/html")
+        status = int(route.get("status", 200))
+        if method == "HEAD" and route.get("head_status"):
+            return web.Response(status=int(route["head_status"]))
+        if route.get("location"):
+            return web.Response(status=status, headers={"Location": route["location"]})
+        body = self._body(route)
+        resp = web.StreamResponse(status=status)
+        resp.content_type = str(route.get("content_type") or "text/html")
+        resp.content_length = len(body)
+        await resp.prepare(request)
+        if method != "GET":
+            return resp
+        chunk = 16 * 1024
+        try:
+            for i in range(0, len(body), chunk):
+                part = body[i : i + chunk]
+                await asyncio.sleep(len(part) / self.bandwidth)
+                await resp.write(part)
+                self.counts["body_bytes"] += len(part)
+            await resp.write_eof()
+        except (ConnectionError, RuntimeError):
+            pass
+        return resp
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = int(self._runner.addresses[0][1])
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def reset(self) -> None:
+        self.counts = {"HEAD": 0, "GET": 0, "connections": 0, "body_bytes": 0}
+        self._transports = set()
+
+
+async def _run_mode(server: _StubServer, urls: List[str], *, mode: str, timeout_s: int) -> Dict[str, Any]:
+    server.reset()
+    pooled = mode != "baseline"
+    connector = aiohttp.TCPConnector(resolver=_StubResolver(server.port), force_close=not pooled, limit=64, limit_per_host=8)
+    kwargs: Dict[str, Any] = {"timeout_s": timeout_s}
+    if not pooled:
+        kwargs.update(head_first=False, max_body_bytes=64 * 1024 * 1024)
+    t0 = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector) as session:
+        kwargs["session"] = session
+        if mode == "concurrent":
+            results = await _resolve.resolve_outbound_urls(urls, **kwargs)
+        else:
+            results = [await _resolve.resolve_outbound_url(u, **kwargs) for u in urls]
+    return {"seconds": time.perf_counter() - t0, "results": results, **server.counts}
+
+
+async def run_benchmark(corpus_path: Optional[Path] = None, *, rounds: int = 1, timeout_s: int = 10) -> int:
+    path = Path(corpus_path or DEFAULT_CORPUS)
+    corpus = json.loads(path.read_text(encoding="utf-8"))
+    cases = corpus.get("cases") or []
+    urls = [c["url"] for c in cases]
+    server = _StubServer(corpus)
+    await server.start()
+    mismatches = 0
+    try:
+        print(
+            f"outbound resolve benchmark: {len(urls)} URL(s) from {path.name}, "
+            f"latency {int(server.latency_s * 1000)}ms/request + {int(server.connect_s * 1000)}ms/new connection"
+        )
+        for mode in ("baseline", "shared", "concurrent"):
+            for _ in range(max(1, int(rounds))):
+                out = await _run_mode(server, urls, mode=mode, timeout_s=timeout_s)
+                wrong = [
+                    (c["name"], got, c.get("expect"))
+                    for c, got in zip(cases, out["results"])
+                    if c.get("expect") is not None and got != c["expect"]
+                ]
+                mismatches += len(wrong)
+                print(
+                    f"  {mode:<10} {out['seconds']:6.2f}s  GET={out['GET']:<3} HEAD={out['HEAD']:<3} "
+                    f"connections={out['connections']:<3} body={out['body_bytes'] / 1024:8.0f} KiB served  "
+                    f"correct={len(cases) - len(wrong)}/{len(cases)}"
+                )
+                for name, got, want in wrong:
+                    print(f"    MISMATCH {name}: got {got!r} want {want!r}")
+    finally:
+        await server.stop()
+    return 1 if mismatches else 0
@@ -7,19 +7,30 @@ Ports MW universal_link_resolver V2 behavior with two production fixes:
      giant per-shortener allowlist.
 
 Mavely/Amazon tagging stays in affiliate_rewriter.py; this module only resolves merchant URLs.
+
+HTTP is aiohttp on one shared pooled session (`shared_session()`; the bot closes it on shutdown).
+Each hop probes with HEAD first: when HEAD already lands on a merchant page (or only the chain is
+needed) no body is downloaded. Otherwise a GET streams at most `max_body_bytes` of HTML for
+`extract_best_url_from_html`. `resolve_outbound_urls()` resolves a message's URLs concurrently.
 """
 from __future__ import annotations
 
+import asyncio
 import base64
 import html
 import re
-from typing import List, Optional, Set, Tuple
+from typing import List, Optional, Set
 from urllib.parse import parse_qs, parse_qsl, unquote, urlparse
 
-import requests
+import aiohttp
 
 _DEFAULT_TIMEOUT = 20
 _DEFAULT_MAX_DEPTH = 10
+# Hub/interstitial pages put the outbound link (meta refresh, JS redirect, "Go to deal" anchor)
+# well inside the first 256 KiB; merchant pages are never read to the end.
+_DEFAULT_MAX_BODY_BYTES = 256 * 1024
+_SHARED_CONNECTOR_LIMIT = 64
+_SHARED_CONNECTOR_LIMIT_PER_HOST = 8
 _DEFAULT_UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -356,6 +367,24 @@ def is_intermediate_url(url: Optional[str]) -> bool:
     return False
 
 
+_KNOWN_RETAIL_HOST_MARKERS = (
+    "walmart.com",
+    "target.com",
+    "macys.com",
+    "lowes.com",
+    "bestbuy.com",
+    "costco.com",
+    "kohls.com",
+    "homedepot.com",
+    "woot.com",
+    "samsclub.com",
+)
+
+
+def _is_known_retail_host(host: str) -> bool:
+    return any(store in host for store in _KNOWN_RETAIL_HOST_MARKERS)
+
+
 def score_outbound_candidate(url: str) -> int:
     u = normalize_merchant_url((url or "").strip())
     if not _looks_like_http_url(u):
@@ -380,21 +409,7 @@ def score_outbound_candidate(url: str) -> int:
             score += 85
         else:
             score += 20
-    if any(
-        store in host
-        for store in (
-            "walmart.com",
-            "target.com",
-            "macys.com",
-            "lowes.com",
-            "bestbuy.com",
-            "costco.com",
-            "kohls.com",
-            "homedepot.com",
-            "woot.com",
-            "samsclub.com",
-        )
-    ):
+    if _is_known_retail_host(host):
         score += 20
     return score
 
@@ -551,32 +566,131 @@ def collect_candidates_from_chain(chain: List[str], *, html: str = "") -> List[s
     return _dedupe_keep_order([normalize_merchant_url(x) for x in out])
 
 
-def request_once(url: str, timeout: int) -> Tuple[Optional[requests.Response], List[str], Optional[str]]:
-    headers = {
-        "User-Agent": _DEFAULT_UA,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cache-Control": "no-cache",
-        "Upgrade-Insecure-Requests": "1",
-    }
+_FETCH_HEADERS = {
+    "User-Agent": _DEFAULT_UA,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Cache-Control": "no-cache",
+    "Upgrade-Insecure-Requests": "1",
+}
+
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def shared_session() -> aiohttp.ClientSession:
+    """Process-wide session (one pooled connector, cached DNS); recreated if closed or on another loop."""
+    global _shared_session, _shared_session_loop
+    loop = asyncio.get_running_loop()
+    if _shared_session is None or _shared_session.closed or _shared_session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=_SHARED_CONNECTOR_LIMIT,
+            limit_per_host=_SHARED_CONNECTOR_LIMIT_PER_HOST,
+            ttl_dns_cache=300,
+        )
+        _shared_session = aiohttp.ClientSession(connector=connector, headers=_FETCH_HEADERS)
+        _shared_session_loop = loop
+    return _shared_session
+
+
+async def close_shared_session() -> None:
+    global _shared_session, _shared_session_loop
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+    _shared_session_loop = None
+
+
+class FetchResult:
+    """One hop: final status/url after redirects, the redirect chain, and (capped) HTML text."""
+
+    __slots__ = ("status", "url", "chain", "text", "err")
+
+    def __init__(self, status: int, url: str, chain: List[str], text: str = "", err: Optional[str] = None) -> None:
+        self.status = int(status or 0)
+        self.url = url
+        self.chain = chain
+        self.text = text
+        self.err = err
+
+
+def _response_chain(resp: aiohttp.ClientResponse) -> List[str]:
+    return [str(h.url) for h in (resp.history or ())] + [str(resp.url)]
+
+
+async def _read_capped(resp: aiohttp.ClientResponse, max_bytes: int) -> str:
+    buf = bytearray()
+    async for chunk in resp.content.iter_chunked(16 * 1024):
+        buf.extend(chunk)
+        if len(buf) >= max_bytes:
+            break
+    return bytes(buf[:max_bytes]).decode(resp.charset or "utf-8", errors="ignore")
+
+
+async def fetch_once(
+    session: aiohttp.ClientSession,
+    url: str,
+    *,
+    timeout_s: float,
+    need_body: bool = True,
+    max_body_bytes: int = _DEFAULT_MAX_BODY_BYTES,
+    head_first: bool = True,
+) -> FetchResult:
+    """
+    HEAD first (follows redirects). The body is fetched only when the hop still needs HTML:
+    HEAD failed/refused, or it stopped on an HTML page that is not a known retailer's page
+    (an unknown host may be a deal hub whose HTML holds the real outbound link).
+    `head_first=False` is a plain GET (benchmark baseline / hosts that mishandle HEAD).
+    """
+    timeout = aiohttp.ClientTimeout(total=float(timeout_s))
+    head: Optional[FetchResult] = None
+    head_html = True
+    if head_first:
+        try:
+            async with session.head(url, allow_redirects=True, timeout=timeout) as resp:
+                head = FetchResult(resp.status, str(resp.url), _response_chain(resp))
+                head_html = "html" in (resp.content_type or "") or not resp.content_type
+        except Exception:
+            head = None
+    if head is not None and head.status < 400:
+        landed = normalize_merchant_url(head.url)
+        landed_host = _host_of(landed)
+        if (not need_body) or (not head_html) or (
+            (_is_known_retail_host(landed_host) or is_amazon_retail_host(landed_host))
+            and not is_intermediate_url(landed)
+            and score_outbound_candidate(landed) > 0
+        ):
+            return head
+    get_url = head.url if head is not None and head.status < 400 else url
     try:
-        resp = requests.get(url, timeout=timeout, allow_redirects=True, headers=headers)
+        async with session.get(get_url, allow_redirects=True, timeout=timeout) as resp:
+            chain = _response_chain(resp)
+            text = await _read_capped(resp, max(1, int(max_body_bytes))) if need_body else ""
+            status = resp.status
+            final = str(resp.url)
     except Exception as e:
-        return None, [], str(e)
-    chain = [str(h.url) for h in (resp.history or [])] + [str(resp.url or url)]
-    return resp, chain, None
+        if head is not None:
+            return head
+        return FetchResult(0, url, [], err=str(e) or type(e).__name__)
+    if get_url != url and head is not None:
+        chain = head.chain[:-1] + chain
+    return FetchResult(status, final, chain, text)
 
 
-def resolve_outbound_url(
+async def resolve_outbound_url(
     input_url: str,
     *,
     timeout_s: int = _DEFAULT_TIMEOUT,
     max_depth: int = _DEFAULT_MAX_DEPTH,
+    max_body_bytes: int = _DEFAULT_MAX_BODY_BYTES,
+    head_first: bool = True,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> str:
     """
     Resolve any http(s) link to the best merchant/product URL we can find.
     Does not depend on the host being pre-registered in a shortener list.
     """
+    sess = session or shared_session()
     original = clean_candidate_url(input_url)
     canon_dp = amazon_canonical_dp_url(original)
     if canon_dp:
@@ -594,15 +708,13 @@ def resolve_outbound_url(
             current = embedded
             continue
 
-        resp, chain, err = request_once(current, int(timeout_s))
-        if err is not None or resp is None:
+        resp = await fetch_once(
+            sess, current, timeout_s=timeout_s, max_body_bytes=max_body_bytes, head_first=head_first
+        )
+        if resp.err is not None:
             break
-
-        html_text = ""
-        try:
-            html_text = resp.text or ""
-        except Exception:
-            html_text = ""
+        chain = resp.chain
+        html_text = resp.text
 
         murl = try_extract_murl_from_chain(chain)
         if murl:
@@ -613,7 +725,7 @@ def resolve_outbound_url(
             chain = chain + [post_q]
 
         # HTML from 403/bot pages often points back to shorteners; prefer redirect chain only.
-        use_html = html_text if (resp.status_code and int(resp.status_code) < 400) else ""
+        use_html = html_text if (resp.status and int(resp.status) < 400) else ""
         candidates = collect_candidates_from_chain(chain, html=use_html)
         best = pick_best_from_candidates(candidates, prefer_url=original)
         final_resp = normalize_merchant_url(str(resp.url or current))
@@ -651,13 +763,18 @@ def resolve_outbound_url(
         if out_asin and in_asin and (out_asin.group(1) or "").upper() != (in_asin.group(1) or "").upper():
             return canon_in
     if is_intermediate_url(out):
-        _, chain, _err = request_once(original, int(timeout_s))
-        if chain:
+        retry = await fetch_once(sess, original, timeout_s=timeout_s, need_body=False, head_first=head_first)
+        if retry.chain:
             retry_best = pick_best_from_candidates(
-                collect_candidates_from_chain(chain, html=""),
+                collect_candidates_from_chain(retry.chain, html=""),
                 prefer_url=original,
             )
             if retry_best and not is_intermediate_url(retry_best) and score_outbound_candidate(retry_best) > 0:
                 return retry_best
         return canon_in or original
     return out
+
+
+async def resolve_outbound_urls(urls: List[str], **kwargs) -> List[str]:
+    """Resolve several URLs (e.g. every link in one message) concurrently; same order as `urls`."""
+    return list(await asyncio.gather(*(resolve_outbound_url(u, **kwargs) for u in urls)))
@@ -31,7 +31,11 @@ from RSForwarder import rs_fs_sheet_sync
 from RSForwarder.rs_fs_monitor_data_resolver import RsFsMonitorDataResolver
 from RSForwarder import fetch_monitor_channels as _fetch_monitor_channels
 from RSForwarder import monitor_data_search as _monitor_data_search
+from RSForwarder import outbound_url_resolve as _outbound_url_resolve
 from RSForwarder import zephyr_release_feed_parser
+from RSForwarder.webhook_delivery import WebhookDeliveryPipeline
+from RSForwarder.url_resolve_cache import UrlResolveCache
+from RSForwarder.monitor_capture_store import MonitorCaptureStore
 
 # Ensure repo root is importable when executed as a script (matches Ubuntu run_bot.sh PYTHONPATH).
 _REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -1269,6 +1273,26 @@ class RSForwarderBot:
 
         self.load_config()
 
+        # Forward webhook POSTs: pooled aiohttp session + per-webhook queues (never blocks the loop).
+        self._webhook_delivery = WebhookDeliveryPipeline(
+            self.stats,
+            max_connections=self._webhook_cfg_int("webhook_max_connections", 20, 1, 100),
+            timeout_s=float(self._webhook_cfg_int("webhook_timeout_s", 10, 2, 60)),
+            max_retries=self._webhook_cfg_int("webhook_max_retries", 3, 0, 10),
+            max_queue_per_webhook=self._webhook_cfg_int("webhook_max_queue_per_webhook", 500, 10, 10000),
+        )
+        # Affiliate URL resolution cache shared by every message/channel (memory LRU + SQLite tier).
+        self._affiliate_resolve_cache: Optional[UrlResolveCache] = UrlResolveCache.from_config(
+            self.config, Path(__file__).parent
+        )
+        # Live monitor capture: per-channel item maps in memory, flushed to monitor_data/*.json in the background.
+        self._monitor_capture = MonitorCaptureStore(
+            Path(__file__).resolve().parent / "monitor_data",
+            max_store=self._rs_fs_monitor_live_capture_store_max(),
+            flush_interval_s=self._rs_fs_monitor_live_capture_flush_interval_s(),
+            flush_dirty_items=self._rs_fs_monitor_live_capture_flush_dirty_items(),
+        )
+
         # RS - Full Send List sheet sync (Zephyr release feed -> Google Sheet)
         self._rs_fs_sheet = rs_fs_sheet_sync.RsFsSheetSync(self.config)
         self._rs_fs_seen_message_ids: Set[int] = set()
@@ -1300,6 +1324,13 @@ class RSForwarderBot:
         self._setup_events()
         self._setup_commands()
 
+    def _webhook_cfg_int(self, key: str, default: int, lo: int, hi: int) -> int:
+        try:
+            v = int((self.config or {}).get(key) or default)
+        except Exception:
+            v = default
+        return max(lo, min(v, hi))
+
     def _mavely_monitor_interval_s(self) -> int:
         try:
             v = int((self.config or {}).get("mavely_monitor_interval_s") or 300)
@@ -1313,6 +1344,8 @@ class RSForwarderBot:
         (`[AffiliateDebug]`) uses `affiliate_rewrite_debug` / AFFILIATE_REWRITE_DEBUG — not `repost_debug`."""
         base = dict(self.config or {})
         base["_affiliate_compute_memo"] = {}
+        if self._affiliate_resolve_cache is not None:
+            base["_affiliate_resolve_cache"] = self._affiliate_resolve_cache
         return base
 
     def _rs_server_guild_id(self) -> int:
@@ -1569,6 +1602,8 @@ class RSForwarderBot:
         
         rows: List[List[str]] = []
         last_seen = rs_fs_sheet_sync.RsFsSheetSync._utc_now_iso()  # type: ignore[attr-defined]
+        # The resolver reads monitor_data from disk; write out pending live captures first.
+        await self._monitor_capture.flush()
         monitor_resolver = RsFsMonitorDataResolver(Path(__file__).resolve().parent / "monitor_data")
 
         for r in recs:
@@ -3289,16 +3324,17 @@ class RSForwarderBot:
         Returns True on successful POST to webhook.
         """
         try:
-            import requests
-
             src_ch_ref = _discord_channel_mention(channel_id)
             key_part = f" dedupe_key={dedupe_key_short}" if dedupe_key_short else ""
             webhook_exec = _webhook_post_url_with_wait(webhook_url)
-            response = requests.post(webhook_exec, json=payload, timeout=10)
+            response = await self._webhook_delivery.deliver(webhook_exec, payload)
 
-            if response.status_code in [200, 204]:
+            if response.ok:
                 self.stats["messages_forwarded"] += 1
-                posted_url, dest_ch_ref = _posted_message_url_from_webhook_response(response, webhook_url)
+                # May fall back to a blocking webhook GET for guild_id; keep it off the loop.
+                posted_url, dest_ch_ref = await asyncio.to_thread(
+                    _posted_message_url_from_webhook_response, response, webhook_url
+                )
                 dest_part = dest_ch_ref or "(unknown dest channel)"
                 posted_part = posted_url or "(no message id; webhook wait=true response empty)"
                 embed_count = len(payload.get("embeds") or [])
@@ -3315,7 +3351,12 @@ class RSForwarderBot:
                 return True
 
             self.stats["errors"] += 1
-            error_msg = f"{response.status_code}: {str(response.text or '')[:200]}"
+            if response.status_code:
+                error_msg = f"{response.status_code}: {str(response.text or '')[:200]}"
+            else:
+                error_msg = response.error or "webhook delivery failed"
+            if response.attempts > 1:
+                error_msg += f" (after {response.attempts} attempts)"
             print(
                 f"{Colors.RED}[Forward]{key_part} ✗ {src_ch_ref} Error {error_msg}{Colors.RESET}",
                 flush=True,
@@ -3825,6 +3866,20 @@ class RSForwarderBot:
             v = 5000
         return max(100, min(v, 25000))
 
+    def _rs_fs_monitor_live_capture_flush_interval_s(self) -> float:
+        try:
+            v = float((self.config or {}).get("rs_fs_monitor_live_capture_flush_interval_s") or 5)
+        except Exception:
+            v = 5.0
+        return max(1.0, min(v, 300.0))
+
+    def _rs_fs_monitor_live_capture_flush_dirty_items(self) -> int:
+        try:
+            v = int((self.config or {}).get("rs_fs_monitor_live_capture_flush_dirty_items") or 50)
+        except Exception:
+            v = 50
+        return max(1, min(v, 5000))
+
     def _rs_fs_monitor_channel_key_by_id(self) -> Dict[int, str]:
         """
         Reverse map of config rs_fs_monitor_channel_ids: channel_id -> channel_key.
@@ -3977,6 +4032,7 @@ class RSForwarderBot:
                     query=str(q),
                     limit=3,
                     exclude_channels=set(),  # monitor_data_search already excludes needoh-aio by default in CLI; here we want same behavior
+                    unflushed=self._monitor_capture.unflushed_items(),
                 )
             except Exception:
                 hits = []
@@ -4033,7 +4089,8 @@ class RSForwarderBot:
 
     async def _maybe_capture_monitor_message(self, message: discord.Message) -> None:
         """
-        If this message is in a configured monitor channel, upsert it into monitor_data/<channel_key>.json.
+        If this message is in a configured monitor channel, upsert it into monitor_data/<channel_key>.json
+        (in memory via MonitorCaptureStore; the file is written by its background flush).
         """
         if not self._rs_fs_monitor_live_capture_enabled():
             return
@@ -4047,31 +4104,6 @@ class RSForwarderBot:
         if not channel_key:
             return
 
-        def _build_item_key(pid_obj: dict, title_key: str) -> str:
-            try:
-                if isinstance(pid_obj, dict) and str(pid_obj.get("kind") or "") in {"field", "derived"} and str(pid_obj.get("value") or "").strip():
-                    nm = str(pid_obj.get("name") or "ID").strip()
-                    val = str(pid_obj.get("value") or "").strip()
-                    return f"{nm}:{val}"
-            except Exception:
-                pass
-            return f"TITLE:{title_key}"
-
-        def _norm_title_key(raw_title: str) -> str:
-            # Mirror fetch_monitor_channels._upsert_channel_messages normalization (no second implementation of storage).
-            try:
-                import re as _re
-
-                t = str(raw_title or "").strip().lower()
-                t = _re.sub(r"\s+", " ", t)
-                t = _re.sub(r"[^a-z0-9\s]+", "", t)
-                t = t.strip()
-                if len(t) > 140:
-                    t = t[:140].strip()
-                return t
-            except Exception:
-                return ""
-
         try:
             embeds = []
             for e in (getattr(message, "embeds", None) or []):
@@ -4102,8 +4134,6 @@ class RSForwarderBot:
             # For readable logs + NEW/UPDATE classification.
             product_title = str((human or {}).get("title") or title or "").strip()
             product_url = str((human or {}).get("url") or primary_url or "").strip()
-            title_key = _norm_title_key(product_title) or f"msg-{str(msg_dict.get('id') or '')}"
-            item_key = _build_item_key(product_id if isinstance(product_id, dict) else {}, title_key)
             stored_msg = {
                 "id": msg_dict.get("id") or "",
                 "timestamp": msg_dict.get("timestamp") or "",
@@ -4122,26 +4152,9 @@ class RSForwarderBot:
             return
 
         try:
-            out_dir = Path(__file__).resolve().parent / "monitor_data"
-            store_path = out_dir / f"{channel_key}.json"
-            existed = False
+            self._monitor_capture.max_store = self._rs_fs_monitor_live_capture_store_max()
+            existed, unique_items = await self._monitor_capture.upsert_message(str(channel_key), int(ch_id), stored_msg)
             try:
-                if store_path.exists():
-                    prev_obj = json.loads(store_path.read_text(encoding="utf-8", errors="replace") or "{}")
-                    prev_items = prev_obj.get("items_by_key") if isinstance(prev_obj, dict) else None
-                    if isinstance(prev_items, dict) and item_key in prev_items:
-                        existed = True
-            except Exception:
-                existed = False
-            out = _fetch_monitor_channels._upsert_channel_messages(  # type: ignore[attr-defined]
-                store_path,
-                channel_key=str(channel_key),
-                channel_id=int(ch_id),
-                new_messages=[stored_msg],
-                max_store=self._rs_fs_monitor_live_capture_store_max(),
-            )
-            try:
-                items = out.get("item_keys_sorted") or []
                 pid = (stored_msg.get("extracted") or {}).get("product_id") if isinstance(stored_msg.get("extracted"), dict) else {}
                 pid_txt = ""
                 if isinstance(pid, dict):
@@ -4158,7 +4171,7 @@ class RSForwarderBot:
                 # One readable line, stable fields.
                 line = (
                     f"{Colors.CYAN}[MonitorData]{Colors.RESET} {action} "
-                    f"channel={channel_key} unique_items={len(items)} "
+                    f"channel={channel_key} unique_items={unique_items} "
                     f"id={pid_txt or 'NONE'} "
                     f"product={safe_title!r}"
                 )
@@ -4368,6 +4381,7 @@ class RSForwarderBot:
             debug_enabled = False
 
         try:
+            await self._monitor_capture.flush()
             resolver = RsFsMonitorDataResolver(Path(__file__).resolve().parent / "monitor_data")
             hit = resolver.resolve(store=store, sku=sku, monitor_tag="")
         except Exception:
@@ -8575,7 +8589,12 @@ class RSForwarderBot:
             # Stats
             embed.add_field(
                 name="Statistics",
-                value=f"Messages Forwarded: {self.stats['messages_forwarded']}\nErrors: {self.stats['errors']}",
+                value=(
+                    f"Messages Forwarded: {self.stats['messages_forwarded']}\nErrors: {self.stats['errors']}\n"
+                    f"Webhook queue: {self.stats.get('webhook_queue_depth', 0)} (max {self.stats.get('webhook_queue_depth_max', 0)}) | "
+                    f"retries {self.stats.get('webhook_retries', 0)} | 429s {self.stats.get('webhook_rate_limited', 0)}\n"
+                    f"Webhook latency: avg {self.stats.get('webhook_latency_ms_avg', 0.0)}ms / p95 {self.stats.get('webhook_latency_ms_p95', 0.0)}ms"
+                ),
                 inline=False
             )
             
@@ -9068,12 +9087,50 @@ class RSForwarderBot:
                     lines.append(f"- last CDP harvest: {ts_str} (ok={hv_ok})")
                 if hv_msg:
                     lines.append(f"- harvest msg: `{hv_msg[:240]}`")
+                mint_cache = affiliate_rewriter.mavely_mint_cache(self.config)
+                if mint_cache is not None:
+                    ms = mint_cache.stats()
+                    lines.append(
+                        f"- mint cache: {ms['entries']} link(s), hits {ms['hits']} (refused {ms['negative_hits']}) "
+                        f"/ misses {ms['misses']}, account changes {ms['invalidations']}"
+                    )
                 lines.append(f"- monitor log: `{self._mavely_monitor_log_path()}`")
                 lines.append("- manual login: `oracle_novnc_tunnel.bat` → Mavely → `!rsmavelysync`")
                 await ctx.send("\n".join(lines)[:1900])
             except Exception as e:
                 await ctx.send(f"❌ Failed to read Mavely status: {str(e)[:300]}")
         
+        @self.bot.command(name="rsresolvecache", aliases=["resolvecache"])
+        async def resolve_cache_stats(ctx, action: str = ""):
+            """Show affiliate URL resolution cache counters; `clear` empties it (admin only)."""
+            cache = self._affiliate_resolve_cache
+            if cache is None:
+                await ctx.send("ℹ️ Affiliate resolve cache is disabled (`affiliate_resolve_cache.enabled`).")
+                return
+            if (action or "").strip().lower() == "clear":
+                if not (
+                    getattr(ctx, "guild", None) is not None
+                    and getattr(ctx.author, "guild_permissions", None)
+                    and ctx.author.guild_permissions.administrator
+                ):
+                    await ctx.send("❌ You don't have permission to use this command.")
+                    return
+                cache.clear()
+                await ctx.send("✅ Affiliate resolve cache cleared (memory + disk).")
+                return
+            st = cache.stats()
+            lines = [
+                f"**Affiliate resolve cache** (`{cache.path or 'memory only'}`)",
+                f"- entries: memory {st['memory_size']}/{cache.memory_entries}, disk {st['disk_size']}",
+                f"- hits: memory {int(st['memory_hits'])}, disk {int(st['disk_hits'])} "
+                f"(negative {int(st['negative_hits'])}) / misses {int(st['misses'])} — hit rate {st['hit_rate']:.1%}",
+                f"- stores {int(st['stores'])}, evictions {int(st['evictions'])}, expired {int(st['expired'])}",
+                f"- resolve latency (misses): avg {st['resolve_ms_avg']}ms / max {st['resolve_ms_max']}ms "
+                f"/ last {st['resolve_ms_last']}ms over {int(st['resolve_count'])} resolve(s)",
+                f"- ttl {int(cache.ttl_s)}s, negative ttl {int(cache.negative_ttl_s)}s, host overrides {len(cache.host_ttl_s)}",
+            ]
+            await ctx.send("\n".join(lines)[:1900])
+
         @self.bot.command(name='rscommands', aliases=['commands'])
         async def bot_help(ctx):
             """Show available commands"""
@@ -9100,6 +9157,7 @@ class RSForwarderBot:
                 ("`!rsmavelystatus`", "Show Mavely CDP harvest + preflight status (admin only)"),
                 ("`!rsmavelyalertme`", "DM me if Mavely session expires (admin only)"),
                 ("`!rsmavelyalertoff`", "Disable Mavely expiry DMs (admin only)"),
+                ("`!rsresolvecache [clear]`", "Affiliate URL resolve cache hits/misses/latency (clear: admin only)"),
                 ("`!rscommands`", "Show this help message"),
             ]
             
@@ -9819,6 +9877,18 @@ class RSForwarderBot:
             print(f"{Colors.CYAN}Stats:{Colors.RESET}")
             print(f"  Messages forwarded: {self.stats['messages_forwarded']}")
             print(f"  Errors: {self.stats['errors']}")
+        finally:
+            await self._webhook_delivery.close()
+            await self._monitor_capture.close()
+            if self._affiliate_resolve_cache is not None:
+                self._affiliate_resolve_cache.close()
+            mint_cache = affiliate_rewriter.mavely_mint_cache(self.config)
+            if mint_cache is not None:
+                mint_cache.close()
+            title_cache = rs_fs_sheet_sync.title_cache(self.config)
+            if title_cache is not None:
+                title_cache.close()
+            await _outbound_url_resolve.close_shared_session()
 
 
 def main():
@@ -9826,8 +9896,23 @@ def main():
     import argparse
     parser = argparse.ArgumentParser(add_help=True)
     parser.add_argument("--check-config", action="store_true", help="Validate config + secrets and exit (no Discord connection).")
+    parser.add_argument(
+        "--benchmark-resolve",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="CORPUS",
+        help="Replay the outbound URL resolve corpus against a local stub server and exit (offline).",
+    )
+    parser.add_argument("--benchmark-rounds", type=int, default=1, help="Rounds per mode for --benchmark-resolve.")
     args = parser.parse_args()
 
+    if args.benchmark_resolve is not None:
+        from RSForwarder import outbound_resolve_bench
+
+        corpus = Path(args.benchmark_resolve) if args.benchmark_resolve else None
+        sys.exit(asyncio.run(outbound_resolve_bench.run_benchmark(corpus, rounds=args.benchmark_rounds)))
+
     if args.check_config:
         base = Path(__file__).parent
         cfg, config_path, secrets_path = load_config_with_secrets(base)
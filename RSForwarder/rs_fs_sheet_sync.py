@@ -11,7 +11,14 @@ from pathlib import Path
 from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from urllib.parse import quote_plus
 
-import requests
+import aiohttp
+
+try:
+    from RSForwarder import outbound_url_resolve as _outbound_url_resolve
+    from RSForwarder.rs_fs_title_cache import BLOCKED_ERROR, NOT_FOUND_ERRORS, RsFsTitleCache, StoreFetchGovernor
+except ImportError:
+    import outbound_url_resolve as _outbound_url_resolve
+    from rs_fs_title_cache import BLOCKED_ERROR, NOT_FOUND_ERRORS, RsFsTitleCache, StoreFetchGovernor
 
 
 def _cfg_bool(cfg: Dict[str, Any], key: str, default: bool) -> bool:
@@ -124,7 +131,34 @@ def _strip_title_suffix(title: str) -> str:
     return t
 
 
-async def _fetch_html(url: str, *, timeout_s: float = 12.0) -> Tuple[Optional[str], Optional[str]]:
+_TITLE_FETCH_MAX_BYTES = 512 * 1024
+_OG_TITLE_RE = re.compile(rb'<meta[^>]+property=["\']og:title["\'][^>]+content=["\'][^"\']+["\']', re.IGNORECASE)
+_AMAZON_PRODUCT_TITLE_RE = re.compile(rb'id=["\']productTitle["\'][^>]*>\s*[^<]+<', re.IGNORECASE)
+_TITLE_CLOSE_RE = re.compile(rb"</title\s*>", re.IGNORECASE)
+_HEAD_CLOSE_RE = re.compile(rb"</head\s*>", re.IGNORECASE)
+
+
+def _title_html_complete(buf: bytes, start: int, *, amazon: bool) -> bool:
+    """
+    True once `buf` holds everything _extract_title_from_html would use, so the rest of the page
+    can be skipped: og:title, Amazon's #productTitle, or (elsewhere) <title> with the whole <head>
+    (og:title may follow <title> inside <head>).
+    """
+    if _OG_TITLE_RE.search(buf, start):
+        return True
+    if amazon:
+        return bool(_AMAZON_PRODUCT_TITLE_RE.search(buf, start))
+    return bool(_HEAD_CLOSE_RE.search(buf, start)) and bool(_TITLE_CLOSE_RE.search(buf))
+
+
+async def _fetch_html(
+    url: str,
+    *,
+    store: str = "",
+    timeout_s: float = 12.0,
+    max_bytes: int = _TITLE_FETCH_MAX_BYTES,
+) -> Tuple[Optional[str], Optional[str]]:
+    """GET `url` on the shared aiohttp session and stop reading once the title markup is in."""
     u = (url or "").strip()
     if not (u.startswith("http://") or u.startswith("https://")):
         return None, "invalid url"
@@ -141,24 +175,27 @@ async def _fetch_html(url: str, *, timeout_s: float = 12.0) -> Tuple[Optional[st
         "Cache-Control": "no-cache",
         "Pragma": "no-cache",
     }
-    def _do() -> Tuple[Optional[str], Optional[str]]:
-        try:
-            r = requests.get(u, headers=headers, timeout=float(timeout_s), allow_redirects=True)
-        except Exception as e:
-            return None, str(e)
-        try:
-            ct = (r.headers.get("content-type") or "").lower()
-        except Exception:
-            ct = ""
-        if int(getattr(r, "status_code", 0) or 0) >= 400:
-            return None, f"http {getattr(r, 'status_code', '')}"
-        # Even if ct isn't HTML, some sites mislabel; we still try to parse title.
-        text = getattr(r, "text", None)
-        if not isinstance(text, str) or not text.strip():
-            return None, "empty body"
-        return text, None
-
-    return await asyncio.to_thread(_do)
+    amazon = "amazon" in (store or "").lower()
+    try:
+        session = _outbound_url_resolve.shared_session()
+        timeout = aiohttp.ClientTimeout(total=float(timeout_s))
+        async with session.get(u, headers=headers, timeout=timeout, allow_redirects=True) as resp:
+            if int(resp.status or 0) >= 400:
+                return None, f"http {resp.status}"
+            # Even if ct isn't HTML, some sites mislabel; we still try to parse title.
+            buf = bytearray()
+            async for chunk in resp.content.iter_chunked(16 * 1024):
+                # Re-scan a little of the previous chunk so a tag split across chunks still matches.
+                start = max(0, len(buf) - 1024)
+                buf.extend(chunk)
+                if len(buf) >= max_bytes or _title_html_complete(bytes(buf), start, amazon=amazon):
+                    break
+            text = bytes(buf[:max_bytes]).decode(resp.charset or "utf-8", errors="replace")
+    except Exception as e:
+        return None, str(e) or type(e).__name__
+    if not text.strip():
+        return None, "empty body"
+    return text, None
 
 
 def _extract_title_from_html(html: str, *, store: str = "") -> str:
@@ -186,39 +223,79 @@ def _extract_title_from_html(html: str, *, store: str = "") -> str:
     return ""
 
 
-async def fetch_product_title(store: str, sku: str) -> Tuple[str, Optional[str]]:
+def _classify_title(title: str) -> Tuple[str, Optional[str]]:
+    t0 = (title or "").strip()
+    t0_l = t0.lower()
+    # Common anti-bot / interstitial titles (especially Walmart)
+    if "robot or human" in t0_l or "access denied" in t0_l or "verify you are a human" in t0_l:
+        return "", BLOCKED_ERROR
+    # Generic/non-product titles (treat as missing to avoid writing junk like "Amazon.com" or "Target")
+    if t0_l in {"amazon.com", "amazon", "target", "walmart", "best buy", "bestbuy", "costco", "gamestop"}:
+        return "", "title not found"
+    return title, None if title else "title not found"
+
+
+_title_cache: Optional[RsFsTitleCache] = None
+_title_cache_loaded = False
+_title_governor: Optional[StoreFetchGovernor] = None
+_title_governor_settings: Optional[Dict[str, Any]] = None
+
+
+def title_cache(cfg: Dict[str, Any]) -> Optional[RsFsTitleCache]:
+    """Process-wide title cache (built from cfg on first use; None when disabled or unusable)."""
+    global _title_cache, _title_cache_loaded
+    if not _title_cache_loaded:
+        _title_cache_loaded = True
+        try:
+            _title_cache = RsFsTitleCache.from_config(cfg, Path(__file__).resolve().parent)
+        except Exception as e:
+            print(f"[RS-FS] title cache disabled: {e}")
+            _title_cache = None
+    return _title_cache
+
+
+def _title_fetch_governor(cfg: Dict[str, Any]) -> StoreFetchGovernor:
+    """Process-wide governor so concurrent !rsfs runs share the per-store limits; rebuilt if its config changes."""
+    global _title_governor, _title_governor_settings
+    settings = StoreFetchGovernor.settings_from_config(cfg)
+    if _title_governor is None or settings != _title_governor_settings:
+        _title_governor = StoreFetchGovernor(**settings)
+        _title_governor_settings = settings
+    return _title_governor
+
+
+async def fetch_product_title(store: str, sku: str, cfg: Optional[Dict[str, Any]] = None) -> Tuple[str, Optional[str]]:
     url = build_store_link(store, sku)
     if not url:
         return "", "no store url"
+    cache = title_cache(cfg or {})
+    if cache is not None:
+        cached = cache.get(store, sku)
+        if cached is not None:
+            return cached
+    governor = _title_fetch_governor(cfg or {})
+    title, err = "", "title not found"
     for attempt in range(2):
-        html, err = await _fetch_html(url)
+        async with governor.slot(store):
+            html, err = await _fetch_html(url, store=store)
         if err or not html:
-            # No retry for 404 (permanent)
-            if err and "404" in str(err):
-                return "", err
+            # No retry for 404 / 410 (permanent)
+            if err in NOT_FOUND_ERRORS:
+                break
+            # One retry, paced by the store's slot interval.
             if attempt == 0 and err:
-                await asyncio.sleep(2.5)
                 continue
-            return "", err
-        title = _extract_title_from_html(html, store=store)
-        t0 = (title or "").strip()
-        t0_l = t0.lower()
-        # Common anti-bot / interstitial titles (especially Walmart)
-        if t0_l in {"robot or human?", "robot or human"} or "robot or human" in t0_l:
+            break
+        title, err = _classify_title(_extract_title_from_html(html, store=store))
+        if err == BLOCKED_ERROR:
+            # Hold the whole store (not just this SKU) before the retry.
+            governor.blocked(store)
             if attempt == 0:
-                await asyncio.sleep(2.5)
                 continue
-            return "", "blocked (anti-bot)"
-        if "access denied" in t0_l or "verify you are a human" in t0_l:
-            if attempt == 0:
-                await asyncio.sleep(2.5)
-                continue
-            return "", "blocked (anti-bot)"
-        # Generic/non-product titles (treat as missing to avoid writing junk like "Amazon.com" or "Target")
-        if t0_l in {"amazon.com", "amazon", "target", "walmart", "best buy", "bestbuy", "costco", "gamestop"}:
-            return "", "title not found"
-        return title, None if title else "title not found"
-    return "", "title not found"
+        break
+    if cache is not None:
+        cache.put(store, sku, title, err)
+    return title, err
 
 
 @dataclass(frozen=True)
@@ -1860,24 +1937,16 @@ async def build_preview_entries(
     if not unique:
         return []
 
-    # Concurrency limit to avoid hammering stores
-    try:
-        conc = int((cfg or {}).get("rs_fs_title_fetch_concurrency") or 3)
-    except Exception:
-        conc = 3
-    conc = max(1, min(conc, 5))
-    sem = asyncio.Semaphore(conc)
-
+    # Per-store and overall fetch limits live in fetch_product_title's governor; cached SKUs skip them.
     async def _one(st: str, sk: str) -> RsFsPreviewEntry:
         url = build_store_link(st, sk)
         title = ""
         err = ""
-        async with sem:
-            if url:
-                title, err2 = await fetch_product_title(st, sk)
-                err = err2 or ""
-            else:
-                err = "no store url"
+        if url:
+            title, err2 = await fetch_product_title(st, sk, cfg)
+            err = err2 or ""
+        else:
+            err = "no store url"
         # IMPORTANT: never write the URL into the title column.
         # If title extraction fails, keep title blank and rely on monitor/manual resolution.
         if not (title or "").strip():
@@ -1899,6 +1968,8 @@ async def build_preview_entries(
     total = len(unique)
     results: List[Optional[RsFsPreviewEntry]] = [None] * total
     errors = 0
+    cache = title_cache(cfg or {})
+    before = dict(cache.counters) if cache is not None else {}
 
     tasks: List[asyncio.Task] = []
     for i, (st, sk) in enumerate(unique):
@@ -1920,6 +1991,11 @@ async def build_preview_entries(
             except Exception:
                 pass
 
+    if cache is not None:
+        hits = cache.counters["hits"] - before.get("hits", 0)
+        neg = cache.counters["negative_hits"] - before.get("negative_hits", 0)
+        print(f"[RS-FS] website titles: {total} pair(s), cached={hits} cached_fail={neg} fetched={total - hits - neg}")
+
     out: List[RsFsPreviewEntry] = []
     for r in results:
         if isinstance(r, RsFsPreviewEntry):
@@ -0,0 +1,205 @@
+"""
+RS-FS website title lookups: persistent title cache + per-store fetch governor.
+
+Cache (SQLite `rs_fs_title_cache_file`, next to the bot), keyed by "store|sku":
+- titles live for `rs_fs_title_cache_ttl_s`
+- anti-bot pages ("blocked (anti-bot)") are remembered for `rs_fs_title_cache_blocked_ttl_s`
+- 404 / 410 for `rs_fs_title_cache_not_found_ttl_s`
+Other failures (timeouts, 5xx, no title) are not cached, so the next run tries again.
+
+Governor: at most `rs_fs_title_fetch_per_store_concurrency` fetches per store at once, started
+at least `rs_fs_title_fetch_per_store_min_interval_s` apart, and `rs_fs_title_fetch_concurrency`
+across all stores. `rs_fs_title_fetch_store_overrides` ({"walmart": {"concurrency": 1,
+"min_interval_s": 2.0}}) tightens single stores. An anti-bot page holds that store for
+`rs_fs_title_fetch_blocked_backoff_s` before its next fetch.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS title_cache (
+    key TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    error TEXT NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+BLOCKED_ERROR = "blocked (anti-bot)"
+NOT_FOUND_ERRORS = {"http 404", "http 410"}
+
+
+def title_cache_key(store: str, sku: str) -> str:
+    return f"{(store or '').strip().lower()}|{(sku or '').strip().lower()}"
+
+
+class RsFsTitleCache:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        ttl_s: float = 604800.0,
+        blocked_ttl_s: float = 1800.0,
+        not_found_ttl_s: float = 86400.0,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.blocked_ttl_s = max(0.0, float(blocked_ttl_s))
+        self.not_found_ttl_s = max(0.0, float(not_found_ttl_s))
+        self.counters: Dict[str, int] = {"hits": 0, "negative_hits": 0, "misses": 0, "stores": 0}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db.execute("DELETE FROM title_cache WHERE expires_at <= ?", (time.time(),))
+        self._db.commit()
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any], base_dir: Path) -> Optional["RsFsTitleCache"]:
+        """Build from the rs_fs_title_cache_* keys in config.json; None when disabled."""
+        c = cfg or {}
+        if c.get("rs_fs_title_cache_enabled") is False:
+            return None
+        path = Path(str(c.get("rs_fs_title_cache_file") or "rs_fs_title_cache.sqlite3").strip())
+        if not path.is_absolute():
+            path = Path(base_dir) / path
+        return cls(
+            path,
+            ttl_s=float(c.get("rs_fs_title_cache_ttl_s", 604800) or 0),
+            blocked_ttl_s=float(c.get("rs_fs_title_cache_blocked_ttl_s", 1800) or 0),
+            not_found_ttl_s=float(c.get("rs_fs_title_cache_not_found_ttl_s", 86400) or 0),
+        )
+
+    def get(self, store: str, sku: str) -> Optional[Tuple[str, Optional[str]]]:
+        """(title, None) or ("", error) for a live entry; None on miss."""
+        row = self._db.execute(
+            "SELECT title, error, expires_at FROM title_cache WHERE key = ?", (title_cache_key(store, sku),)
+        ).fetchone()
+        if row is None or float(row[2]) <= time.time():
+            self.counters["misses"] += 1
+            return None
+        if row[0]:
+            self.counters["hits"] += 1
+            return str(row[0]), None
+        self.counters["negative_hits"] += 1
+        return "", str(row[1])
+
+    def put(self, store: str, sku: str, title: str, error: Optional[str]) -> None:
+        """Store a fetch result; transient failures are skipped."""
+        if title:
+            ttl, err = self.ttl_s, ""
+        elif error == BLOCKED_ERROR:
+            ttl, err = self.blocked_ttl_s, error
+        elif error in NOT_FOUND_ERRORS:
+            ttl, err = self.not_found_ttl_s, error
+        else:
+            return
+        if ttl <= 0:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO title_cache (key, title, error, expires_at) VALUES (?, ?, ?, ?)",
+            (title_cache_key(store, sku), title or "", err, time.time() + ttl),
+        )
+        self._db.commit()
+        self.counters["stores"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = dict(self.counters)
+        out["entries"] = int(self._db.execute("SELECT COUNT(*) FROM title_cache").fetchone()[0])
+        return out
+
+    def close(self) -> None:
+        try:
+            self._db.close()
+        except Exception:
+            pass
+
+
+class _StoreSlot:
+    __slots__ = ("sem", "lock", "min_interval_s", "next_at")
+
+    def __init__(self, concurrency: int, min_interval_s: float) -> None:
+        self.sem = asyncio.Semaphore(max(1, int(concurrency)))
+        self.lock = asyncio.Lock()
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self.next_at = 0.0
+
+
+class StoreFetchGovernor:
+    def __init__(
+        self,
+        *,
+        total: int = 8,
+        per_store: int = 2,
+        min_interval_s: float = 0.5,
+        blocked_backoff_s: float = 5.0,
+        overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.total = max(1, int(total))
+        self.per_store = max(1, int(per_store))
+        self.min_interval_s = max(0.0, float(min_interval_s))
+        self.blocked_backoff_s = max(0.0, float(blocked_backoff_s))
+        self.overrides = {str(k).strip().lower(): v for (k, v) in (overrides or {}).items() if isinstance(v, dict)}
+        self._total = asyncio.Semaphore(self.total)
+        self._stores: Dict[str, _StoreSlot] = {}
+
+    @classmethod
+    def settings_from_config(cls, cfg: Dict[str, Any]) -> Dict[str, Any]:
+        c = cfg or {}
+
+        def _num(key: str, default: float, lo: float, hi: float) -> float:
+            try:
+                v = float(c.get(key, default))
+            except Exception:
+                v = default
+            return max(lo, min(v, hi))
+
+        overrides = c.get("rs_fs_title_fetch_store_overrides")
+        return {
+            "total": int(_num("rs_fs_title_fetch_concurrency", 8, 1, 32)),
+            "per_store": int(_num("rs_fs_title_fetch_per_store_concurrency", 2, 1, 8)),
+            "min_interval_s": _num("rs_fs_title_fetch_per_store_min_interval_s", 0.5, 0.0, 30.0),
+            "blocked_backoff_s": _num("rs_fs_title_fetch_blocked_backoff_s", 5.0, 0.0, 120.0),
+            "overrides": overrides if isinstance(overrides, dict) else {},
+        }
+
+    def _slot(self, store: str) -> _StoreSlot:
+        key = (store or "").strip().lower()
+        slot = self._stores.get(key)
+        if slot is None:
+            ov: Dict[str, Any] = {}
+            for name, o in self.overrides.items():
+                if name and name in key:
+                    ov = o
+                    break
+            slot = _StoreSlot(
+                int(ov.get("concurrency", self.per_store) or self.per_store),
+                float(ov.get("min_interval_s", self.min_interval_s) or 0.0),
+            )
+            self._stores[key] = slot
+        return slot
+
+    @contextlib.asynccontextmanager
+    async def slot(self, store: str) -> AsyncIterator[None]:
+        """Hold for one fetch from `store` (store limit first, so a busy store never pins global slots)."""
+        st = self._slot(store)
+        async with st.sem:
+            async with st.lock:
+                wait = st.next_at - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                st.next_at = time.monotonic() + st.min_interval_s
+            async with self._total:
+                yield
+
+    def blocked(self, store: str) -> None:
+        """The store served an anti-bot page: hold its next fetch for blocked_backoff_s."""
+        st = self._slot(store)
+        st.next_at = max(st.next_at, time.monotonic() + self.blocked_backoff_s)
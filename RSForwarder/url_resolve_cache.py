@@ -0,0 +1,269 @@
+"""
+Cross-message URL resolution cache for affiliate_rewriter.
+
+Maps a normalized raw URL (what was posted) to the final merchant URL the resolve step
+produced, plus the hop chain. Two tiers:
+- memory: LRU (OrderedDict) bounded by `memory_entries`
+- disk: SQLite table next to the bot, so a restart keeps warm entries
+
+Entries expire per host of the raw URL (`host_ttl_s`, suffix match, else `ttl_s`).
+Failed resolves (no acceptable merchant) are cached for `negative_ttl_s` so a dead link
+posted to ten channels is probed once, not ten times.
+
+`claim(url)` serializes resolves of the same URL: the second caller waits for the first
+and then reads its entry instead of resolving in parallel.
+
+Counters (read by `!rsresolvecache`): memory_hits / disk_hits / negative_hits / misses /
+stores / evictions / expired, plus resolve latency (last / avg / max) for misses.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resolve_cache (
+    url TEXT PRIMARY KEY,
+    final_url TEXT NOT NULL,
+    chain TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+def _host_of(url: str) -> str:
+    try:
+        host = (urlparse(url).netloc or "").lower()
+    except Exception:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+class UrlResolveCache:
+    def __init__(
+        self,
+        path: Optional[Path],
+        *,
+        ttl_s: float = 21600.0,
+        negative_ttl_s: float = 600.0,
+        host_ttl_s: Optional[Dict[str, float]] = None,
+        memory_entries: int = 5000,
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.negative_ttl_s = max(0.0, float(negative_ttl_s))
+        self.host_ttl_s: Dict[str, float] = {}
+        for host, ttl in (host_ttl_s or {}).items():
+            h = str(host or "").strip().lower()
+            if h.startswith("www."):
+                h = h[4:]
+            if h:
+                self.host_ttl_s[h] = max(0.0, float(ttl))
+        self.memory_entries = max(1, int(memory_entries))
+        # url -> (final_url, chain, ok, expires_at)
+        self._mem: "OrderedDict[str, Tuple[str, List[str], bool, float]]" = OrderedDict()
+        self._claims: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self.counters: Dict[str, float] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+            "resolve_count": 0,
+            "resolve_ms_total": 0.0,
+            "resolve_ms_last": 0.0,
+            "resolve_ms_max": 0.0,
+        }
+        if self.path is not None:
+            self._open_db()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], base_dir: Path) -> Optional["UrlResolveCache"]:
+        """Build from `affiliate_resolve_cache` in config.json; None when disabled."""
+        raw = (config or {}).get("affiliate_resolve_cache")
+        section: Dict[str, Any] = raw if isinstance(raw, dict) else {}
+        if section.get("enabled") is False:
+            return None
+        db_file = str(section.get("db_file") or "").strip()
+        path: Optional[Path] = None
+        if db_file:
+            path = Path(db_file)
+            if not path.is_absolute():
+                path = Path(base_dir) / path
+        host_ttl = section.get("host_ttl_s")
+        return cls(
+            path,
+            ttl_s=float(section.get("ttl_s", 21600) or 0),
+            negative_ttl_s=float(section.get("negative_ttl_s", 600) or 0),
+            host_ttl_s=host_ttl if isinstance(host_ttl, dict) else None,
+            memory_entries=int(section.get("memory_entries", 5000) or 5000),
+        )
+
+    def _open_db(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(_SCHEMA)
+            db.execute("DELETE FROM resolve_cache WHERE expires_at <= ?", (time.time(),))
+            db.commit()
+            self._db = db
+        except Exception as e:
+            print(f"[ResolveCache] disk tier disabled ({self.path}): {e}", flush=True)
+            self._db = None
+
+    def ttl_for(self, url: str, ok: bool) -> float:
+        if not ok:
+            return self.negative_ttl_s
+        host = _host_of(url)
+        while host:
+            if host in self.host_ttl_s:
+                return self.host_ttl_s[host]
+            if "." not in host:
+                break
+            host = host.split(".", 1)[1]
+        return self.ttl_s
+
+    def contains(self, url: str) -> bool:
+        """Live entry in either tier (no counters, no LRU bump)."""
+        key = (url or "").strip()
+        entry = self._mem.get(key)
+        if entry is not None:
+            return entry[3] > time.time()
+        if self._db is None or not key:
+            return False
+        try:
+            row = self._db.execute("SELECT expires_at FROM resolve_cache WHERE url = ?", (key,)).fetchone()
+        except Exception:
+            return False
+        return row is not None and float(row[0]) > time.time()
+
+    def get(self, url: str) -> Optional[Tuple[str, List[str], bool]]:
+        """(final_url, chain, ok) for a live entry, else None (counted as a miss)."""
+        key = (url or "").strip()
+        if not key:
+            return None
+        now = time.time()
+        entry = self._mem.get(key)
+        tier = "memory_hits"
+        if entry is not None and entry[3] <= now:
+            self._mem.pop(key, None)
+            self.counters["expired"] += 1
+            entry = None
+        if entry is None and self._db is not None:
+            try:
+                row = self._db.execute(
+                    "SELECT final_url, chain, ok, expires_at FROM resolve_cache WHERE url = ?", (key,)
+                ).fetchone()
+            except Exception:
+                row = None
+            if row is not None:
+                if float(row[3]) > now:
+                    try:
+                        chain = [str(x) for x in json.loads(row[1] or "[]")]
+                    except ValueError:
+                        chain = []
+                    entry = (str(row[0]), chain, bool(row[2]), float(row[3]))
+                    self._remember(key, entry)
+                    tier = "disk_hits"
+                else:
+                    self.counters["expired"] += 1
+        if entry is None:
+            self.counters["misses"] += 1
+            return None
+        self._mem.move_to_end(key)
+        self.counters[tier] += 1
+        if not entry[2]:
+            self.counters["negative_hits"] += 1
+        return entry[0], list(entry[1]), entry[2]
+
+    def put(self, url: str, final_url: str, chain: Optional[List[str]] = None, *, ok: bool, elapsed_s: float = 0.0) -> None:
+        key = (url or "").strip()
+        if not key or not final_url:
+            return
+        ms = max(0.0, float(elapsed_s)) * 1000.0
+        self.counters["resolve_count"] += 1
+        self.counters["resolve_ms_total"] += ms
+        self.counters["resolve_ms_last"] = round(ms, 1)
+        self.counters["resolve_ms_max"] = max(self.counters["resolve_ms_max"], round(ms, 1))
+        ttl = self.ttl_for(key, ok)
+        if ttl <= 0:
+            return
+        entry = (str(final_url), [str(x) for x in (chain or [])], bool(ok), time.time() + ttl)
+        self._remember(key, entry)
+        self.counters["stores"] += 1
+        if self._db is not None:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO resolve_cache (url, final_url, chain, ok, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, entry[0], json.dumps(entry[1]), int(entry[2]), entry[3]),
+                )
+                self._db.commit()
+            except Exception as e:
+                print(f"[ResolveCache] disk write failed: {e}", flush=True)
+
+    def _remember(self, key: str, entry: Tuple[str, List[str], bool, float]) -> None:
+        self._mem[key] = entry
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.memory_entries:
+            self._mem.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    @contextlib.asynccontextmanager
+    async def claim(self, url: str) -> AsyncIterator[None]:
+        """Hold while resolving `url`; concurrent callers for the same URL wait, then hit the cache."""
+        key = (url or "").strip()
+        lock, users = self._claims.get(key) or (asyncio.Lock(), 0)
+        self._claims[key] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._claims[key]
+            if users <= 1:
+                self._claims.pop(key, None)
+            else:
+                self._claims[key] = (lock, users - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        c = dict(self.counters)
+        lookups = c["memory_hits"] + c["disk_hits"] + c["misses"]
+        c["hit_rate"] = round((c["memory_hits"] + c["disk_hits"]) / lookups, 3) if lookups else 0.0
+        c["resolve_ms_avg"] = round(c["resolve_ms_total"] / c["resolve_count"], 1) if c["resolve_count"] else 0.0
+        c["memory_size"] = len(self._mem)
+        c["disk_size"] = 0
+        if self._db is not None:
+            try:
+                c["disk_size"] = int(self._db.execute("SELECT COUNT(*) FROM resolve_cache").fetchone()[0])
+            except Exception:
+                pass
+        return c
+
+    def clear(self) -> None:
+        self._mem.clear()
+        if self._db is not None:
+            try:
+                self._db.execute("DELETE FROM resolve_cache")
+                self._db.commit()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        if self._db is not None:
+            try:
+                self._db.close()
+            except Exception:
+                pass
+            self._db = None
@@ -0,0 +1,285 @@
+"""
+Async Discord webhook delivery for RSForwarder.
+
+One pooled aiohttp session, one FIFO queue + worker per webhook route, and Discord
+rate-limit bucket tracking (X-RateLimit-Remaining / Reset-After / Bucket, 429 retry_after,
+X-RateLimit-Global). Callers `await deliver(url, payload)` and get a result object that
+mimics the bits of `requests.Response` the forward path reads (status_code / text / json()).
+
+Counters are written into the dict passed as `stats` (the bot's `self.stats`):
+  webhook_queue_depth / webhook_queue_depth_max / webhook_sent / webhook_failed /
+  webhook_retries / webhook_rate_limited / webhook_latency_ms_last / _avg / _p95
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import aiohttp
+
+_WEBHOOK_ROUTE_RE = re.compile(r"/webhooks/(\d+)/([^/?\s]+)")
+_LATENCY_WINDOW = 200
+
+# Failures raised before the request reached Discord (safe to resend). A timeout or a dropped
+# connection after the body went out may still have posted the message, so those are not retried.
+_PRE_SEND_ERRORS: Tuple[type, ...] = tuple(
+    t for t in (aiohttp.ClientConnectorError, getattr(aiohttp, "ConnectionTimeoutError", None)) if t is not None
+)
+
+
+class WebhookDeliveryResult:
+    """Minimal response view; `_posted_message_url_from_webhook_response` only needs these."""
+
+    __slots__ = ("status_code", "text", "attempts", "latency_s", "error")
+
+    def __init__(self, status_code: int, text: str, *, attempts: int, latency_s: float, error: str = "") -> None:
+        self.status_code = int(status_code or 0)
+        self.text = str(text or "")
+        self.attempts = int(attempts or 0)
+        self.latency_s = float(latency_s or 0.0)
+        self.error = str(error or "")
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code in (200, 204)
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+def _webhook_route_key(url: str) -> str:
+    m = _WEBHOOK_ROUTE_RE.search(url or "")
+    return f"{m.group(1)}/{m.group(2)}" if m else (url or "").split("?", 1)[0]
+
+
+def _header_float(headers: Any, name: str) -> Optional[float]:
+    try:
+        raw = headers.get(name)
+        return float(raw) if raw not in (None, "") else None
+    except Exception:
+        return None
+
+
+class _Bucket:
+    """Discord rate-limit bucket state (shared by routes that report the same X-RateLimit-Bucket)."""
+
+    __slots__ = ("remaining", "reset_at")
+
+    def __init__(self) -> None:
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+
+    def wait_s(self, now: float) -> float:
+        if self.remaining is not None and self.remaining <= 0 and self.reset_at > now:
+            return self.reset_at - now
+        return 0.0
+
+
+class WebhookDeliveryPipeline:
+    def __init__(
+        self,
+        stats: Dict[str, Any],
+        *,
+        max_connections: int = 20,
+        timeout_s: float = 10.0,
+        max_retries: int = 3,
+        max_queue_per_webhook: int = 500,
+        idle_worker_s: float = 300.0,
+    ) -> None:
+        self._stats = stats
+        self._max_connections = max(1, int(max_connections))
+        self._timeout_s = max(1.0, float(timeout_s))
+        self._max_retries = max(0, int(max_retries))
+        self._max_queue = max(1, int(max_queue_per_webhook))
+        self._idle_worker_s = max(5.0, float(idle_worker_s))
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._queues: Dict[str, "asyncio.Queue[Tuple[str, Dict[str, Any], asyncio.Future]]"] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._route_bucket: Dict[str, str] = {}
+        self._buckets: Dict[str, _Bucket] = {}
+        self._global_reset_at: float = 0.0
+        self._latencies_ms: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._closed = False
+
+        for k in (
+            "webhook_queue_depth",
+            "webhook_queue_depth_max",
+            "webhook_sent",
+            "webhook_failed",
+            "webhook_retries",
+            "webhook_rate_limited",
+        ):
+            self._stats.setdefault(k, 0)
+        for k in ("webhook_latency_ms_last", "webhook_latency_ms_avg", "webhook_latency_ms_p95"):
+            self._stats.setdefault(k, 0.0)
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    async def deliver(self, url: str, payload: Dict[str, Any]) -> WebhookDeliveryResult:
+        """Queue one POST behind earlier sends to the same webhook and wait for its result."""
+        if self._closed:
+            return WebhookDeliveryResult(0, "", attempts=0, latency_s=0.0, error="delivery pipeline closed")
+        route = _webhook_route_key(url)
+        q = self._queues.get(route)
+        if q is None:
+            q = asyncio.Queue(maxsize=self._max_queue)
+            self._queues[route] = q
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        await q.put((url, payload, fut))
+        self._update_depth()
+        w = self._workers.get(route)
+        if w is None or w.done():
+            self._workers[route] = asyncio.create_task(self._worker(route, q))
+        return await fut
+
+    async def close(self) -> None:
+        self._closed = True
+        for t in list(self._workers.values()):
+            t.cancel()
+        for t in list(self._workers.values()):
+            try:
+                await t
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._workers.clear()
+        for q in self._queues.values():
+            while not q.empty():
+                _url, _payload, fut = q.get_nowait()
+                if not fut.done():
+                    fut.set_result(WebhookDeliveryResult(0, "", attempts=0, latency_s=0.0, error="delivery pipeline closed"))
+        self._update_depth()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._max_connections, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self._timeout_s),
+            )
+        return self._session
+
+    def _update_depth(self) -> None:
+        depth = sum(q.qsize() for q in self._queues.values())
+        self._stats["webhook_queue_depth"] = depth
+        if depth > int(self._stats.get("webhook_queue_depth_max") or 0):
+            self._stats["webhook_queue_depth_max"] = depth
+
+    def _record_latency(self, latency_s: float) -> None:
+        ms = round(latency_s * 1000.0, 1)
+        self._latencies_ms.append(ms)
+        ordered = sorted(self._latencies_ms)
+        self._stats["webhook_latency_ms_last"] = ms
+        self._stats["webhook_latency_ms_avg"] = round(sum(ordered) / len(ordered), 1)
+        self._stats["webhook_latency_ms_p95"] = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    async def _worker(self, route: str, q: "asyncio.Queue[Tuple[str, Dict[str, Any], asyncio.Future]]") -> None:
+        while True:
+            try:
+                url, payload, fut = await asyncio.wait_for(q.get(), timeout=self._idle_worker_s)
+            except asyncio.TimeoutError:
+                # Idle routes release their worker; deliver() restarts one on demand.
+                if q.empty():
+                    self._workers.pop(route, None)
+                    return
+                continue
+            self._update_depth()
+            try:
+                res = await self._send_with_retries(route, url, payload)
+            except asyncio.CancelledError:
+                if not fut.done():
+                    fut.set_result(WebhookDeliveryResult(0, "", attempts=0, latency_s=0.0, error="delivery pipeline closed"))
+                raise
+            except Exception as e:
+                res = WebhookDeliveryResult(0, "", attempts=1, latency_s=0.0, error=str(e)[:240])
+            if res.ok:
+                self._stats["webhook_sent"] = int(self._stats.get("webhook_sent") or 0) + 1
+            else:
+                self._stats["webhook_failed"] = int(self._stats.get("webhook_failed") or 0) + 1
+            if not fut.done():
+                fut.set_result(res)
+
+    async def _wait_for_bucket(self, route: str) -> None:
+        now = time.monotonic()
+        delay = max(0.0, self._global_reset_at - now)
+        bucket_id = self._route_bucket.get(route)
+        if bucket_id:
+            b = self._buckets.get(bucket_id)
+            if b is not None:
+                delay = max(delay, b.wait_s(now))
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _update_bucket(self, route: str, headers: Any) -> None:
+        bucket_id = str(headers.get("X-RateLimit-Bucket") or "").strip() or route
+        self._route_bucket[route] = bucket_id
+        b = self._buckets.get(bucket_id)
+        if b is None:
+            b = _Bucket()
+            self._buckets[bucket_id] = b
+        remaining = _header_float(headers, "X-RateLimit-Remaining")
+        reset_after = _header_float(headers, "X-RateLimit-Reset-After")
+        if remaining is not None:
+            b.remaining = int(remaining)
+        if reset_after is not None:
+            b.reset_at = time.monotonic() + max(0.0, reset_after)
+
+    async def _send_with_retries(self, route: str, url: str, payload: Dict[str, Any]) -> WebhookDeliveryResult:
+        t0 = time.monotonic()
+        attempts = 0
+        last_status = 0
+        last_text = ""
+        last_err = ""
+        while attempts <= self._max_retries:
+            attempts += 1
+            await self._wait_for_bucket(route)
+            t_req = time.monotonic()
+            try:
+                async with self._get_session().post(url, json=payload) as resp:
+                    text = await resp.text()
+                    self._update_bucket(route, resp.headers)
+                    last_status, last_text, last_err = int(resp.status), text, ""
+                    if resp.status == 429:
+                        self._stats["webhook_rate_limited"] = int(self._stats.get("webhook_rate_limited") or 0) + 1
+                        retry_after = _header_float(resp.headers, "Retry-After")
+                        is_global = str(resp.headers.get("X-RateLimit-Global") or "").lower() == "true"
+                        try:
+                            body = json.loads(text) if text else {}
+                            retry_after = float(body.get("retry_after", retry_after) or 0.0)
+                            is_global = is_global or bool(body.get("global"))
+                        except Exception:
+                            pass
+                        delay = max(0.05, float(retry_after or 1.0))
+                        if is_global:
+                            self._global_reset_at = time.monotonic() + delay
+                        if attempts <= self._max_retries:
+                            self._stats["webhook_retries"] = int(self._stats.get("webhook_retries") or 0) + 1
+                            await asyncio.sleep(delay)
+                        continue
+                    if resp.status >= 500 and attempts <= self._max_retries:
+                        self._stats["webhook_retries"] = int(self._stats.get("webhook_retries") or 0) + 1
+                        await asyncio.sleep(min(8.0, 0.5 * (2 ** (attempts - 1))) + random.uniform(0, 0.25))
+                        continue
+                    self._record_latency(time.monotonic() - t_req)
+                    return WebhookDeliveryResult(resp.status, text, attempts=attempts, latency_s=time.monotonic() - t0)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_status, last_text = 0, ""
+                last_err = f"{type(e).__name__}: {str(e)[:200]}"
+                if not isinstance(e, _PRE_SEND_ERRORS):
+                    break  # the POST may have landed; resending could duplicate the forward
+                if attempts <= self._max_retries:
+                    self._stats["webhook_retries"] = int(self._stats.get("webhook_retries") or 0) + 1
+                    await asyncio.sleep(min(8.0, 0.5 * (2 ** (attempts - 1))) + random.uniform(0, 0.25))
+                    continue
+        return WebhookDeliveryResult(last_status, last_text, attempts=attempts, latency_s=time.monotonic() - t0, error=last_err)
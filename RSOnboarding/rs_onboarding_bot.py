@@ -9,7 +9,6 @@ Configuration is split across:
 Messages are stored in messages.json.
 """
 
-import os
 import sys
 import json
 import time
@@ -31,6 +30,8 @@ from discord import ui
 from mirror_world_config import load_config_with_secrets
 from mirror_world_config import is_placeholder_secret, mask_secret
 
+from ticket_store import TicketStore
+
 # Colors for terminal
 class Colors:
     GREEN = '\033[92m'
@@ -53,7 +54,7 @@ class RSOnboardingBot:
         self.config: Dict[str, Any] = {}
         self.messages: Dict[str, Any] = {}
         
-        self.ticket_data: Dict[str, Any] = {}
+        self.ticket_data: TicketStore
         self._completion_sent_channels: set = set()  # channel IDs that already received the completion message
         self._close_locks = defaultdict(asyncio.Lock)
         self._open_locks = defaultdict(asyncio.Lock)
@@ -137,32 +138,22 @@ class RSOnboardingBot:
             print(f"{Colors.RED}[Messages] Failed to save messages: {e}{Colors.RESET}")
     
     def load_tickets(self):
-        """Load ticket data from file (for active tickets only) with corruption handling"""
+        """Open the ticket store (tickets.json + journal; see ticket_store.py)."""
+        # `!reload` reopens the store: fold the old one to disk and stop its writer first,
+        # otherwise its compaction timer would overwrite tickets.json with a stale snapshot.
+        old_store = getattr(self, "ticket_data", None)
+        if isinstance(old_store, TicketStore):
+            old_store.close()
         tickets_file = self.base_path / self.config.get("tickets_file", "tickets.json")
-        if tickets_file.exists():
-            try:
-                with open(tickets_file, 'r', encoding='utf-8') as f:
-                    self.ticket_data = json.load(f)
-                print(f"{Colors.GREEN}[Tickets] Loaded {len(self.ticket_data)} active tickets{Colors.RESET}")
-            except json.JSONDecodeError as e:
-                print(f"{Colors.RED}[Tickets] JSON corruption detected in {tickets_file}: {e}{Colors.RESET}")
-                print(f"{Colors.YELLOW}[Tickets] Attempting to load backup or falling back to empty state{Colors.RESET}")
-                # Try to load backup if it exists
-                backup_file = tickets_file.with_suffix('.json.bak')
-                if backup_file.exists():
-                    try:
-                        with open(backup_file, 'r', encoding='utf-8') as f:
-                            self.ticket_data = json.load(f)
-                        print(f"{Colors.GREEN}[Tickets] Restored from backup{Colors.RESET}")
-                    except Exception:
-                        self.ticket_data = {}
-                else:
-                    self.ticket_data = {}
-            except Exception as e:
-                print(f"{Colors.RED}[Tickets] Failed to load tickets: {repr(e)}{Colors.RESET}")
-                self.ticket_data = {}
-        else:
-            self.ticket_data = {}
+        self.ticket_data = TicketStore(
+            tickets_file,
+            flush_interval_ms=int(self.config.get("tickets_journal_flush_ms", 200)),
+            compact_ops=int(self.config.get("tickets_journal_compact_ops", 500)),
+            compact_seconds=float(self.config.get("tickets_journal_compact_seconds", 300)),
+        )
+        for note in self.ticket_data.load_notes:
+            print(f"{Colors.YELLOW}[Tickets] {note}{Colors.RESET}")
+        print(f"{Colors.GREEN}[Tickets] Loaded {len(self.ticket_data)} active tickets{Colors.RESET}")
     
     def _load_completion_sent(self):
         """Load set of channel IDs that already received the completion message"""
@@ -187,41 +178,8 @@ class RSOnboardingBot:
         except Exception as e:
             print(f"{Colors.RED}[Completion] Failed to save completion_sent: {e}{Colors.RESET}")
     
-    def save_tickets(self):
-        """Save ticket data to file (active tickets only) with atomic writes"""
-        tickets_file = self.base_path / self.config.get("tickets_file", "tickets.json")
-        temp_file = tickets_file.with_suffix('.json.tmp')
-        backup_file = tickets_file.with_suffix('.json.bak')
-        
-        try:
-            os.makedirs(tickets_file.parent, exist_ok=True)
-            
-            # Write to temp file first
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self.ticket_data, f, indent=2, ensure_ascii=False)
-                f.flush()
-                os.fsync(f.fileno())  # Force write to disk (Ubuntu-safe)
-            
-            # Create backup of existing file if it exists
-            if tickets_file.exists():
-                import shutil
-                shutil.copy2(tickets_file, backup_file)
-            
-            # Atomic rename (Ubuntu: rename is atomic on same filesystem)
-            os.replace(temp_file, tickets_file)
-            
-        except Exception as e:
-            print(f"{Colors.RED}[Tickets] Failed to save tickets: {repr(e)}{Colors.RESET}")
-            # Clean up temp file on error
-            if temp_file.exists():
-                try:
-                    temp_file.unlink()
-                except Exception:
-                    pass
-    
     def _migrate_ticket_schema_if_needed(self):
         """Migrate old schema {user_id: channel_id} -> {user_id: {channel_id, opened_at}} (match original)"""
-        changed = False
         for uid, v in list(self.ticket_data.items()):
             if isinstance(v, int):
                 # Old format: {user_id: channel_id}
@@ -229,7 +187,6 @@ class RSOnboardingBot:
                     "channel_id": v, 
                     "opened_at": time.time()
                 }
-                changed = True
             elif isinstance(v, dict):
                 # Remove extra fields not in original (status, last_activity, creating_at)
                 if "status" in v or "last_activity" in v or "creating_at" in v:
@@ -239,15 +196,11 @@ class RSOnboardingBot:
                     # Remove entries with channel_id=0 (stuck "creating" entries)
                     if channel_id == 0:
                         self.ticket_data.pop(uid, None)
-                        changed = True
                     else:
                         self.ticket_data[uid] = {
                             "channel_id": channel_id,
                             "opened_at": opened_at
                         }
-                    changed = True
-        if changed:
-            self.save_tickets()
     
     def get_embed_color(self) -> discord.Color:
         """Get embed color from config"""
@@ -773,8 +726,6 @@ class RSOnboardingBot:
                 # Clean storage regardless of channel existence (match original)
                 removed = self.ticket_data.pop(str(member.id), None)
                 if removed is not None:
-                    self.save_tickets()
-
                     print(f"{Colors.GREEN}[Success] Ticket closed for {member.name}{Colors.RESET}")
                     await self.log_action(
                         guild,
@@ -857,7 +808,6 @@ class RSOnboardingBot:
                 # Member truly doesn't exist - safe to clean up
                 print(f"{Colors.YELLOW}[Auto-Close] Member {member_id} not found in guild, cleaning up storage{Colors.RESET}")
                 self.ticket_data.pop(str(member_id), None)
-                self.save_tickets()
                 return
             except Exception as e:
                 # Transient API failure - don't delete, will retry on next restart
@@ -903,7 +853,6 @@ class RSOnboardingBot:
                     else:
                         # Channel was deleted but data remains - clean it up
                         self.ticket_data.pop(str(member.id), None)
-                        self.save_tickets()
             
             # Check if a channel with this name pattern already exists
             expected_channel_name = self._safe_channel_name(member.name)
@@ -920,13 +869,11 @@ class RSOnboardingBot:
                         if isinstance(channel, discord.TextChannel) and channel.name == expected_channel_name:
                             # Channel with same name exists - store it to prevent duplicates
                             self.ticket_data[str(member.id)] = {"channel_id": channel.id, "opened_at": time.time()}
-                            self.save_tickets()
                             print(f"{Colors.YELLOW}[Ticket] Skipped - channel {channel.name} already exists for {member.name} ({member.id}){Colors.RESET}")
                             return
             
             # Mark as creating immediately to prevent race conditions (still in lock)
             self.ticket_data[str(member.id)] = {"channel_id": 0, "opened_at": time.time()}
-            self.save_tickets()
             print(f"{Colors.CYAN}[Event] Opening onboarding ticket for {member.name} ({member.id}){Colors.RESET}")
 
             try:
@@ -975,7 +922,6 @@ class RSOnboardingBot:
 
                 # Update with actual channel ID (was set to 0 earlier to prevent race condition)
                 self.ticket_data[str(member.id)] = {"channel_id": ticket.id, "opened_at": time.time()}
-                self.save_tickets()
 
                 # Log and notify staff (enhanced embed format)
                 welcome_log_channel_id = self.config.get("welcome_log_channel_id")
@@ -1177,7 +1123,6 @@ class RSOnboardingBot:
             except discord.Forbidden as e:
                 # Remove ticket data so retry can happen
                 self.ticket_data.pop(str(member.id), None)
-                self.save_tickets()
                 error_details = str(e)
                 if "50013" in error_details or "Missing Permissions" in error_details:
                     error_msg = (
@@ -1214,7 +1159,6 @@ class RSOnboardingBot:
                 error_details = str(e)
                 # Remove ticket data so retry can happen
                 self.ticket_data.pop(str(member.id), None)
-                self.save_tickets()
                 error_msg = (
                     f"❌ **HTTP ERROR** - Discord API request failed\n\n"
                     f"**Error:** `{error_details}`\n\n"
@@ -1299,6 +1243,9 @@ class RSOnboardingBot:
             print(f"{Colors.CYAN}[Cleanup] Checking {total_tickets} ticket(s) in storage...{Colors.RESET}")
         
         # Check all tickets in storage
+        auto_close_seconds = self.config.get("auto_close_seconds", 86400)  # Default 24 hours
+        # Indexed by opened_at: everything opened before the cutoff is past auto-close.
+        past_auto_close = set(self.ticket_data.opened_before(time.time() - auto_close_seconds))
         checked_count = 0
         skipped_creating = 0
         for user_id_str, ticket_info in list(self.ticket_data.items()):
@@ -1339,7 +1286,6 @@ class RSOnboardingBot:
                         if channel and channel.permissions_for(guild.me).manage_channels:
                             await channel.delete()
                         self.ticket_data.pop(user_id_str, None)
-                        self.save_tickets()
                         cleaned_count += 1
                         print(f"{Colors.GREEN}[Cleanup] Closed ticket for {member.name} <@{member.id}> channel <#{channel.id}> (no Welcome role){Colors.RESET}")
                     except Exception as e:
@@ -1364,11 +1310,8 @@ class RSOnboardingBot:
                         pass
                 
                 # Case 4: Ticket is older than auto_close_seconds - should be auto-closed
-                auto_close_seconds = self.config.get("auto_close_seconds", 86400)  # Default 24 hours
-                opened_at = float(ticket_info.get("opened_at", time.time()))
-                age_seconds = time.time() - opened_at
-                
-                if age_seconds >= auto_close_seconds:
+                if user_id_str in past_auto_close:
+                    age_seconds = time.time() - float(ticket_info.get("opened_at", time.time()))
                     # Ticket is past auto-close time - close it
                     if member:
                         try:
@@ -1386,7 +1329,6 @@ class RSOnboardingBot:
                             except Exception:
                                 pass
                         self.ticket_data.pop(user_id_str, None)
-                        self.save_tickets()
                         orphaned_count += 1
                         age_hours = age_seconds / 3600
                         print(f"{Colors.YELLOW}[Cleanup] Removed orphaned ticket for user <@{user_id_str}> channel <#{channel.id}> (opened {age_hours:.1f} hours ago, member not found){Colors.RESET}")
@@ -1409,6 +1351,7 @@ class RSOnboardingBot:
         # Case 4: Find orphaned channels in ticket categories (not in tickets.json)
         ticket_categories = []
         channels_checked = 0
+        members_by_ticket_name: Optional[Dict[str, discord.Member]] = None
         
         if ticket_category_id:
             cat = guild.get_channel(ticket_category_id)
@@ -1435,23 +1378,17 @@ class RSOnboardingBot:
                 
                 # Check if this channel matches ticket naming pattern
                 # Ticket channels are named like the user's name (sanitized)
-                # Check if channel is in tickets.json
-                found_in_storage = False
-                for user_id_str, ticket_info in self.ticket_data.items():
-                    if ticket_info.get("channel_id") == channel.id:
-                        found_in_storage = True
-                        break
+                # Check if channel is in tickets.json (indexed by channel id)
+                found_in_storage = self.ticket_data.user_for_channel(channel.id) is not None
                 
                 if not found_in_storage:
                     # Orphaned channel - check if it's a ticket channel
-                    # Try to find member by channel name
-                    channel_name = channel.name
-                    matched_member = None
-                    for member in guild.members:
-                        expected_name = self._safe_channel_name(member.name)
-                        if channel_name == expected_name:
-                            matched_member = member
-                            break
+                    # Try to find member by channel name (name map built once per cleanup, first member wins)
+                    if members_by_ticket_name is None:
+                        members_by_ticket_name = {}
+                        for member in guild.members:
+                            members_by_ticket_name.setdefault(self._safe_channel_name(member.name), member)
+                    matched_member = members_by_ticket_name.get(channel.name)
                     
                     if matched_member:
                         # Found matching member - check if they should have a ticket
@@ -1506,7 +1443,6 @@ class RSOnboardingBot:
                                             "channel_id": channel.id,
                                             "opened_at": existing_ticket.get("opened_at", time.time())
                                         }
-                                        self.save_tickets()
                                         orphaned_count += 1
                                         print(f"{Colors.GREEN}[Cleanup] Reconciled orphaned channel {channel.name} <#{channel.id}> for {matched_member.name} <@{matched_member.id}> (updated tickets.json){Colors.RESET}")
                                 else:
@@ -1515,7 +1451,6 @@ class RSOnboardingBot:
                                         "channel_id": channel.id,
                                         "opened_at": time.time()  # Use current time as fallback
                                     }
-                                    self.save_tickets()
                                     orphaned_count += 1
                                     print(f"{Colors.GREEN}[Cleanup] Reconciled orphaned channel {channel.name} <#{channel.id}> for {matched_member.name} <@{matched_member.id}> (added to tickets.json){Colors.RESET}")
                             except discord.NotFound:
@@ -1556,7 +1491,6 @@ class RSOnboardingBot:
             print(f"{Colors.CYAN}[Cleanup] Checked {channels_checked} channel(s) in ticket categories{Colors.RESET}")
         
         if cleaned_count > 0 or orphaned_count > 0:
-            self.save_tickets()
             print(f"{Colors.CYAN}[Cleanup] ✅ Cleanup complete: {cleaned_count} stale tickets closed, {orphaned_count} orphaned entries removed{Colors.RESET}")
             await self.log_action(
                 guild,
@@ -2166,7 +2100,6 @@ class RSOnboardingBot:
                 else:
                     # Ticket data exists but channel is gone, clean it up
                     self.ticket_data.pop(str(member.id), None)
-                    self.save_tickets()
                     await ctx.send(
                         f"ℹ️ Found orphaned ticket data. Cleaning up and creating new ticket...",
                         delete_after=10
@@ -2226,7 +2159,6 @@ class RSOnboardingBot:
                     except Exception:
                         pass
                 self.ticket_data.pop(str(member.id), None)
-                self.save_tickets()
                 await self.log_action(
                     ctx.guild,
                     f"Cleaned up existing ticket for {member.mention} (force mode)",
@@ -2325,7 +2257,6 @@ class RSOnboardingBot:
             
             # Remove from ticket data
             self.ticket_data.pop(str(member.id), None)
-            self.save_tickets()
             
             try:
                 await ctx.message.delete()
@@ -2763,6 +2694,8 @@ def main():
     except KeyboardInterrupt:
         print(f"\n{Colors.YELLOW}[Bot] Stopped{Colors.RESET}")
     finally:
+        # Fold the ticket journal into tickets.json before the single-instance lock is released.
+        bot.ticket_data.close()
         try:
             if lock_fh:
                 lock_fh.close()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Active onboarding tickets: in memory, persisted as tickets.json + an append-only journal.
+
+- Every put/delete is one journal line ({"op": "put"|"del", "uid": ..., "ticket": {...}}),
+  written by a background thread in small batches (one fsync per batch), so nothing on
+  the event loop touches the disk and a burst of joins costs O(changes), not O(n) each.
+- The writer compacts the journal into tickets.json (temp file + fsync + replace, .bak of
+  the previous file) every `compact_ops` journal lines or `compact_seconds`, and on close.
+  tickets.json keeps its old shape ({user_id: {channel_id, opened_at}}) for other tools;
+  between compactions it can lag the journal by a few seconds.
+- Load = tickets.json (or .bak if corrupt) + journal replay (a torn last line is ignored).
+- Indexes: user id (the dict key), channel id -> user id, and opened_at (sorted) for
+  "opened before" queries.
+
+Values are plain dicts; assign a new dict to change a ticket (in-place edits are not journaled).
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import shutil
+import threading
+import time
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class TicketStore(MutableMapping):
+    def __init__(
+        self,
+        path: Path,
+        *,
+        flush_interval_ms: int = 200,
+        compact_ops: int = 500,
+        compact_seconds: float = 300.0,
+    ) -> None:
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal.jsonl")
+        self.backup_path = self.path.with_suffix(".json.bak")
+        self.flush_interval_s = max(0.0, int(flush_interval_ms) / 1000.0)
+        self.compact_ops = max(1, int(compact_ops))
+        self.compact_seconds = max(1.0, float(compact_seconds))
+
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._tickets: Dict[str, Dict[str, Any]] = {}
+        self._by_channel: Dict[int, str] = {}
+        self._by_opened: List[Tuple[float, str]] = []
+        self._pending: List[str] = []  # journal lines not yet written
+        self._journal_ops = 0
+        self._compacted_at = time.monotonic()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self.load_notes: List[str] = []
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+        self._writer = threading.Thread(target=self._writer_loop, name="rsonboarding-ticket-writer", daemon=True)
+        self._writer.start()
+
+    # -------------------------
+    # Mapping (memory only; changes are queued for the writer)
+    # -------------------------
+    def __getitem__(self, uid: str) -> Dict[str, Any]:
+        return self._tickets[uid]
+
+    def __setitem__(self, uid: str, ticket: Dict[str, Any]) -> None:
+        uid = str(uid)
+        with self._lock:
+            self._index_remove(uid)
+            self._tickets[uid] = ticket
+            self._index_add(uid, ticket)
+            self._queue({"op": "put", "uid": uid, "ticket": ticket})
+
+    def __delitem__(self, uid: str) -> None:
+        uid = str(uid)
+        with self._lock:
+            if uid not in self._tickets:
+                raise KeyError(uid)
+            self._index_remove(uid)
+            del self._tickets[uid]
+            self._queue({"op": "del", "uid": uid})
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._tickets))
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __contains__(self, uid: object) -> bool:
+        return uid in self._tickets
+
+    # -------------------------
+    # Indexed queries
+    # -------------------------
+    def user_for_channel(self, channel_id: int) -> Optional[str]:
+        """User id whose ticket is this channel, or None."""
+        return self._by_channel.get(int(channel_id or 0))
+
+    def opened_before(self, cutoff_ts: float) -> List[str]:
+        """User ids of tickets opened before `cutoff_ts` (unix seconds), oldest first."""
+        with self._lock:
+            end = bisect.bisect_left(self._by_opened, (float(cutoff_ts), ""))
+            return [uid for _ts, uid in self._by_opened[:end]]
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def flush(self) -> int:
+        """Append queued changes to the journal now (compacting if due). Returns lines written."""
+        with self._io_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if lines:
+                try:
+                    with open(self.journal_path, "a", encoding="utf-8") as f:
+                        f.write("".join(lines))
+                        f.flush()
+                        os.fsync(f.fileno())
+                except Exception:
+                    with self._lock:
+                        self._pending[:0] = lines
+                    raise
+                self._journal_ops += len(lines)
+            if self._journal_ops >= self.compact_ops or (
+                self._journal_ops and time.monotonic() - self._compacted_at >= self.compact_seconds
+            ):
+                self._compact()
+            return len(lines)
+
+    def close(self) -> None:
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._writer.join(timeout=10)
+        # Fold everything straight into tickets.json; the snapshot covers anything still queued.
+        with self._io_lock:
+            with self._lock:
+                self._pending = []
+            self._compact()
+
+    def _compact(self) -> None:
+        with self._lock:
+            snapshot = json.dumps(self._tickets, indent=2, ensure_ascii=False)
+        # Lines queued after this snapshot stay pending and land in the fresh journal
+        # (replaying a put/del the snapshot already has is harmless).
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(snapshot)
+            f.flush()
+            os.fsync(f.fileno())
+        if self.path.exists():
+            shutil.copy2(self.path, self.backup_path)
+        os.replace(tmp, self.path)
+        # The snapshot already contains every journaled change.
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self._journal_ops = 0
+        self._compacted_at = time.monotonic()
+
+    def _queue(self, entry: Dict[str, Any]) -> None:
+        self._pending.append(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._wake.set()
+
+    def _writer_loop(self) -> None:
+        while not self._stop.is_set():
+            # Wake on changes, or at least once per compaction period so a quiet journal still folds in.
+            self._wake.wait(timeout=self.compact_seconds)
+            # Batch: let a burst of joins land before writing.
+            self._stop.wait(self.flush_interval_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[Tickets] Journal write failed (will retry): {e!r}")
+
+    def _load(self) -> None:
+        tickets: Dict[str, Any] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    tickets = json.load(f)
+            except json.JSONDecodeError as e:
+                self.load_notes.append(f"JSON corruption detected in {self.path}: {e}")
+                tickets = {}
+                if self.backup_path.exists():
+                    try:
+                        with open(self.backup_path, "r", encoding="utf-8") as f:
+                            tickets = json.load(f)
+                        self.load_notes.append("Restored from backup")
+                    except Exception:
+                        tickets = {}
+            except Exception as e:
+                self.load_notes.append(f"Failed to load tickets: {e!r}")
+                tickets = {}
+        if not isinstance(tickets, dict):
+            tickets = {}
+
+        replayed = 0
+        if self.journal_path.exists():
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn write at crash time
+                    uid = str(entry.get("uid") or "")
+                    if not uid:
+                        continue
+                    if entry.get("op") == "put":
+                        tickets[uid] = entry.get("ticket")
+                    elif entry.get("op") == "del":
+                        tickets.pop(uid, None)
+                    replayed += 1
+        if replayed:
+            self.load_notes.append(f"Replayed {replayed} journal entries")
+        self._journal_ops = replayed
+
+        for uid, ticket in tickets.items():
+            self._tickets[str(uid)] = ticket
+            self._index_add(str(uid), ticket)
+
+    def _index_add(self, uid: str, ticket: Any) -> None:
+        if not isinstance(ticket, dict):
+            return
+        try:
+            channel_id = int(ticket.get("channel_id") or 0)
+        except (TypeError, ValueError):
+            channel_id = 0
+        if channel_id:
+            self._by_channel[channel_id] = uid
+        try:
+            opened_at = float(ticket["opened_at"])
+        except (KeyError, TypeError, ValueError):
+            return  # no open time: never "opened before" anything (matches the old age check)
+        bisect.insort(self._by_opened, (opened_at, uid))
+
+    def _index_remove(self, uid: str) -> None:
+        ticket = self._tickets.get(uid)
+        if not isinstance(ticket, dict):
+            return
+        try:
+            channel_id = int(ticket.get("channel_id") or 0)
+        except (TypeError, ValueError):
+            channel_id = 0
+        if channel_id and self._by_channel.get(channel_id) == uid:
+            del self._by_channel[channel_id]
+        try:
+            opened_at = float(ticket["opened_at"])
+        except (KeyError, TypeError, ValueError):
+            return
+        i = bisect.bisect_left(self._by_opened, (opened_at, uid))
+        if i < len(self._by_opened) and self._by_opened[i] == (opened_at, uid):
+            del self._by_opened[i]
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import argparse
 import asyncio
+import logging
+import tempfile
+import time
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 
 import aiohttp
@@ -37,9 +42,13 @@ class PromoBot(discord.Client):
         self.messages = load_json_file(BASE_DIR / "messages.json")
         self.storage = JSONStorage(BASE_DIR / self.config["data_dir"])
         self.session_store = PromoSessionStore(self.storage)
-        self.queue_store = PromoQueueStore(self.storage)
-        self.campaign_store = PromoCampaignStore(self.storage)
         self.send_log_store = SendLogStore(self.storage)
+        self.queue_store = PromoQueueStore(
+            self.storage,
+            self.send_log_store,
+            checkpoint_every=int(self.config.get("queue_checkpoint_every", 25)),
+        )
+        self.campaign_store = PromoCampaignStore(self.storage)
         self.logger = configure_logging(BASE_DIR / self.config["logs_dir"])
         self.explain_log = ExplainableLog(
             self.logger,
@@ -63,6 +72,10 @@ class PromoBot(discord.Client):
         self.logger.info("slash_commands_synced Guild-ID=%s", self.config["guild_id"])
         self.sender.start()
 
+    async def close(self) -> None:
+        self.queue_store.checkpoint()
+        await super().close()
+
     async def on_ready(self) -> None:
         self.logger.info("bot_ready %s Guild-ID=%s", format_log_user_id(self.user.id), self.config["guild_id"])
 
@@ -441,7 +454,164 @@ class PromoBot(discord.Client):
             self.queue_store.save(queue)
 
 
+class _BenchmarkUser:
+    def __init__(self, client: "_BenchmarkClient", user_id: int) -> None:
+        self._client = client
+        self.id = user_id
+
+    async def send(self, **_kwargs: Any) -> None:
+        await self._client.api_call()
+        if self.id % 40 == 0:
+            # Roughly the share of members with DMs closed.
+            raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), {"code": 50007, "message": "Cannot send messages to this user"})
+        self._client.delivered += 1
+
+
+class _BenchmarkClient:
+    """Just enough of discord.Client for PromoSender.process_once; nothing leaves the process.
+
+    Every API call takes `latency` seconds; with `rate_per_second` set, calls beyond that
+    rate get a 429 like Discord's DM bucket would. Nine in ten recipients are in the
+    member cache.
+    """
+
+    def __init__(self, *, latency: float = 0.0, rate_per_second: float = 0.0) -> None:
+        self.latency = latency
+        self.rate_per_second = rate_per_second
+        self.delivered = 0
+        self.api_calls = 0
+        self.rate_limited = 0
+        self._recent: list[float] = []
+        self._guild = SimpleNamespace(get_member=lambda user_id: None if user_id % 10 == 0 else _BenchmarkUser(self, user_id))
+
+    async def api_call(self) -> None:
+        self.api_calls += 1
+        if self.rate_per_second > 0:
+            now = time.monotonic()
+            self._recent = [ts for ts in self._recent if now - ts < 1.0]
+            if len(self._recent) >= self.rate_per_second:
+                self.rate_limited += 1
+                raise discord.HTTPException(SimpleNamespace(status=429, reason="Too Many Requests", headers={"Retry-After": "1"}), {"code": 0, "message": "You are being rate limited."})
+            self._recent.append(now)
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    def get_guild(self, _guild_id: int) -> SimpleNamespace:
+        return self._guild
+
+    def get_user(self, _user_id: int) -> None:
+        return None
+
+    async def fetch_user(self, user_id: int) -> _BenchmarkUser:
+        await self.api_call()
+        return _BenchmarkUser(self, user_id)
+
+    async def update_live_status(self, _campaign_id: str) -> None:
+        return None
+
+    def get_channel(self, _channel_id: int) -> None:
+        return None
+
+
+async def _benchmark_campaign(data_dir: Path, *, recipients: int, batch_size: int, latency: float, rate_per_second: float) -> dict[str, Any]:
+    config = dict(load_config(BASE_DIR))
+    # No jitter and no per-minute cap: measure the stores and the dispatcher, not the pacing policy.
+    config.update({"dm_delay_min_seconds": 0, "dm_delay_max_seconds": 0, "dm_max_per_minute": 1_000_000, "log_channel_id": ""})
+    storage = JSONStorage(data_dir)
+    send_log_store = SendLogStore(storage)
+    queue_store = PromoQueueStore(storage, send_log_store, checkpoint_every=int(config.get("queue_checkpoint_every", 25)))
+    campaign_store = PromoCampaignStore(storage)
+    client = _BenchmarkClient(latency=latency, rate_per_second=rate_per_second)
+    logger = logging.getLogger("rspromobot.benchmark")
+    logger.disabled = True
+    sender = PromoSender(client, config, {}, campaign_store, queue_store, send_log_store, logger)
+
+    user_ids = [100_000_000_000_000_000 + i for i in range(recipients)]
+    session = {
+        "campaign_name": "benchmark",
+        "target_role_id": "0",
+        "message_body": "Dry run",
+        "batch_size": batch_size,
+        "batch_interval_minutes": 1,
+    }
+    campaign = campaign_store.create_from_session(0, 0, session, user_ids)
+    queue_store.save({
+        "campaign_id": campaign["campaign_id"],
+        "guild_id": "0",
+        "status": "running",
+        "recipients": [{"user_id": str(user_id), "status": "pending", "sent_at": "", "error": ""} for user_id in user_ids],
+        "pending_count": recipients,
+        "sent_count": 0,
+        "failed_count": 0,
+        "last_run_at": "",
+        "next_run_at": "",
+    })
+
+    passes = 0
+    started = time.perf_counter()
+    while queue_store.get().get("status") == "running":
+        queue_store.get()["next_run_at"] = ""  # the batch interval elapses instantly
+        await sender.process_once()
+        passes += 1
+    seconds = time.perf_counter() - started
+
+    reloaded = PromoQueueStore(storage, SendLogStore(storage)).get()
+    return {
+        "seconds": seconds,
+        "passes": passes,
+        "delivered": client.delivered,
+        "api_calls": client.api_calls,
+        "rate_limited": client.rate_limited,
+        "window": sender._window.size if sender._window else 0,
+        "sent": reloaded.get("sent_count", 0),
+        "failed": reloaded.get("failed_count", 0),
+        "pending": reloaded.get("pending_count", 0),
+        "status": reloaded.get("status", ""),
+    }
+
+
+def run_campaign_benchmark(recipients: int, batch_size: int, latency_ms: int, rate_per_second: float) -> None:
+    print(
+        f"campaign dry-run benchmark: {recipients} recipients, batch size {batch_size}, fake Discord client "
+        f"(latency {latency_ms}ms, rate limit {rate_per_second or 'off'}/s)"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        result = asyncio.run(
+            _benchmark_campaign(
+                Path(tmp),
+                recipients=recipients,
+                batch_size=batch_size,
+                latency=max(0, latency_ms) / 1000.0,
+                rate_per_second=max(0.0, rate_per_second),
+            )
+        )
+    print(
+        f"  {result['seconds']:.2f}s for {result['passes']} batches "
+        f"({recipients / max(result['seconds'], 1e-9):,.0f} recipients/s); "
+        f"status={result['status']} sent={result['sent']} failed={result['failed']} pending={result['pending']}"
+    )
+    print(f"  api_calls={result['api_calls']} rate_limited={result['rate_limited']} final_window={result['window']}")
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="RSPromoBot")
+    parser.add_argument(
+        "--benchmark-campaign",
+        type=int,
+        nargs="?",
+        const=50_000,
+        default=0,
+        metavar="N",
+        help="Dry-run a campaign of N recipients (default 50000) against a fake Discord client and exit",
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Batch size for --benchmark-campaign")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Simulated Discord API latency for --benchmark-campaign")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Simulated DM rate limit (calls/s) for --benchmark-campaign; 0 = off")
+    args = parser.parse_args()
+    if args.benchmark_campaign:
+        run_campaign_benchmark(args.benchmark_campaign, max(1, args.batch_size), args.latency_ms, args.rate_limit)
+        return
+
     load_dotenv(BASE_DIR / ".env")
     token = os.getenv("DISCORD_TOKEN", "").strip()
     if not token:
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class AdaptiveSendWindow:
+    """How many campaign DMs may be in flight at once, tuned by Discord's responses.
+
+    - Starts at one sender; after `grow_after` clean sends in a row it opens one more
+      slot, up to `maximum`.
+    - A rate-limit signal (a 429, or a send slow enough that discord.py must have
+      slept on one) halves the window, holds new sends for the retry-after period and
+      doubles the clean streak needed before the next widening.
+    - Send starts are spaced so the campaign never exceeds `max_per_minute`, however
+      wide the window is.
+    - `close()` (quarantine trip-wire) stops new acquisitions; in-flight sends finish.
+
+    Each slot is held for the send plus the caller's jittered pause, so per-slot
+    pacing matches the old one-at-a-time loop.
+    """
+
+    def __init__(self, *, maximum: int = 3, max_per_minute: float = 40.0, grow_after: int = 10, slow_send_seconds: float = 5.0) -> None:
+        self.maximum = max(1, int(maximum))
+        self.min_start_gap = 60.0 / max(1.0, float(max_per_minute))
+        self.grow_after = max(1, int(grow_after))
+        self.slow_send_seconds = max(0.5, float(slow_send_seconds))
+        self.size = 1
+        self.in_flight = 0
+        self.rate_limit_hits = 0
+        self.closed = False
+        self._clean_streak = 0
+        self._grow_after = self.grow_after
+        self._hold_until = 0.0
+        self._last_start = 0.0
+        self._changed = asyncio.Condition()
+
+    async def acquire(self) -> bool:
+        """Wait for a free slot and the pacing gap. Returns False once the window is closed."""
+        async with self._changed:
+            while True:
+                if self.closed:
+                    return False
+                if self.in_flight < self.size:
+                    now = time.monotonic()
+                    wait = max(self._hold_until, self._last_start + self.min_start_gap) - now
+                    if wait <= 0:
+                        self.in_flight += 1
+                        self._last_start = now
+                        return True
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await self._changed.wait()
+
+    async def release(self) -> None:
+        async with self._changed:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._changed.notify_all()
+
+    async def record_send(self, seconds: float) -> None:
+        """A send completed (delivered or refused by the recipient) in `seconds`."""
+        if seconds >= self.slow_send_seconds:
+            await self.record_rate_limited(0.0)
+            return
+        async with self._changed:
+            self._clean_streak += 1
+            if self._clean_streak >= self._grow_after and self.size < self.maximum:
+                self.size += 1
+                self._clean_streak = 0
+                self._changed.notify_all()
+
+    async def record_rate_limited(self, retry_after: float) -> None:
+        async with self._changed:
+            self.rate_limit_hits += 1
+            self._clean_streak = 0
+            now = time.monotonic()
+            # Sends already in flight when the first 429 landed report it too; shrink once per hold.
+            if now >= self._hold_until:
+                self.size = max(1, self.size // 2)
+                # Each limit hit makes the next widening more cautious (sawtooth damping).
+                self._grow_after = min(self.grow_after * 16, self._grow_after * 2)
+            self._hold_until = max(self._hold_until, now + max(float(retry_after or 0.0), self.min_start_gap))
+            self._changed.notify_all()
+
+    async def close(self) -> None:
+        async with self._changed:
+            self.closed = True
+            self._changed.notify_all()
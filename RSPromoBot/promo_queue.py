@@ -2,29 +2,143 @@ from __future__ import annotations
 
 from typing import Any
 
+from send_log_store import SendLogStore
 from storage import JSONStorage
 
 
+def _default_queue() -> dict[str, Any]:
+    return {
+        "campaign_id": "",
+        "guild_id": "",
+        "status": "idle",
+        "recipients": [],
+        "pending_count": 0,
+        "sent_count": 0,
+        "failed_count": 0,
+        "last_run_at": "",
+        "next_run_at": "",
+        "pending_cursor": 0,
+        "send_log_start": 0,
+    }
+
+
 class PromoQueueStore:
-    def __init__(self, storage: JSONStorage) -> None:
+    """The active campaign queue, held in memory.
+
+    - queue.json: the queue header (status, counts, cursor, next run). Small, so a
+      checkpoint is cheap no matter how many recipients the campaign has.
+    - queue_recipients.json: the recipient records, written once when a campaign's
+      recipient list is saved. Results after that live in the append-only send log;
+      on load, the campaign's log entries (from `send_log_start`) are replayed onto
+      the records, so a restart never re-sends a recipient that was logged.
+    - `get()` returns the live queue dict (the same object until `save()` replaces it),
+      so status checks during a send batch never touch the disk.
+    - `pending_cursor` is the index of the first recipient that may still be pending;
+      recipients are sent in order, so `next_pending()` never rescans finished ones.
+    - `mark()` applies one result in memory and checkpoints the header every
+      `checkpoint_every` results.
+    """
+
+    def __init__(self, storage: JSONStorage, send_log_store: SendLogStore, *, checkpoint_every: int = 25) -> None:
         self.storage = storage
+        self.send_log_store = send_log_store
         self.file_name = "queue.json"
+        self.recipients_file_name = "queue_recipients.json"
+        self.checkpoint_every = max(1, int(checkpoint_every))
+        self._unsaved_marks = 0
+        self._by_user: dict[str, int] = {}
+        self._queue: dict[str, Any] = _default_queue()
+        self._load()
 
     def get(self) -> dict[str, Any]:
-        return self.storage.read(
-            self.file_name,
-            {
-                "campaign_id": "",
-                "guild_id": "",
-                "status": "idle",
-                "recipients": [],
-                "pending_count": 0,
-                "sent_count": 0,
-                "failed_count": 0,
-                "last_run_at": "",
-                "next_run_at": ""
-            }
-        )
+        return self._queue
 
     def save(self, payload: dict[str, Any]) -> None:
-        self.storage.write(self.file_name, payload)
+        recipients = payload.setdefault("recipients", [])
+        if payload is not self._queue or recipients is not self._queue.get("recipients"):
+            payload["pending_cursor"] = 0
+            payload["send_log_start"] = self.send_log_store.offset()
+            self.storage.write(self.recipients_file_name, recipients)
+            self._queue = payload
+            self._rebuild_index()
+        self.checkpoint(force=True)
+
+    def checkpoint(self, force: bool = False) -> bool:
+        """Write the queue header if results are unsaved (or `force`). Returns True if written."""
+        if not force and self._unsaved_marks <= 0:
+            return False
+        header = {key: value for key, value in self._queue.items() if key != "recipients"}
+        self.storage.write(self.file_name, header)
+        self._unsaved_marks = 0
+        return True
+
+    def next_pending(self, limit: int) -> list[dict[str, Any]]:
+        """Up to `limit` pending recipient records, in queue order, from the cursor."""
+        recipients = self._queue.get("recipients", [])
+        cursor = int(self._queue.get("pending_cursor", 0) or 0)
+        while cursor < len(recipients) and recipients[cursor].get("status") != "pending":
+            cursor += 1
+        self._queue["pending_cursor"] = cursor
+        batch: list[dict[str, Any]] = []
+        for record in recipients[cursor:]:
+            if len(batch) >= limit:
+                break
+            if record.get("status") == "pending":
+                batch.append(record)
+        return batch
+
+    def mark(self, user_id: int | str, status: str, *, sent_at: str, error: str = "") -> bool:
+        """Record a send result for a pending recipient. Returns False if it was not pending."""
+        if not self._apply(str(user_id), status, sent_at, error):
+            return False
+        self._unsaved_marks += 1
+        if self._unsaved_marks >= self.checkpoint_every:
+            self.checkpoint()
+        return True
+
+    def _apply(self, user_id: str, status: str, sent_at: str, error: str) -> bool:
+        idx = self._by_user.get(user_id)
+        if idx is None:
+            return False
+        record = self._queue["recipients"][idx]
+        if record.get("status") != "pending":
+            return False
+        record["status"] = status
+        record["sent_at"] = sent_at
+        if error:
+            record["error"] = error
+        counter = "sent_count" if status == "sent" else "failed_count"
+        self._queue[counter] = int(self._queue.get(counter, 0)) + 1
+        self._queue["pending_count"] = max(0, int(self._queue.get("pending_count", 0)) - 1)
+        return True
+
+    def _rebuild_index(self) -> None:
+        self._by_user = {str(record.get("user_id")): idx for idx, record in enumerate(self._queue.get("recipients", []))}
+
+    def _load(self) -> None:
+        header = self.storage.read(self.file_name, None)
+        if not isinstance(header, dict):
+            return
+        if "recipients" in header:
+            # Older queue.json kept the records inline; their log entries may be anywhere in the log.
+            recipients = header["recipients"]
+            header["send_log_start"] = 0
+            self.storage.write(self.recipients_file_name, recipients)
+        else:
+            recipients = self.storage.read(self.recipients_file_name, [])
+        header["recipients"] = recipients if isinstance(recipients, list) else []
+        header.setdefault("pending_cursor", 0)
+        self._queue = header
+        self._rebuild_index()
+
+        campaign_id = header.get("campaign_id", "")
+        if campaign_id and self._by_user:
+            for entry in self.send_log_store.read_from(int(header.get("send_log_start", 0) or 0)):
+                if entry.get("campaign_id") == campaign_id:
+                    self._apply(str(entry.get("user_id", "")), str(entry.get("status", "failed")), str(entry.get("timestamp", "")), str(entry.get("error", "")))
+        # The header may lag the log by up to one checkpoint; the records are authoritative.
+        statuses = [record.get("status") for record in header["recipients"]]
+        header["pending_count"] = statuses.count("pending")
+        header["sent_count"] = statuses.count("sent")
+        header["failed_count"] = statuses.count("failed")
+        self.checkpoint(force=True)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import io
 import random
+import time
 from typing import Any
 from urllib.parse import urlparse
 
@@ -10,11 +11,23 @@ import aiohttp
 import discord
 
 from promo_campaigns import PromoCampaignStore
+from promo_dispatch import AdaptiveSendWindow
 from promo_queue import PromoQueueStore
 from send_log_store import SendLogStore
 from utils import build_dm_embeds, format_log_user_id, iso_now, next_run_iso, parse_attachment_urls, utc_now
 
 
+def _retry_after_seconds(exc: Exception) -> float:
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        retry_after = headers.get("Retry-After")
+    try:
+        return max(0.0, float(retry_after or 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
 class OptOutButton(discord.ui.Button):
     def __init__(self, bot: discord.Client, config: dict[str, Any], logger) -> None:
         super().__init__(
@@ -106,6 +119,10 @@ class PromoSender:
         self.send_log_store = send_log_store
         self.logger = logger
         self._loop_task: asyncio.Task | None = None
+        self._window: AdaptiveSendWindow | None = None
+        self._window_campaign_id = ""
+        self._attachments_key: tuple[str, str] | None = None
+        self._attachments: list[tuple[str, bytes]] = []
 
     async def build_attachment_files_payload(self, campaign: dict[str, Any]) -> list[tuple[str, bytes]]:
         attachment_urls = parse_attachment_urls(campaign.get("attachment_urls"), max_urls=2)
@@ -180,9 +197,7 @@ class PromoSender:
             self.logger.warning("Queue references missing campaign: %s", campaign_id)
             return
 
-        recipient_records = queue.get("recipients", [])
-        pending = [item for item in recipient_records if item.get("status") == "pending"]
-        if not pending:
+        if int(queue.get("pending_count", 0)) <= 0:
             self.logger.info("campaign_completed campaign_id=%s sent=%s failed=%s", campaign_id, queue.get("sent_count", 0), queue.get("failed_count", 0))
             queue["status"] = "completed"
             queue["next_run_at"] = ""
@@ -195,7 +210,7 @@ class PromoSender:
             return
 
         batch_size = int(campaign["batch_size"])
-        batch = pending[:batch_size]
+        batch = self.queue_store.next_pending(batch_size)
         timeout_seconds = int(self.config["send_timeout_seconds"])
         dm_delay_min_seconds = float(self.config["dm_delay_min_seconds"])
         dm_delay_max_seconds = float(self.config["dm_delay_max_seconds"])
@@ -204,111 +219,113 @@ class PromoSender:
         send_view = self._build_send_view(campaign)
         embed_color = int(self.config["embed_color"])
         dm_embeds = build_dm_embeds(campaign, embed_color)
-        attachment_files_payload = await self.build_attachment_files_payload(campaign)
-
-        self.logger.info("send_batch_start campaign_id=%s batch_size=%d pending_total=%d", campaign_id, len(batch), len(pending))
+        attachment_files_payload = await self._campaign_attachments(campaign)
+        guild_id_raw = str(queue.get("guild_id", "")).strip()
+        guild = self.bot.get_guild(int(guild_id_raw)) if guild_id_raw.isdigit() else None
+        window = await self._send_window(campaign_id)
         quarantine_tripped = False
+
+        async def send_one(recipient: dict[str, Any]) -> None:
+            nonlocal quarantine_tripped
+            user_id = int(recipient["user_id"])
+            try:
+                started = time.monotonic()
+                try:
+                    user = self._cached_recipient(guild, user_id)
+                    if user is None:
+                        user = await asyncio.wait_for(self.bot.fetch_user(user_id), timeout=timeout_seconds)
+                    files = self.build_discord_files(attachment_files_payload)
+                    await asyncio.wait_for(user.send(embeds=dm_embeds, files=files, view=send_view), timeout=timeout_seconds)
+                    self._record_result(campaign, user_id, "sent", "")
+                    self.logger.info("send_ok campaign_id=%s %s", campaign_id, format_log_user_id(user_id))
+                    await window.record_send(time.monotonic() - started)
+                except discord.Forbidden as exc:
+                    # 20026 = Discord app quarantine (anti-spam). Stop future sends immediately.
+                    if getattr(exc, "code", None) == 20026:
+                        quarantine_tripped = True
+                        await window.close()
+                        self.logger.error("quarantine_detected campaign_id=%s code=20026 action=auto_pause", campaign_id)
+                    else:
+                        await window.record_send(time.monotonic() - started)
+                    self._record_result(campaign, user_id, "failed", str(exc))
+                    self.logger.warning("send_failed campaign_id=%s %s error=%s", campaign_id, format_log_user_id(user_id), exc)
+                except Exception as exc:
+                    rate_limited = isinstance(exc, discord.RateLimited) or (isinstance(exc, discord.HTTPException) and exc.status == 429)
+                    if not rate_limited:
+                        self._record_result(campaign, user_id, "failed", str(exc))
+                        self.logger.warning("send_failed campaign_id=%s %s error=%s", campaign_id, format_log_user_id(user_id), exc)
+                    else:
+                        # Not the recipient's fault: leave them pending for a later pass and back off.
+                        retry_after = _retry_after_seconds(exc)
+                        await window.record_rate_limited(retry_after)
+                        self.logger.warning(
+                            "send_rate_limited campaign_id=%s %s retry_after=%.1f window=%d",
+                            campaign_id,
+                            format_log_user_id(user_id),
+                            retry_after,
+                            window.size,
+                        )
+                if dm_delay_hi > 0 and not quarantine_tripped:
+                    await asyncio.sleep(random.uniform(max(0.0, dm_delay_lo), dm_delay_hi))
+            finally:
+                await window.release()
+
+        self.logger.info(
+            "send_batch_start campaign_id=%s batch_size=%d pending_total=%d window=%d",
+            campaign_id,
+            len(batch),
+            int(queue.get("pending_count", 0)),
+            window.size,
+        )
+        in_flight: list[asyncio.Task] = []
         for recipient in batch:
-            # If an operator paused/cancelled mid-batch, stop promptly.
-            live_queue = self.queue_store.get()
-            if live_queue.get("campaign_id") == campaign_id and live_queue.get("status") != "running":
+            if not await window.acquire():
+                break
+            # If an operator paused/cancelled/replaced the queue mid-batch, stop promptly.
+            # get() is the in-memory queue, so this check costs nothing per recipient.
+            if self.queue_store.get() is not queue or queue.get("status") != "running":
+                await window.release()
                 self.logger.info(
                     "send_halted campaign_id=%s reason=queue_status_changed status=%s",
                     campaign_id,
-                    live_queue.get("status"),
+                    self.queue_store.get().get("status"),
                 )
                 break
+            in_flight.append(asyncio.create_task(send_one(recipient)))
+        if in_flight:
+            await asyncio.gather(*in_flight)
+        self.logger.info(
+            "send_batch_window campaign_id=%s window=%d rate_limit_hits=%d",
+            campaign_id,
+            window.size,
+            window.rate_limit_hits,
+        )
 
-            user_id = int(recipient["user_id"])
-            try:
-                user = await asyncio.wait_for(self.bot.fetch_user(user_id), timeout=timeout_seconds)
-                files = self.build_discord_files(attachment_files_payload)
-                await asyncio.wait_for(user.send(embeds=dm_embeds, files=files, view=send_view), timeout=timeout_seconds)
-                recipient["status"] = "sent"
-                recipient["sent_at"] = iso_now()
-                queue["sent_count"] = int(queue.get("sent_count", 0)) + 1
-                campaign["sent_count"] = int(campaign.get("sent_count", 0)) + 1
-                self.send_log_store.append({
-                    "campaign_id": campaign_id,
-                    "user_id": str(user_id),
-                    "status": "sent",
-                    "timestamp": iso_now(),
-                    "error": ""
-                })
-                self.logger.info("send_ok campaign_id=%s %s", campaign_id, format_log_user_id(user_id))
-            except discord.Forbidden as exc:
-                # 20026 = Discord app quarantine (anti-spam). Stop future sends immediately.
-                code = getattr(exc, "code", None)
-                if code == 20026:
-                    quarantine_tripped = True
-                recipient["status"] = "failed"
-                recipient["sent_at"] = iso_now()
-                recipient["error"] = str(exc)
-                queue["failed_count"] = int(queue.get("failed_count", 0)) + 1
-                campaign["failed_count"] = int(campaign.get("failed_count", 0)) + 1
-                self.send_log_store.append({
-                    "campaign_id": campaign_id,
-                    "user_id": str(user_id),
-                    "status": "failed",
-                    "timestamp": iso_now(),
-                    "error": str(exc)
-                })
-                self.logger.warning("send_failed campaign_id=%s %s error=%s", campaign_id, format_log_user_id(user_id), exc)
-                if quarantine_tripped:
-                    self.logger.error("quarantine_detected campaign_id=%s code=20026 action=auto_pause", campaign_id)
-                    break
-            except Exception as exc:
-                recipient["status"] = "failed"
-                recipient["sent_at"] = iso_now()
-                recipient["error"] = str(exc)
-                queue["failed_count"] = int(queue.get("failed_count", 0)) + 1
-                campaign["failed_count"] = int(campaign.get("failed_count", 0)) + 1
-                self.send_log_store.append({
-                    "campaign_id": campaign_id,
-                    "user_id": str(user_id),
-                    "status": "failed",
-                    "timestamp": iso_now(),
-                    "error": str(exc)
-                })
-                self.logger.warning("send_failed campaign_id=%s %s error=%s", campaign_id, format_log_user_id(user_id), exc)
-            if dm_delay_hi > 0:
-                await asyncio.sleep(random.uniform(max(0.0, dm_delay_lo), dm_delay_hi))
+        if self.queue_store.get() is not queue:
+            # Queue was reset (campaign deleted) mid-batch; its results are in the send log only.
+            self.campaign_store.upsert(campaign)
+            return
 
         # If quarantine hit, flip queue/campaign to paused and clear next run.
+        # Operator pause/cancel already landed in `queue` (same object) and wins over running/completed.
         if quarantine_tripped:
             queue["status"] = "paused"
             queue["next_run_at"] = ""
             campaign["status"] = "paused"
 
-        queue["recipients"] = recipient_records
-        queue["pending_count"] = len([item for item in recipient_records if item.get("status") == "pending"])
         queue["last_run_at"] = iso_now()
-        if queue.get("status") == "running" and queue["pending_count"] > 0:
+        if queue.get("status") == "running" and int(queue.get("pending_count", 0)) > 0:
             queue["next_run_at"] = next_run_iso(int(campaign["batch_interval_minutes"]))
             self.logger.info("send_batch_done campaign_id=%s next_batch_at=%s pending=%d", campaign_id, queue["next_run_at"], queue["pending_count"])
         else:
             queue["next_run_at"] = ""
-            if queue["pending_count"] <= 0:
+            if queue.get("status") == "running":
                 queue["status"] = "completed"
                 campaign["status"] = "completed"
                 campaign["completed_at"] = iso_now()
                 self.logger.info("campaign_completed campaign_id=%s sent=%s failed=%s", campaign_id, queue.get("sent_count", 0), queue.get("failed_count", 0))
                 await self._log_to_channel(self.messages.get("log_completed", "Campaign completed."), campaign)
 
-        # Status reconciliation:
-        # - quarantine-triggered auto_pause must be sticky (never revert to running)
-        # - operator non-running statuses (paused/cancelled/completed/idle) should win
-        live_queue = self.queue_store.get()
-        if live_queue.get("campaign_id") == campaign_id:
-            live_status = live_queue.get("status")
-            if quarantine_tripped:
-                queue["status"] = "paused"
-                queue["next_run_at"] = ""
-            elif live_status in {"paused", "cancelled", "completed", "idle"} and live_status != queue.get("status"):
-                queue["status"] = live_status
-                if queue["status"] != "running":
-                    queue["next_run_at"] = ""
-
         self.queue_store.save(queue)
         self.campaign_store.upsert(campaign)
 
@@ -323,6 +340,49 @@ class PromoSender:
         except Exception as exc:
             self.logger.debug("update_live_status: %s", exc)
 
+    def _record_result(self, campaign: dict[str, Any], user_id: int, status: str, error: str) -> None:
+        # Send log first: it is what a restart replays onto the queue.
+        timestamp = iso_now()
+        campaign_id = campaign["campaign_id"]
+        self.send_log_store.append({
+            "campaign_id": campaign_id,
+            "user_id": str(user_id),
+            "status": status,
+            "timestamp": timestamp,
+            "error": error
+        })
+        if self.queue_store.mark(user_id, status, sent_at=timestamp, error=error):
+            counter = "sent_count" if status == "sent" else "failed_count"
+            campaign[counter] = int(campaign.get(counter, 0)) + 1
+
+    def _cached_recipient(self, guild: discord.Guild | None, user_id: int) -> discord.abc.Messageable | None:
+        # Member/user cache first; fetch_user is an API call per recipient.
+        if guild is not None:
+            member = guild.get_member(user_id)
+            if member is not None:
+                return member
+        return self.bot.get_user(user_id)
+
+    async def _send_window(self, campaign_id: str) -> AdaptiveSendWindow:
+        # One window per campaign so what it learned carries across batches; a
+        # quarantine-closed window is replaced when the campaign is resumed.
+        if self._window is None or self._window_campaign_id != campaign_id or self._window.closed:
+            self._window = AdaptiveSendWindow(
+                maximum=int(self.config.get("dm_concurrency_max", 3)),
+                max_per_minute=float(self.config.get("dm_max_per_minute", 40)),
+                slow_send_seconds=float(self.config.get("dm_slow_send_seconds", 5)),
+            )
+            self._window_campaign_id = campaign_id
+        return self._window
+
+    async def _campaign_attachments(self, campaign: dict[str, Any]) -> list[tuple[str, bytes]]:
+        # Download once per campaign, not once per batch; edits to the URLs refetch.
+        key = (campaign.get("campaign_id", ""), str(campaign.get("attachment_urls") or ""))
+        if self._attachments_key != key:
+            self._attachments = await self.build_attachment_files_payload(campaign)
+            self._attachments_key = key
+        return self._attachments
+
     def _build_send_view(self, campaign: dict[str, Any]) -> discord.ui.View | None:
         label = campaign.get("cta_label", "").strip()
         url = campaign.get("cta_url", "").strip()
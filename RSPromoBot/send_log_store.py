@@ -1,19 +1,67 @@
 from __future__ import annotations
 
+import json
+from collections.abc import Iterator
 from typing import Any
 
 from storage import JSONStorage
 
 
 class SendLogStore:
+    """Append-only DM send log (one JSON object per line in send_logs.jsonl).
+
+    A send is one short append instead of a read + rewrite of the whole history.
+    `offset()` / `read_from()` let the queue store replay sends that landed after
+    its last checkpoint.
+    """
+
     def __init__(self, storage: JSONStorage) -> None:
         self.storage = storage
-        self.file_name = "send_logs.json"
-
-    def _load(self) -> dict[str, Any]:
-        return self.storage.read(self.file_name, {"entries": []})
+        self.file_name = "send_logs.jsonl"
+        self.legacy_file_name = "send_logs.json"
+        self._migrate_legacy()
 
     def append(self, entry: dict[str, Any]) -> None:
-        payload = self._load()
-        payload["entries"].append(entry)
-        self.storage.write(self.file_name, payload)
+        self.append_many([entry])
+
+    def append_many(self, entries: list[dict[str, Any]]) -> None:
+        if not entries:
+            return
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+        with self.storage.path(self.file_name).open("a", encoding="utf-8") as fp:
+            fp.write(lines)
+
+    def offset(self) -> int:
+        """Current end of the log in bytes (where the next entry will start)."""
+        path = self.storage.path(self.file_name)
+        return path.stat().st_size if path.exists() else 0
+
+    def read_from(self, offset: int = 0) -> Iterator[dict[str, Any]]:
+        """Entries starting at byte `offset`; a torn last line is skipped."""
+        path = self.storage.path(self.file_name)
+        if not path.exists():
+            return
+        with path.open("rb") as fp:
+            fp.seek(max(0, int(offset)))
+            for raw in fp:
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+
+    def _migrate_legacy(self) -> None:
+        # send_logs.json ({"entries": [...]}) -> send_logs.jsonl, once.
+        legacy_path = self.storage.path(self.legacy_file_name)
+        if not legacy_path.exists():
+            return
+        payload = self.storage.read(self.legacy_file_name, {"entries": []})
+        entries = payload.get("entries", []) if isinstance(payload, dict) else []
+        existing = self.storage.path(self.file_name)
+        tail = existing.read_text(encoding="utf-8") if existing.exists() else ""
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries if isinstance(entry, dict))
+        tmp_name = f"{self.file_name}.tmp"
+        self.storage.path(tmp_name).write_text(lines + tail, encoding="utf-8")
+        self.storage.path(tmp_name).replace(existing)
+        legacy_path.replace(self.storage.path(f"{self.legacy_file_name}.migrated"))
@@ -145,9 +145,19 @@ class RSBotRunner:
         # Initialize modules before running
         self.initialize_modules()
         
+        async def _serve():
+            async with self.bot:
+                try:
+                    await self.bot.start(token)
+                finally:
+                    # Pooled HTTP session + hashing pool belong to this loop; close them before it stops.
+                    if self.success_bot:
+                        await self.success_bot.close_image_pipeline()
+        
         try:
             print(f"{Colors.CYAN}[Runner] Starting bot with shared instance...{Colors.RESET}")
-            self.bot.run(token)
+            discord.utils.setup_logging()
+            asyncio.run(_serve())
         except KeyboardInterrupt:
             print(f"\n{Colors.YELLOW}[Runner] Shutting down...{Colors.RESET}")
         finally:
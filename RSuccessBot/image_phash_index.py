@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate index for success-channel screenshots.
+
+- compute_image_hashes(): legacy SHA-256 of the 64x64 RGB resize (what success_points.json
+  "image_hashes" holds) + a 64-bit dHash (9x8 grayscale gradient). Top-level and PIL-only so
+  it can run in a spawned process pool without importing the bot.
+- ImageHashIndex: dHash records in a flat array file (8-byte header + uint64 triples
+  dhash, user_id, created_unix; little-endian). Startup is one array read; a new image is a
+  24-byte append instead of rewriting the points JSON. Lookups use an in-memory BK-tree on
+  Hamming distance, so "within N bits" does not scan every stored hash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from PIL import Image
+
+_MAGIC = b"RSPH\x01\x00\x00\x00"
+_FIELDS = 3  # dhash, user_id, created_unix
+
+
+def compute_image_hashes(image_bytes: bytes) -> Tuple[str, int]:
+    """(legacy sha256 hex, 64-bit dHash) for one image."""
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        rgb = img.convert("RGB")
+        legacy = hashlib.sha256(rgb.resize((64, 64)).tobytes()).hexdigest()
+        px = rgb.convert("L").resize((9, 8), Image.LANCZOS).tobytes()
+    bits = 0
+    for row in range(8):
+        base = row * 9
+        for col in range(8):
+            bits = (bits << 1) | (px[base + col] > px[base + col + 1])
+    return legacy, bits
+
+
+class _BKTree:
+    """BK-tree over 64-bit ints with Hamming distance. Node = [hash, [record idx], {distance: child}]."""
+
+    def __init__(self) -> None:
+        self.root: Optional[List[Any]] = None
+
+    def add(self, h: int, idx: int) -> None:
+        if self.root is None:
+            self.root = [h, [idx], {}]
+            return
+        node = self.root
+        while True:
+            d = (node[0] ^ h).bit_count()
+            if d == 0:
+                node[1].append(idx)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [h, [idx], {}]
+                return
+            node = child
+
+    def search(self, h: int, max_distance: int) -> List[Tuple[int, int]]:
+        """[(distance, record idx)] for every stored hash within max_distance bits."""
+        out: List[Tuple[int, int]] = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            d = (node[0] ^ h).bit_count()
+            if d <= max_distance:
+                out.extend((d, i) for i in node[1])
+            lo, hi = d - max_distance, d + max_distance
+            for cd, child in node[2].items():
+                if lo <= cd <= hi:
+                    stack.append(child)
+        return out
+
+
+class ImageHashIndex:
+    def __init__(self, path: Path, *, max_distance: int = 4) -> None:
+        self.path = Path(path)
+        self.max_distance = max(0, min(32, int(max_distance)))
+        self._records = array("Q")
+        self._tree = _BKTree()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._records) // _FIELDS
+
+    def find(self, dhash: int) -> Optional[Tuple[int, int, int]]:
+        """Closest stored image within max_distance: (distance, user_id, created_unix), or None."""
+        hits = self._tree.search(int(dhash), self.max_distance)
+        if not hits:
+            return None
+        distance, idx = min(hits)
+        base = idx * _FIELDS
+        return distance, int(self._records[base + 1]), int(self._records[base + 2])
+
+    def add(self, dhash: int, user_id: int, created_unix: Optional[int] = None) -> None:
+        row = array("Q", [int(dhash), int(user_id), int(created_unix if created_unix is not None else time.time())])
+        new_file = not self.path.exists() or self.path.stat().st_size < len(_MAGIC)
+        with open(self.path, "ab") as f:
+            if new_file:
+                f.truncate(0)
+                f.write(_MAGIC)
+            f.write(self._to_disk(row))
+        idx = len(self)
+        self._records.extend(row)
+        self._tree.add(int(dhash), idx)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        raw = self.path.read_bytes()
+        if not raw.startswith(_MAGIC):
+            raise ValueError(f"{self.path} is not an image hash index")
+        body = raw[len(_MAGIC):]
+        row_bytes = 8 * _FIELDS
+        usable = len(body) - len(body) % row_bytes  # drop a torn last row
+        records = array("Q")
+        records.frombytes(body[:usable])
+        if sys.byteorder != "little":
+            records.byteswap()
+        self._records = records
+        for idx in range(len(records) // _FIELDS):
+            self._tree.add(int(records[idx * _FIELDS]), idx)
+        if usable != len(body):
+            with open(self.path, "r+b") as f:
+                f.truncate(len(_MAGIC) + usable)
+
+    @staticmethod
+    def _to_disk(row: array) -> bytes:
+        if sys.byteorder == "little":
+            return row.tobytes()
+        swapped = array("Q", row)
+        swapped.byteswap()
+        return swapped.tobytes()
@@ -14,8 +14,9 @@ import os
 import sys
 import json
 import time
-import hashlib
 import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, Optional, Tuple
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
@@ -23,11 +24,10 @@ from datetime import datetime, timezone, timedelta
 import discord
 from discord.ext import commands
 from discord import app_commands
-from PIL import Image
 import aiohttp
-import io
 
 from mirror_world_config import load_config_with_secrets
+from image_phash_index import ImageHashIndex, compute_image_hashes
 
 # Colors for terminal
 class Colors:
@@ -79,6 +79,15 @@ class RSSuccessBot:
         self.load_messages()
         self.load_json_data()
         
+        # Near-duplicate screenshot index (dHash, array file); legacy exact hashes stay in json_data["image_hashes"]
+        self.image_index = ImageHashIndex(
+            self.base_path / "image_phash_index.bin",
+            max_distance=int(self.config.get("duplicate_image_max_distance", 4)),
+        )
+        print(f"{Colors.CYAN}[JSON]   - {len(self.image_index)} perceptual image hashes{Colors.RESET}")
+        self._hash_pool: Optional[ProcessPoolExecutor] = None
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
         # Use provided bot instance or create new one
         if bot_instance:
             self.bot = bot_instance
@@ -387,30 +396,47 @@ class RSSuccessBot:
             return self.json_data["points"][user_id_str].get("points", 0)
         return 0
     
-    def save_image_hash(self, hash_value: str, user_id: int):
-        """Save image hash to JSON"""
-        if hash_value not in self.json_data["image_hashes"]:
-            self.json_data["image_hashes"][hash_value] = {
-                "user_id": user_id,
-                "created_at": datetime.now().isoformat()
-            }
-            self.save_json_data()
+    def save_image_hash(self, dhash: int, user_id: int):
+        """Record a new image in the perceptual index (one small append, no JSON rewrite)"""
+        self.image_index.add(dhash, user_id)
     
-    def is_duplicate_hash(self, hash_value: str) -> bool:
-        """Check if image hash already exists"""
-        return hash_value in self.json_data["image_hashes"]
+    def find_duplicate_image(self, legacy_hash: str, dhash: int) -> Optional[str]:
+        """Return why the image counts as a duplicate, or None if it is new"""
+        if legacy_hash in self.json_data["image_hashes"]:
+            return "exact match (legacy hash)"
+        hit = self.image_index.find(dhash)
+        if hit:
+            distance, user_id, _created = hit
+            return f"near-duplicate (dHash distance {distance}) of an image from user {user_id}"
+        return None
     
-    def get_image_hash(self, image_bytes: bytes) -> str:
-        """Generate hash from image bytes"""
-        with Image.open(io.BytesIO(image_bytes)) as img:
-            img = img.convert("RGB").resize((64, 64))
-            return hashlib.sha256(img.tobytes()).hexdigest()
+    async def get_image_hashes(self, image_bytes: bytes) -> Tuple[str, int]:
+        """(legacy sha256, dHash) computed in the process pool so big uploads don't stall the event loop"""
+        if self._hash_pool is None:
+            # spawn: never fork the running bot (threads, sockets) into the workers
+            self._hash_pool = ProcessPoolExecutor(
+                max_workers=max(1, int(self.config.get("image_hash_workers", 2))),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._hash_pool, compute_image_hashes, image_bytes)
     
     async def fetch_image_bytes(self, url: str) -> bytes:
-        """Fetch image bytes from URL"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                return await resp.read()
+        """Fetch image bytes from URL over one pooled session"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60))
+        async with self._http_session.get(url) as resp:
+            resp.raise_for_status()
+            return await resp.read()
+    
+    async def close_image_pipeline(self):
+        """Close the pooled HTTP session and the hashing process pool (call before the loop stops)"""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+        if self._hash_pool is not None:
+            self._hash_pool.shutdown(wait=False, cancel_futures=True)
+            self._hash_pool = None
     
     async def log_action(self, guild: discord.Guild, message: str, log_type: str = "info",
                         member: discord.Member = None, channel: discord.TextChannel = None):
@@ -910,12 +936,14 @@ class RSSuccessBot:
                     try:
                         print(f"{Colors.GREEN}[Success Channel] Fetching image from URL: {attachment.url}{Colors.RESET}")
                         image_bytes = await self.fetch_image_bytes(attachment.url)
-                        img_hash = self.get_image_hash(image_bytes)
+                        legacy_hash, dhash = await self.get_image_hashes(image_bytes)
                         self.stats['images_processed'] += 1
-                        print(f"{Colors.GREEN}[Success Channel] Image hash: {img_hash[:16]}...{Colors.RESET}")
+                        print(f"{Colors.GREEN}[Success Channel] Image hash: {legacy_hash[:16]}... dHash: {dhash:016x}{Colors.RESET}")
                         
-                        if self.is_duplicate_hash(img_hash):
+                        duplicate_reason = self.find_duplicate_image(legacy_hash, dhash)
+                        if duplicate_reason:
                             self.stats['duplicates_rejected'] += 1
+                            print(f"{Colors.YELLOW}[Success Channel] Duplicate image: {duplicate_reason}{Colors.RESET}")
                             
                             # Delete the original message
                             try:
@@ -957,7 +985,7 @@ class RSSuccessBot:
                             continue
                         else:
                             print(f"{Colors.GREEN}[Success Channel] New unique image detected, saving hash{Colors.RESET}")
-                            self.save_image_hash(img_hash, message.author.id)
+                            self.save_image_hash(dhash, message.author.id)
                             has_new_success = True
                     
                     except discord.Forbidden:
@@ -1641,7 +1669,7 @@ class RSSuccessBot:
                 data.get("points", 0) if isinstance(data, dict) else data
                 for data in self.json_data["points"].values()
             )
-            images_processed = len(self.json_data["image_hashes"])
+            images_processed = len(self.json_data["image_hashes"]) + len(self.image_index)
             
             # Calculate uptime
             uptime_str = "Unknown"
@@ -2654,8 +2682,16 @@ class RSSuccessBot:
             print(f"{Colors.RED}[Bot] ERROR: bot_token not found in config.secrets.json (server-only){Colors.RESET}")
             sys.exit(1)
         
+        async def _serve():
+            async with self.bot:
+                try:
+                    await self.bot.start(token)
+                finally:
+                    await self.close_image_pipeline()
+        
         try:
-            self.bot.run(token)
+            discord.utils.setup_logging()
+            asyncio.run(_serve())
         except KeyboardInterrupt:
             print(f"\n{Colors.YELLOW}[Bot] Shutting down...{Colors.RESET}")
         finally:
@@ -1,14 +1,21 @@
 #!/usr/bin/env python3
 """
 Main entry point for Whop Membership to Google Sheets sync.
+
+Usage:
+  python main.py               startup sync, then continuous cycles if enabled in config
+  python main.py --benchmark   one startup sync + one continuous cycle back to back, then
+                               print per-stage timings (Whop fetch, row build, Sheets
+                               reads/commit, segregation) and Sheets request counters
 """
 
 import asyncio
 import json
 import logging
 import sys
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Setup logging with more detail
 logging.basicConfig(
@@ -74,9 +81,8 @@ def load_config() -> Dict[str, Any]:
     return cfg
 
 
-async def run_sync_once(cfg: Dict[str, Any]) -> None:
-    """Run a single sync cycle."""
-    # Initialize Whop API client
+def build_whop_client(cfg: Dict[str, Any]) -> Optional[WhopAPIClient]:
+    """Build the pooled Whop API client shared by every sync cycle (None when misconfigured)."""
     log.info("Initializing Whop API client...")
     whop_cfg = cfg.get("whop_api", {})
     api_key = whop_cfg.get("api_key", "").strip()
@@ -86,30 +92,34 @@ async def run_sync_once(cfg: Dict[str, Any]) -> None:
     if not api_key:
         log.error("✗ Missing whop_api.api_key in config.secrets.json")
         print("X ERROR: Missing whop_api.api_key in config.secrets.json")
-        return
+        return None
     
     if not company_id:
         log.error("✗ Missing whop_api.company_id in config.json")
         print("X ERROR: Missing whop_api.company_id in config.json")
-        return
+        return None
     
     log.debug(f"  API Key: {'*' * 20}...{api_key[-4:] if len(api_key) > 4 else '****'}")
     log.debug(f"  Base URL: {base_url}")
     log.debug(f"  Company ID: {company_id}")
     
     try:
-        whop_client = WhopAPIClient(api_key=api_key, base_url=base_url, company_id=company_id)
+        whop_client = WhopAPIClient.from_config(api_key, whop_cfg)
         log.info("✓ Whop API client initialized successfully")
         print("OK Whop API client initialized successfully")
+        return whop_client
     except ValueError as e:
         log.error(f"✗ Invalid configuration: {e}", exc_info=True)
         print(f"X ERROR: Invalid configuration: {e}")
-        return
+        return None
     except Exception as e:
         log.error(f"✗ Failed to initialize Whop API client: {type(e).__name__}: {e}", exc_info=True)
         print(f"X ERROR: Failed to initialize Whop API client: {type(e).__name__}: {e}")
-        return
-    
+        return None
+
+
+async def run_sync_once(cfg: Dict[str, Any], whop_client: WhopAPIClient) -> Optional[WhopSheetsSync]:
+    """Run a single sync cycle. Returns the sync instance (for its stage timer)."""
     # Initialize Sheets sync
     log.info("Initializing Google Sheets sync...")
     print("Initializing Google Sheets sync...")
@@ -120,7 +130,7 @@ async def run_sync_once(cfg: Dict[str, Any]) -> None:
     except Exception as e:
         log.error(f"✗ Failed to initialize Google Sheets sync: {type(e).__name__}: {e}", exc_info=True)
         print(f"X ERROR: Failed to initialize Google Sheets sync: {type(e).__name__}: {e}")
-        return
+        return None
     
     # Sync all products
     log.info("=" * 60)
@@ -155,9 +165,23 @@ async def run_sync_once(cfg: Dict[str, Any]) -> None:
     print("")
     print(f"Total: {total_success}/{len(results)} products synced, {total_members} total members")
     print("=" * 60)
+    return sheets_sync
+
+
+def print_stage_report(label: str, sheets_sync: Optional[WhopSheetsSync], wall_s: float) -> None:
+    """Print the per-stage timings collected by one sync run."""
+    print("")
+    print("=" * 60)
+    print(f"=== Benchmark: {label} ({wall_s:.2f}s wall) ===")
+    print("=" * 60)
+    if sheets_sync is None:
+        print("(run failed before any stage was timed)")
+        return
+    for line in sheets_sync.timer.report_lines():
+        print(line)
 
 
-async def main():
+async def main(benchmark: bool = False):
     """Main sync function."""
     cfg = load_config()
     
@@ -165,6 +189,32 @@ async def main():
         log.info("Sync is disabled in config")
         return
     
+    whop_client = build_whop_client(cfg)
+    if whop_client is None:
+        return
+    try:
+        if benchmark:
+            await _run_benchmark(cfg, whop_client)
+        else:
+            await _run_main(cfg, whop_client)
+    finally:
+        await whop_client.close()
+
+
+async def _run_benchmark(cfg: Dict[str, Any], whop_client: WhopAPIClient) -> None:
+    """Startup sync + one continuous cycle without the interval wait; report where the time went."""
+    t0 = time.perf_counter()
+    startup = await run_sync_once(cfg, whop_client)
+    startup_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cycle = await run_continuous_cycle(cfg, whop_client)
+    cycle_s = time.perf_counter() - t0
+    print_stage_report("startup sync", startup, startup_s)
+    print_stage_report("continuous cycle", cycle, cycle_s)
+
+
+async def _run_main(cfg: Dict[str, Any], whop_client: WhopAPIClient) -> None:
+    """Startup sync, then continuous cycles (all sharing one pooled Whop client)."""
     # Check if continuous sync is enabled
     continuous_cfg = cfg.get("continuous_sync", {})
     if continuous_cfg.get("enabled", False):
@@ -180,7 +230,7 @@ async def main():
         print("=" * 60)
         print("Initial sync (startup)...")
         print("=" * 60)
-        await run_sync_once(cfg)
+        await run_sync_once(cfg, whop_client)
         
         # Then run continuous cycles
         cycle_count = 0
@@ -200,7 +250,7 @@ async def main():
                 
                 # Continuous cycle: update source, then segregate
                 try:
-                    await run_continuous_cycle(cfg)
+                    await run_continuous_cycle(cfg, whop_client)
                     log.info(f"✓ Cycle #{cycle_count} completed successfully")
                     print(f"OK Cycle #{cycle_count} completed successfully")
                 except Exception as e:
@@ -217,23 +267,12 @@ async def main():
             raise
     else:
         # Run once (startup sync)
-        await run_sync_once(cfg)
+        await run_sync_once(cfg, whop_client)
 
 
-async def run_continuous_cycle(cfg: Dict[str, Any]) -> None:
-    """Run a continuous sync cycle: update source tab, then segregate by status."""
-    # Initialize Whop API client
-    whop_cfg = cfg.get("whop_api", {})
-    api_key = whop_cfg.get("api_key", "").strip()
-    base_url = whop_cfg.get("base_url", "https://api.whop.com/api/v1").strip()
-    company_id = whop_cfg.get("company_id", "").strip()
-    
-    if not api_key or not company_id:
-        log.error("Missing Whop API configuration")
-        return
-    
+async def run_continuous_cycle(cfg: Dict[str, Any], whop_client: WhopAPIClient) -> Optional[WhopSheetsSync]:
+    """Run a continuous sync cycle: update source tab, then segregate by status. Returns the sync instance."""
     try:
-        whop_client = WhopAPIClient(api_key=api_key, base_url=base_url, company_id=company_id)
         sheets_sync = WhopSheetsSync(cfg)
         
         # Run continuous cycle
@@ -249,15 +288,16 @@ async def run_continuous_cycle(cfg: Dict[str, Any]) -> None:
             status_icon = "OK" if success else "X"
             log.info(f"{status_icon} {tab_name}: {count} members - {msg}")
             print(f"{status_icon} {tab_name}: {count} members - {msg}")
-        
+        return sheets_sync
     except Exception as e:
         log.error(f"Continuous cycle failed: {e}", exc_info=True)
         print(f"X Continuous cycle failed: {e}")
+        return None
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        asyncio.run(main(benchmark="--benchmark" in sys.argv[1:]))
     except KeyboardInterrupt:
         log.info("Interrupted by user")
         sys.exit(0)
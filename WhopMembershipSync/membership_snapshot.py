@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Local snapshot of what WhopMembershipSync last wrote to Google Sheets.
+
+One SQLite file (WAL) with:
+- tab_rows: per tab, member key (same key the sheet writer uses: Email, else Discord ID)
+  -> sheet row number, row hash, row values, Status Updated
+- tabs:     per tab, sheetId, last used sheet row, and when the tab was last fully reconciled
+- cursors:  per product, change-feed cursor (ISO ts) + when the last full Whop sweep ran
+
+The snapshot lets a cycle diff desired rows in memory and write only dirty rows by row
+number, instead of reading the whole tab back every time. It is a cache: a full reconcile
+(read tab + diff) rebuilds it, and is forced whenever it looks stale.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tab_rows (
+    tab TEXT NOT NULL,
+    key TEXT NOT NULL,
+    sheet_row INTEGER NOT NULL,
+    row_hash TEXT NOT NULL,
+    row_json TEXT NOT NULL,
+    updated_at TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (tab, key)
+);
+CREATE TABLE IF NOT EXISTS tabs (
+    tab TEXT PRIMARY KEY,
+    sheet_id INTEGER,
+    reconciled_at TEXT NOT NULL,
+    last_row INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    scope TEXT PRIMARY KEY,
+    cursor TEXT NOT NULL,
+    full_sweep_at TEXT NOT NULL
+);
+"""
+
+# (sheet_row, row_hash, row)
+SnapshotRow = Tuple[int, str, List[str]]
+
+
+def row_hash(row: List[str]) -> str:
+    return hashlib.sha1(json.dumps([str(c or "") for c in row], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _row_updated_at(row: List[str]) -> str:
+    # Column G = Status Updated
+    return str(row[6] or "") if len(row) > 6 else ""
+
+
+class MembershipSnapshot:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        cols = {r[1] for r in self._conn.execute("PRAGMA table_info(tabs)")}
+        if "last_row" not in cols:
+            self._conn.execute("ALTER TABLE tabs ADD COLUMN last_row INTEGER NOT NULL DEFAULT 0")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # -------------------------
+    # Tabs
+    # -------------------------
+    def tab_state(self, tab: str) -> Optional[Tuple[Optional[int], str, int]]:
+        """(sheet_id, reconciled_at, last_row) or None if the tab was never reconciled."""
+        cur = self._conn.execute("SELECT sheet_id, reconciled_at, last_row FROM tabs WHERE tab = ?", (tab,))
+        r = cur.fetchone()
+        if not r:
+            return None
+        return (int(r[0]) if r[0] is not None else None, str(r[1] or ""), int(r[2] or 0))
+
+    def load_tab(self, tab: str) -> Dict[str, SnapshotRow]:
+        out: Dict[str, SnapshotRow] = {}
+        for key, sheet_row, h, data in self._conn.execute(
+            "SELECT key, sheet_row, row_hash, row_json FROM tab_rows WHERE tab = ?", (tab,)
+        ):
+            try:
+                row = json.loads(data)
+            except ValueError:
+                continue
+            if isinstance(row, list):
+                out[str(key)] = (int(sheet_row), str(h), [str(c or "") for c in row])
+        return out
+
+    def replace_tab(
+        self,
+        tab: str,
+        rows: Dict[str, Tuple[int, List[str]]],
+        *,
+        sheet_id: Optional[int],
+        last_row: int,
+    ) -> None:
+        """Store the full layout of a tab right after a reconcile (key -> (sheet_row, row))."""
+        with self._conn:
+            self._conn.execute("DELETE FROM tab_rows WHERE tab = ?", (tab,))
+            self._conn.executemany(
+                "INSERT INTO tab_rows (tab, key, sheet_row, row_hash, row_json, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (tab, k, int(i), row_hash(r), json.dumps(r, ensure_ascii=False), _row_updated_at(r))
+                    for k, (i, r) in rows.items()
+                ],
+            )
+            self._conn.execute(
+                "INSERT INTO tabs (tab, sheet_id, reconciled_at, last_row) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(tab) DO UPDATE SET sheet_id = excluded.sheet_id, reconciled_at = excluded.reconciled_at, "
+                "last_row = excluded.last_row",
+                (tab, sheet_id, _now_iso(), int(last_row)),
+            )
+
+    def apply_tab_changes(
+        self,
+        tab: str,
+        *,
+        upserts: Dict[str, Tuple[int, List[str]]],
+        deleted_keys: Iterable[str],
+        deleted_rows: Iterable[int],
+        last_row: int,
+    ) -> None:
+        """Record a dirty-row write: upsert changed/appended rows, then drop deleted rows and shift the rest up."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO tab_rows (tab, key, sheet_row, row_hash, row_json, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(tab, key) DO UPDATE SET sheet_row = excluded.sheet_row, row_hash = excluded.row_hash, "
+                "row_json = excluded.row_json, updated_at = excluded.updated_at",
+                [
+                    (tab, k, int(i), row_hash(r), json.dumps(r, ensure_ascii=False), _row_updated_at(r))
+                    for k, (i, r) in upserts.items()
+                ],
+            )
+            self._conn.executemany("DELETE FROM tab_rows WHERE tab = ? AND key = ?", [(tab, k) for k in deleted_keys])
+            # Bottom-up, so each deleted row number still refers to the pre-delete layout.
+            self._conn.executemany(
+                "UPDATE tab_rows SET sheet_row = sheet_row - 1 WHERE tab = ? AND sheet_row > ?",
+                [(tab, int(r)) for r in sorted(set(deleted_rows), reverse=True)],
+            )
+            self._conn.execute("UPDATE tabs SET last_row = ? WHERE tab = ?", (int(last_row), tab))
+
+    def invalidate_tab(self, tab: str) -> None:
+        """Force the next write to this tab to do a full reconcile."""
+        with self._conn:
+            self._conn.execute("DELETE FROM tabs WHERE tab = ?", (tab,))
+
+    # -------------------------
+    # Change-feed cursors
+    # -------------------------
+    def get_cursor(self, scope: str) -> Optional[Tuple[str, str]]:
+        """(cursor, full_sweep_at) or None if no full sweep has been recorded for this scope."""
+        r = self._conn.execute("SELECT cursor, full_sweep_at FROM cursors WHERE scope = ?", (scope,)).fetchone()
+        return (str(r[0] or ""), str(r[1] or "")) if r else None
+
+    def set_cursor(self, scope: str, cursor: str, *, full_sweep_at: str = "") -> None:
+        with self._conn:
+            if full_sweep_at:
+                self._conn.execute(
+                    "INSERT INTO cursors (scope, cursor, full_sweep_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(scope) DO UPDATE SET cursor = excluded.cursor, full_sweep_at = excluded.full_sweep_at",
+                    (scope, cursor, full_sweep_at),
+                )
+            else:
+                self._conn.execute("UPDATE cursors SET cursor = ? WHERE scope = ?", (cursor, scope))
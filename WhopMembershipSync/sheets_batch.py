@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Google Sheets request plumbing for WhopMembershipSync.
+
+- SheetsQuotaLimiter: token buckets for read and write requests per minute (the Sheets API
+  quota is counted per request, not per cell), plus a shared pause after a 429.
+- SheetsWriteBatch: mutations queued during one sync cycle. They are sent as at most:
+    1) spreadsheets.batchUpdate  appendDimension  (only if a tab needs more grid rows)
+    2) values.batchUpdate        every row/header write, all tabs
+    3) spreadsheets.batchUpdate  deleteDimension  (stale/blank rows, all tabs, bottom-up per tab)
+  Row numbers are planned against the pre-delete layout, so values go before deletes.
+  Callbacks run after a successful commit (snapshot bookkeeping) or after a failure.
+- StageTimer: wall-time per named stage, for `main.py --benchmark`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from typing import Any, Callable, Dict, Iterator, List, Set
+
+
+class SheetsQuotaLimiter:
+    def __init__(self, *, reads_per_minute: int = 60, writes_per_minute: int = 60) -> None:
+        self._rate = {
+            "read": max(1, int(reads_per_minute)) / 60.0,
+            "write": max(1, int(writes_per_minute)) / 60.0,
+        }
+        # Start full so a cycle's first few calls are not delayed.
+        self._tokens = {k: max(1.0, v * 60.0) for k, v in self._rate.items()}
+        self._capacity = dict(self._tokens)
+        self._at = {k: time.monotonic() for k in self._rate}
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, kind: str) -> float:
+        """Wait for one request token of `kind` ("read" | "write"). Returns seconds waited."""
+        kind = "write" if kind == "write" else "read"
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens[kind] = min(
+                    self._capacity[kind],
+                    self._tokens[kind] + (now - self._at[kind]) * self._rate[kind],
+                )
+                self._at[kind] = now
+                delay = max(0.0, self._paused_until - now)
+                if not delay and self._tokens[kind] >= 1.0:
+                    self._tokens[kind] -= 1.0
+                    return waited
+                if not delay:
+                    delay = (1.0 - self._tokens[kind]) / self._rate[kind]
+                waited += delay
+                await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for `seconds` (after a 429 RESOURCE_EXHAUSTED)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + max(0.0, float(seconds)))
+        for k in self._tokens:
+            self._tokens[k] = 0.0
+
+
+class SheetsWriteBatch:
+    def __init__(self) -> None:
+        self.grow: Dict[int, int] = {}  # sheetId -> rows to append to the grid
+        self.values: List[Dict[str, Any]] = []
+        self.deletes: List[Dict[str, Any]] = []
+        self.tabs: Set[str] = set()
+        self.on_commit: List[Callable[[], None]] = []
+        self.on_fail: List[Callable[[], None]] = []
+
+    def empty(self) -> bool:
+        return not (self.grow or self.values or self.deletes or self.on_commit)
+
+    def grow_rows(self, sheet_id: int, rows: int) -> None:
+        if rows > 0:
+            self.grow[int(sheet_id)] = self.grow.get(int(sheet_id), 0) + int(rows)
+
+    def set_values(self, a1_range: str, values: List[List[str]]) -> None:
+        self.values.append({"range": a1_range, "values": values})
+
+    def delete_rows(self, sheet_id: int, rows_1b: List[int]) -> None:
+        """Queue deletion of 1-based rows; contiguous runs become one request, emitted bottom-up."""
+        rows = sorted(set(int(r) for r in rows_1b if int(r) > 1))
+        if not rows:
+            return
+        runs: List[List[int]] = []
+        for r in rows:
+            if runs and r == runs[-1][1] + 1:
+                runs[-1][1] = r
+            else:
+                runs.append([r, r])
+        for start_1b, end_1b in reversed(runs):
+            self.deletes.append(
+                {
+                    "deleteDimension": {
+                        "range": {
+                            "sheetId": int(sheet_id),
+                            "dimension": "ROWS",
+                            "startIndex": start_1b - 1,
+                            "endIndex": end_1b,
+                        }
+                    }
+                }
+            )
+
+    def grow_requests(self) -> List[Dict[str, Any]]:
+        return [
+            {"appendDimension": {"sheetId": sid, "dimension": "ROWS", "length": n}}
+            for sid, n in self.grow.items()
+        ]
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name: str, seconds: float) -> None:
+        st = self.stages.setdefault(name, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+        st["count"] += 1
+        st["total_s"] += seconds
+        st["max_s"] = max(st["max_s"], seconds)
+
+    def incr(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def report_lines(self) -> List[str]:
+        lines = [f"{'stage':<44} {'count':>6} {'total_s':>9} {'max_s':>8}"]
+        for name, st in self.stages.items():
+            lines.append(f"{name:<44} {int(st['count']):>6} {st['total_s']:>9.2f} {st['max_s']:>8.2f}")
+        for name, n in sorted(self.counters.items()):
+            lines.append(f"{name:<44} {n:>6}")
+        return lines
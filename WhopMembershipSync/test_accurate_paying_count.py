@@ -14,6 +14,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def test_accurate_paying_count():
     """Accurately determine paying members using exact code logic."""
     
@@ -44,6 +57,7 @@ async def test_accurate_paying_count():
     print("=" * 80)
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     # Step 1: Fetch all memberships (like code does)
     print("\nStep 1: Fetching all memberships from /memberships endpoint...")
@@ -446,4 +460,4 @@ async def test_accurate_paying_count():
         print(f"  - {len(only_active)} active tab members are NOT 'renewing' (manual renewals or different billing)")
 
 if __name__ == "__main__":
-    asyncio.run(test_accurate_paying_count())
+    asyncio.run(_run_closing(test_accurate_paying_count()))
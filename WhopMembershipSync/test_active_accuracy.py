@@ -12,6 +12,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def test_active_accuracy():
     """Find missing active members."""
     
@@ -36,6 +49,7 @@ async def test_active_accuracy():
     print("=" * 80)
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     # Get all active memberships from API
     print("\nFetching all active memberships from API...")
@@ -198,4 +212,4 @@ async def test_active_accuracy():
     print(f"  - Active in left: {len(overlap_left)}")
 
 if __name__ == "__main__":
-    asyncio.run(test_active_accuracy())
+    asyncio.run(_run_closing(test_active_accuracy()))
@@ -13,6 +13,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def test_active_members():
     """Test fetching active memberships directly from Whop API."""
     
@@ -40,6 +53,7 @@ async def test_active_members():
     print()
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     # Test 1: Fetch active memberships directly
     print("TEST 1: Fetching active memberships from /memberships endpoint...")
@@ -237,4 +251,4 @@ async def test_active_members():
     print("  4. Other statuses overriding 'active'")
 
 if __name__ == "__main__":
-    asyncio.run(test_active_members())
+    asyncio.run(_run_closing(test_active_members()))
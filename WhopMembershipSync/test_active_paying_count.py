@@ -12,6 +12,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def test_active_paying_count():
     """Test active members vs paying members (excluding trials and lifetime)."""
     
@@ -40,6 +53,7 @@ async def test_active_paying_count():
     print("=" * 80)
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     # Step 1: Fetch ALL active memberships (all products)
     print("\nStep 1: Fetching ALL active memberships (all products)...")
@@ -212,4 +226,4 @@ async def test_active_paying_count():
     print(f"\n  Expected paying count (excluding trials, lifetime, canceling): {len(main_active_not_canceling)}")
 
 if __name__ == "__main__":
-    asyncio.run(test_active_paying_count())
+    asyncio.run(_run_closing(test_active_paying_count()))
@@ -13,6 +13,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def test_active_tab_breakdown():
     """Test what statuses map to 'Active' tab."""
     
@@ -52,6 +65,7 @@ async def test_active_tab_breakdown():
     print(f"\nStatuses that map to 'Active' tab: {statuses_to_active}")
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     # Fetch all memberships for each status that maps to "Active"
     print("\n" + "=" * 80)
@@ -151,4 +165,4 @@ async def test_active_tab_breakdown():
     print(f"  (e.g., a member with both 'active' and 'past_due' would only appear once)")
 
 if __name__ == "__main__":
-    asyncio.run(test_active_tab_breakdown())
+    asyncio.run(_run_closing(test_active_tab_breakdown()))
@@ -12,6 +12,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def test_active_vs_special():
     """Check if active members appear in special status lists."""
     
@@ -36,6 +49,7 @@ async def test_active_vs_special():
     print("=" * 80)
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     # Step 1: Fetch active memberships
     print("\nStep 1: Fetching active memberships...")
@@ -183,4 +197,4 @@ async def test_active_vs_special():
     print("excluded from the special list and handled as 'active' instead.")
 
 if __name__ == "__main__":
-    asyncio.run(test_active_vs_special())
+    asyncio.run(_run_closing(test_active_vs_special()))
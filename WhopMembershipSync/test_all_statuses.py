@@ -14,6 +14,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def test_all_statuses():
     """Test fetching each status separately and compare with our code logic."""
     
@@ -41,6 +54,7 @@ async def test_all_statuses():
     print()
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     results = {}
     
@@ -425,4 +439,4 @@ async def test_all_statuses():
         print(f"  Canceling: Expected {expected_canceling}, Got {actual_canceling} (diff: {actual_canceling - expected_canceling})")
 
 if __name__ == "__main__":
-    asyncio.run(test_all_statuses())
+    asyncio.run(_run_closing(test_all_statuses()))
@@ -14,6 +14,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def test_code_vs_api():
     """Test our code's exact logic vs direct API calls."""
     
@@ -40,6 +53,7 @@ async def test_code_vs_api():
     print()
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     # Step 1: Fetch all memberships from /memberships endpoint (like our code does)
     print("Step 1: Fetching memberships from /memberships endpoint...")
@@ -465,4 +479,4 @@ async def test_code_vs_api():
     print(f"Excluded from special (already active): {excluded_from_special}")
 
 if __name__ == "__main__":
-    asyncio.run(test_code_vs_api())
+    asyncio.run(_run_closing(test_code_vs_api()))
@@ -13,6 +13,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def test_deduplication_detailed():
     """Test deduplication logic in detail to find the bug."""
     
@@ -37,6 +50,7 @@ async def test_deduplication_detailed():
     print("=" * 80)
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     status_priority = {
         "canceling": 1,
@@ -288,4 +302,4 @@ async def test_deduplication_detailed():
             print(f"    - {email}")
 
 if __name__ == "__main__":
-    asyncio.run(test_deduplication_detailed())
+    asyncio.run(_run_closing(test_deduplication_detailed()))
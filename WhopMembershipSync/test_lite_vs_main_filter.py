@@ -51,6 +51,19 @@ async def fetch_all_memberships_for_product(whop_client, product_id: str, produc
     return all_memberships
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def main():
     config_file = Path(__file__).parent / "config.secrets.json"
     if not config_file.exists():
@@ -72,6 +85,7 @@ async def main():
     print("=" * 80)
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     # 1) Fetch memberships for MAIN product only (same as our code: product_ids=[main])
     print("\nStep 1: Fetching memberships for MAIN product only (product_ids=[prod_RrcvGelB8tVgu])...")
@@ -165,4 +179,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(_run_closing(main()))
@@ -12,6 +12,19 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def test_unassigned_email_payment():
     """Verify payment status of 'unassigned' email accounts."""
     
@@ -36,6 +49,7 @@ async def test_unassigned_email_payment():
     print("=" * 80)
     
     whop_client = WhopAPIClient(api_key=api_key, company_id=company_id)
+    _OPEN_CLIENTS.append(whop_client)
     
     # Fetch all active memberships
     print("\nStep 1: Fetching all active memberships...")
@@ -178,4 +192,4 @@ async def test_unassigned_email_payment():
     print(f"  - No email: {len(no_email)}")
 
 if __name__ == "__main__":
-    asyncio.run(test_unassigned_email_payment())
+    asyncio.run(_run_closing(test_unassigned_email_payment()))
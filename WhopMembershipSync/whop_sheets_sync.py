@@ -7,13 +7,18 @@ Syncs Whop API membership data to Google Sheets for integration with GHL, KIT, a
 from __future__ import annotations
 
 import asyncio
+import bisect
+import contextlib
+import contextvars
 import json
 import logging
 import os
+import random
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 
 log = logging.getLogger("whop-sheets-sync")
 
@@ -22,11 +27,50 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 try:
     from RSCheckerbot.whop_api_client import WhopAPIClient, WhopAPIError
+    from RSCheckerbot.member_history_store import get_member_history_store
     from RSCheckerbot.rschecker_utils import extract_discord_id_from_whop_member_record
+    from shared.whop_webhook_raw_log import WhopWebhookRawLog
 except ImportError:
     print("Error: Could not import WhopAPIClient. Make sure RSCheckerbot is available.")
     sys.exit(1)
 
+from membership_snapshot import MembershipSnapshot, row_hash
+from sheets_batch import SheetsQuotaLimiter, SheetsWriteBatch, StageTimer
+
+# Sheet columns A..J shared by product tabs and status tabs
+MEMBERSHIP_HEADERS = [
+    "Name",
+    "Phone Number",
+    "Email",
+    "Product",
+    "Status",
+    "Discord ID",
+    "Status Updated",
+    "Date Left",
+    "Date Joined",
+    "Total Spend",
+]
+
+# Status priority: IMPORTANT - "left" only applies if member has NO active membership
+# Active memberships take precedence over "left" status from /members endpoint
+# Priority: canceling > renewing > active > trialing > churned > expired > completed > past_due > unresolved > drafted > left
+STATUS_PRIORITY = {
+    "canceling": 1,  # Highest priority - active membership being canceled
+    "renewing": 2,
+    "active": 3,
+    "trialing": 4,
+    "churned": 5,
+    "expired": 6,
+    "completed": 7,
+    "past_due": 8,
+    "unresolved": 9,
+    "drafted": 10,
+    "left": 11,  # Lowest priority - only if no active membership exists
+}
+
+# Per-sync counters live per asyncio task, so products synced concurrently keep separate reports.
+_SYNC_STATS: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("whop_sheets_sync_stats")
+
 
 def _cfg_str(cfg: Dict[str, Any], key: str, default: str = "") -> str:
     v = str((cfg or {}).get(key) or "").strip()
@@ -202,6 +246,40 @@ def _col_letter(n_1_based: int) -> str:
     return out
 
 
+def _parse_iso_utc(raw: Any) -> Optional[datetime]:
+    s = str(raw or "").strip()
+    if not s:
+        return None
+    try:
+        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _membership_product_id(mship: Dict[str, Any]) -> str:
+    product = mship.get("product") if isinstance(mship, dict) else None
+    if isinstance(product, dict):
+        return str(product.get("id") or "").strip()
+    return str((mship or {}).get("product_id") or "").strip() if isinstance(mship, dict) else ""
+
+
+def _membership_ids_from_webhook(payload: Any) -> Set[str]:
+    """Membership IDs a Whop webhook refers to (membership.* events carry it as data.id; payments etc. as data.membership)."""
+    out: Set[str] = set()
+    data = payload.get("data") if isinstance(payload, dict) else None
+    if not isinstance(data, dict):
+        return out
+    candidates = [data.get("id"), data.get("membership_id")]
+    m = data.get("membership")
+    candidates.append(m.get("id") if isinstance(m, dict) else m)
+    for c in candidates:
+        s = str(c or "").strip()
+        if s.startswith("mem_"):
+            out.add(s)
+    return out
+
+
 def _resolve_discord_id_from_identity_cache(cache: Dict[str, Any], email: str) -> str:
     """Return Discord ID from RSCheckerbot identity cache by email (best-effort)."""
     em = str(email or "").strip().lower()
@@ -473,14 +551,45 @@ class WhopSheetsSync:
         self._ghl_phone_map_at: float = 0.0
         # Member history cache (discord_id -> total_spent string)
         self._mh_total_spent: Dict[str, str] = {}
-        self._mh_total_spent_mtime: float = 0.0
+        self._mh_total_spent_version: Optional[Tuple[int, int]] = None
         self._mh_total_spent_at: float = 0.0
         # Whop payments spend cache (email -> {"total_spent": str, "fetched_at": iso})
         self._whop_payments_spend: Dict[str, Any] = {}
         self._whop_payments_spend_mtime: float = 0.0
         self._whop_payments_spend_at: float = 0.0
-        # Per-sync counters (reset at start of each sync method)
-        self._sync_stats: Dict[str, Any] = {}
+        # Incremental sync: local snapshot of written rows + per-cycle Whop lookups for changed memberships
+        self._membership_snapshot: Optional[MembershipSnapshot] = None
+        self._membership_by_id: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._user_product_ids: Dict[str, Set[str]] = {}
+        # Sheets request path: quota limiter, per-cycle write batch, per-cycle read/metadata caches
+        sheets_api = self.cfg.get("sheets_api") if isinstance(self.cfg.get("sheets_api"), dict) else {}
+        self._sheets_limiter = SheetsQuotaLimiter(
+            reads_per_minute=int(sheets_api.get("reads_per_minute") or 60),
+            writes_per_minute=int(sheets_api.get("writes_per_minute") or 60),
+        )
+        self._sheets_max_429_retries = max(0, int(sheets_api.get("max_rate_limit_retries") or 5))
+        self._batch: Optional[SheetsWriteBatch] = None
+        self._batch_commit: Tuple[bool, str] = (True, "ok")
+        self._read_cache: Dict[str, List[List[str]]] = {}
+        self._sheet_meta_cache: Optional[Dict[str, Tuple[int, int]]] = None
+        self._sheet_meta_lock = asyncio.Lock()
+        # Rows each tab was last written with this run (segregation source without a read-back)
+        self._tab_rows: Dict[str, List[List[str]]] = {}
+        self.timer = StageTimer()
+
+    @property
+    def _sync_stats(self) -> Dict[str, Any]:
+        """Per-sync counters (reset at start of each sync method; one dict per asyncio task)."""
+        try:
+            return _SYNC_STATS.get()
+        except LookupError:
+            stats: Dict[str, Any] = {}
+            _SYNC_STATS.set(stats)
+            return stats
+
+    @_sync_stats.setter
+    def _sync_stats(self, value: Dict[str, Any]) -> None:
+        _SYNC_STATS.set(value)
 
     def _change_report_enabled(self) -> bool:
         return _cfg_bool(self.cfg, "sync_change_report_enabled", True)
@@ -807,7 +916,7 @@ class WhopSheetsSync:
         return _cfg_bool(self.cfg, "member_history_total_spent_enabled", True)
 
     def _member_history_path(self) -> Path:
-        p = _cfg_str(self.cfg, "member_history_path", "RSCheckerbot/member_history.json")
+        p = _cfg_str(self.cfg, "member_history_path", "RSCheckerbot/member_history.sqlite3")
         path = Path(p)
         if not path.is_absolute():
             repo_root = Path(__file__).resolve().parents[1]
@@ -815,10 +924,10 @@ class WhopSheetsSync:
         return path
 
     def _load_member_history_total_spent_if_needed(self, *, force: bool = False) -> Dict[str, str]:
-        """Load discord_id -> total_spent from member_history.json (cached)."""
+        """Load discord_id -> total_spent from the RSCheckerbot member history store (cached)."""
         if not self._member_history_spend_enabled():
             self._mh_total_spent = {}
-            self._mh_total_spent_mtime = 0.0
+            self._mh_total_spent_version = None
             self._mh_total_spent_at = 0.0
             return {}
 
@@ -832,25 +941,23 @@ class WhopSheetsSync:
             return dict(self._mh_total_spent)
 
         path = self._member_history_path()
-        try:
-            mtime = float(path.stat().st_mtime)
-        except Exception:
-            mtime = 0.0
-        if (not force) and self._mh_total_spent and mtime and self._mh_total_spent_mtime and mtime == self._mh_total_spent_mtime:
-            self._mh_total_spent_at = now
-            return dict(self._mh_total_spent)
-
-        raw: Dict[str, Any] = {}
+        raw: List[Tuple[str, Any]] = []
+        version = None
         try:
             if path.exists():
-                obj = json.loads(path.read_text(encoding="utf-8") or "{}")
-                raw = obj if isinstance(obj, dict) else {}
-        except Exception:
-            raw = {}
+                store = get_member_history_store(path, legacy_json_path=None)
+                version = store.max_version()
+                if (not force) and self._mh_total_spent and version == self._mh_total_spent_version:
+                    self._mh_total_spent_at = now
+                    return dict(self._mh_total_spent)
+                raw = store.iter_records()
+        except Exception as e:
+            log.warning(f"  member_history store unavailable ({path.name}): {e}")
+            raw = []
 
         out: Dict[str, str] = {}
         # member_history is keyed by discord_id string
-        for did, rec in (raw or {}).items():
+        for did, rec in raw:
             if not (isinstance(did, str) and did.isdigit() and isinstance(rec, dict)):
                 continue
             wh = rec.get("whop") if isinstance(rec.get("whop"), dict) else {}
@@ -860,7 +967,7 @@ class WhopSheetsSync:
                 out[did] = ts
 
         self._mh_total_spent = dict(out)
-        self._mh_total_spent_mtime = mtime
+        self._mh_total_spent_version = version
         self._mh_total_spent_at = now
         # One-time-ish visibility: confirm member_history spend coverage on this host.
         try:
@@ -946,14 +1053,14 @@ class WhopSheetsSync:
         tab = self._ghl_phone_tab_title()
         rng = f"'{tab}'!A:Z"
 
-        async with self._api_lock:
-            def _do_get():
-                return service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=rng).execute()
+        def _do_get():
+            return service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=rng).execute()
 
-            try:
-                resp = await asyncio.to_thread(_do_get)
-            except Exception:
-                return {}
+        try:
+            with self.timer.stage("sheets_read"):
+                resp = await self._sheets_call(_do_get)
+        except Exception:
+            return {}
 
         values = resp.get("values") if isinstance(resp, dict) else None
         if not isinstance(values, list) or not values:
@@ -1041,40 +1148,194 @@ class WhopSheetsSync:
         
         return self._service
     
-    async def _get_existing_tabs(self) -> List[str]:
-        """Get list of all existing tab names in the spreadsheet."""
+    # -------------------------
+    # Sheets request path
+    # -------------------------
+    async def _sheets_call(self, fn: Callable[[], Any], *, write: bool = False) -> Any:
+        """Run one blocking Sheets request off the event loop: quota limiter, one request at a time, 429 backoff."""
+        kind = "write" if write else "read"
+        attempt = 0
+        while True:
+            waited = await self._sheets_limiter.acquire(kind)
+            if waited:
+                self.timer.add("sheets_quota_wait", waited)
+            self.timer.incr(f"sheets_{kind}_requests")
+            try:
+                async with self._api_lock:
+                    return await asyncio.to_thread(fn)
+            except Exception as e:
+                status = getattr(getattr(e, "resp", None), "status", None)
+                if str(status or "") != "429" or attempt >= self._sheets_max_429_retries:
+                    raise
+                attempt += 1
+                delay = min(64.0, 2.0 ** attempt) + random.uniform(0.0, 1.0)
+                log.warning(f"Sheets API rate limited ({kind}); retry {attempt} in {delay:.1f}s")
+                self.timer.incr("sheets_rate_limited")
+                self._sheets_limiter.pause(delay)
+
+    async def _sheet_meta(self) -> Dict[str, Tuple[int, int]]:
+        """Tab title -> (sheetId, grid rowCount). Cached until the next commit or addSheet. Raises on API errors."""
+        async with self._sheet_meta_lock:
+            if self._sheet_meta_cache is None:
+                self._sheet_meta_cache = await self._fetch_sheet_meta()
+            return self._sheet_meta_cache
+
+    async def _fetch_sheet_meta(self) -> Dict[str, Tuple[int, int]]:
         spreadsheet_id = _cfg_str(self.cfg, "spreadsheet_id", "")
         if not spreadsheet_id:
-            return []
-        
+            raise RuntimeError("missing spreadsheet_id")
         service = self._get_service()
         if not service:
-            return []
-        
-        async with self._api_lock:
-            def _do_get():
-                return service.spreadsheets().get(
-                    spreadsheetId=spreadsheet_id,
-                    fields="sheets(properties(sheetId,title))",
-                ).execute()
-            
+            raise RuntimeError(self._last_error or "missing google service")
+
+        def _do_get():
+            return service.spreadsheets().get(
+                spreadsheetId=spreadsheet_id,
+                fields="sheets(properties(sheetId,title,gridProperties(rowCount)))",
+            ).execute()
+
+        resp = await self._sheets_call(_do_get)
+        meta: Dict[str, Tuple[int, int]] = {}
+        sheets = resp.get("sheets") if isinstance(resp, dict) else None
+        for sh in sheets if isinstance(sheets, list) else []:
+            props = sh.get("properties") if isinstance(sh, dict) else None
+            if not isinstance(props, dict):
+                continue
+            title = str(props.get("title") or "").strip()
+            grid = props.get("gridProperties") if isinstance(props.get("gridProperties"), dict) else {}
             try:
-                resp = await asyncio.to_thread(_do_get)
-                sheets = resp.get("sheets") if isinstance(resp, dict) else None
-                if isinstance(sheets, list):
-                    tab_names = []
-                    for sh in sheets:
-                        props = sh.get("properties") if isinstance(sh, dict) else None
-                        if isinstance(props, dict):
-                            title = str(props.get("title") or "").strip()
-                            if title:
-                                tab_names.append(title)
-                    return tab_names
-            except Exception as e:
-                log.debug(f"Failed to get existing tabs: {e}")
-                return []
-        
-        return []
+                meta[title] = (int(props.get("sheetId")), int(grid.get("rowCount") or 0))
+            except (TypeError, ValueError):
+                continue
+        return meta
+
+    async def _read_tab_values(self, tab_title: str, end_col: str) -> Optional[List[List[str]]]:
+        """
+        Read '<tab>'!A:<end_col> (header included). None on error.
+
+        Inside a sheets cycle the result is cached until the next commit, and pending writes for
+        the tab are committed first so the read never sees a stale tab.
+        """
+        cache_key = f"{tab_title}!{end_col}"
+        if self._batch is not None:
+            if tab_title in self._batch.tabs:
+                await self._flush_sheets_batch()
+            elif cache_key in self._read_cache:
+                return self._read_cache[cache_key]
+
+        spreadsheet_id = _cfg_str(self.cfg, "spreadsheet_id", "")
+        service = self._get_service()
+        if not spreadsheet_id or not service:
+            return None
+
+        def _do_get() -> Dict[str, Any]:
+            return service.spreadsheets().values().get(
+                spreadsheetId=spreadsheet_id,
+                range=f"'{tab_title}'!A:{end_col}",
+            ).execute()
+
+        try:
+            with self.timer.stage("sheets_read"):
+                resp = await self._sheets_call(_do_get)
+        except Exception as e:
+            log.error(f"Failed to read tab '{tab_title}': {e}")
+            return None
+        values = resp.get("values") if isinstance(resp, dict) else None
+        out = [[str(c or "") for c in row] for row in (values or []) if isinstance(row, list)]
+        if self._batch is not None:
+            self._read_cache[cache_key] = out
+        return out
+
+    @contextlib.asynccontextmanager
+    async def sheets_cycle(self) -> AsyncIterator[None]:
+        """
+        Queue every Sheets mutation made inside the block and commit them together on exit
+        (see SheetsWriteBatch). The commit result is left in `self._batch_commit`.
+        Nested use joins the outer cycle.
+        """
+        if self._batch is not None:
+            yield
+            return
+        self._batch = SheetsWriteBatch()
+        self._read_cache = {}
+        self._batch_commit = (True, "ok")
+        try:
+            yield
+        finally:
+            batch, self._batch = self._batch, None
+            self._batch_commit = await self._commit_sheets_batch(batch)
+            self._read_cache = {}
+
+    async def _flush_sheets_batch(self) -> Tuple[bool, str]:
+        """Commit what the current cycle queued so far and keep queueing into a fresh batch."""
+        if self._batch is None or self._batch.empty():
+            return True, "ok"
+        batch, self._batch = self._batch, SheetsWriteBatch()
+        ok, msg = await self._commit_sheets_batch(batch)
+        if not ok:
+            self._batch_commit = (ok, msg)
+        return ok, msg
+
+    async def _commit_sheets_batch(self, batch: SheetsWriteBatch) -> Tuple[bool, str]:
+        """Send a batch: grid growth, one values.batchUpdate, one deleteDimension batchUpdate; then callbacks."""
+        if batch.empty():
+            return True, "ok"
+        spreadsheet_id = _cfg_str(self.cfg, "spreadsheet_id", "")
+        service = self._get_service()
+        if not spreadsheet_id or not service:
+            for cb in batch.on_fail:
+                cb()
+            return False, "missing spreadsheet_id or google service"
+
+        def _do_grow() -> None:
+            service.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={"requests": batch.grow_requests()},
+            ).execute()
+
+        def _do_values() -> None:
+            service.spreadsheets().values().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={"valueInputOption": "USER_ENTERED", "data": batch.values},
+            ).execute()
+
+        def _do_deletes() -> None:
+            service.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={"requests": batch.deletes},
+            ).execute()
+
+        try:
+            with self.timer.stage("sheets_commit"):
+                if batch.grow:
+                    await self._sheets_call(_do_grow, write=True)
+                if batch.values:
+                    await self._sheets_call(_do_values, write=True)
+                if batch.deletes:
+                    await self._sheets_call(_do_deletes, write=True)
+        except Exception as e:
+            log.error(f"Sheets commit failed ({len(batch.tabs)} tab(s): {', '.join(sorted(batch.tabs))}): {e}")
+            for cb in batch.on_fail:
+                cb()
+            return False, f"sheets commit failed: {e}"
+        finally:
+            # Grid sizes and tab contents changed (or are unknown after a failure).
+            self._sheet_meta_cache = None
+            self._read_cache = {}
+        for cb in batch.on_commit:
+            cb()
+        self.timer.incr("sheets_commits")
+        self.timer.incr("sheets_value_ranges", len(batch.values))
+        self.timer.incr("sheets_delete_runs", len(batch.deletes))
+        return True, "ok"
+
+    async def _get_existing_tabs(self) -> List[str]:
+        """Get list of all existing tab names in the spreadsheet."""
+        try:
+            return list((await self._sheet_meta()).keys())
+        except Exception as e:
+            log.debug(f"Failed to get existing tabs: {e}")
+            return []
     
     async def _find_existing_tab(self, desired_tab_name: str) -> Optional[str]:
         """Find existing tab that matches desired name (case-insensitive, handles variations like Cancelled/Canceled)."""
@@ -1114,91 +1375,48 @@ class WhopSheetsSync:
         if not service:
             return None, self._last_error or "missing google service"
         
-        async with self._api_lock:
-            def _do_get():
-                return service.spreadsheets().get(
-                    spreadsheetId=spreadsheet_id,
-                    fields="sheets(properties(sheetId,title))",
-                ).execute()
-            
-            try:
-                resp = await asyncio.to_thread(_do_get)
-            except Exception as e:
-                return None, f"spreadsheets.get failed: {e}"
-            
-            sheets = resp.get("sheets") if isinstance(resp, dict) else None
-            if isinstance(sheets, list):
-                # Check for exact match first
-                for sh in sheets:
-                    props = sh.get("properties") if isinstance(sh, dict) else None
-                    if not isinstance(props, dict):
-                        continue
-                    title = str(props.get("title") or "").strip()
-                    if title == tab_title:
-                        return title, None
-                
-                # Check for existing similar tab (handles Cancelled vs Canceled, etc.)
-                # Build list of existing tabs from current response
-                existing_tabs = []
-                for sh in sheets:
-                    props = sh.get("properties") if isinstance(sh, dict) else None
-                    if isinstance(props, dict):
-                        title = str(props.get("title") or "").strip()
-                        if title:
-                            existing_tabs.append(title)
-                
-                # Find matching tab
-                desired_lower = tab_title.strip().lower()
-                for tab in existing_tabs:
-                    if tab.strip().lower() == desired_lower:
-                        return tab, None
-                
-                # Handle common variations
-                variations = {
-                    "cancelled": ["canceled", "cancelling", "canceling"],
-                    "canceled": ["cancelled", "cancelling", "canceling"],
-                    "canceling": ["cancelling", "canceled", "cancelled"],
-                    "cancelling": ["canceling", "canceled", "cancelled"],
-                }
-                
-                for base, variants in variations.items():
-                    if desired_lower == base:
-                        for variant in variants:
-                            for tab in existing_tabs:
-                                if tab.strip().lower() == variant:
-                                    log.info(f"  -> Using existing tab '{tab}' (matches desired '{tab_title}')")
-                                    return tab, None
-            
-            # Not found -> create
-            log.info(f"  -> Creating new tab '{tab_title}'...")
-            def _do_add():
-                return service.spreadsheets().batchUpdate(
-                    spreadsheetId=spreadsheet_id,
-                    body={
-                        "requests": [
-                            {
-                                "addSheet": {
-                                    "properties": {
-                                        "title": tab_title,
-                                        "gridProperties": {"frozenRowCount": 1},
-                                    }
+        try:
+            meta = await self._sheet_meta()
+        except Exception as e:
+            return None, f"spreadsheets.get failed: {e}"
+        if tab_title in meta:
+            return tab_title, None
+        # Existing similar tab (handles Cancelled vs Canceled, etc.)
+        existing = await self._find_existing_tab(tab_title)
+        if existing:
+            return existing, None
+        
+        # Not found -> create
+        log.info(f"  -> Creating new tab '{tab_title}'...")
+        def _do_add():
+            return service.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={
+                    "requests": [
+                        {
+                            "addSheet": {
+                                "properties": {
+                                    "title": tab_title,
+                                    "gridProperties": {"frozenRowCount": 1},
                                 }
                             }
-                        ]
-                    },
-                ).execute()
-            
-            try:
-                resp2 = await asyncio.to_thread(_do_add)
-                replies = resp2.get("replies") if isinstance(resp2, dict) else None
-                if isinstance(replies, list) and replies:
-                    props = replies[0].get("addSheet", {}).get("properties", {})
-                    title2 = str(props.get("title") or tab_title).strip()
-                    return title2, None
-            except Exception as e:
-                return None, f"addSheet failed: {e}"
-            
-            return tab_title, None
+                        }
+                    ]
+                },
+            ).execute()
+        
+        try:
+            resp2 = await self._sheets_call(_do_add, write=True)
+        except Exception as e:
+            return None, f"addSheet failed: {e}"
+        finally:
+            self._sheet_meta_cache = None
+        replies = resp2.get("replies") if isinstance(resp2, dict) else None
+        if isinstance(replies, list) and replies:
+            props = replies[0].get("addSheet", {}).get("properties", {})
+            title2 = str(props.get("title") or tab_title).strip()
+            return title2, None
+        return tab_title, None
     
     async def _fetch_product_user_ids(self, whop_client: WhopAPIClient, product_id: str) -> Set[str]:
         """Fetch all user IDs that have any membership for the given product (for Lite-only exclusion)."""
@@ -1229,6 +1447,281 @@ class WhopSheetsSync:
                     break
         return user_ids
     
+    # -------------------------
+    # Incremental sync (snapshot + change feed)
+    # -------------------------
+    def _incremental_cfg(self) -> Dict[str, Any]:
+        v = (self.cfg or {}).get("incremental_sync")
+        return v if isinstance(v, dict) else {}
+
+    def _incremental_enabled(self) -> bool:
+        return bool(self._incremental_cfg().get("enabled", False))
+
+    def _incremental_path(self, key: str, default: str) -> Path:
+        path = Path(str(self._incremental_cfg().get(key) or default).strip())
+        if not path.is_absolute():
+            repo_root = Path(__file__).resolve().parents[1]
+            path = (repo_root / path).resolve()
+        return path
+
+    def _incremental_int(self, key: str, default: int) -> int:
+        try:
+            n = int(self._incremental_cfg().get(key) or default)
+        except Exception:
+            n = default
+        return max(0, n)
+
+    def _snapshot(self) -> Optional[MembershipSnapshot]:
+        """Open the local snapshot (None when incremental sync is disabled or the DB cannot be opened)."""
+        if not self._incremental_enabled():
+            return None
+        if self._membership_snapshot is None:
+            path = self._incremental_path("snapshot_path", "WhopMembershipSync/membership_snapshot.sqlite3")
+            try:
+                self._membership_snapshot = MembershipSnapshot(path)
+            except Exception as e:
+                log.warning(f"Incremental sync disabled: cannot open snapshot {path}: {e}")
+                return None
+        return self._membership_snapshot
+
+    def _full_sweep_due(self, stamp: str) -> bool:
+        """True when `stamp` (ISO) is older than full_sweep_interval_hours (or missing)."""
+        hours = self._incremental_int("full_sweep_interval_hours", 24)
+        dt = _parse_iso_utc(stamp)
+        if dt is None or hours <= 0:
+            return True
+        return (datetime.now(timezone.utc) - dt).total_seconds() >= hours * 3600
+
+    def _changed_membership_ids(self, *, since_iso: str) -> Tuple[Optional[Set[str]], str]:
+        """
+        Membership IDs named in Whop webhook events newer than `since_iso` (RSCheckerbot raw log),
+        plus the newest event timestamp (the next cursor).
+
+        Returns (None, since_iso) when the feed cannot prove it covers the window: no feed on this
+        host, or the ring no longer reaches back to the cursor (events may have rotated out).
+        """
+        since = _parse_iso_utc(since_iso)
+        feed_dir = self._incremental_path("change_feed_dir", "RSCheckerbot/whop_webhook_raw")
+        if since is None or not feed_dir.is_dir():
+            return None, since_iso
+        feed = WhopWebhookRawLog(feed_dir)
+        ids: Set[str] = set()
+        newest = since_iso
+        reached_cursor = False
+        for rec in feed.iter_records(newest_first=True):
+            ts = _parse_iso_utc(rec.get("ts"))
+            if ts is None:
+                continue
+            if ts <= since:
+                reached_cursor = True
+                break
+            if newest == since_iso:
+                newest = str(rec.get("ts") or since_iso)
+            ids.update(_membership_ids_from_webhook(rec.get("payload")))
+        if not reached_cursor:
+            return None, since_iso
+        return ids, newest
+
+    async def _get_membership_cached(self, whop_client: WhopAPIClient, membership_id: str) -> Optional[Dict[str, Any]]:
+        if membership_id not in self._membership_by_id:
+            self._membership_by_id[membership_id] = await whop_client.get_membership_by_id(membership_id)
+        return self._membership_by_id[membership_id]
+
+    async def _user_product_memberships(self, whop_client: WhopAPIClient, user_id: str) -> List[Dict[str, Any]]:
+        """All memberships of one Whop user (used instead of paging whole products for a single change)."""
+        mships = await whop_client.get_user_memberships(user_id)
+        out = [m for m in mships if isinstance(m, dict)]
+        self._user_product_ids[user_id] = {_membership_product_id(m) for m in out}
+        return out
+
+    async def _user_has_product(self, whop_client: WhopAPIClient, user_id: str, product_id: str) -> bool:
+        if user_id not in self._user_product_ids:
+            await self._user_product_memberships(whop_client, user_id)
+        return product_id in self._user_product_ids.get(user_id, set())
+
+    async def _sheet_id_for_title(self, title: str) -> Optional[int]:
+        """Resolve sheetId for a tab title (needed for deleteDimension / appendDimension)."""
+        try:
+            props = (await self._sheet_meta()).get(title)
+        except Exception:
+            return None
+        return props[0] if props else None
+
+    async def _build_membership_row(
+        self,
+        whop_client: WhopAPIClient,
+        mship: Dict[str, Any],
+        *,
+        tab_name: str,
+        existing_phone_by_email: Dict[str, str],
+        existing_discord_by_email: Dict[str, str],
+        payments_spend_lookups_remaining: Optional[int],
+        member_cache: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build one sheet row (A..J) from a /memberships record (or a converted /members special record).
+
+        Shared by the full product sync and the change-feed sync so both produce identical rows.
+        Returns None for canceled memberships, else:
+          {"member_key", "status", "row", "updated_at", "used_payments", "spend_source"}
+        member_key is "" when the member has no usable identifier (caller skips the row).
+        """
+        # Get member_id from membership.member field
+        member_obj = mship.get("member") or {}
+        member_id = None
+        if isinstance(member_obj, dict):
+            member_id = str(member_obj.get("id") or "").strip()
+
+        # Get detailed member record (for Discord ID, phone)
+        member_record = member_cache.get(member_id) if (member_id and member_cache) else None
+
+        # Extract data from membership
+        # Check if this is a "canceling" membership (active/trialing with cancel_at_period_end=true)
+        # IMPORTANT: Only mark as "canceling" if status is active/trialing AND cancel_at_period_end=true
+        # Do NOT mark canceled/expired memberships as "canceling"
+        base_status = str(mship.get("status") or "").strip().lower()
+
+        # Skip canceled status - we're removing it
+        if base_status == "canceled":
+            return None
+
+        if mship.get("cancel_at_period_end") is True and base_status in ["active", "trialing"]:
+            status = "canceling"
+        else:
+            status = base_status
+
+        # Get user data from membership.user field
+        user_obj = mship.get("user") or {}
+        name = ""
+        email = ""
+        if isinstance(user_obj, dict):
+            name = str(user_obj.get("name") or user_obj.get("username") or "").strip()
+            email = str(user_obj.get("email") or "").strip()
+
+        # For special status members (left, churned), get data from member_data if available
+        for status_type in ["left", "churned"]:
+            if mship.get(f"_is_{status_type}_member") and mship.get(f"_{status_type}_member_data"):
+                special_data = mship.get(f"_{status_type}_member_data")
+                if isinstance(special_data, dict):
+                    if not name:
+                        name = str(special_data.get("name") or special_data.get("username") or "").strip()
+                    if not email:
+                        user_from_special = special_data.get("user") or {}
+                        if isinstance(user_from_special, dict):
+                            email = str(user_from_special.get("email") or "").strip()
+                            if not name:
+                                name = str(user_from_special.get("name") or user_from_special.get("username") or "").strip()
+                    break
+
+        # Phone: preserve from existing sheet row if present; otherwise try GHL Website Data Info tab (email->phone).
+        phone = ""
+        if email:
+            phone = str(existing_phone_by_email.get(email.strip().lower(), "") or "").strip()
+        if not phone and isinstance(member_record, dict):
+            phone = str(member_record.get("phone") or "").strip()
+        if not phone:
+            # Try from special member data
+            for status_type in ["left", "churned"]:
+                if mship.get(f"_{status_type}_member_data"):
+                    special_data = mship.get(f"_{status_type}_member_data")
+                    if isinstance(special_data, dict):
+                        phone = str(special_data.get("phone") or "").strip()
+                        if phone:
+                            break
+        if not phone and email:
+            phone = await self._enrich_phone_from_ghl(email=email, current_phone=phone)
+
+        # Get product name from membership
+        product_obj = mship.get("product") or {}
+        product_name = ""
+        if isinstance(product_obj, dict):
+            product_name = str(product_obj.get("title") or product_obj.get("name") or "").strip()
+
+        # Fallback product name
+        if not product_name:
+            product_name = "Reselling Secrets" if "Reselling Secrets" in tab_name and "Lite" not in tab_name else "Reselling Secrets Lite"
+
+        # Discord ID:
+        # - Whop-side extraction (usually blank in your account)
+        # - Preserve existing sheet Discord ID by email (keeps previously linked rows stable)
+        # - Fallback to RSCheckerbot identity cache (email -> discord_id)
+        discord_id = _extract_discord_id(mship, member_record)
+        if not discord_id and email:
+            discord_id = str(existing_discord_by_email.get(email.strip().lower(), "") or "").strip() or discord_id
+        if not discord_id and email:
+            discord_id = self._enrich_discord_id(email=email, current_discord_id=discord_id)
+
+        # Get updated_at timestamp for determining most recent status
+        updated_at = mship.get("updated_at") or mship.get("created_at") or ""
+        formatted_timestamp = _format_timestamp(updated_at)
+
+        # Joined/Left dates (MM/DD/YY)
+        created_at = mship.get("created_at") or ""
+        date_joined = _format_date_mmddyy(str(created_at or ""))
+        left_statuses = {"left", "expired", "completed", "churned"}
+        date_left = _format_date_mmddyy(str(updated_at or "")) if status in left_statuses else ""
+
+        # Total Spend (prefer Whop payload, then Whop payments by email, then member_history by resolved Discord ID)
+        total_spend = _extract_total_spend(mship, member_record)
+        spend_from_whop = bool(total_spend)
+        used_payments = False
+        if not total_spend:
+            total_spend, used_payments = await self._enrich_total_spend_from_whop_payments(
+                whop_client,
+                email=email,
+                current_total_spend=total_spend,
+                lookups_remaining=payments_spend_lookups_remaining,
+            )
+        if not total_spend:
+            did_for_spend = self._resolve_discord_id_for_spend(
+                email=email,
+                discord_id=discord_id,
+                existing_discord_by_email=existing_discord_by_email,
+            )
+            if did_for_spend:
+                total_spend = self._enrich_total_spend_from_member_history(
+                    discord_id=did_for_spend,
+                    current_total_spend=total_spend,
+                )
+        spend_source = ""
+        if total_spend:
+            spend_source = "whop" if spend_from_whop else ("payments" if used_payments else "member_history")
+
+        # Determine member key (prefer email, fallback to Discord ID, then member ID)
+        # CRITICAL: Active members should NEVER be skipped - use member ID as last resort
+        member_key = ""
+        if email:
+            member_key = email.strip().lower()
+        elif discord_id:
+            member_key = f"discord_{discord_id}"
+        elif member_id and member_id.startswith("mber_"):
+            # For active/trialing members, use member ID as fallback to ensure 100% accuracy
+            if status in ["active", "trialing"]:
+                member_key = f"member_{member_id}"
+            # For other statuses, skip if no email/Discord ID (member_key stays "")
+        # Otherwise: no identifier -> member_key stays "" and the caller skips the row
+
+        row = [
+            name,
+            phone,
+            email,
+            product_name,
+            status,
+            discord_id,
+            formatted_timestamp,
+            date_left,
+            date_joined,
+            total_spend,
+        ]
+        return {
+            "member_key": member_key,
+            "status": status,
+            "row": row,
+            "updated_at": updated_at,
+            "used_payments": bool(used_payments),
+            "spend_source": spend_source,
+        }
+
     async def sync_product_memberships(
         self,
         whop_client: WhopAPIClient,
@@ -1247,6 +1740,8 @@ class WhopSheetsSync:
         spreadsheet_id = _cfg_str(self.cfg, "spreadsheet_id", "")
         if not spreadsheet_id:
             return False, "missing spreadsheet_id", 0
+        # Change-feed cursor for incremental cycles: events from here on are replayed after this sweep.
+        sweep_started_at = datetime.now(timezone.utc).isoformat()
         
         # Ensure tab exists
         log.info(f"  → Ensuring tab '{tab_name}' exists...")
@@ -1262,6 +1757,7 @@ class WhopSheetsSync:
 
         # Read existing tab rows once so we can preserve phone/discord and avoid refetching details.
         existing_rows = await self.read_source_tab(tab_title)
+        t_stage = time.perf_counter()
         existing_phone_by_email: Dict[str, str] = {}
         existing_discord_by_email: Dict[str, str] = {}
         for r in (existing_rows or []):
@@ -1596,6 +2092,8 @@ class WhopSheetsSync:
             log.info(f"  OK Excluded {excluded_from_special} special status members (already have active memberships)")
             print(f"  OK Excluded {excluded_from_special} special status members (already have active memberships)")
         
+        self.timer.add(f"whop_fetch:{tab_title}", time.perf_counter() - t_stage)
+        t_stage = time.perf_counter()
         # Convert special members to membership-like format for processing
         for status_type, members_list in special_members.items():
             for member in members_list:
@@ -1641,18 +2139,7 @@ class WhopSheetsSync:
         #   H Date Left, I Date Joined, J Total Spend
         # IMPORTANT: Each member should appear in ONLY ONE status tab (most recent status)
         # Group by member identifier (email or Discord ID) and pick the most recent status
-        headers = [
-            "Name",
-            "Phone Number",
-            "Email",
-            "Product",
-            "Status",
-            "Discord ID",
-            "Status Updated",
-            "Date Left",
-            "Date Joined",
-            "Total Spend",
-        ]
+        headers = MEMBERSHIP_HEADERS
         
         # Track members by email and Discord ID to ensure one status per member
         member_status_map: Dict[str, Dict[str, Any]] = {}  # key: email_lower or discord_id -> {status, row_data, updated_at}
@@ -1680,22 +2167,7 @@ class WhopSheetsSync:
             )
         spend_samples: List[str] = []
         
-        # Status priority: IMPORTANT - "left" only applies if member has NO active membership
-        # Active memberships take precedence over "left" status from /members endpoint
-        # Priority: canceling > renewing > active > trialing > churned > expired > completed > past_due > unresolved > drafted > left
-        status_priority = {
-            "canceling": 1,  # Highest priority - active membership being canceled
-            "renewing": 2,
-            "active": 3,
-            "trialing": 4,
-            "churned": 5,
-            "expired": 6,
-            "completed": 7,
-            "past_due": 8,
-            "unresolved": 9,
-            "drafted": 10,
-            "left": 11,  # Lowest priority - only if no active membership exists
-        }
+        status_priority = STATUS_PRIORITY
         
         def get_status_priority(status: str) -> int:
             """Get priority for status (lower = higher priority)."""
@@ -1711,165 +2183,50 @@ class WhopSheetsSync:
                 if not isinstance(mship, dict):
                     continue
                 
-                # Get member_id from membership.member field
-                member_obj = mship.get("member") or {}
-                member_id = None
-                if isinstance(member_obj, dict):
-                    member_id = str(member_obj.get("id") or "").strip()
-                
-                # Get detailed member record (for Discord ID, phone)
-                member_record = member_cache.get(member_id) if member_id else None
-                
-                # Extract data from membership
-                # Check if this is a "canceling" membership (active/trialing with cancel_at_period_end=true)
-                # IMPORTANT: Only mark as "canceling" if status is active/trialing AND cancel_at_period_end=true
-                # Do NOT mark canceled/expired memberships as "canceling"
-                base_status = str(mship.get("status") or "").strip().lower()
-                
-                # Skip canceled status - we're removing it
-                if base_status == "canceled":
+                built = await self._build_membership_row(
+                    whop_client,
+                    mship,
+                    tab_name=tab_name,
+                    existing_phone_by_email=existing_phone_by_email,
+                    existing_discord_by_email=existing_discord_by_email,
+                    payments_spend_lookups_remaining=payments_spend_lookups_remaining,
+                    member_cache=member_cache,
+                )
+                if built is None:
                     continue
-                
-                if mship.get("cancel_at_period_end") is True and base_status in ["active", "trialing"]:
-                    status = "canceling"
-                else:
-                    status = base_status
-                
-                # Get user data from membership.user field
-                user_obj = mship.get("user") or {}
-                name = ""
-                email = ""
-                if isinstance(user_obj, dict):
-                    name = str(user_obj.get("name") or user_obj.get("username") or "").strip()
-                    email = str(user_obj.get("email") or "").strip()
-                
-                # For special status members (left, churned), get data from member_data if available
-                for status_type in ["left", "churned"]:
-                    if mship.get(f"_is_{status_type}_member") and mship.get(f"_{status_type}_member_data"):
-                        special_data = mship.get(f"_{status_type}_member_data")
-                        if isinstance(special_data, dict):
-                            if not name:
-                                name = str(special_data.get("name") or special_data.get("username") or "").strip()
-                            if not email:
-                                user_from_special = special_data.get("user") or {}
-                                if isinstance(user_from_special, dict):
-                                    email = str(user_from_special.get("email") or "").strip()
-                                    if not name:
-                                        name = str(user_from_special.get("name") or user_from_special.get("username") or "").strip()
-                            break
-                
-                # Phone: preserve from existing sheet row if present; otherwise try GHL Website Data Info tab (email->phone).
-                phone = ""
-                if email:
-                    phone = str(existing_phone_by_email.get(email.strip().lower(), "") or "").strip()
-                if not phone and isinstance(member_record, dict):
-                    phone = str(member_record.get("phone") or "").strip()
-                if not phone:
-                    # Try from special member data
-                    for status_type in ["left", "churned"]:
-                        if mship.get(f"_{status_type}_member_data"):
-                            special_data = mship.get(f"_{status_type}_member_data")
-                            if isinstance(special_data, dict):
-                                phone = str(special_data.get("phone") or "").strip()
-                                if phone:
-                                    break
-                if not phone and email:
-                    phone = await self._enrich_phone_from_ghl(email=email, current_phone=phone)
-                
-                # Get product name from membership
-                product_obj = mship.get("product") or {}
-                product_name = ""
-                if isinstance(product_obj, dict):
-                    product_name = str(product_obj.get("title") or product_obj.get("name") or "").strip()
-                
-                # Fallback product name
-                if not product_name:
-                    product_name = "Reselling Secrets" if "Reselling Secrets" in tab_name and "Lite" not in tab_name else "Reselling Secrets Lite"
-                
-                # Discord ID:
-                # - Whop-side extraction (usually blank in your account)
-                # - Preserve existing sheet Discord ID by email (keeps previously linked rows stable)
-                # - Fallback to RSCheckerbot identity cache (email -> discord_id)
-                discord_id = _extract_discord_id(mship, member_record)
-                if not discord_id and email:
-                    discord_id = str(existing_discord_by_email.get(email.strip().lower(), "") or "").strip() or discord_id
-                if not discord_id and email:
-                    discord_id = self._enrich_discord_id(email=email, current_discord_id=discord_id)
-                
+                row = built["row"]
+                status = built["status"]
+                updated_at = built["updated_at"]
+                discord_id = row[5]
+
                 # Track data completeness
-                if email:
+                if row[2]:
                     rows_with_email += 1
-                if phone:
+                if row[1]:
                     rows_with_phone += 1
                 if discord_id:
                     rows_with_discord += 1
-                
-                # Get updated_at timestamp for determining most recent status
-                updated_at = mship.get("updated_at") or mship.get("created_at") or ""
-                formatted_timestamp = _format_timestamp(updated_at)
-
-                # Joined/Left dates (MM/DD/YY)
-                created_at = mship.get("created_at") or ""
-                date_joined = _format_date_mmddyy(str(created_at or ""))
-                left_statuses = {"left", "expired", "completed", "churned"}
-                date_left = _format_date_mmddyy(str(updated_at or "")) if status in left_statuses else ""
-
-                # Total Spend (prefer Whop payload, then Whop payments by email, then member_history by resolved Discord ID)
-                total_spend = _extract_total_spend(mship, member_record)
-                spend_from_whop = bool(total_spend)
-                used_payments = False
-                if not total_spend:
-                    total_spend, used_payments = await self._enrich_total_spend_from_whop_payments(
-                        whop_client,
-                        email=email,
-                        current_total_spend=total_spend,
-                        lookups_remaining=payments_spend_lookups_remaining,
-                    )
-                    if used_payments and payments_spend_lookups_remaining is not None and payments_spend_lookups_remaining > 0:
-                        payments_spend_lookups_remaining -= 1
-                if not total_spend:
-                    did_for_spend = self._resolve_discord_id_for_spend(
-                        email=email,
-                        discord_id=discord_id,
-                        existing_discord_by_email=existing_discord_by_email,
-                    )
-                    if did_for_spend:
-                        total_spend = self._enrich_total_spend_from_member_history(
-                            discord_id=did_for_spend,
-                            current_total_spend=total_spend,
-                        )
-                if total_spend:
+                if built["used_payments"] and payments_spend_lookups_remaining is not None and payments_spend_lookups_remaining > 0:
+                    payments_spend_lookups_remaining -= 1
+                if built["spend_source"]:
                     rows_with_spend += 1
-                    if spend_from_whop:
+                    if built["spend_source"] == "whop":
                         rows_spend_from_whop += 1
-                    elif used_payments:
+                    elif built["spend_source"] == "payments":
                         rows_spend_from_payments += 1
                     else:
                         rows_spend_from_member_history += 1
                     if len(spend_samples) < 5:
-                        spend_samples.append(f"{email or '-'} did={discord_id or '-'} spend={total_spend}")
-                
-                # Determine member key (prefer email, fallback to Discord ID, then member ID)
-                # CRITICAL: Active members should NEVER be skipped - use member ID as last resort
-                member_key = None
-                if email:
-                    member_key = email.strip().lower()
-                elif discord_id:
-                    member_key = f"discord_{discord_id}"
-                elif member_id and member_id.startswith("mber_"):
-                    # For active/trialing members, use member ID as fallback to ensure 100% accuracy
-                    if status in ["active", "trialing"]:
-                        member_key = f"member_{member_id}"
-                    else:
-                        # For other statuses, skip if no email/Discord ID
-                        continue
-                else:
-                    # Skip if no identifier (except for active/trialing which are handled above)
+                        spend_samples.append(f"{row[2] or '-'} did={discord_id or '-'} spend={row[9]}")
+
+                member_key = built["member_key"]
+                if not member_key:
                     continue
                 
                 # Check if we already have this member with a status
                 existing = member_status_map.get(member_key)
                 current_priority = get_status_priority(status)
+                entry = {"status": status, "row": row, "updated_at": updated_at}
                 
                 if existing:
                     existing_priority = get_status_priority(existing.get("status", ""))
@@ -1877,77 +2234,17 @@ class WhopSheetsSync:
                     # Only use "left" if there's no active membership
                     if existing.get("status", "").lower() == "left" and current_priority < 11:
                         # Existing is "left" but current is an active membership - replace with active
-                        member_status_map[member_key] = {
-                            "status": status,
-                            "row": [
-                                name,
-                                phone,
-                                email,
-                                product_name,
-                                status,
-                                discord_id,
-                                formatted_timestamp,
-                                date_left,
-                                date_joined,
-                                total_spend,
-                            ],
-                            "updated_at": updated_at,
-                        }
+                        member_status_map[member_key] = entry
                     elif current_priority < existing_priority:
                         # Current status has higher priority, replace
-                        member_status_map[member_key] = {
-                            "status": status,
-                            "row": [
-                                name,
-                                phone,
-                                email,
-                                product_name,
-                                status,
-                                discord_id,
-                                formatted_timestamp,
-                                date_left,
-                                date_joined,
-                                total_spend,
-                            ],
-                            "updated_at": updated_at,
-                        }
+                        member_status_map[member_key] = entry
                     elif current_priority == existing_priority and updated_at > existing.get("updated_at", ""):
                         # Same priority but more recent, replace
-                        member_status_map[member_key] = {
-                            "status": status,
-                            "row": [
-                                name,
-                                phone,
-                                email,
-                                product_name,
-                                status,
-                                discord_id,
-                                formatted_timestamp,
-                                date_left,
-                                date_joined,
-                                total_spend,
-                            ],
-                            "updated_at": updated_at,
-                        }
+                        member_status_map[member_key] = entry
                     # Otherwise keep existing
                 else:
                     # First time seeing this member
-                    member_status_map[member_key] = {
-                        "status": status,
-                        "row": [
-                            name,
-                            phone,
-                            email,
-                            product_name,
-                            status,
-                            discord_id,
-                            formatted_timestamp,
-                            date_left,
-                            date_joined,
-                            total_spend,
-                        ],
-                        "updated_at": updated_at,
-                    }
+                    member_status_map[member_key] = entry
                 
                 # Debug: Log sample data (only first 3 to avoid spam)
                 if idx < 3:
@@ -2058,13 +2355,15 @@ class WhopSheetsSync:
         if spend_samples:
             log.info("  Spend samples (up to 5): " + " | ".join(spend_samples))
         
+        self.timer.add(f"build_rows:{tab_title}", time.perf_counter() - t_stage)
         # Write to sheet with diff-upsert (only touches changed/new/stale members)
         log.info(f"  -> Writing {len(rows)} rows to Google Sheets tab '{tab_title}' (diff-upsert)...")
         print(f"  -> Writing {len(rows)} rows to Google Sheets tab '{tab_title}' (diff-upsert)...")
         log.info(f"  -> Status breakdown for '{tab_title}': {dict(final_status_counts)}")
         print(f"  -> Status breakdown for '{tab_title}': {dict(final_status_counts)}")
         
-        success, msg = await self._write_tab_diff_upsert(tab_title, headers, rows, log_context=f"Tab '{tab_title}'")
+        with self.timer.stage(f"sheets_plan:{tab_title}"):
+            success, msg = await self._write_tab_diff_upsert(tab_title, headers, rows, log_context=f"Tab '{tab_title}'")
         if not success:
             log.error(f"  ✗ {msg}")
             return False, msg, len(rows)
@@ -2103,35 +2402,17 @@ class WhopSheetsSync:
                         )
             except Exception:
                 pass
+        snap = self._snapshot()
+        if snap is not None:
+            snap.set_cursor(f"product:{product_id}", sweep_started_at, full_sweep_at=sweep_started_at)
         return True, "ok", len(rows)
     
     async def read_source_tab(self, tab_name: str) -> List[List[str]]:
         """Read all rows from a source tab (excluding header)."""
-        spreadsheet_id = _cfg_str(self.cfg, "spreadsheet_id", "")
-        if not spreadsheet_id:
-            return []
-        
-        service = self._get_service()
-        if not service:
-            return []
-        
-        async with self._api_lock:
-            def _do_get():
-                return service.spreadsheets().values().get(
-                    spreadsheetId=spreadsheet_id,
-                    range=f"'{tab_name}'!A:J",
-                ).execute()
-            
-            try:
-                resp = await asyncio.to_thread(_do_get)
-                values = resp.get("values") if isinstance(resp, dict) else None
-                if isinstance(values, list) and len(values) > 1:
-                    # Skip header row, return data rows
-                    return values[1:]
-            except Exception as e:
-                log.error(f"Failed to read source tab '{tab_name}': {e}")
-                return []
-        
+        values = await self._read_tab_values(tab_name, "J")
+        if values and len(values) > 1:
+            # Skip header row, return data rows
+            return values[1:]
         return []
     
     async def _write_tab_diff_upsert(
@@ -2143,9 +2424,16 @@ class WhopSheetsSync:
     ) -> Tuple[bool, str]:
         """
         Upsert rows to a tab with minimal writes:
-        - Update only member rows whose values changed (keyed by Discord ID, else Email)
+        - Update only member rows whose values changed (keyed by Email, else Discord ID)
         - Append missing members
         - Remove rows for members no longer present (does not rewrite whole sheet)
+
+        With incremental sync enabled, a recently reconciled tab is diffed against the local
+        snapshot instead of being read back (see _plan_tab_dirty_rows); otherwise the tab is
+        read, diffed, and the resulting layout is stored as the new snapshot.
+
+        Mutations are queued on the current sheets cycle (see sheets_cycle) and committed with
+        every other tab's writes; outside a cycle they are committed before returning.
         """
         spreadsheet_id = _cfg_str(self.cfg, "spreadsheet_id", "")
         if not spreadsheet_id:
@@ -2157,8 +2445,6 @@ class WhopSheetsSync:
 
         # Normalize row shapes to header length
         col_count = max(1, len(headers))
-        end_col = _col_letter(col_count)
-        desired_rows: List[List[str]] = []
         desired_by_key: Dict[str, List[str]] = {}
         for r in (rows or []):
             rr = [str(c or "") for c in (r or [])]
@@ -2169,34 +2455,51 @@ class WhopSheetsSync:
             k = _member_key_from_row(rr)
             if not k:
                 continue
-            desired_rows.append(rr)
             desired_by_key[k] = rr
+        self._tab_rows[tab_title] = list(desired_by_key.values())
+
+        in_cycle = self._batch is not None
+        if in_cycle and tab_title in self._batch.tabs:
+            # Second write to the same tab this cycle: plan against committed state.
+            await self._flush_sheets_batch()
+        batch = self._batch if in_cycle else SheetsWriteBatch()
+
+        snap = self._snapshot()
+        planned: Optional[Tuple[bool, str]] = None
+        if snap is not None:
+            planned = await self._plan_tab_dirty_rows(batch, snap, tab_title, desired_by_key, col_count, log_context=log_context)
+        if planned is None:
+            planned = await self._plan_tab_full_diff(batch, snap, tab_title, headers, desired_by_key, col_count, log_context=log_context)
+        if not planned[0] or in_cycle:
+            return planned
+        return await self._commit_sheets_batch(batch)
+
+    async def _plan_tab_full_diff(
+        self,
+        batch: SheetsWriteBatch,
+        snap: Optional[MembershipSnapshot],
+        tab_title: str,
+        headers: List[str],
+        desired_by_key: Dict[str, List[str]],
+        col_count: int,
+        *,
+        log_context: str = "",
+    ) -> Tuple[bool, str]:
+        """Full reconcile for _write_tab_diff_upsert: read the tab, diff by member key, queue the writes."""
+        end_col = _col_letter(col_count)
 
         # Read existing sheet A:J including header
-        async with self._api_lock:
-            def _do_get() -> Dict[str, Any]:
-                return service.spreadsheets().values().get(
-                    spreadsheetId=spreadsheet_id,
-                    range=f"'{tab_title}'!A:{end_col}",
-                ).execute()
-
-            try:
-                resp = await asyncio.to_thread(_do_get)
-            except Exception as e:
-                return False, f"read existing failed: {e}"
-
-        values = resp.get("values") if isinstance(resp, dict) else None
+        values = await self._read_tab_values(tab_title, end_col)
+        if values is None:
+            return False, "read existing failed"
         existing_values: List[List[str]] = []
-        if isinstance(values, list):
-            for row in values:
-                if not isinstance(row, list):
-                    continue
-                row_str = [str(c or "") for c in row]
-                if len(row_str) < col_count:
-                    row_str = row_str + [""] * (col_count - len(row_str))
-                else:
-                    row_str = row_str[:col_count]
-                existing_values.append(row_str)
+        for row in values:
+            row_str = list(row)
+            if len(row_str) < col_count:
+                row_str = row_str + [""] * (col_count - len(row_str))
+            else:
+                row_str = row_str[:col_count]
+            existing_values.append(row_str)
 
         # Ensure header row
         header_needs_update = True
@@ -2221,23 +2524,17 @@ class WhopSheetsSync:
             if k not in existing_by_key:
                 existing_by_key[k] = (i, row)
 
-        to_update: List[Dict[str, Any]] = []
+        to_update: List[Tuple[int, List[str]]] = []
         updated_keys: List[str] = []
-        updated_members = 0
         for k, desired in desired_by_key.items():
             if k not in existing_by_key:
                 continue
             row_i, existing = existing_by_key[k]
             if desired != existing:
-                to_update.append(
-                    {
-                        "range": f"'{tab_title}'!A{row_i}:{end_col}{row_i}",
-                        "values": [desired],
-                    }
-                )
+                to_update.append((row_i, desired))
                 updated_keys.append(k)
 
-        to_add = [desired_by_key[k] for k in desired_by_key.keys() if k not in existing_by_key]
+        add_keys = [k for k in desired_by_key.keys() if k not in existing_by_key]
         stale_keys = [k for k in existing_by_key.keys() if k not in desired_by_key]
 
         delete_stale_rows = _cfg_bool(self.cfg, "diff_upsert_delete_stale_rows", True)
@@ -2255,49 +2552,6 @@ class WhopSheetsSync:
                 stale_row_indices_1b.append(int(row_i))
         stale_row_indices_1b.sort()
 
-        async def _get_sheet_id_for_title(title: str) -> Optional[int]:
-            """Resolve sheetId for a tab title (needed for deleteDimension)."""
-            try:
-                service2 = self._get_service()
-                if not service2:
-                    return None
-                def _do_get_meta():
-                    return service2.spreadsheets().get(
-                        spreadsheetId=spreadsheet_id,
-                        fields="sheets(properties(sheetId,title))",
-                    ).execute()
-                resp2 = await asyncio.to_thread(_do_get_meta)
-                sheets = resp2.get("sheets") if isinstance(resp2, dict) else None
-                if isinstance(sheets, list):
-                    for sh in sheets:
-                        props = sh.get("properties") if isinstance(sh, dict) else None
-                        if isinstance(props, dict) and str(props.get("title") or "") == title:
-                            sid = props.get("sheetId")
-                            try:
-                                return int(sid)
-                            except Exception:
-                                return None
-            except Exception:
-                return None
-            return None
-
-        def _group_contiguous(rows_1b: List[int]) -> List[Tuple[int, int]]:
-            """Group sorted 1-based row indices into contiguous (start,end_inclusive) ranges."""
-            if not rows_1b:
-                return []
-            out: List[Tuple[int, int]] = []
-            s = e = rows_1b[0]
-            for r in rows_1b[1:]:
-                if r == e + 1:
-                    e = r
-                else:
-                    out.append((s, e))
-                    s = e = r
-            out.append((s, e))
-            return out
-
-        # Build deleteDimension requests (descending order) so indices remain valid as we delete.
-        delete_requests: List[Dict[str, Any]] = []
         rows_to_delete_1b: List[int] = []
         if delete_stale_rows and stale_row_indices_1b:
             rows_to_delete_1b.extend(stale_row_indices_1b)
@@ -2305,96 +2559,62 @@ class WhopSheetsSync:
             # Cap deletions per run for safety
             rows_to_delete_1b.extend(empty_row_indices_1b[:delete_blank_rows_max])
 
-        if delete_requests is not None and rows_to_delete_1b:
-            sheet_id = await _get_sheet_id_for_title(tab_title)
-            if sheet_id is not None:
-                rows_to_delete_1b = sorted(set(int(x) for x in rows_to_delete_1b if int(x) > 1))
-                ranges = _group_contiguous(rows_to_delete_1b)
-                # delete bottom-up
-                for start_1b, end_1b in reversed(ranges):
-                    # convert 1-based row numbers to 0-based [startIndex,endIndex)
-                    start_index = max(1, int(start_1b)) - 1
-                    end_index = max(1, int(end_1b))
-                    delete_requests.append(
-                        {
-                            "deleteDimension": {
-                                "range": {
-                                    "sheetId": sheet_id,
-                                    "dimension": "ROWS",
-                                    "startIndex": start_index,
-                                    "endIndex": end_index,
-                                }
-                            }
-                        }
-                    )
-
-        async with self._api_lock:
-            # Header update first (if needed)
-            if header_needs_update:
-                def _do_header() -> None:
-                    service.spreadsheets().values().update(
-                        spreadsheetId=spreadsheet_id,
-                        range=f"'{tab_title}'!A1:{end_col}1",
-                        valueInputOption="USER_ENTERED",
-                        body={"values": [headers[:col_count]]},
-                    ).execute()
-
-                try:
-                    await asyncio.to_thread(_do_header)
-                except Exception as e:
-                    return False, f"header update failed: {e}"
-
-            if to_update:
-                def _do_updates() -> None:
-                    service.spreadsheets().values().batchUpdate(
-                        spreadsheetId=spreadsheet_id,
-                        body={"valueInputOption": "USER_ENTERED", "data": to_update},
-                    ).execute()
-
-                try:
-                    await asyncio.to_thread(_do_updates)
-                    updated_members = len(to_update)
-                except Exception as e:
-                    return False, f"member updates failed: {e}"
-
-            if to_add:
-                def _do_add() -> None:
-                    service.spreadsheets().values().append(
-                        spreadsheetId=spreadsheet_id,
-                        range=f"'{tab_title}'!A:{end_col}",
-                        valueInputOption="USER_ENTERED",
-                        insertDataOption="INSERT_ROWS",
-                        body={"values": to_add},
-                    ).execute()
-
-                try:
-                    await asyncio.to_thread(_do_add)
-                except Exception as e:
-                    return False, f"append failed: {e}"
-
-            # Delete stale rows to avoid huge blank gaps (preferred). If disabled/unavailable, we leave stale
-            # rows in place to avoid full rewrites; status tabs and continuous cycles will still converge.
-            if delete_requests:
-                def _do_delete_rows() -> None:
-                    service.spreadsheets().batchUpdate(
-                        spreadsheetId=spreadsheet_id,
-                        body={"requests": delete_requests},
-                    ).execute()
-                try:
-                    await asyncio.to_thread(_do_delete_rows)
-                except Exception as e:
-                    return False, f"delete stale rows failed: {e}"
+        try:
+            sheet_id, row_count = (await self._sheet_meta()).get(tab_title, (None, 0))
+        except Exception:
+            sheet_id, row_count = None, 0
+        # Without a sheetId we cannot delete; stale rows stay in place (status tabs and
+        # continuous cycles still converge).
+        rows_to_delete_1b = sorted(set(int(x) for x in rows_to_delete_1b if int(x) > 1)) if sheet_id is not None else []
+
+        # New members go right below the last used row (header row counts even if not written yet).
+        last_row = max(1, len(existing_values))
+        add_first_row = last_row + 1
+        grow = last_row + len(add_keys) - row_count
+        if add_keys and grow > 0 and sheet_id is None:
+            return False, "append failed: sheetId not found"
+
+        # Queue everything at once (no awaits below), so a concurrent flush sees all or nothing.
+        if header_needs_update or to_update or add_keys or rows_to_delete_1b:
+            batch.tabs.add(tab_title)
+        if add_keys and grow > 0:
+            batch.grow_rows(sheet_id, grow)
+        if header_needs_update:
+            batch.set_values(f"'{tab_title}'!A1:{end_col}1", [headers[:col_count]])
+        for row_i, rr in to_update:
+            batch.set_values(f"'{tab_title}'!A{row_i}:{end_col}{row_i}", [rr])
+        if add_keys:
+            batch.set_values(
+                f"'{tab_title}'!A{add_first_row}:{end_col}{add_first_row + len(add_keys) - 1}",
+                [desired_by_key[k] for k in add_keys],
+            )
+        if rows_to_delete_1b:
+            batch.delete_rows(sheet_id, rows_to_delete_1b)
+
+        if snap is not None:
+            # Record the layout this write produces so the next write can skip the read.
+            layout: Dict[str, Tuple[int, List[str]]] = {}
+            for i, k in enumerate(add_keys):
+                layout[k] = (add_first_row + i, desired_by_key[k])
+            for k, rr in desired_by_key.items():
+                if k in existing_by_key:
+                    layout[k] = (existing_by_key[k][0], rr)
+            layout = {k: (row_i - bisect.bisect_left(rows_to_delete_1b, row_i), rr) for k, (row_i, rr) in layout.items()}
+            new_last_row = last_row + len(add_keys) - len(rows_to_delete_1b)
+            batch.on_commit.append(
+                lambda: snap.replace_tab(tab_title, layout, sheet_id=sheet_id, last_row=new_last_row)
+            )
+            batch.on_fail.append(lambda: snap.invalidate_tab(tab_title))
 
         if log_context:
             log.debug(
-                f"    {log_context} diff-upsert: updated={updated_members}, added={len(to_add)}, stale={len(stale_row_indices_1b)}, deleted_empty={len(rows_to_delete_1b) - len(stale_row_indices_1b) if 'rows_to_delete_1b' in locals() else 0}"
+                f"    {log_context} diff-upsert: updated={len(to_update)}, added={len(add_keys)}, stale={len(stale_row_indices_1b)}, deleted_empty={max(0, len(rows_to_delete_1b) - len(stale_row_indices_1b))}"
             )
             if self._change_report_enabled():
                 try:
                     n = self._change_report_samples_n()
                     if n:
-                        add_keys = list(desired_by_key.keys())
-                        add_samples = [k for k in add_keys if k not in existing_by_key][:n]
+                        add_samples = add_keys[:n]
                         upd_samples = updated_keys[:n]
                         del_samples = stale_keys[:n]
                         if upd_samples:
@@ -2411,10 +2631,148 @@ class WhopSheetsSync:
             if isinstance(self._sync_stats, dict):
                 self._sync_stats.setdefault("sheet", {})
                 self._sync_stats["sheet"][str(tab_title)] = {
-                    "updated": int(updated_members),
-                    "added": int(len(to_add)),
+                    "updated": int(len(to_update)),
+                    "added": int(len(add_keys)),
                     "stale": int(len(stale_keys)),
-                    "deleted_rows": int(len(rows_to_delete_1b)) if "rows_to_delete_1b" in locals() else 0,
+                    "deleted_rows": int(len(rows_to_delete_1b)),
+                }
+        except Exception:
+            pass
+        return True, "ok"
+
+    async def _plan_tab_dirty_rows(
+        self,
+        batch: SheetsWriteBatch,
+        snap: MembershipSnapshot,
+        tab_title: str,
+        desired_by_key: Dict[str, List[str]],
+        col_count: int,
+        *,
+        log_context: str = "",
+    ) -> Optional[Tuple[bool, str]]:
+        """
+        Snapshot fast path for _write_tab_diff_upsert: no full-tab read.
+
+        Diffs desired rows against the snapshot by row hash, checks that the rows it will touch
+        still hold the same members and that the rows new members go into are still empty (one
+        values.batchGet over just those cells), then queues changed rows, appended rows and
+        deleted rows. Cells read and written scale with the number of changed members, not the
+        size of the tab.
+
+        Returns None when the tab needs a full reconcile instead (never reconciled, reconcile
+        interval elapsed, too many dirty rows, or the sheet was edited under us).
+        """
+        state = snap.tab_state(tab_title)
+        if state is None or self._full_sweep_due(state[1]) or state[2] < 1:
+            return None
+        sheet_id, _reconciled_at, last_row = state
+        current = snap.load_tab(tab_title)
+
+        updates = {k: rr for k, rr in desired_by_key.items() if k in current and current[k][1] != row_hash(rr)}
+        adds = [k for k in desired_by_key if k not in current]
+        stale = [k for k in current if k not in desired_by_key]
+        delete_stale = _cfg_bool(self.cfg, "diff_upsert_delete_stale_rows", True)
+        to_delete = stale if delete_stale else []
+        if len(updates) + len(to_delete) > self._incremental_int("max_dirty_rows_per_write", 200):
+            return None
+
+        end_col = _col_letter(col_count)
+        add_first_row = last_row + 1
+        add_last_row = last_row + len(adds)
+        deleted_rows = sorted(current[k][0] for k in to_delete)
+        row_count = 0
+        if adds or deleted_rows:
+            try:
+                meta_id, row_count = (await self._sheet_meta()).get(tab_title, (None, 0))
+            except Exception:
+                meta_id = None
+            if meta_id is None or (sheet_id is not None and meta_id != sheet_id):
+                return None
+            sheet_id = meta_id
+
+        touched = sorted({current[k][0] for k in list(updates) + to_delete})
+        ranges = [f"'{tab_title}'!C{r}:F{r}" for r in touched]
+        if adds and row_count > last_row:
+            ranges.append(f"'{tab_title}'!A{add_first_row}:{end_col}{min(add_last_row, row_count)}")
+        if ranges:
+            spreadsheet_id = _cfg_str(self.cfg, "spreadsheet_id", "")
+            service = self._get_service()
+            if not service:
+                return False, self._last_error or "missing google service"
+
+            # Email (C) .. Discord ID (F) of each row we are about to overwrite/delete,
+            # plus the block new members are appended into.
+            def _do_verify() -> Dict[str, Any]:
+                return service.spreadsheets().values().batchGet(
+                    spreadsheetId=spreadsheet_id,
+                    ranges=ranges,
+                ).execute()
+
+            try:
+                with self.timer.stage("sheets_read"):
+                    resp = await self._sheets_call(_do_verify)
+            except Exception as e:
+                log.warning(f"    {log_context or tab_title}: snapshot verify failed ({e}); full reconcile")
+                return None
+            value_ranges = (resp or {}).get("valueRanges") or []
+            found: Dict[int, str] = {}
+            for r, vr in zip(touched, value_ranges):
+                vals = (vr or {}).get("values") or [[]]
+                found[r] = _member_key_from_row(["", ""] + [str(c or "") for c in (vals[0] or [])])
+            moved = any(found.get(current[k][0]) != k for k in list(updates) + to_delete)
+            if len(ranges) > len(touched) and len(value_ranges) == len(ranges):
+                moved = moved or any(
+                    any(str(c or "").strip() for c in row) for row in ((value_ranges[-1] or {}).get("values") or [])
+                )
+            if moved:
+                log.info(f"    {log_context or tab_title}: sheet rows moved since last reconcile; full reconcile")
+                snap.invalidate_tab(tab_title)
+                return None
+
+        # Queue everything at once (no awaits below), so a concurrent flush sees all or nothing.
+        if updates or adds or deleted_rows:
+            batch.tabs.add(tab_title)
+        for k, rr in updates.items():
+            batch.set_values(f"'{tab_title}'!A{current[k][0]}:{end_col}{current[k][0]}", [rr])
+        if adds:
+            if add_last_row > row_count:
+                batch.grow_rows(sheet_id, add_last_row - row_count)
+            batch.set_values(
+                f"'{tab_title}'!A{add_first_row}:{end_col}{add_last_row}",
+                [desired_by_key[k] for k in adds],
+            )
+        if deleted_rows:
+            batch.delete_rows(sheet_id, deleted_rows)
+
+        upserts: Dict[str, Tuple[int, List[str]]] = {k: (current[k][0], rr) for k, rr in updates.items()}
+        for i, k in enumerate(adds):
+            upserts[k] = (add_first_row + i, desired_by_key[k])
+        if upserts or stale:
+            batch.on_commit.append(
+                lambda: snap.apply_tab_changes(
+                    tab_title,
+                    upserts=upserts,
+                    # Stale rows left in place (deletion disabled) are simply no longer tracked.
+                    deleted_keys=stale,
+                    deleted_rows=deleted_rows,
+                    last_row=add_last_row - len(deleted_rows),
+                )
+            )
+            batch.on_fail.append(lambda: snap.invalidate_tab(tab_title))
+
+        if log_context:
+            log.debug(
+                f"    {log_context} dirty-row write: updated={len(updates)}, added={len(adds)}, stale={len(stale)}, deleted_rows={len(deleted_rows)}"
+            )
+        try:
+            if isinstance(self._sync_stats, dict):
+                self._sync_stats.setdefault("sheet", {})
+                self._sync_stats["sheet"][str(tab_title)] = {
+                    "updated": len(updates),
+                    "added": len(adds),
+                    "stale": len(stale),
+                    "deleted_rows": len(deleted_rows),
+                    "mode": "snapshot",
                 }
         except Exception:
             pass
@@ -2426,23 +2784,13 @@ class WhopSheetsSync:
         if err or not tab_title:
             return False, f"failed to ensure tab: {err}"
         
-        headers = [
-            "Name",
-            "Phone Number",
-            "Email",
-            "Product",
-            "Status",
-            "Discord ID",
-            "Status Updated",
-            "Date Left",
-            "Date Joined",
-            "Total Spend",
-        ]
+        headers = MEMBERSHIP_HEADERS
         return await self._write_tab_diff_upsert(tab_title, headers, rows, log_context=f"Status tab '{tab_title}'")
     
-    async def segregate_by_status(self) -> Dict[str, Tuple[bool, str, int]]:
+    async def segregate_by_status(self, source_rows: Optional[List[List[str]]] = None) -> Dict[str, Tuple[bool, str, int]]:
         """
         Read from source tab and segregate members by status into status tabs.
+        source_rows: rows already known for the source tab (what this run wrote to it); skips the read.
         
         Returns: Dict mapping status tab name -> (success, message, count)
         """
@@ -2457,12 +2805,12 @@ class WhopSheetsSync:
             log.warning("Status tabs sync disabled or misconfigured")
             return {}
         
-        log.info(f"  -> Reading source tab '{source_tab}'...")
-        print(f"  -> Reading source tab '{source_tab}'...")
-        
-        source_rows = await self.read_source_tab(source_tab)
-        log.info(f"  ✓ Read {len(source_rows)} members from source tab")
-        print(f"  OK Read {len(source_rows)} members from source tab")
+        if source_rows is None:
+            log.info(f"  -> Reading source tab '{source_tab}'...")
+            print(f"  -> Reading source tab '{source_tab}'...")
+            source_rows = await self.read_source_tab(source_tab)
+            log.info(f"  ✓ Read {len(source_rows)} members from source tab")
+            print(f"  OK Read {len(source_rows)} members from source tab")
         
         if not source_rows:
             log.warning("  WARNING: Source tab is empty, nothing to segregate")
@@ -2571,9 +2919,11 @@ class WhopSheetsSync:
         spreadsheet_id = _cfg_str(self.cfg, "spreadsheet_id", "")
         if not spreadsheet_id:
             return False, "missing spreadsheet_id", 0, []
+        sweep_started_at = datetime.now(timezone.utc).isoformat()
         
         # Read existing source tab
         existing_rows = await self.read_source_tab(source_tab)
+        t_stage = time.perf_counter()
         existing_by_email: Dict[str, int] = {}  # email -> row_index
         existing_by_discord: Dict[str, int] = {}  # discord_id -> row_index
         
@@ -2742,6 +3092,8 @@ class WhopSheetsSync:
                 log.debug(f"    Error fetching left members: {e}")
                 break
         
+        self.timer.add(f"whop_fetch:{source_tab}", time.perf_counter() - t_stage)
+        t_stage = time.perf_counter()
         # Convert special members to membership-like format
         for status_type, members_list in special_members.items():
             for member in members_list:
@@ -3087,145 +3439,284 @@ class WhopSheetsSync:
         # Add new rows
         updated_rows.extend(rows_to_add)
         
+        self.timer.add(f"build_rows:{source_tab}", time.perf_counter() - t_stage)
         # Write back to source tab
         tab_title, err = await self._ensure_sheet_tab(source_tab)
         if err or not tab_title:
             return False, f"failed to ensure tab: {err}", len(rows_to_add), []
 
-        headers = [
-            "Name",
-            "Phone Number",
-            "Email",
-            "Product",
-            "Status",
-            "Discord ID",
-            "Status Updated",
-            "Date Left",
-            "Date Joined",
-            "Total Spend",
-        ]
+        headers = MEMBERSHIP_HEADERS
 
-        ok, msg = await self._write_tab_diff_upsert(tab_title, headers, updated_rows, log_context=f"Source tab '{tab_title}'")
+        with self.timer.stage(f"sheets_plan:{tab_title}"):
+            ok, msg = await self._write_tab_diff_upsert(tab_title, headers, updated_rows, log_context=f"Source tab '{tab_title}'")
         if not ok:
             return False, msg, len(rows_to_add), []
 
         log.info(f"  ✓ Updated source tab: {len(rows_to_update)} updated, {len(rows_to_add)} added")
         print(f"  OK Updated source tab: {len(rows_to_update)} updated, {len(rows_to_add)} added")
+        snap = self._snapshot()
+        if snap is not None:
+            snap.set_cursor(f"product:{product_id}", sweep_started_at, full_sweep_at=sweep_started_at)
         return True, "ok", len(rows_to_add), updated_rows
+
+    async def sync_product_changes(
+        self,
+        whop_client: WhopAPIClient,
+        product_id: str,
+        tab_name: str,
+        *,
+        exclude_product_id: str = "",
+    ) -> Optional[Tuple[bool, str, int, int]]:
+        """
+        Incremental product sync for continuous cycles.
+
+        Instead of re-paging /memberships for every status, only memberships named in Whop
+        webhook events since this product's cursor are fetched (GET /memberships/{id}), their
+        rows are rebuilt and merged into the snapshot rows, and the writer sends only the dirty
+        rows. If exclude_product_id is set (Lite-only tab), members who hold that product are
+        dropped, checked per changed user instead of paging the other product.
+
+        Returns (success, message, member_count, changed_count), or None when a full sweep is
+        needed: no snapshot/cursor yet, full_sweep_interval_hours elapsed, change feed gap,
+        more than max_changes_per_cycle changes, or a change only the full sweep can classify
+        (e.g. a canceled membership, which becomes left/churned via /members).
+        """
+        snap = self._snapshot()
+        if snap is None:
+            return None
+        scope = f"product:{product_id}"
+        cursor = snap.get_cursor(scope)
+        if cursor is None or self._full_sweep_due(cursor[1]) or snap.tab_state(tab_name) is None:
+            return None
+        changed_ids, next_cursor = self._changed_membership_ids(since_iso=cursor[0])
+        if changed_ids is None:
+            log.info(f"  -> Change feed does not cover {scope} since {cursor[0]}; full sweep")
+            return None
+        if len(changed_ids) > self._incremental_int("max_changes_per_cycle", 300):
+            log.info(f"  -> {len(changed_ids)} changed memberships (over max_changes_per_cycle); full sweep")
+            return None
+
+        desired: Dict[str, List[str]] = {k: row for k, (_i, _h, row) in snap.load_tab(tab_name).items()}
+        if not changed_ids:
+            snap.set_cursor(scope, next_cursor)
+            return True, "no changes", len(desired), 0
+
+        self._sync_stats_reset(context=f"product_changes:{product_id}:{tab_name}")
+        existing_phone_by_email: Dict[str, str] = {}
+        existing_discord_by_email: Dict[str, str] = {}
+        for row in desired.values():
+            em = str(row[2] or "").strip().lower()
+            if em and str(row[1] or "").strip():
+                existing_phone_by_email[em] = str(row[1]).strip()
+            if em and str(row[5] or "").strip():
+                existing_discord_by_email[em] = str(row[5]).strip()
+        payments_spend_lookups_remaining = self._whop_payments_spend_max_lookups_per_sync()
+
+        log.info(f"  -> {len(changed_ids)} changed memberships since {cursor[0]} (change feed)")
+        print(f"  -> {len(changed_ids)} changed memberships since last cycle (change feed)")
+        changed = 0
+        for membership_id in sorted(changed_ids):
+            mship = await self._get_membership_cached(whop_client, membership_id)
+            if not isinstance(mship, dict):
+                return None
+            mship_product_id = _membership_product_id(mship)
+            user_obj = mship.get("user") if isinstance(mship.get("user"), dict) else {}
+            user_id = str(user_obj.get("id") or "").strip()
+            email_key = str(user_obj.get("email") or "").strip().lower()
+
+            if exclude_product_id and mship_product_id == exclude_product_id:
+                # Member now holds the other product: a Lite-only tab drops them.
+                if email_key and desired.pop(email_key, None) is not None:
+                    changed += 1
+                continue
+            if mship_product_id != product_id:
+                continue
+            if exclude_product_id and user_id and await self._user_has_product(whop_client, user_id, exclude_product_id):
+                if email_key and desired.pop(email_key, None) is not None:
+                    changed += 1
+                continue
+
+            built = await self._build_membership_row(
+                whop_client,
+                mship,
+                tab_name=tab_name,
+                existing_phone_by_email=existing_phone_by_email,
+                existing_discord_by_email=existing_discord_by_email,
+                payments_spend_lookups_remaining=payments_spend_lookups_remaining,
+            )
+            if built is None:
+                return None
+            if built["used_payments"] and payments_spend_lookups_remaining > 0:
+                payments_spend_lookups_remaining -= 1
+            row = built["row"]
+            key = _member_key_from_row(row)
+            if not key:
+                continue
+
+            # One row per member: a change on a lower-priority membership (e.g. an old expired one)
+            # must not override a better one the member still holds.
+            current = desired.get(key)
+            if current is not None and user_id:
+                cur_p = STATUS_PRIORITY.get(str(current[4] or "").strip().lower(), 999)
+                new_p = STATUS_PRIORITY.get(built["status"], 999)
+                if new_p > cur_p:
+                    others = [
+                        m for m in await self._user_product_memberships(whop_client, user_id)
+                        if _membership_product_id(m) == product_id and str(m.get("id") or "") != membership_id
+                    ]
+                    best = None
+                    for m in others:
+                        b = await self._build_membership_row(
+                            whop_client,
+                            m,
+                            tab_name=tab_name,
+                            existing_phone_by_email=existing_phone_by_email,
+                            existing_discord_by_email=existing_discord_by_email,
+                            payments_spend_lookups_remaining=0,
+                        )
+                        if b is not None and STATUS_PRIORITY.get(b["status"], 999) < STATUS_PRIORITY.get((best or built)["status"], 999):
+                            best = b
+                    if best is not None:
+                        row = best["row"]
+
+            if current != row:
+                desired[key] = row
+                changed += 1
+
+        rows = list(desired.values())
+        if changed:
+            ok, msg = await self._write_tab_diff_upsert(tab_name, MEMBERSHIP_HEADERS, rows, log_context=f"Tab '{tab_name}'")
+            if not ok:
+                return False, msg, len(rows), changed
+        snap.set_cursor(scope, next_cursor)
+        log.info(f"  OK {tab_name}: {changed} member rows changed ({len(changed_ids)} membership events)")
+        print(f"  OK {tab_name}: {changed} member rows changed ({len(changed_ids)} membership events)")
+        return True, f"incremental: {changed} changed", len(rows), changed
     
-    async def sync_all_products(self, whop_client: WhopAPIClient) -> Dict[str, Tuple[bool, str, int]]:
-        """Sync all configured products."""
+    def _enabled_products(self) -> List[Tuple[str, str]]:
+        """(product_id, tab_name) for every enabled product in config order."""
+        out: List[Tuple[str, str]] = []
         products = self.cfg.get("products", [])
-        if not isinstance(products, list):
-            return {}
-        
-        results = {}
-        status_cfg = self.cfg.get("status_tabs", {})
-        source_tab = status_cfg.get("source_tab", "Whop API - Reselling Secrets") if status_cfg.get("enabled", True) else None
-        main_product_id = None
-        lifetime_product_id = None
-        lifetime_tab_name = None
-        
-        # First, sync all products normally (clear and replace), but skip Lifetime for now
-        for product_cfg in products:
+        for product_cfg in products if isinstance(products, list) else []:
             product_id = str(product_cfg.get("product_id") or "").strip()
             tab_name = str(product_cfg.get("tab_name") or "").strip()
-            enabled = product_cfg.get("enabled", True)  # Default to enabled if not specified
-            
             if not product_id or not tab_name:
                 continue
-            
-            # Skip if disabled
-            if not enabled:
+            if not product_cfg.get("enabled", True):  # Default to enabled if not specified
                 log.info(f"Skipping disabled product: {product_id} -> {tab_name}")
-                print(f"Skipping disabled product: {product_id} -> {tab_name}")
-                continue
-            
-            # Track Lifetime product to sync separately at the end
-            if product_id == "prod_76xygbFOv0aUM" or "Lifetime" in tab_name:
-                lifetime_product_id = product_id
-                lifetime_tab_name = tab_name
-                log.info(f"Lifetime product detected: {product_id} -> {tab_name} (will sync separately at end)")
-                print(f"Lifetime product detected: {product_id} -> {tab_name} (will sync separately at end)")
                 continue
-            
-            # Track which is the main "Reselling Secrets" product (not Lite)
-            if source_tab and tab_name == source_tab:
-                main_product_id = product_id
-            
-            # Lite tab: only members who have Lite and do NOT have Main (exclude Main user IDs)
-            exclude_user_ids: Optional[Set[str]] = None
-            if (product_id == "prod_U52ytqRZdCFak" or "Lite" in tab_name) and main_product_id:
-                log.info(f"  Fetching Main product user IDs to exclude from Lite tab (Lite-only)...")
-                print(f"  -> Lite-only: excluding members who also have Main product...")
-                exclude_user_ids = await self._fetch_product_user_ids(whop_client, main_product_id)
-                log.info(f"  Excluding {len(exclude_user_ids)} Main product user IDs from Lite tab")
-            
-            print(f"\nSyncing product: {product_id} -> tab: {tab_name}")
-            success, msg, count = await self.sync_product_memberships(
-                whop_client,
-                product_id,
-                tab_name,
-                exclude_user_ids=exclude_user_ids,
-            )
-            results[product_id] = (success, msg, count)
-            
-            if success:
-                print(f"OK Synced {count} members to '{tab_name}'")
-            else:
-                print(f"X Failed: {msg}")
-        
-        # Then, segregate source tab by status into status tabs
-        if source_tab and status_cfg.get("enabled", True):
-            print(f"\n{'='*60}")
-            print(f"Segregating '{source_tab}' by status into status tabs...")
-            print(f"{'='*60}")
-            
-            status_results = await self.segregate_by_status()
-            for tab_name, (success, msg, count) in status_results.items():
-                if success:
-                    print(f"OK {tab_name}: {count} members")
-                else:
-                    print(f"X {tab_name}: {msg}")
+            out.append((product_id, tab_name))
+        return out
+
+    async def _sync_product_full(
+        self,
+        whop_client: WhopAPIClient,
+        product_id: str,
+        tab_name: str,
+        *,
+        exclude_product_id: str = "",
+    ) -> Tuple[bool, str, int]:
+        """Full product sync; a Lite-only tab first fetches the user IDs of exclude_product_id (Main)."""
+        exclude_user_ids: Optional[Set[str]] = None
+        if exclude_product_id:
+            log.info(f"  Fetching Main product user IDs to exclude from Lite tab (Lite-only)...")
+            print(f"  -> Lite-only: excluding members who also have Main product...")
+            with self.timer.stage(f"whop_fetch:{tab_name}:exclude_ids"):
+                exclude_user_ids = await self._fetch_product_user_ids(whop_client, exclude_product_id)
+            log.info(f"  Excluding {len(exclude_user_ids)} Main product user IDs from Lite tab")
+        return await self.sync_product_memberships(
+            whop_client,
+            product_id,
+            tab_name,
+            exclude_user_ids=exclude_user_ids,
+        )
+
+    def _mark_commit_failed(self, results: Dict[str, Tuple[bool, str, int]]) -> None:
+        """Sheets writes are committed after the products ran; a failed commit fails every result."""
+        ok, msg = self._batch_commit
+        if ok:
+            return
+        print(f"X Sheets commit failed: {msg}")
+        for key, (_success, _msg, count) in list(results.items()):
+            results[key] = (False, msg, count)
+
+    async def sync_all_products(self, whop_client: WhopAPIClient) -> Dict[str, Tuple[bool, str, int]]:
+        """
+        Sync all configured products.
+
+        Products run concurrently, so Whop pagination for one product overlaps Sheets reads and
+        row building for another. Every Sheets mutation of the run (product tabs and status tabs)
+        is queued and committed in one batch per request type at the end (see sheets_cycle).
+        """
+        products = self._enabled_products()
+        if not products:
+            return {}
         
-        # Finally, sync Lifetime members separately at the end (simpler, fewer data)
-        if lifetime_product_id and lifetime_tab_name:
-            print(f"\n{'='*60}")
-            print(f"Syncing Lifetime members separately: {lifetime_product_id} -> {lifetime_tab_name}")
-            print(f"{'='*60}")
-            
-            success, msg, count = await self.sync_product_memberships(
-                whop_client,
-                lifetime_product_id,
-                lifetime_tab_name,
-            )
-            results[lifetime_product_id] = (success, msg, count)
-            
-            if success:
-                print(f"OK Synced {count} Lifetime members to '{lifetime_tab_name}'")
-            else:
-                print(f"X Failed: {msg}")
+        results: Dict[str, Tuple[bool, str, int]] = {}
+        status_cfg = self.cfg.get("status_tabs", {})
+        source_tab = status_cfg.get("source_tab", "Whop API - Reselling Secrets") if status_cfg.get("enabled", True) else None
+        # Main "Reselling Secrets" product (not Lite): the Lite tab excludes its members
+        main_product_id = next((pid for pid, tab in products if source_tab and tab == source_tab), "")
+
+        def _exclude_for(product_id: str, tab_name: str) -> str:
+            is_lite = product_id == "prod_U52ytqRZdCFak" or "Lite" in tab_name
+            return main_product_id if is_lite and main_product_id and product_id != main_product_id else ""
+
+        for product_id, tab_name in products:
+            print(f"Syncing product: {product_id} -> tab: {tab_name}")
+
+        with self.timer.stage("sync_all_products"):
+            async with self.sheets_cycle():
+                outcomes = await asyncio.gather(
+                    *(
+                        self._sync_product_full(whop_client, pid, tab, exclude_product_id=_exclude_for(pid, tab))
+                        for pid, tab in products
+                    ),
+                    return_exceptions=True,
+                )
+                for (product_id, tab_name), out in zip(products, outcomes):
+                    if isinstance(out, BaseException):
+                        log.error(f"Product sync {product_id} -> {tab_name} crashed: {out}", exc_info=out)
+                        out = (False, f"{type(out).__name__}: {out}", 0)
+                    success, msg, count = out
+                    results[product_id] = (success, msg, count)
+                    if success:
+                        print(f"OK Synced {count} members to '{tab_name}'")
+                    else:
+                        print(f"X Failed ({tab_name}): {msg}")
+
+                # Then, segregate source tab by status into status tabs
+                if source_tab and status_cfg.get("enabled", True):
+                    print(f"\n{'='*60}")
+                    print(f"Segregating '{source_tab}' by status into status tabs...")
+                    print(f"{'='*60}")
+
+                    with self.timer.stage("segregate"):
+                        status_results = await self.segregate_by_status(source_rows=self._tab_rows.get(source_tab))
+                    for tab_name, (success, msg, count) in status_results.items():
+                        if success:
+                            print(f"OK {tab_name}: {count} members")
+                        else:
+                            print(f"X {tab_name}: {msg}")
         
+        self._mark_commit_failed(results)
         return results
     
     async def sync_continuous_cycle(self, whop_client: WhopAPIClient) -> Dict[str, Tuple[bool, str, int]]:
         """
         Continuous sync cycle: Update all enabled products incrementally, then segregate source tab by status.
+
+        Products run concurrently and all Sheets mutations are committed together (see sync_all_products).
         """
         status_cfg = self.cfg.get("status_tabs", {})
         if not status_cfg.get("enabled", True):
             return {}
         
         source_tab = status_cfg.get("source_tab", "Whop API - Reselling Secrets")
-        products = self.cfg.get("products", [])
+        products = self._enabled_products()
         
         # Find product_id for source tab (main product)
-        main_product_id = None
-        for product_cfg in products:
-            tab_name = str(product_cfg.get("tab_name") or "").strip()
-            if tab_name == source_tab:
-                main_product_id = str(product_cfg.get("product_id") or "").strip()
-                break
+        main_product_id = next((pid for pid, tab in products if tab == source_tab), "")
         
         if not main_product_id:
             log.error(f"Could not find product_id for source tab '{source_tab}'")
@@ -3238,25 +3729,27 @@ class WhopSheetsSync:
         print("Continuous sync cycle: Updating all enabled products...")
         print("=" * 60)
         
-        results = {}
-        
-        # Sync all enabled products (incremental for source tab, full sync for others)
-        for product_cfg in products:
-            product_id = str(product_cfg.get("product_id") or "").strip()
-            tab_name = str(product_cfg.get("tab_name") or "").strip()
-            enabled = product_cfg.get("enabled", True)
-            
-            if not product_id or not tab_name:
-                continue
-            
-            if not enabled:
-                continue
-            
-            # Skip Lifetime in continuous sync (it's simpler, fewer changes)
-            if product_id == "prod_76xygbFOv0aUM" or "Lifetime" in tab_name:
-                continue
-            
-            print(f"\nUpdating product: {product_id} -> tab: {tab_name}")
+        # Skip Lifetime in continuous sync (it's simpler, fewer changes)
+        products = [(pid, tab) for pid, tab in products if not (pid == "prod_76xygbFOv0aUM" or "Lifetime" in tab)]
+
+        async def _update_product(product_id: str, tab_name: str) -> Tuple[Tuple[bool, str, int], Optional[int]]:
+            """((success, msg, count), changed rows or None after a full sweep)."""
+            print(f"Updating product: {product_id} -> tab: {tab_name}")
+            is_lite = (product_id == "prod_U52ytqRZdCFak" or "Lite" in tab_name) and tab_name != source_tab
+            exclude_product_id = main_product_id if is_lite else ""
+
+            # Change-feed sync when the snapshot allows it
+            with self.timer.stage(f"changes:{tab_name}"):
+                fast = await self.sync_product_changes(
+                    whop_client,
+                    product_id,
+                    tab_name,
+                    exclude_product_id=exclude_product_id,
+                )
+            if fast is not None:
+                success, msg, count, changed = fast
+                print(f"{'OK' if success else 'X'} {tab_name}: {msg}")
+                return (success, msg, count), (changed if success else None)
             
             # For source tab (main product): use incremental sync
             if tab_name == source_tab:
@@ -3266,42 +3759,57 @@ class WhopSheetsSync:
                     tab_name,
                 )
                 if success:
-                    results[tab_name] = (True, f"added {added_count}", len(updated_rows))
                     print(f"OK Updated {tab_name}: {added_count} new members added")
-                else:
-                    results[tab_name] = (False, msg, 0)
-                    print(f"X Failed to update {tab_name}: {msg}")
-            else:
-                # For other products (e.g. Lite): use full sync with exclusion if needed
-                exclude_user_ids: Optional[Set[str]] = None
-                if (product_id == "prod_U52ytqRZdCFak" or "Lite" in tab_name) and main_product_id:
-                    log.info(f"  Fetching Main product user IDs to exclude from Lite tab (Lite-only)...")
-                    print(f"  -> Lite-only: excluding members who also have Main product...")
-                    exclude_user_ids = await self._fetch_product_user_ids(whop_client, main_product_id)
-                    log.info(f"  Excluding {len(exclude_user_ids)} Main product user IDs from Lite tab")
-                
-                success, msg, count = await self.sync_product_memberships(
-                    whop_client,
-                    product_id,
-                    tab_name,
-                    exclude_user_ids=exclude_user_ids,
+                    return (True, f"added {added_count}", len(updated_rows)), None
+                print(f"X Failed to update {tab_name}: {msg}")
+                return (False, msg, 0), None
+
+            # For other products (e.g. Lite): use full sync with exclusion if needed
+            success, msg, count = await self._sync_product_full(
+                whop_client,
+                product_id,
+                tab_name,
+                exclude_product_id=exclude_product_id,
+            )
+            if success:
+                print(f"OK Synced {count} members to '{tab_name}'")
+                return (success, msg, count), None
+            print(f"X Failed: {msg}")
+            return (False, msg, 0), None
+
+        results: Dict[str, Tuple[bool, str, int]] = {}
+        # Incremental cycles: None = source tab went through a full sweep (segregate from its rows)
+        source_changed: Optional[int] = None
+
+        with self.timer.stage("sync_continuous_cycle"):
+            async with self.sheets_cycle():
+                outcomes = await asyncio.gather(
+                    *(_update_product(pid, tab) for pid, tab in products),
+                    return_exceptions=True,
                 )
-                if success:
-                    results[tab_name] = (success, msg, count)
-                    print(f"OK Synced {count} members to '{tab_name}'")
+                for (product_id, tab_name), out in zip(products, outcomes):
+                    if isinstance(out, BaseException):
+                        log.error(f"Product update {product_id} -> {tab_name} crashed: {out}", exc_info=out)
+                        out = ((False, f"{type(out).__name__}: {out}", 0), None)
+                    results[tab_name], changed = out
+                    if tab_name == source_tab:
+                        source_changed = changed
+
+                # Segregate source tab by status
+                if source_changed == 0:
+                    log.info(f"No changes in '{source_tab}' this cycle; status tabs unchanged")
+                    print(f"\nNo changes in '{source_tab}' this cycle; status tabs unchanged")
                 else:
-                    results[tab_name] = (False, msg, 0)
-                    print(f"X Failed: {msg}")
-        
-        # Segregate source tab by status
-        print(f"\n{'='*60}")
-        print(f"Segregating '{source_tab}' by status...")
-        print(f"{'='*60}")
-        
-        status_results = await self.segregate_by_status()
-        
-        # Merge status results into main results
-        for tab_name, (success, msg, count) in status_results.items():
-            results[tab_name] = (success, msg, count)
+                    print(f"\n{'='*60}")
+                    print(f"Segregating '{source_tab}' by status...")
+                    print(f"{'='*60}")
+
+                    with self.timer.stage("segregate"):
+                        status_results = await self.segregate_by_status(source_rows=self._tab_rows.get(source_tab))
+
+                    # Merge status results into main results
+                    for tab_name, (success, msg, count) in status_results.items():
+                        results[tab_name] = (success, msg, count)
         
+        self._mark_commit_failed(results)
         return results
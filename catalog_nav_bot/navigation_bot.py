@@ -1,12 +1,16 @@
+import argparse
 import asyncio
+import hashlib
 import io
 import json
 import logging
 import os
 import re
+import tempfile
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 import aiohttp
@@ -216,6 +220,7 @@ class Config:
     allowed_channel_ids: List[int]
     allowed_guild_ids: List[int]
     state_path: Path
+    state_flush_interval_ms: int
     log_level: str
     title_regex: str
     ignore_bots_except_source: bool
@@ -229,6 +234,7 @@ class Config:
     explain_trace: bool
     log_skip_traffic: bool
     navigation_edit_min_interval_seconds: float
+    navigation_refresh_window_ms: int
     delete_superseded_source_catalog_messages: bool
     title_rewrite_rules: Tuple[TitleRewriteRule, ...]
     catalog_store_names: Tuple[str, ...]
@@ -259,12 +265,24 @@ class Config:
         state_path = (root / state_rel).resolve()
         state_path.parent.mkdir(parents=True, exist_ok=True)
 
+        state_flush_ms = int(data.get("state_flush_interval_ms", 250))
+        if state_flush_ms < 0:
+            state_flush_ms = 0
+        if state_flush_ms > 10000:
+            state_flush_ms = 10000
+
         nav_edit_interval = float(data.get("navigation_edit_min_interval_seconds", 0.35))
         if nav_edit_interval < 0:
             nav_edit_interval = 0.0
         if nav_edit_interval > 10.0:
             nav_edit_interval = 10.0
 
+        nav_refresh_window_ms = int(data.get("navigation_refresh_window_ms", 1500))
+        if nav_refresh_window_ms < 0:
+            nav_refresh_window_ms = 0
+        if nav_refresh_window_ms > 30000:
+            nav_refresh_window_ms = 30000
+
         title_rewrite_rules = _parse_title_rewrite_rules(data.get("title_rewrites"))
         catalog_store_names = _parse_catalog_store_names(data.get("catalog_store_names"))
 
@@ -278,6 +296,7 @@ class Config:
             allowed_channel_ids=allowed_channel_ids,
             allowed_guild_ids=allowed_guild_ids,
             state_path=state_path,
+            state_flush_interval_ms=state_flush_ms,
             log_level=str(data.get("log_level", "INFO")).upper(),
             title_regex=str(data.get("title_regex", TITLE_PATTERN.pattern)),
             ignore_bots_except_source=bool(data.get("ignore_bots_except_source", True)),
@@ -291,6 +310,7 @@ class Config:
             explain_trace=bool(data.get("explain_trace", False)),
             log_skip_traffic=bool(data.get("log_skip_traffic", False)),
             navigation_edit_min_interval_seconds=nav_edit_interval,
+            navigation_refresh_window_ms=nav_refresh_window_ms,
             delete_superseded_source_catalog_messages=bool(
                 data.get("delete_superseded_source_catalog_messages", True)
             ),
@@ -299,15 +319,40 @@ class Config:
         )
 
 
+def _empty_state() -> dict:
+    return {"categories": {}, "reply_index": {}, "main_catalog_by_channel": {}}
+
+
+def _copy_rows(rows: Dict[str, dict]) -> Dict[str, dict]:
+    """State rows are flat str->str dicts, so a one-level copy is a full copy."""
+    return {k: dict(v) for k, v in rows.items()}
+
+
 class NavigationState:
-    def __init__(self, path: Path) -> None:
+    """
+    Catalog state lives in memory; the JSON file is written behind the mutations.
+
+    Mutations mark the state dirty. After `start()`, a background task writes the whole file
+    atomically (temp file + replace) at most once per `flush_interval_ms`, so a burst of
+    mutations from one catalog repost costs one write. The JSON snapshot is taken on the loop;
+    the file write runs in a thread. A failed write is retried with backoff. `close()` waits
+    for an in-flight write, then writes any pending change.
+    Before `start()`, after `close()`, or with `flush_interval_ms=0`, every mutation writes
+    through immediately.
+    """
+
+    def __init__(self, path: Path, *, flush_interval_ms: int = 250) -> None:
         self.path = path
-        self.data = {
-            "categories": {},
-            "reply_index": {},
-            "main_catalog_by_channel": {},
-        }
+        self.flush_interval_s = max(0, int(flush_interval_ms)) / 1000.0
+        self.data = _empty_state()
+        self.writes = 0
         self._lock = asyncio.Lock()
+        self._dirty = False
+        self._wake: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Future] = None
+        # reply_channel_id -> {reply_message_id: category_slug}; derived from reply_targets.
+        self._replies_by_channel: Dict[int, Dict[str, str]] = {}
         self.load()
 
     def load(self) -> None:
@@ -319,11 +364,109 @@ class NavigationState:
         except Exception:
             backup = self.path.with_suffix(".corrupt.json")
             self.path.replace(backup)
-            self.data = {"categories": {}, "reply_index": {}, "main_catalog_by_channel": {}}
+            self.data = _empty_state()
             self.save_sync()
+        self._rebuild_reply_index()
+
+    def _serialize(self) -> str:
+        return json.dumps(self.data, indent=2, ensure_ascii=False)
+
+    def _write_file(self, text: str) -> None:
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.writes += 1
 
     def save_sync(self) -> None:
-        self.path.write_text(json.dumps(self.data, indent=2, ensure_ascii=False), encoding="utf-8")
+        self._write_file(self._serialize())
+        self._dirty = False
+
+    def flush(self) -> bool:
+        """Write now if anything changed since the last write. Returns True if the file was written."""
+        if not self._dirty:
+            return False
+        self.save_sync()
+        return True
+
+    async def flush_async(self) -> bool:
+        """Like `flush()`, but only the JSON snapshot is taken on the loop; the file write runs in a thread."""
+        if not self._dirty:
+            return False
+        text = self._serialize()
+        self._dirty = False
+        write = asyncio.ensure_future(asyncio.to_thread(self._write_file, text))
+        self._inflight = write
+        try:
+            # Shielded: a cancelled flusher leaves the write running; close() waits for it.
+            await asyncio.shield(write)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._dirty = True
+            raise
+        return True
+
+    def start(self) -> None:
+        """Switch to write-behind; call from a running event loop (bot setup_hook)."""
+        if self._flusher is not None or self.flush_interval_s <= 0:
+            return
+        self._wake = asyncio.Event()
+        self._flusher = asyncio.create_task(self._flush_loop(), name="navigation-state-flush")
+
+    async def close(self) -> None:
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.cancel()
+            try:
+                await flusher
+            except asyncio.CancelledError:
+                pass
+        inflight, self._inflight = self._inflight, None
+        if inflight is not None:
+            await asyncio.wait([inflight])
+            if inflight.exception() is not None:
+                self._dirty = True
+        await self.flush_async()
+
+    async def _flush_loop(self) -> None:
+        log = logging.getLogger("catalog_nav_bot")
+        retry_s = self.flush_interval_s
+        while True:
+            await self._wake.wait()
+            # Let the rest of the burst land, then write once.
+            await asyncio.sleep(self.flush_interval_s)
+            self._wake.clear()
+            try:
+                await self.flush_async()
+                retry_s = self.flush_interval_s
+            except Exception:
+                retry_s = min(max(retry_s * 2, 1.0), 60.0)
+                log.exception("navigation state flush failed path=%s (will retry in %.1fs)", self.path, retry_s)
+                await asyncio.sleep(retry_s)
+                self._wake.set()
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if self._flusher is None:
+            self.save_sync()
+        else:
+            self._wake.set()
+
+    def _rebuild_reply_index(self) -> None:
+        by_channel: Dict[int, Dict[str, str]] = {}
+        for slug, category in self.data.get("categories", {}).items():
+            for reply_id, target in category.get("reply_targets", {}).items():
+                by_channel.setdefault(int(target.get("reply_channel_id", 0)), {})[str(reply_id)] = slug
+        self._replies_by_channel = by_channel
+
+    def _drop_reply(self, category: dict, reply_id: str) -> Optional[dict]:
+        target = category.get("reply_targets", {}).pop(reply_id, None)
+        self.data.get("reply_index", {}).pop(reply_id, None)
+        if target is not None:
+            replies = self._replies_by_channel.get(int(target.get("reply_channel_id", 0)))
+            if replies is not None:
+                replies.pop(reply_id, None)
+        return target
 
     async def upsert_entry(
         self,
@@ -362,7 +505,8 @@ class NavigationState:
                 "source_message_id": str(source_message_id),
             }
             self.data.setdefault("reply_index", {})[str(reply_message_id)] = category_slug
-            self.save_sync()
+            self._replies_by_channel.setdefault(reply_channel_id, {})[str(reply_message_id)] = category_slug
+            self._mark_dirty()
             return category
 
     async def remove_reply_targets_for_store(
@@ -382,24 +526,23 @@ class NavigationState:
             if not cat:
                 return []
             targets = cat.setdefault("reply_targets", {})
-            reply_index = self.data.setdefault("reply_index", {})
             removed: List[Tuple[int, int]] = []
-            for rid, target in list(targets.items()):
-                if target.get("store_slug") != store_slug:
+            for rid, slug in list(self._replies_by_channel.get(channel_id, {}).items()):
+                if slug != category_slug:
                     continue
-                if int(target.get("reply_channel_id", 0)) != channel_id:
+                target = targets.get(rid)
+                if not target or target.get("store_slug") != store_slug:
                     continue
-                targets.pop(rid, None)
-                reply_index.pop(rid, None)
+                self._drop_reply(cat, rid)
                 removed.append((int(target["reply_channel_id"]), int(target["reply_message_id"])))
             if removed:
-                self.save_sync()
+                self._mark_dirty()
             return removed
 
     async def set_main_catalog_message(self, channel_id: int, message_id: int) -> None:
         async with self._lock:
             self.data.setdefault("main_catalog_by_channel", {})[str(channel_id)] = str(message_id)
-            self.save_sync()
+            self._mark_dirty()
 
     async def get_main_catalog_message_id(self, channel_id: int) -> Optional[int]:
         async with self._lock:
@@ -411,22 +554,31 @@ class NavigationState:
             category = self.data.get("categories", {}).get(category_slug)
             if not category:
                 return None
-            return json.loads(json.dumps(category))
+            return {
+                "label": category.get("label", category_slug),
+                "stores": _copy_rows(category.get("stores", {})),
+                "reply_targets": _copy_rows(category.get("reply_targets", {})),
+            }
 
     async def get_categories_for_channel(self, channel_id: int) -> Dict[str, dict]:
+        """Categories with at least one store in this channel; reply_targets are limited to this channel."""
         async with self._lock:
+            replies = self._replies_by_channel.get(channel_id, {})
             result: Dict[str, dict] = {}
             for slug, category in self.data.get("categories", {}).items():
                 stores = {
-                    store_slug: store
+                    store_slug: dict(store)
                     for store_slug, store in category.get("stores", {}).items()
                     if int(store.get("source_channel_id", 0)) == channel_id
                 }
                 if stores:
+                    targets = category.get("reply_targets", {})
                     result[slug] = {
                         "label": category.get("label", slug),
-                        "stores": json.loads(json.dumps(stores)),
-                        "reply_targets": json.loads(json.dumps(category.get("reply_targets", {}))),
+                        "stores": stores,
+                        "reply_targets": {
+                            rid: dict(targets[rid]) for rid, s in replies.items() if s == slug and rid in targets
+                        },
                     }
             return result
 
@@ -435,10 +587,12 @@ class NavigationState:
             return
         async with self._lock:
             latest = self.data.get("categories", {}).get(category_slug, {})
+            removed = 0
             for reply_id in stale_reply_ids:
-                latest.get("reply_targets", {}).pop(reply_id, None)
-                self.data.get("reply_index", {}).pop(reply_id, None)
-            self.save_sync()
+                if self._drop_reply(latest, reply_id) is not None:
+                    removed += 1
+            if removed:
+                self._mark_dirty()
 
 
 class LinkButtonView(discord.ui.View):
@@ -462,7 +616,7 @@ class CatalogNavigationBot(commands.Bot):
         intents.messages = True
         super().__init__(command_prefix="!", intents=intents)
         self.config_data = config
-        self.state = NavigationState(config.state_path)
+        self.state = NavigationState(config.state_path, flush_interval_ms=config.state_flush_interval_ms)
         self.title_pattern = re.compile(config.title_regex, re.IGNORECASE)
         self._catalog_store_splitters = _compile_catalog_store_splitters(config.catalog_store_names)
         self._log = logging.getLogger("catalog_nav_bot")
@@ -472,6 +626,28 @@ class CatalogNavigationBot(commands.Bot):
             log_skip_traffic=config.log_skip_traffic,
         )
         self._catalog_handoff_locks: Dict[int, asyncio.Lock] = {}
+        # Coalescing nav refresh: channel_id -> dirty category slugs, drained by one task per channel.
+        self._nav_dirty: Dict[int, Set[str]] = {}
+        self._nav_refresh_tasks: Dict[int, asyncio.Task] = {}
+        # reply_message_id -> hash of what we last rendered into it (edit is skipped when unchanged).
+        self._nav_rendered: Dict[str, str] = {}
+        self._nav_edit_lock = asyncio.Lock()
+        self._last_nav_edit_at = 0.0
+        self.nav_edit_counters: Dict[str, int] = {
+            "edits_sent": 0,
+            "edits_skipped": 0,
+            "refresh_passes": 0,
+            "refresh_requests_coalesced": 0,
+        }
+
+    async def setup_hook(self) -> None:
+        self.state.start()
+
+    async def close(self) -> None:
+        for task in list(self._nav_refresh_tasks.values()):
+            task.cancel()
+        await self.state.close()
+        await super().close()
 
     def _catalog_handoff_lock(self, channel_id: int) -> asyncio.Lock:
         """One mutex per channel so two catalog posts in the same channel cannot interleave dedupe/upsert/main-catalog."""
@@ -481,10 +657,13 @@ class CatalogNavigationBot(commands.Bot):
             self._catalog_handoff_locks[channel_id] = lk
         return lk
 
-    async def _throttle_after_navigation_edit(self) -> None:
-        delay = self.config_data.navigation_edit_min_interval_seconds
-        if delay > 0:
-            await asyncio.sleep(delay)
+    async def _pace_navigation_edit(self) -> None:
+        """Space nav reply PATCHes (all channels) at least navigation_edit_min_interval_seconds apart; skips cost nothing."""
+        async with self._nav_edit_lock:
+            wait = self._last_nav_edit_at + self.config_data.navigation_edit_min_interval_seconds - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_nav_edit_at = time.monotonic()
 
     async def _delete_navigation_reply_message(self, channel_id: int, message_id: int) -> None:
         """Best-effort delete of a nav reply we no longer track (e.g. same catalog reposted)."""
@@ -583,6 +762,8 @@ class CatalogNavigationBot(commands.Bot):
                 f"explain_trace={self.config_data.explain_trace}",
                 f"log_skip_traffic={self.config_data.log_skip_traffic}",
                 f"navigation_edit_min_interval_seconds={self.config_data.navigation_edit_min_interval_seconds}",
+                f"state_flush_interval_ms={self.config_data.state_flush_interval_ms}",
+                f"navigation_refresh_window_ms={self.config_data.navigation_refresh_window_ms}",
             ],
         )
         self.explain.trace(
@@ -779,11 +960,12 @@ class CatalogNavigationBot(commands.Bot):
                 reply_message_id=reply_message.id,
             )
             await self._refresh_main_catalog_message(message.channel)
-            await self._refresh_all_category_navigation_messages(message.channel.id)
+            categories = await self.state.get_categories_for_channel(message.channel.id)
+            self._schedule_navigation_refresh(message.channel.id, categories.keys())
             main_catalog_url = await self._get_main_catalog_url(message.channel.id)
 
             self.explain.eli5(
-                "Catalog navigation updated: reply posted, single main catalog at bottom, every category's nav replies retargeted.",
+                "Catalog navigation updated: reply posted, single main catalog at bottom, every category's nav replies queued for retargeting.",
                 [
                     f"reply_message_id={reply_message.id}",
                     f"main_catalog_button_url={main_catalog_url}",
@@ -791,14 +973,17 @@ class CatalogNavigationBot(commands.Bot):
                 ],
             )
             self.explain.human(
-                "Rules that fired: source author, guild/channel allowlist, title_regex match, state upsert, main catalog refresh (once), refresh ALL category nav replies in channel (retarget Main Catalog).",
+                "Rules that fired: source author, guild/channel allowlist, title_regex match, state upsert, main catalog refresh (once), queue ALL category nav replies in channel for one coalesced refresh (retarget Main Catalog).",
                 yes=[
                     f"Parsed store={store_label!r} category={category_label!r}",
                     "Posted or refreshed navigation reply under source message",
                     "Posted exactly one new main catalog message and removed the previous one",
-                    "Edited navigation replies for every category in this channel so Main Catalog points at the new bottom message",
+                    "Queued navigation replies for every category in this channel so Main Catalog points at the new bottom message",
+                ],
+                notes=[
+                    f"State file: {self.config_data.state_path}",
+                    f"Nav refresh runs after navigation_refresh_window_ms={self.config_data.navigation_refresh_window_ms}",
                 ],
-                notes=[f"State file: {self.config_data.state_path}"],
             )
             self.explain.trace(
                 {
@@ -894,23 +1079,66 @@ class CatalogNavigationBot(commands.Bot):
             color=self.config_data.embed_color,
         )
         view = LinkButtonView(label=self.config_data.navigation_button_label, url=main_catalog_url)
-        return await message.reply(embed=embed, view=view, mention_author=False)
+        reply = await message.reply(embed=embed, view=view, mention_author=False)
+        self._nav_rendered[str(reply.id)] = _navigation_render_hash(
+            embed.description or "", self.config_data.navigation_button_label, main_catalog_url
+        )
+        return reply
+
+    def _schedule_navigation_refresh(self, channel_id: int, category_slugs: Iterable[str]) -> None:
+        """
+        Mark categories dirty; one task per channel waits navigation_refresh_window_ms, then refreshes
+        everything that became dirty meanwhile in a single pass (a bulk repost costs one pass, not N).
+        """
+        pending = self._nav_dirty.get(channel_id)
+        if pending is None:
+            pending = self._nav_dirty[channel_id] = set()
+        elif pending:
+            self.nav_edit_counters["refresh_requests_coalesced"] += 1
+        pending.update(category_slugs)
+        if channel_id not in self._nav_refresh_tasks:
+            self._nav_refresh_tasks[channel_id] = asyncio.create_task(
+                self._navigation_refresh_worker(channel_id), name=f"nav-refresh-{channel_id}"
+            )
+
+    async def _navigation_refresh_worker(self, channel_id: int) -> None:
+        try:
+            while self._nav_dirty.get(channel_id):
+                await asyncio.sleep(self.config_data.navigation_refresh_window_ms / 1000.0)
+                slugs = self._nav_dirty.pop(channel_id, set())
+                try:
+                    await self._refresh_navigation_categories(channel_id, slugs)
+                except Exception:
+                    self._log.exception("nav refresh failed channel_id=%s categories=%s", channel_id, sorted(slugs))
+        finally:
+            self._nav_refresh_tasks.pop(channel_id, None)
 
     async def _refresh_all_category_navigation_messages(self, channel_id: int) -> None:
         """After main catalog moves, every category's nav replies must get the new Main Catalog URL (not only the triggering category)."""
         categories = await self.state.get_categories_for_channel(channel_id)
-        for slug in sorted(categories.keys()):
+        await self._refresh_navigation_categories(channel_id, categories.keys())
+
+    async def _refresh_navigation_categories(self, channel_id: int, category_slugs: Iterable[str]) -> None:
+        slugs = sorted(set(category_slugs))
+        counters = self.nav_edit_counters
+        sent_before, skipped_before = counters["edits_sent"], counters["edits_skipped"]
+        for slug in slugs:
             await self._refresh_category_messages(slug, channel_id, log_route=False)
+        counters["refresh_passes"] += 1
         self.explain.route(
             "ALL CATEGORY NAV REPLIES",
             destination=f"channel_id={channel_id}",
-            detail=f"categories_refreshed={len(categories)}",
+            detail=(
+                f"categories_refreshed={len(slugs)} edits_sent={counters['edits_sent'] - sent_before} "
+                f"edits_skipped={counters['edits_skipped'] - skipped_before} totals={counters}"
+            ),
         )
         self.explain.trace(
             {
                 "event": "all_categories_refresh",
                 "channel_id": channel_id,
-                "category_slugs": sorted(categories.keys()),
+                "category_slugs": slugs,
+                "nav_edit_counters": dict(counters),
             }
         )
 
@@ -932,31 +1160,44 @@ class CatalogNavigationBot(commands.Bot):
         content = self._render_navigation_text(category.get("label", category_slug), stores)
         embed = discord.Embed(description=content, color=self.config_data.embed_color)
         view = LinkButtonView(label=self.config_data.navigation_button_label, url=main_catalog_url)
+        btn_label = self.config_data.navigation_button_label
+        render_hash = _navigation_render_hash(content, btn_label, main_catalog_url)
 
         stale_reply_ids: List[str] = []
         edited = 0
         skipped_unchanged = 0
-        btn_label = self.config_data.navigation_button_label
         for reply_id, target in category.get("reply_targets", {}).items():
             if int(target.get("reply_channel_id", 0)) != channel_id:
                 continue
+            last_hash = self._nav_rendered.get(reply_id)
+            if last_hash == render_hash:
+                skipped_unchanged += 1
+                continue
             channel = self.get_channel(int(target["reply_channel_id"]))
             if channel is None:
                 stale_reply_ids.append(reply_id)
                 continue
             try:
-                reply_message = await channel.fetch_message(int(target["reply_message_id"]))
-                if _navigation_reply_matches_target(
-                    reply_message,
-                    embed,
-                    button_label=btn_label,
-                    button_url=main_catalog_url,
-                ):
-                    skipped_unchanged += 1
-                    continue
-                await reply_message.edit(embed=embed, view=view)
+                if last_hash is None:
+                    # Unknown content (e.g. after a restart): one fetch decides whether an edit is needed.
+                    reply_message = await channel.fetch_message(int(target["reply_message_id"]))
+                    if _navigation_reply_matches_target(
+                        reply_message,
+                        embed,
+                        button_label=btn_label,
+                        button_url=main_catalog_url,
+                    ):
+                        self._nav_rendered[reply_id] = render_hash
+                        skipped_unchanged += 1
+                        continue
+                    await self._pace_navigation_edit()
+                    await reply_message.edit(embed=embed, view=view)
+                else:
+                    # We know what it shows and that it differs: edit without fetching it first.
+                    await self._pace_navigation_edit()
+                    await channel.get_partial_message(int(target["reply_message_id"])).edit(embed=embed, view=view)
+                self._nav_rendered[reply_id] = render_hash
                 edited += 1
-                await self._throttle_after_navigation_edit()
             except discord.NotFound:
                 stale_reply_ids.append(reply_id)
             except discord.Forbidden:
@@ -964,6 +1205,10 @@ class CatalogNavigationBot(commands.Bot):
             except discord.HTTPException:
                 self._log.exception("http error editing reply_message_id=%s", reply_id)
 
+        for reply_id in stale_reply_ids:
+            self._nav_rendered.pop(reply_id, None)
+        self.nav_edit_counters["edits_sent"] += edited
+        self.nav_edit_counters["edits_skipped"] += skipped_unchanged
         await self.state.cleanup_missing_reply_targets(category_slug, stale_reply_ids)
         if log_route:
             self.explain.route(
@@ -1126,6 +1371,10 @@ class CatalogNavigationBot(commands.Bot):
         return f"https://discord.com/channels/{guild_id}/{channel_id}/{message_id}"
 
 
+def _navigation_render_hash(description: str, button_label: str, button_url: str) -> str:
+    return hashlib.sha1(f"{description}\x00{button_label}\x00{button_url}".encode("utf-8")).hexdigest()
+
+
 def store_bullet_line(store: dict, *, guild_id: Optional[int] = None) -> str:
     """Link each store to its catalog *message* (jump URL), not only the channel — avoids every line opening the same #channel."""
     label = store.get("label", "Store")
@@ -1222,7 +1471,89 @@ def configure_logging(level: str, *, explain_trace: bool) -> None:
         logging.getLogger("discord.http").setLevel(logging.WARNING)
 
 
+async def _benchmark_state_refresh(path: Path, *, entries: int, flush_interval_ms: int) -> Tuple[float, int]:
+    """
+    Replay the state calls of a full catalog refresh (every store reposted once) against a
+    state file that already holds `entries` stores in one channel. Returns (seconds, file writes).
+    """
+    channel_id = 1000
+    categories = 25  # main catalog button limit
+    per_category = max(1, entries // categories)
+    seed = NavigationState(path, flush_interval_ms=0)
+    for c in range(categories):
+        for n in range(per_category):
+            await seed.upsert_entry(
+                category_slug=f"category-{c}",
+                category_label=f"Category {c}",
+                store_slug=f"store-{n}",
+                store_label=f"Store {n}",
+                source_channel_id=channel_id,
+                source_message_id=10_000 + c * per_category + n,
+                source_jump_url=f"https://discord.com/channels/1/{channel_id}/{10_000 + c * per_category + n}",
+                reply_channel_id=channel_id,
+                reply_message_id=20_000 + c * per_category + n,
+            )
+
+    state = NavigationState(path, flush_interval_ms=flush_interval_ms)
+    state.start()
+    next_id = 50_000
+    t0 = time.perf_counter()
+    for c in range(categories):
+        for n in range(per_category):
+            slug = f"category-{c}"
+            next_id += 2
+            await state.get_category(slug)
+            await state.remove_reply_targets_for_store(category_slug=slug, store_slug=f"store-{n}", channel_id=channel_id)
+            await state.get_main_catalog_message_id(channel_id)
+            await state.upsert_entry(
+                category_slug=slug,
+                category_label=f"Category {c}",
+                store_slug=f"store-{n}",
+                store_label=f"Store {n}",
+                source_channel_id=channel_id,
+                source_message_id=next_id,
+                source_jump_url=f"https://discord.com/channels/1/{channel_id}/{next_id}",
+                reply_channel_id=channel_id,
+                reply_message_id=next_id + 1,
+            )
+            await state.get_categories_for_channel(channel_id)
+            await state.get_main_catalog_message_id(channel_id)
+            await state.set_main_catalog_message(channel_id, next_id + 2)
+            for other in sorted(await state.get_categories_for_channel(channel_id)):
+                await state.get_category(other)
+                await state.get_main_catalog_message_id(channel_id)
+                await state.cleanup_missing_reply_targets(other, [])
+            # Discord round-trips would yield here; give the flusher its chance to run.
+            await asyncio.sleep(0)
+    await state.close()
+    return time.perf_counter() - t0, state.writes
+
+
+def run_state_benchmark(entries: int, flush_interval_ms: int) -> None:
+    print(f"catalog refresh benchmark: {entries} entries, 25 categories, one channel")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, interval in (("write-through (flush_interval_ms=0)", 0), (f"write-behind (flush_interval_ms={flush_interval_ms})", flush_interval_ms)):
+            path = Path(tmp) / f"state_{interval}.json"
+            seconds, writes = asyncio.run(_benchmark_state_refresh(path, entries=entries, flush_interval_ms=interval))
+            print(f"  {label:<40} {seconds * 1000:>9.1f} ms  file_writes={writes}")
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Catalog navigation bot")
+    parser.add_argument(
+        "--benchmark-state",
+        type=int,
+        nargs="?",
+        const=500,
+        metavar="ENTRIES",
+        help="Offline: time a full catalog refresh against NavigationState (write-through vs write-behind) and exit",
+    )
+    parser.add_argument("--flush-interval-ms", type=int, default=250, help="Write-behind interval for --benchmark-state")
+    args = parser.parse_args()
+    if args.benchmark_state:
+        run_state_benchmark(args.benchmark_state, args.flush_interval_ms)
+        return
+
     config_path = Path(os.environ.get("CATALOG_NAV_CONFIG", "config.json")).resolve()
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
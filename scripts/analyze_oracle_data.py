@@ -41,6 +41,28 @@ def load_json_file(file_path: Path) -> tuple[dict | None, int, str]:
         return None, file_size, f"error: {str(e)}"
 
 
+def analyze_webhook_raw_segments(seg_dir: Path) -> dict:
+    """Analyze the whop_webhook_raw/ segment directory (one JSON record per line)"""
+    from shared.whop_webhook_raw_log import WhopWebhookRawLog
+
+    log = WhopWebhookRawLog(seg_dir)
+    segments = log.segments()
+    file_analysis = {
+        "filename": "whop_webhook_raw/",
+        "status": "ok" if segments else ("empty" if seg_dir.is_dir() else "missing"),
+        "size_bytes": sum(p.stat().st_size for p in segments),
+        "stats": {},
+    }
+    if segments:
+        by_type: dict[str, int] = defaultdict(int)
+        for rec in log.iter_records():
+            by_type[str(rec.get("event_type") or "unknown")] += 1
+        file_analysis["stats"]["segments"] = len(segments)
+        file_analysis["stats"]["total_payloads"] = sum(by_type.values())
+        file_analysis["stats"]["event_types"] = dict(sorted(by_type.items()))
+    return file_analysis
+
+
 def analyze_rcheckerbot_data(data_dir: Path) -> dict:
     """Analyze RSCheckerbot runtime data"""
     bot_dir = data_dir / "RSCheckerbot"
@@ -53,13 +75,16 @@ def analyze_rcheckerbot_data(data_dir: Path) -> dict:
         "member_history.json",
         "whop_identity_cache.json",
         "trial_history.json",
-        "whop_webhook_raw_payloads.json",
+        "whop_webhook_raw/",
         "registry.json",
         "queue.json",
         "invites.json",
     ]
     
     for filename in files_to_check:
+        if filename == "whop_webhook_raw/":
+            analysis["files"][filename] = analyze_webhook_raw_segments(bot_dir / "whop_webhook_raw")
+            continue
         file_path = bot_dir / filename
         data, size, status = load_json_file(file_path)
         
@@ -86,10 +111,6 @@ def analyze_rcheckerbot_data(data_dir: Path) -> dict:
                 total_events = sum(len(v.get("events", [])) for v in data.values())
                 file_analysis["stats"]["total_trial_events"] = total_events
             
-            elif filename == "whop_webhook_raw_payloads.json":
-                payloads = data.get("payloads", [])
-                file_analysis["stats"]["total_payloads"] = len(payloads)
-            
             elif filename == "registry.json":
                 file_analysis["stats"]["total_entries"] = len(data) if isinstance(data, dict) else 0
             
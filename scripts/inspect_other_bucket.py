@@ -118,6 +118,19 @@ def _extract_email(m: dict) -> str:
     return ""
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def main():
     cfg = load_config()
     wh = cfg.get("whop_api") or {}
@@ -147,6 +160,7 @@ async def main():
     window_end = (end_utc + timedelta(days=31)).isoformat().replace("+00:00", "Z")
 
     client = WhopAPIClient(api_key, str(wh.get("base_url") or "https://api.whop.com/api/v1"), company_id)
+    _OPEN_CLIENTS.append(client)
 
     joined_member_ids = set()
     after = None
@@ -222,4 +236,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(_run_closing(main()))
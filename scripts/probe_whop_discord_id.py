@@ -50,6 +50,19 @@ def _connected_account_types(member: dict) -> list[str]:
     return out
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def main() -> int:
     cfg = _load_cfg()
     wh = cfg.get("whop_api") if isinstance(cfg.get("whop_api"), dict) else {}
@@ -64,6 +77,7 @@ async def main() -> int:
         return 2
 
     c = WhopAPIClient(api_key=api_key, base_url=base_url, company_id=company_id)
+    _OPEN_CLIENTS.append(c)
 
     async def _probe(title: str, params: dict) -> None:
         batch, _page = await c.list_members(first=25, params=params)
@@ -114,5 +128,5 @@ async def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(asyncio.run(main()))
+    raise SystemExit(asyncio.run(_run_closing(main())))
 
@@ -27,6 +27,19 @@ def _load_cfg() -> dict:
     return cfg
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def main() -> int:
     cfg = _load_cfg()
     # RSCheckerbot isn't a package; add to sys.path
@@ -49,6 +62,7 @@ async def main() -> int:
         return 2
 
     c = WhopAPIClient(api_key=api_key, base_url=base_url, company_id=company_id)
+    _OPEN_CLIENTS.append(c)
     ws = WhopSheetsSync(cfg)
 
     batch, _page = await c.list_memberships(first=30, params={"product_ids": [product_id], "statuses[]": ["active"]})
@@ -79,5 +93,5 @@ async def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(asyncio.run(main()))
+    raise SystemExit(asyncio.run(_run_closing(main())))
 
@@ -79,7 +79,10 @@ async def _fetch_whop_brief(cfg: dict, membership_id: str) -> dict:
     if not api_key or not company_id:
         return {}
     client = WhopAPIClient(api_key=api_key, base_url=base_url, company_id=company_id)
-    return await fetch_whop_brief(client, membership_id, enable_enrichment=bool(wh.get("enable_enrichment", True)))
+    try:
+        return await fetch_whop_brief(client, membership_id, enable_enrichment=bool(wh.get("enable_enrichment", True)))
+    finally:
+        await client.close()
 
 
 def _resolve_membership_id(discord_id: int) -> str:
@@ -51,14 +51,16 @@ LOCAL_MODE = _LOCAL_REMOTE_ROOT.is_dir() and (_LOCAL_REMOTE_ROOT / "RSAdminBot")
 OUTPUT_DIR = _REPO_ROOT / "OracleServerData"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-# Files to download per bot (runtime data only, NOT synced per CANONICAL_RULES)
+# Files to download per bot (runtime data only, NOT synced per CANONICAL_RULES).
+# An entry ending in "/" is a segment directory: every *.jsonl file in it is downloaded.
 BOT_RUNTIME_FILES = {
     "RSCheckerbot": [
         "member_history.json",
+        "member_history.sqlite3",
         "whop_identity_cache.json",
         "trial_history.json",
         "identity_conflicts.jsonl",
-        "whop_webhook_raw_payloads.json",
+        "whop_webhook_raw/",
         "whop_resolution_alert_state.json",
         "staff_alerts.json",
         "payment_cache.json",
@@ -82,6 +84,7 @@ BOT_RUNTIME_FILES = {
     ],
     "RSuccessBot": [
         "success_points.json",
+        "image_phash_index.bin",
         "vouches.json",
         "marketplace_profiles.json",
     ],
@@ -214,6 +217,28 @@ def get_file_meta(remote_path: str) -> tuple[bool, dict, str]:
         return True, {"raw": out[:200]}, ""
 
 
+def list_segment_files(remote_dir: str) -> tuple[bool, list[str], str]:
+    """Return (exists, names, err) for the *.jsonl files in a remote directory (or local when LOCAL_MODE is True)."""
+    if LOCAL_MODE:
+        try:
+            d = Path(remote_dir)
+            if not d.is_dir():
+                return False, [], ""
+            return True, sorted(p.name for p in d.glob("*.jsonl") if p.is_file()), ""
+        except Exception as e:
+            return False, [], f"local_list_failed: {e}"
+
+    cmd = f"test -d {shlex.quote(remote_dir)} && ls -1 {shlex.quote(remote_dir)} || echo 'MISSING'"
+    code, stdout, stderr = run_ssh_command(cmd)
+    if code != 0:
+        err = (stderr or stdout or "").strip()
+        return False, [], (err[:300] if err else "ssh_failed")
+    names = [ln.strip() for ln in (stdout or "").splitlines() if ln.strip()]
+    if names == ["MISSING"]:
+        return False, [], ""
+    return True, sorted(n for n in names if n.endswith(".jsonl")), ""
+
+
 def sync_bot_data(bot_name: str, files: list[str]) -> dict:
     """Sync runtime data files for a single bot"""
     bot_output_dir = OUTPUT_DIR / bot_name
@@ -229,7 +254,22 @@ def sync_bot_data(bot_name: str, files: list[str]) -> dict:
     print(f"\n[{bot_name}]")
     print("-" * 60)
     
-    for file_path in files:
+    expanded: list[str] = []
+    for entry in files:
+        if not entry.endswith("/"):
+            expanded.append(entry)
+            continue
+        dir_exists, names, list_err = list_segment_files(f"{REMOTE_ROOT}/{bot_name}/{entry.rstrip('/')}")
+        if list_err:
+            results["errors"].append({"file": entry, "remote_path": f"{REMOTE_ROOT}/{bot_name}/{entry}", "error": list_err})
+            print(f"  [ERR]  {entry} - Listing failed ({list_err})")
+        elif not dir_exists or not names:
+            results["missing"].append(entry)
+            print(f"  [WARN] {entry} - No segments found on server")
+        else:
+            expanded.extend(f"{entry}{n}" for n in names)
+    
+    for file_path in expanded:
         remote_path = f"{REMOTE_ROOT}/{bot_name}/{file_path}"
         local_path = bot_output_dir / file_path
         
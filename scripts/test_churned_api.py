@@ -50,6 +50,19 @@ def load_config() -> dict:
     return cfg
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def main():
     use_payments = "--payments" in sys.argv
     cfg = load_config()
@@ -86,6 +99,7 @@ async def main():
     curr_start_iso = curr_month_start.isoformat().replace("+00:00", "Z")
 
     client = WhopAPIClient(api_key, str(wh.get("base_url") or "https://api.whop.com/api/v1"), company_id)
+    _OPEN_CLIENTS.append(client)
 
     prod_ids_cfg = whop_cfg.get("metrics_report_product_ids")
     full_ids = [str(x).strip() for x in ((prod_ids_cfg or {}).get("full") or []) if str(x or "").strip().startswith("prod_")]
@@ -203,4 +217,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(_run_closing(main()))
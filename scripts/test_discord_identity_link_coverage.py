@@ -65,6 +65,19 @@ def _get_cache_did(cache: dict, email: str) -> str:
     return did if did.isdigit() else ""
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def _demo_whop_for_emails(emails: list[str]) -> None:
     """
     Best-effort demo:
@@ -101,6 +114,7 @@ async def _demo_whop_for_emails(emails: list[str]) -> None:
     target = {e.lower() for e in emails if e and "@" in e}
 
     c = WhopAPIClient(api_key=api_key, base_url=base_url, company_id=company_id)
+    _OPEN_CLIENTS.append(c)
     batch, _page = await c.list_members(first=100, params={"product_ids": [product_id]})
     hits = 0
     for m in batch:
@@ -162,5 +176,5 @@ async def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(asyncio.run(main()))
+    raise SystemExit(asyncio.run(_run_closing(main())))
 
@@ -88,6 +88,19 @@ def _is_lite(title: str) -> bool:
     return "lite" in low and "lifetime" not in low
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def main():
     cfg = load_config()
     wh = cfg.get("whop_api") or {}
@@ -132,6 +145,7 @@ async def main():
     # --- Whop API ---
     if api_key and company_id:
         client = WhopAPIClient(api_key, str(wh.get("base_url") or "https://api.whop.com/api/v1"), company_id)
+        _OPEN_CLIENTS.append(client)
 
         # Test list_members with joined_after/joined_before (Date joined filter)
         print("--- Whop API list_members (joined_after/joined_before) ---")
@@ -276,4 +290,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main()))
+    sys.exit(asyncio.run(_run_closing(main())))
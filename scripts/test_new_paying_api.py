@@ -78,6 +78,19 @@ def _payment_membership_id(p: dict) -> str:
     return str(v or "").strip()
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def main():
     cfg = load_config()
     wh = cfg.get("whop_api") or {}
@@ -105,6 +118,7 @@ async def main():
     end_utc_iso = end_utc.isoformat().replace("+00:00", "Z")
 
     client = WhopAPIClient(api_key, str(wh.get("base_url") or "https://api.whop.com/api/v1"), company_id)
+    _OPEN_CLIENTS.append(client)
 
     prod_ids_cfg = whop_cfg.get("metrics_report_product_ids")
     full_ids = [str(x).strip() for x in ((prod_ids_cfg or {}).get("full") or []) if str(x or "").strip().startswith("prod_")]
@@ -295,4 +309,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(_run_closing(main()))
@@ -2,7 +2,8 @@
 Test that when the repeat-trial guard fetches a fresh brief, we persist it to member_history
 (so last_summary.total_spent gets the API value, e.g. $30.00).
 
-Uses a temp member_history.json and the real record_member_whop_summary from main.
+Uses a temp legacy member_history.json (imported into a temp member_history.sqlite3 store)
+and the real record_member_whop_summary from main.
 Run from repo root: python scripts/test_persist_total_spent.py
 """
 import json
@@ -43,14 +44,14 @@ def run_test() -> int:
 
         # Patch main to use our temp file, then call record_member_whop_summary
         import main as main_mod
+        from member_history_store import get_member_history_store
+
+        tmp_db_path = Path(tmpdir) / "member_history.sqlite3"
         original_path = main_mod.MEMBER_HISTORY_FILE
+        original_db_path = main_mod.MEMBER_HISTORY_DB_FILE
         try:
             main_mod.MEMBER_HISTORY_FILE = tmp_path
-            # Clear any in-memory cache so we read from file
-            if hasattr(main_mod, "_MH_LINK_CACHE"):
-                main_mod._MH_LINK_CACHE["db"] = None
-                main_mod._MH_LINK_CACHE["at"] = 0.0
-                main_mod._MH_LINK_CACHE["mtime"] = 0.0
+            main_mod.MEMBER_HISTORY_DB_FILE = tmp_db_path
 
             # This is the same brief shape we get from _fetch_whop_brief_by_membership_id (e.g. API returns $30)
             fresh_brief = {
@@ -70,11 +71,13 @@ def run_test() -> int:
             )
         finally:
             main_mod.MEMBER_HISTORY_FILE = original_path
+            main_mod.MEMBER_HISTORY_DB_FILE = original_db_path
 
         # Read back and assert
-        with open(tmp_path, encoding="utf-8") as f:
-            db = json.load(f)
-    rec = db.get("731728830108270643") or {}
+        store = get_member_history_store(tmp_db_path)
+        rec = store.get("731728830108270643") or {}
+        store.close()
+
     wh = rec.get("whop") or {}
     last = wh.get("last_summary") or {}
     total_spent = str(last.get("total_spent") or "").strip()
@@ -156,6 +156,19 @@ def run_check_had_trial_before(discord_id: int) -> int:
     return 0
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def run(membership_id: str, verbose: bool) -> int:
     cfg = load_config()
     wh = cfg.get("whop_api") or {}
@@ -172,6 +185,7 @@ async def run(membership_id: str, verbose: bool) -> int:
     from rschecker_utils import usd_amount
 
     client = WhopAPIClient(api_key, base_url, company_id)
+    _OPEN_CLIENTS.append(client)
     enable_enrichment = bool(wh.get("enable_enrichment", True))
 
     print(f"Membership ID: {membership_id}")
@@ -272,7 +286,7 @@ def main():
         print("ERROR: Provide --membership-id or --discord-id", file=sys.stderr)
         return 1
 
-    return asyncio.run(run(mid, args.verbose))
+    return asyncio.run(_run_closing(run(mid, args.verbose)))
 
 
 if __name__ == "__main__":
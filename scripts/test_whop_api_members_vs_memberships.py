@@ -46,6 +46,19 @@ def load_config() -> dict:
     return cfg
 
 
+# Whop clients opened during the run; _run_closing() closes their pooled sessions on exit.
+_OPEN_CLIENTS: list = []
+
+
+async def _run_closing(coro):
+    """Await the script's entry coroutine, then close every Whop client it opened."""
+    try:
+        return await coro
+    finally:
+        while _OPEN_CLIENTS:
+            await _OPEN_CLIENTS.pop().close()
+
+
 async def main():
     cfg = load_config()
     wh = cfg.get("whop_api") or {}
@@ -58,6 +71,7 @@ async def main():
         return 1
 
     client = WhopAPIClient(api_key, base_url, company_id)
+    _OPEN_CLIENTS.append(client)
 
     # Feb 2-9, 2026 (UTC)
     start_d = date(2026, 2, 2)
@@ -162,4 +176,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main()))
+    sys.exit(asyncio.run(_run_closing(main())))
@@ -0,0 +1,220 @@
+"""Append-only segmented JSONL log for raw Whop webhook payloads.
+
+Each webhook is one line appended to the newest segment file
+(`<prefix>.000001.jsonl`, `<prefix>.000002.jsonl`, ...). When a segment passes
+`max_segment_bytes` a new one is started and the oldest segments beyond
+`max_segments` are deleted, so the log is a bounded ring and an append is O(1).
+
+Record shape (one JSON object per line):
+  {"ts": "<iso utc>", "event_type": "<type>", "headers": {...}, "payload": {...}}
+
+CLI:
+  py -3 -m shared.whop_webhook_raw_log RSCheckerbot/whop_webhook_raw --tail 20
+  py -3 -m shared.whop_webhook_raw_log RSCheckerbot/whop_webhook_raw --type membership.activated --since 2026-01-01
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_PREFIX = "whop_webhook_raw"
+DEFAULT_MAX_SEGMENT_BYTES = 4 * 1024 * 1024
+DEFAULT_MAX_SEGMENTS = 8
+
+
+def webhook_event_type(payload: Any) -> str:
+    if not isinstance(payload, dict):
+        return ""
+    for k in ("type", "event_type", "event", "action"):
+        v = str(payload.get(k) or "").strip()
+        if v:
+            return v
+    return ""
+
+
+def _parse_ts(raw: Any) -> Optional[datetime]:
+    s = str(raw or "").strip()
+    if not s:
+        return None
+    if s.endswith("Z"):
+        s = s[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+class WhopWebhookRawLog:
+    """Bounded ring of JSONL segment files. Thread-safe for appends within one process."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        prefix: str = DEFAULT_PREFIX,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+        max_segments: int = DEFAULT_MAX_SEGMENTS,
+    ) -> None:
+        self.directory = Path(directory)
+        self.prefix = str(prefix or DEFAULT_PREFIX)
+        self.max_segment_bytes = max(4096, int(max_segment_bytes or DEFAULT_MAX_SEGMENT_BYTES))
+        self.max_segments = max(1, int(max_segments or DEFAULT_MAX_SEGMENTS))
+        self._seg_re = re.compile(rf"^{re.escape(self.prefix)}\.(\d+)\.jsonl$")
+        self._lock = threading.Lock()
+        self._cur_seq: int = 0
+        self._cur_size: int = 0
+
+    # -------------------------
+    # Segments
+    # -------------------------
+    def _segment_path(self, seq: int) -> Path:
+        return self.directory / f"{self.prefix}.{int(seq):06d}.jsonl"
+
+    def segments(self) -> List[Path]:
+        """Segment files, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        found = []
+        for p in self.directory.iterdir():
+            m = self._seg_re.match(p.name)
+            if m:
+                found.append((int(m.group(1)), p))
+        return [p for _seq, p in sorted(found)]
+
+    def _open_current(self) -> None:
+        if self._cur_seq:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segs = self.segments()
+        if segs:
+            last = segs[-1]
+            self._cur_seq = int(self._seg_re.match(last.name).group(1))  # type: ignore[union-attr]
+            self._cur_size = last.stat().st_size
+        else:
+            self._cur_seq = 1
+            self._cur_size = 0
+
+    def _rotate(self) -> None:
+        self._cur_seq += 1
+        self._cur_size = 0
+        segs = self.segments()
+        # The new (empty) segment counts toward the cap once it is written.
+        excess = len(segs) + 1 - self.max_segments
+        for p in segs[: max(0, excess)]:
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+    # -------------------------
+    # Write
+    # -------------------------
+    def append(self, payload: Any, headers: Optional[Dict[str, Any]] = None, *, ts: str = "") -> Dict[str, Any]:
+        record = {
+            "ts": ts or datetime.now(timezone.utc).isoformat(),
+            "event_type": webhook_event_type(payload),
+            "headers": dict(headers) if headers else {},
+            "payload": payload,
+        }
+        line = (json.dumps(record, ensure_ascii=True) + "\n").encode("utf-8")
+        with self._lock:
+            self._open_current()
+            if self._cur_size and self._cur_size + len(line) > self.max_segment_bytes:
+                self._rotate()
+            with open(self._segment_path(self._cur_seq), "ab") as f:
+                f.write(line)
+            self._cur_size += len(line)
+        return record
+
+    # -------------------------
+    # Read
+    # -------------------------
+    def iter_records(
+        self,
+        *,
+        event_type: str = "",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        newest_first: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield records matching an event type (exact or prefix with trailing '*') and time range."""
+        et = str(event_type or "").strip()
+        et_prefix = et[:-1] if et.endswith("*") else ""
+        segs = self.segments()
+        if newest_first:
+            segs = list(reversed(segs))
+        for seg in segs:
+            try:
+                lines = seg.read_text(encoding="utf-8", errors="replace").splitlines()
+            except FileNotFoundError:
+                continue
+            if newest_first:
+                lines.reverse()
+            for ln in lines:
+                if not ln.strip():
+                    continue
+                try:
+                    rec = json.loads(ln)
+                except Exception:
+                    continue
+                if not isinstance(rec, dict):
+                    continue
+                if et:
+                    rt = str(rec.get("event_type") or webhook_event_type(rec.get("payload")))
+                    if (et_prefix and not rt.startswith(et_prefix)) or (not et_prefix and rt != et):
+                        continue
+                if since or until:
+                    dt = _parse_ts(rec.get("ts"))
+                    if dt is None or (since and dt < since) or (until and dt > until):
+                        continue
+                yield rec
+
+    def tail(self, n: int = 20, **filters: Any) -> List[Dict[str, Any]]:
+        """Last `n` matching records, oldest first."""
+        out: List[Dict[str, Any]] = []
+        for rec in self.iter_records(newest_first=True, **filters):
+            out.append(rec)
+            if len(out) >= max(1, int(n)):
+                break
+        out.reverse()
+        return out
+
+
+def _main() -> int:
+    ap = argparse.ArgumentParser(description="Tail/filter the segmented Whop raw webhook log.")
+    ap.add_argument("directory", help="Segment directory (e.g. RSCheckerbot/whop_webhook_raw)")
+    ap.add_argument("--prefix", default=DEFAULT_PREFIX)
+    ap.add_argument("--tail", type=int, default=20, help="How many records to print (default 20)")
+    ap.add_argument("--type", default="", help="Event type, exact or prefix ending in '*'")
+    ap.add_argument("--since", default="", help="ISO time lower bound (UTC if no offset)")
+    ap.add_argument("--until", default="", help="ISO time upper bound (UTC if no offset)")
+    ap.add_argument("--full", action="store_true", help="Print whole records (default: one summary line each)")
+    args = ap.parse_args()
+
+    log = WhopWebhookRawLog(Path(args.directory), prefix=args.prefix)
+    recs = log.tail(
+        args.tail,
+        event_type=args.type,
+        since=_parse_ts(args.since),
+        until=_parse_ts(args.until),
+    )
+    for rec in recs:
+        if args.full:
+            print(json.dumps(rec, ensure_ascii=False, indent=2))
+            continue
+        p = rec.get("payload") if isinstance(rec.get("payload"), dict) else {}
+        data = p.get("data") if isinstance(p.get("data"), dict) else {}
+        print(f"{rec.get('ts')}  {rec.get('event_type') or '-':<32} id={p.get('id') or '-'} data.id={data.get('id') or '-'}")
+    print(f"[{len(recs)} record(s); segments: {len(log.segments())}]")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
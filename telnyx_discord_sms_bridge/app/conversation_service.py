@@ -63,20 +63,17 @@ class ConversationService:
         conv_cfg = self.config.settings.get("conversations", {})
         max_lines = int(conv_cfg.get("max_lines", 40))
 
-        existing = self.store.get_thread(key)
-        if not existing:
-            self.store.upsert_thread(
-                key,
-                {
-                    "our_line": our,
-                    "remote_party": remote,
-                    "display_name": None,
-                    "channel_id": self.config.channel_id_for_line(our),
-                    "message_id": None,
-                    "lines": [],
-                },
-            )
-
+        self.store.ensure_thread(
+            key,
+            {
+                "our_line": our,
+                "remote_party": remote,
+                "display_name": None,
+                "channel_id": self.config.channel_id_for_line(our),
+                "message_id": None,
+                "lines": [],
+            },
+        )
         self.store.append_line(key, direction=direction, text=text, max_lines=max_lines)
         await self._sync_discord_message(our_line=our, remote_party=remote)
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import logging
+import sqlite3
 import threading
 from datetime import datetime, timezone
 from pathlib import Path
@@ -8,6 +10,16 @@ from typing import Any
 
 from app.phone import normalize_e164
 
+log = logging.getLogger("conversation_store")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
 
 def thread_key(*, our_line: str, remote_party: str) -> str:
     return f"{normalize_e164(our_line)}|{normalize_e164(remote_party)}"
@@ -20,33 +32,64 @@ def digits_key(key: str) -> str:
 
 
 class ConversationStore:
-    def __init__(self, path: Path):
+    """Threads live in memory; a background writer flushes changed threads to SQLite.
+
+    Reads and writes only touch the in-memory dict (one short lock, no I/O), so the cost of a
+    message does not depend on how many threads exist and nothing blocks the event loop.
+    Dirty threads are upserted in one transaction every `flush_interval_s`, and on `close()`.
+    A legacy `conversations.json` next to the database is imported once on first open.
+
+    Safe to share between the FastAPI loop and the Discord bot thread.
+    """
+
+    def __init__(self, path: Path, *, flush_interval_s: float = 1.0):
         self.path = path
+        self.flush_interval_s = max(0.05, float(flush_interval_s))
         self._lock = threading.Lock()
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.path.exists():
-            self._write({"threads": {}, "updated_at": _iso_now()})
+        self._write_lock = threading.Lock()
+        self._threads: dict[str, dict[str, Any]] = {}
+        self._dirty: set[str] = set()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
 
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._load()
+
+        self._writer = threading.Thread(target=self._writer_loop, name="conversation-store-writer", daemon=True)
+        self._writer.start()
+
+    # -------------------------
+    # Reads / writes (memory only)
+    # -------------------------
     def list_threads(self) -> dict[str, dict[str, Any]]:
-        data = self._read()
-        threads = data.get("threads", {})
-        return {k: dict(v) for k, v in threads.items() if isinstance(v, dict)}
+        with self._lock:
+            return {k: _copy_thread(v) for k, v in self._threads.items()}
 
     def get_thread(self, key: str) -> dict[str, Any] | None:
-        data = self._read()
-        thread = data.get("threads", {}).get(key)
-        return dict(thread) if isinstance(thread, dict) else None
+        with self._lock:
+            thread = self._threads.get(key)
+            return _copy_thread(thread) if thread is not None else None
+
+    def ensure_thread(self, key: str, defaults: dict[str, Any]) -> dict[str, Any]:
+        """Create the thread from `defaults` if it does not exist yet; return it either way."""
+        with self._lock:
+            current = self._threads.get(key)
+            if current is None:
+                current = dict(defaults)
+                self._threads[key] = current
+                self._mark_dirty(key)
+            return _copy_thread(current)
 
     def upsert_thread(self, key: str, patch: dict[str, Any]) -> dict[str, Any]:
         with self._lock:
-            data = self._read()
-            threads = data.setdefault("threads", {})
-            current = dict(threads.get(key) or {})
+            current = self._threads.setdefault(key, {})
             current.update(patch)
-            threads[key] = current
-            data["updated_at"] = _iso_now()
-            self._write(data)
-            return dict(current)
+            self._mark_dirty(key)
+            return _copy_thread(current)
 
     def append_line(
         self,
@@ -57,9 +100,7 @@ class ConversationStore:
         max_lines: int,
     ) -> dict[str, Any]:
         with self._lock:
-            data = self._read()
-            threads = data.setdefault("threads", {})
-            current = dict(threads.get(key) or {})
+            current = self._threads.setdefault(key, {})
             lines = list(current.get("lines") or [])
             normalized_text = str(text or "")
             if lines:
@@ -68,7 +109,7 @@ class ConversationStore:
                     str(last.get("direction") or "") == direction
                     and str(last.get("text") or "") == normalized_text
                 ):
-                    return dict(current)
+                    return _copy_thread(current)
             lines.append(
                 {
                     "direction": direction,
@@ -79,21 +120,100 @@ class ConversationStore:
             if max_lines > 0 and len(lines) > max_lines:
                 lines = lines[-max_lines:]
             current["lines"] = lines
-            threads[key] = current
-            data["updated_at"] = _iso_now()
-            self._write(data)
-            return dict(current)
-
-    def _read(self) -> dict[str, Any]:
-        with self.path.open("r", encoding="utf-8") as f:
-            raw = json.load(f)
-        return raw if isinstance(raw, dict) else {"threads": {}}
-
-    def _write(self, data: dict[str, Any]) -> None:
-        tmp = self.path.with_suffix(".json.tmp")
-        with tmp.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        tmp.replace(self.path)
+            self._mark_dirty(key)
+            return _copy_thread(current)
+
+    # -------------------------
+    # Persistence
+    # -------------------------
+    def flush(self) -> int:
+        """Write every changed thread now. Returns the number of threads written."""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return 0
+                now = _iso_now()
+                rows = [
+                    (key, json.dumps(self._threads[key], ensure_ascii=False), now)
+                    for key in self._dirty
+                    if key in self._threads
+                ]
+                self._dirty.clear()
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO threads (key, data, updated_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                        rows,
+                    )
+            except Exception:
+                # Keep the rows dirty so the next flush retries them.
+                with self._lock:
+                    self._dirty.update(key for key, _data, _at in rows)
+                raise
+            return len(rows)
+
+    def close(self) -> None:
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._wake.set()
+        self._writer.join(timeout=10)
+        self.flush()
+        with self._write_lock:
+            self._conn.close()
+
+    def _mark_dirty(self, key: str) -> None:
+        self._dirty.add(key)
+        self._wake.set()
+
+    def _writer_loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            # Batch: let a burst of messages land before writing.
+            self._stop.wait(self.flush_interval_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                log.exception("event=conversation_store_flush_failed path=%s", self.path)
+
+    def _load(self) -> None:
+        for key, data in self._conn.execute("SELECT key, data FROM threads"):
+            try:
+                thread = json.loads(data)
+            except ValueError:
+                continue
+            if isinstance(thread, dict):
+                self._threads[str(key)] = thread
+        if not self._threads:
+            self._import_legacy_json()
+
+    def _import_legacy_json(self) -> None:
+        legacy = self.path.with_suffix(".json")
+        if legacy == self.path or not legacy.exists():
+            return
+        try:
+            with legacy.open("r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            log.exception("event=conversation_store_legacy_import_failed path=%s", legacy)
+            return
+        threads = raw.get("threads", {}) if isinstance(raw, dict) else {}
+        for key, thread in threads.items():
+            if isinstance(thread, dict):
+                self._threads[str(key)] = dict(thread)
+                self._dirty.add(str(key))
+        self.flush()
+        legacy.replace(legacy.with_suffix(".json.migrated"))
+        log.info("event=conversation_store_legacy_imported threads=%s path=%s", len(self._threads), legacy)
+
+
+def _copy_thread(thread: dict[str, Any]) -> dict[str, Any]:
+    out = dict(thread)
+    if isinstance(out.get("lines"), list):
+        out["lines"] = [dict(line) if isinstance(line, dict) else line for line in out["lines"]]
+    return out
 
 
 def _iso_now() -> str:
@@ -28,7 +28,7 @@ async def lifespan(_app: FastAPI):
     )
     await runtime.start_discord_bot()
     yield
-    await runtime.stop_discord_bot()
+    await runtime.close()
 
 
 app = FastAPI(title="Telnyx Discord SMS Bridge", lifespan=lifespan)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
 
 from app.config import AppConfig
 from app.conversation_service import ConversationService
@@ -11,9 +11,6 @@ from app.discord_bot_runner import DiscordBotRunner
 from app.discord_client import DiscordClient
 from app.telnyx_client import TelnyxClient
 
-if TYPE_CHECKING:
-    import asyncio
-
 
 @dataclass
 class BridgeRuntime:
@@ -28,8 +25,8 @@ class BridgeRuntime:
     def build(cls) -> "BridgeRuntime":
         config = AppConfig.load()
         conv_cfg = config.settings.get("conversations", {})
-        data_file = Path(str(conv_cfg.get("data_file", "data/conversations.json")))
-        store = ConversationStore(data_file)
+        data_file = Path(str(conv_cfg.get("data_file", "data/conversations.sqlite3")))
+        store = ConversationStore(data_file, flush_interval_s=float(conv_cfg.get("flush_interval_s", 1.0)))
         conversations = ConversationService(config=config, store=store)
         discord_bot = None
         if config.discord_bot_token:
@@ -51,3 +48,7 @@ class BridgeRuntime:
     async def stop_discord_bot(self) -> None:
         if self.discord_bot:
             await self.discord_bot.close()
+
+    async def close(self) -> None:
+        await self.stop_discord_bot()
+        await asyncio.to_thread(self.conversations.store.close)
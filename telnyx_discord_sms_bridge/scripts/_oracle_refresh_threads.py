@@ -21,7 +21,7 @@ async def main() -> int:
     await runtime.discord_bot.wait_ready()
     count = await runtime.conversations.refresh_all_threads()
     print(f"Refreshed {count} thread(s).")
-    await runtime.discord_bot.close()
+    await runtime.close()
     return 0
 
 
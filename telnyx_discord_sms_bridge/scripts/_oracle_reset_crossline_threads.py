@@ -1,24 +1,26 @@
 #!/usr/bin/env python3
-"""Clear cross-line thread state after Discord cards were deleted (run on Oracle)."""
+"""Clear cross-line thread state after Discord cards were deleted (run on Oracle, bridge stopped)."""
 from __future__ import annotations
 
-import json
+import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.conversation_store import ConversationStore  # noqa: E402
+
 KEYS = ("+15419202540|+18334882119", "+18334882119|+15419202540")
-PATH = Path("data/conversations.json")
+PATH = Path("data/conversations.sqlite3")
 
 
 def main() -> None:
-    data = json.loads(PATH.read_text(encoding="utf-8")) if PATH.exists() else {"threads": {}}
-    threads = data.setdefault("threads", {})
-    for key in KEYS:
-        entry = dict(threads.get(key) or {})
-        entry["message_id"] = None
-        entry["lines"] = []
-        threads[key] = entry
-    PATH.parent.mkdir(parents=True, exist_ok=True)
-    PATH.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    store = ConversationStore(PATH)
+    try:
+        for key in KEYS:
+            store.upsert_thread(key, {"message_id": None, "lines": []})
+    finally:
+        store.close()
     print(f"Reset {len(KEYS)} thread(s) in {PATH}")
 
 
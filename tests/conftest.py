@@ -0,0 +1,21 @@
+"""
+Shared pytest helpers for the per-bot storage modules.
+
+Each bot folder is a flat script directory (not a package), so tests import a module by
+putting its bot folder first on sys.path, the same way the bots' own scripts do.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def add_bot_dir(name: str) -> Path:
+    """Put `<repo>/<name>` first on sys.path and return it."""
+    p = REPO_ROOT / name
+    if str(p) not in sys.path:
+        sys.path.insert(0, str(p))
+    return p
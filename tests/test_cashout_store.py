@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from conftest import add_bot_dir
+
+add_bot_dir("RSCashoutBot")
+
+from cashout_store import JsonStore, TicketStore  # noqa: E402
+
+
+def _disk(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_write_during_inflight_save_is_flushed(tmp_path):
+    path = tmp_path / "store.json"
+
+    async def run():
+        store = JsonStore(path, {"n": 0}, flush_delay_ms=0)
+        started = asyncio.Event()
+        release = asyncio.Event()
+        real_replace = store._replace_file
+
+        def slow_replace(text):
+            loop.call_soon_threadsafe(started.set)
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            real_replace(text)
+
+        loop = asyncio.get_running_loop()
+        store._replace_file = slow_replace
+        await store.write({"n": 1})
+        await started.wait()
+        # Lands while the first save is still in to_thread.
+        await store.write({"n": 2})
+        store._replace_file = real_replace
+        release.set()
+        await store._flush_task
+        return store
+
+    store = asyncio.run(run())
+    assert _disk(path) == {"n": 2}
+    assert store._dirty is False
+
+
+def test_close_flush_and_background_flush_do_not_collide(tmp_path):
+    path = tmp_path / "store.json"
+
+    async def run():
+        store = JsonStore(path, {"n": 0}, flush_delay_ms=0)
+        for i in range(20):
+            await store.write({"n": i})
+            await asyncio.gather(store.flush(), store.flush())
+        await store.write({"n": 99})
+        await asyncio.gather(store.flush(), store._flush_task)
+
+    asyncio.run(run())
+    assert _disk(path) == {"n": 99}
+    assert not path.with_name("store.json.tmp").exists()
+
+
+def test_ticket_store_open_index(tmp_path):
+    path = tmp_path / "tickets.json"
+
+    async def run():
+        store = TicketStore(path, flush_delay_ms=0)
+        base = {"guild_id": 1, "owner_id": 7, "is_open": True}
+        await store.upsert_ticket(300, {**base, "ticket_type": "request_submit"})
+        await store.upsert_ticket(200, {**base, "ticket_type": "request_custom_quote"})
+        await store.upsert_ticket(100, {**base, "ticket_type": "other"})
+        # request_submit and request_custom_quote share one open-ticket slot.
+        assert await store.count_open_tickets(1, 7, "request_submit") == 2
+        found = await store.find_open_ticket(1, 7, "request_submit")
+        assert found["channel_id"] == 200
+        await store.upsert_ticket(200, {**base, "ticket_type": "request_custom_quote", "is_open": False})
+        assert (await store.find_open_ticket(1, 7, "request_submit"))["channel_id"] == 300
+        await store.delete_ticket(300)
+        assert await store.find_open_ticket(1, 7, "request_submit") is None
+        await store.flush()
+
+    asyncio.run(run())
+    reopened = TicketStore(path)
+    assert set(_disk(path)["tickets"]) == {"100", "200"}
+    assert asyncio.run(reopened.count_open_tickets(1, 7, "other")) == 1
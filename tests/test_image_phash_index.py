@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import io
+import random
+
+import pytest
+
+from conftest import add_bot_dir
+
+PIL_Image = pytest.importorskip("PIL.Image")
+add_bot_dir("RSuccessBot")
+
+from image_phash_index import ImageHashIndex, _BKTree, compute_image_hashes  # noqa: E402
+
+
+def test_bk_tree_search_matches_brute_force():
+    rng = random.Random(7)
+    hashes = [rng.getrandbits(64) for _ in range(500)]
+    # A few near neighbours of the first hash.
+    hashes += [hashes[0] ^ (1 << b) for b in (3, 17, 40)]
+    tree = _BKTree()
+    for i, h in enumerate(hashes):
+        tree.add(h, i)
+    for probe in (hashes[0], hashes[123], rng.getrandbits(64)):
+        for max_d in (0, 2, 6):
+            expected = sorted(((h ^ probe).bit_count(), i) for i, h in enumerate(hashes) if (h ^ probe).bit_count() <= max_d)
+            assert sorted(tree.search(probe, max_d)) == expected
+
+
+def test_find_returns_closest_record_within_distance(tmp_path):
+    idx = ImageHashIndex(tmp_path / "hashes.bin", max_distance=4)
+    base = 0xF0F0_F0F0_0F0F_0F0F
+    idx.add(base ^ 0b111, user_id=1, created_unix=100)
+    idx.add(base ^ 0b1, user_id=2, created_unix=200)
+    assert idx.find(base) == (1, 2, 200)
+    assert idx.find(base ^ 0xFFFF) is None
+
+
+def test_records_survive_reload_and_torn_row_is_dropped(tmp_path):
+    path = tmp_path / "hashes.bin"
+    idx = ImageHashIndex(path)
+    idx.add(11, user_id=111, created_unix=1)
+    idx.add(22, user_id=222, created_unix=2)
+    size = path.stat().st_size
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")  # crash mid-append
+    reloaded = ImageHashIndex(path, max_distance=0)
+    assert len(reloaded) == 2
+    assert reloaded.find(22) == (0, 222, 2)
+    assert path.stat().st_size == size
+
+
+def test_foreign_file_is_rejected(tmp_path):
+    path = tmp_path / "hashes.bin"
+    path.write_bytes(b"not an index")
+    with pytest.raises(ValueError):
+        ImageHashIndex(path)
+
+
+def _png(img) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_dhash_is_stable_under_resize():
+    img = PIL_Image.new("RGB", (200, 120))
+    for x in range(200):
+        for y in range(120):
+            img.putpixel((x, y), ((x * 3) % 256, (y * 5) % 256, ((x + y) * 2) % 256))
+    legacy_a, dh_a = compute_image_hashes(_png(img))
+    legacy_b, dh_b = compute_image_hashes(_png(img.resize((400, 240))))
+    assert len(legacy_a) == 64
+    assert (dh_a ^ dh_b).bit_count() <= 4
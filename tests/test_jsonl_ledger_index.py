@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import add_bot_dir
+
+pytest.importorskip("discord")
+add_bot_dir("RSCheckerbot")
+
+from rschecker_utils import JsonlLedgerIndex  # noqa: E402
+
+
+def _append(path, *events: dict) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        for ev in events:
+            f.write(json.dumps(ev) + "\n")
+
+
+def _ev(i: int, day: int, mid: str = "") -> dict:
+    return {"event_id": f"e{i}", "occurred_at": f"2026-01-{day:02d}T12:00:00Z", "membership_id": mid}
+
+
+def _utc(day: int, hour: int = 0) -> datetime:
+    return datetime(2026, 1, day, hour, tzinfo=timezone.utc)
+
+
+def test_records_for_and_between_survive_reload(tmp_path):
+    ledger = tmp_path / "whop_events.jsonl"
+    _append(ledger, _ev(1, 1, "mem_a"), _ev(2, 1, "mem_b"), _ev(3, 2, "mem_a"))
+    idx = JsonlLedgerIndex(ledger)
+    assert idx.refresh() == 3
+    _append(ledger, _ev(4, 3, "mem_a"))
+
+    again = JsonlLedgerIndex(ledger)
+    assert [r["event_id"] for r in again.records_for("mem_a")] == ["e1", "e3", "e4"]
+    assert [r["event_id"] for r in again.records_between(_utc(1), _utc(2, 23))] == ["e1", "e2", "e3"]
+    assert again.records_for("mem_missing") == []
+
+
+def test_late_event_adds_a_run_instead_of_stretching_the_day(tmp_path):
+    ledger = tmp_path / "whop_events.jsonl"
+    _append(ledger, *(_ev(i, 1) for i in range(5)))
+    _append(ledger, *(_ev(10 + i, 2) for i in range(50)))
+    _append(ledger, _ev(99, 1))  # replayed late
+    idx = JsonlLedgerIndex(ledger)
+    idx.refresh()
+    assert len(idx._days["2026-01-01"]) == 2
+    got = idx.records_between(_utc(1), _utc(1, 23))
+    assert [r["event_id"] for r in got] == ["e0", "e1", "e2", "e3", "e4", "e99"]
+
+
+def test_sidecar_is_compacted(tmp_path):
+    ledger = tmp_path / "whop_events.jsonl"
+    idx = JsonlLedgerIndex(ledger, compact_lines=4)
+    for i in range(10):
+        _append(ledger, _ev(i, 1 + i % 3, f"mem_{i % 2}"))
+        idx.refresh()
+    assert len(idx.index_path.read_bytes().splitlines()) <= 1 + 4
+    again = JsonlLedgerIndex(ledger, compact_lines=4)
+    assert [r["event_id"] for r in again.records_for("mem_1")] == ["e1", "e3", "e5", "e7", "e9"]
+
+
+def test_torn_sidecar_line_and_shrunk_ledger(tmp_path):
+    ledger = tmp_path / "whop_events.jsonl"
+    _append(ledger, _ev(1, 1, "mem_a"))
+    JsonlLedgerIndex(ledger).refresh()
+    _append(ledger, _ev(2, 1, "mem_a"))
+    with open(ledger.with_name(ledger.name + ".idx.jsonl"), "a", encoding="utf-8") as f:
+        f.write('{"size": 9')
+    assert len(JsonlLedgerIndex(ledger).records_for("mem_a")) == 2
+
+    ledger.write_text(json.dumps(_ev(3, 5, "mem_c")) + "\n", encoding="utf-8")
+    idx = JsonlLedgerIndex(ledger)
+    assert idx.records_for("mem_a") == []
+    assert [r["event_id"] for r in idx.records_for("mem_c")] == ["e3"]
+
+
+def test_concurrent_refreshes_index_each_line_once(tmp_path):
+    ledger = tmp_path / "whop_events.jsonl"
+    _append(ledger, *(_ev(i, 1, "mem_a") for i in range(200)))
+    idx = JsonlLedgerIndex(ledger)
+    threads = [threading.Thread(target=idx.refresh) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(JsonlLedgerIndex(ledger).records_for("mem_a")) == 200
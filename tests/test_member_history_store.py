@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from conftest import add_bot_dir
+
+add_bot_dir("RSCheckerbot")
+
+from member_history_store import MemberHistoryStore, get_member_history_store, max_events_from_config  # noqa: E402
+
+
+def _store(tmp_path, **kw) -> MemberHistoryStore:
+    return MemberHistoryStore(tmp_path / "mh.sqlite3", legacy_json_path=tmp_path / "member_history.json", **kw)
+
+
+def test_legacy_json_migrates_once(tmp_path):
+    legacy = {
+        "111111111111111111": {"join_count": 2, "events": [{"ts": 1, "kind": "join"}, {"ts": 2, "kind": "leave"}]},
+        "whop_users": {"user_a": {"whop": {"username": "a"}}},
+    }
+    (tmp_path / "member_history.json").write_text(json.dumps(legacy), encoding="utf-8")
+    st = _store(tmp_path)
+    rec = st.get("111111111111111111")
+    assert rec["join_count"] == 2
+    assert [e["kind"] for e in rec["events"]] == ["join", "leave"]
+    assert st.get("whop_users") == {"user_a": {"whop": {"username": "a"}}}
+    st.close()
+
+    # Marker is set: an edited legacy file is not re-imported.
+    (tmp_path / "member_history.json").write_text(json.dumps({"222222222222222222": {}}), encoding="utf-8")
+    st2 = _store(tmp_path)
+    assert st2.get("222222222222222222") is None
+    assert st2.stats()["members"] == 2
+    st2.close()
+
+
+def test_put_strips_events_and_bumps_version(tmp_path):
+    st = _store(tmp_path)
+    st.put("111111111111111111", {"join_count": 1, "events": [{"ts": 1, "kind": "join"}]})
+    assert st.get("111111111111111111")["events"] == []
+    v1 = st.versions(["111111111111111111"])["111111111111111111"]
+    st.put("111111111111111111", {"join_count": 2})
+    assert st.versions(["111111111111111111"])["111111111111111111"] == v1 + 1
+    st.close()
+
+
+def test_append_event_caps_rows_per_member(tmp_path):
+    st = _store(tmp_path, max_events=3)
+    st.put("111111111111111111", {})
+    st.put("222222222222222222", {})
+    for i in range(10):
+        st.append_event("111111111111111111", {"ts": i, "kind": "role_change"})
+    st.append_event("222222222222222222", {"ts": 99, "kind": "join"})
+    assert [e["ts"] for e in st.get("111111111111111111")["events"]] == [7, 8, 9]
+    # The cap is enforced on disk, not just on read, and is per member.
+    assert st.stats()["events"] == 4
+    assert [e["ts"] for e in st.get("222222222222222222")["events"]] == [99]
+    st.close()
+
+
+def test_save_all_writes_only_changed_rows(tmp_path):
+    st = _store(tmp_path)
+    st.put("a", {"x": 1})
+    st.put("b", {"x": 1})
+    db = st.load_all()
+    assert st.save_all(db) == 0
+    db["b"] = {"x": 2}
+    assert st.save_all({"b": db["b"]}) == 1
+    # Keys missing from the dict are left alone.
+    assert st.get("a") == {"x": 1}
+    assert st.get("b") == {"x": 2}
+    st.close()
+
+
+def test_get_cached_reparses_only_on_version_change(tmp_path):
+    st = _store(tmp_path)
+    st.put("whop_users", {"u1": {}})
+    first = st.get_cached(["whop_users", "whop_membership_index"])
+    assert first == {"whop_users": {"u1": {}}, "whop_membership_index": {}}
+    again = st.get_cached(["whop_users"])
+    assert again["whop_users"] is first["whop_users"]
+    st.put("whop_users", {"u1": {}, "u2": {}})
+    assert set(st.get_cached(["whop_users"])["whop_users"]) == {"u1", "u2"}
+    st.close()
+
+
+def test_update_fields_patches_summary_and_leaves_other_fields(tmp_path):
+    st = _store(tmp_path, max_events=5)
+    did = "111111111111111111"
+    st.put(did, {"join_count": 1, "whop": {"last_summary": {"status": "active"}}})
+    st.update_fields(did, {"join_count": 2, "access": {"ever_had_access_role": True}}, event={"ts": 5, "kind": "join"})
+    rec = st.get(did)
+    assert rec["join_count"] == 2
+    assert rec["access"] == {"ever_had_access_role": True}
+    assert rec["whop"] == {"last_summary": {"status": "active"}}
+    assert st.last_event(did) == {"ts": 5, "kind": "join"}
+    assert "events" not in st.get(did, with_events=False)
+
+    # A member with no row yet gets one built from the fields.
+    st.update_fields("222222222222222222", {"last_leave_ts": 9}, event={"ts": 9, "kind": "leave"})
+    assert st.get("222222222222222222")["last_leave_ts"] == 9
+    assert st.last_event("333333333333333333") is None
+    st.close()
+
+
+def test_store_singleton_rejects_mismatched_max_events(tmp_path):
+    db = tmp_path / "shared.sqlite3"
+    first = get_member_history_store(db, legacy_json_path=None)
+    assert get_member_history_store(db, legacy_json_path=None, max_events=7) is first
+    assert first.max_events == 7
+    assert get_member_history_store(db, legacy_json_path=None) is first
+    with pytest.raises(ValueError):
+        get_member_history_store(db, legacy_json_path=None, max_events=8)
+    first.close()
+
+
+def test_max_events_from_config():
+    assert max_events_from_config({"member_history": {"max_events_per_user": 12}}) == 12
+    assert max_events_from_config({}) == 50
+    assert max_events_from_config({"member_history": {"max_events_per_user": "x"}}) == 50
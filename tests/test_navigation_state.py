@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from conftest import add_bot_dir
+
+pytest.importorskip("discord")
+pytest.importorskip("aiohttp")
+add_bot_dir("catalog_nav_bot")
+
+from navigation_bot import NavigationState  # noqa: E402
+
+
+def _entry(store: str, reply_id: int, *, channel: int = 10, category: str = "shoes") -> dict:
+    return {
+        "category_slug": category,
+        "category_label": category.title(),
+        "store_slug": store,
+        "store_label": store.title(),
+        "source_channel_id": channel,
+        "source_message_id": 1000 + reply_id,
+        "source_jump_url": f"https://discord.com/channels/1/{channel}/{1000 + reply_id}",
+        "reply_channel_id": channel,
+        "reply_message_id": reply_id,
+    }
+
+
+def _disk(path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def test_write_through_before_start(tmp_path):
+    path = tmp_path / "state.json"
+
+    async def run():
+        st = NavigationState(path)
+        await st.upsert_entry(**_entry("nike", 1))
+        return st
+
+    st = asyncio.run(run())
+    assert "shoes" in _disk(path)["categories"]
+    assert st.writes == 2  # initial empty file + one mutation
+
+
+def test_write_behind_coalesces_a_burst(tmp_path):
+    path = tmp_path / "state.json"
+
+    async def run():
+        st = NavigationState(path, flush_interval_ms=50)
+        st.start()
+        writes_before = st.writes
+        for i in range(20):
+            await st.upsert_entry(**_entry(f"store{i}", i))
+        assert _disk(path)["categories"] == {}  # nothing written yet
+        await asyncio.sleep(0.15)
+        coalesced = st.writes - writes_before
+        await st.close()
+        return coalesced
+
+    coalesced = asyncio.run(run())
+    assert coalesced == 1
+    assert len(_disk(path)["categories"]["shoes"]["stores"]) == 20
+
+
+def test_close_flushes_pending_changes(tmp_path):
+    path = tmp_path / "state.json"
+
+    async def run():
+        st = NavigationState(path, flush_interval_ms=10_000)
+        st.start()
+        await st.set_main_catalog_message(10, 555)
+        await st.close()
+
+    asyncio.run(run())
+    assert _disk(path)["main_catalog_by_channel"] == {"10": "555"}
+
+
+def test_reply_index_by_channel_survives_reload_and_removal(tmp_path):
+    path = tmp_path / "state.json"
+
+    async def run():
+        st = NavigationState(path)
+        await st.upsert_entry(**_entry("nike", 1, channel=10))
+        await st.upsert_entry(**_entry("nike", 2, channel=10))
+        await st.upsert_entry(**_entry("adidas", 3, channel=10))
+        await st.upsert_entry(**_entry("nike", 4, channel=20))
+
+        reloaded = NavigationState(path)
+        in_10 = await reloaded.get_categories_for_channel(10)
+        assert set(in_10["shoes"]["reply_targets"]) == {"1", "2", "3"}
+
+        removed = await reloaded.remove_reply_targets_for_store(category_slug="shoes", store_slug="nike", channel_id=10)
+        assert sorted(removed) == [(10, 1), (10, 2)]
+        in_10 = await reloaded.get_categories_for_channel(10)
+        assert set(in_10["shoes"]["reply_targets"]) == {"3"}
+        in_20 = await reloaded.get_categories_for_channel(20)
+        assert set(in_20["shoes"]["reply_targets"]) == {"4"}
+
+        await reloaded.cleanup_missing_reply_targets("shoes", ["3"])
+        return _disk(path)
+
+    disk = asyncio.run(run())
+    assert set(disk["reply_index"]) == {"4"}
+    assert set(disk["categories"]["shoes"]["reply_targets"]) == {"4"}
+
+
+def test_corrupt_file_is_moved_aside(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text("{not json", encoding="utf-8")
+    NavigationState(path)
+    assert path.with_suffix(".corrupt.json").read_text(encoding="utf-8") == "{not json"
+    assert _disk(path)["categories"] == {}
+
+
+def test_failed_flush_is_retried_without_a_new_mutation(tmp_path):
+    path = tmp_path / "state.json"
+
+    async def run():
+        st = NavigationState(path, flush_interval_ms=10)
+        st.start()
+        real_write = st._write_file
+        failures = []
+
+        def flaky_write(text):
+            if not failures:
+                failures.append(text)
+                raise OSError("disk full")
+            real_write(text)
+
+        st._write_file = flaky_write
+        await st.set_main_catalog_message(10, 555)
+        await asyncio.sleep(1.3)  # first write fails, retry backs off ~1s
+        on_disk = _disk(path)["main_catalog_by_channel"]
+        await st.close()
+        return failures, on_disk
+
+    failures, on_disk = asyncio.run(run())
+    assert len(failures) == 1
+    assert on_disk == {"10": "555"}
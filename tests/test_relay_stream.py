@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from conftest import add_bot_dir
+
+aiohttp = pytest.importorskip("aiohttp")
+pytest.importorskip("discord")
+add_bot_dir("RSChannelRelay")
+
+from relay_bot import RelayBot, _CdnStream  # noqa: E402
+
+
+class _FakeContent:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    async def iter_chunked(self, n: int):
+        for i in range(0, len(self._data), n):
+            yield self._data[i : i + n]
+
+
+class _FakeResp:
+    def __init__(self, data: bytes) -> None:
+        self.content = _FakeContent(data)
+
+
+class _Sink:
+    def __init__(self) -> None:
+        self.buf = bytearray()
+
+    async def write(self, chunk: bytes) -> None:
+        self.buf.extend(chunk)
+
+
+def test_streamed_multipart_has_content_length():
+    data = b"x" * 200_000
+
+    async def _run() -> tuple[int | None, int]:
+        mp = aiohttp.MultipartWriter("form-data")
+        mp.append_json({"content": "hi"}).set_content_disposition("form-data", name="payload_json")
+        part = _CdnStream(_FakeResp(data), size=len(data), content_type="image/png")
+        mp.append_payload(part).set_content_disposition("form-data", name="files[0]", filename="a.png")
+        sink = _Sink()
+        await mp.write(sink)
+        return mp.size, len(sink.buf)
+
+    size, written = asyncio.run(_run())
+    # A known body size is what makes aiohttp send Content-Length instead of chunked encoding.
+    assert size is not None
+    assert size == written
+
+
+def test_route_gate_tracks_buckets_per_url():
+    bot = RelayBot.__new__(RelayBot)
+    bot._route_blocked_until = {}
+    bot._route_global_until = 0.0
+
+    assert bot._route_gate_update("a", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "2"}) is None
+    assert "a" in bot._route_blocked_until and "b" not in bot._route_blocked_until
+    bot._route_gate_update("a", 200, {"X-RateLimit-Remaining": "4", "X-RateLimit-Reset-After": "2"})
+    assert "a" not in bot._route_blocked_until
+
+    assert bot._route_gate_update("b", 429, {"Retry-After": "3"}) == 3.0
+    assert bot._route_global_until == 0.0
+    bot._route_gate_update("b", 429, {"Retry-After": "1", "X-RateLimit-Global": "true"})
+    assert bot._route_global_until > 0.0
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from conftest import add_bot_dir
+
+add_bot_dir("RSForwarder")
+
+from rs_fs_title_cache import BLOCKED_ERROR, RsFsTitleCache, StoreFetchGovernor  # noqa: E402
+
+
+def test_title_cache_keeps_titles_and_permanent_failures_only(tmp_path):
+    cache = RsFsTitleCache(tmp_path / "titles.sqlite3")
+    cache.put("Walmart", "123", "Widget", None)
+    cache.put("walmart", "404sku", "", "http 404")
+    cache.put("walmart", "gone", "", "http 410")
+    cache.put("walmart", "blocked", "", BLOCKED_ERROR)
+    cache.put("walmart", "slow", "", "timeout")
+    cache.put("walmart", "busy", "", "http 503")
+
+    assert cache.get("walmart", "123") == ("Widget", None)  # key is case-insensitive
+    assert cache.get("walmart", "404sku") == ("", "http 404")
+    assert cache.get("walmart", "gone") == ("", "http 410")
+    assert cache.get("walmart", "blocked") == ("", BLOCKED_ERROR)
+    assert cache.get("walmart", "slow") is None
+    assert cache.get("walmart", "busy") is None
+    assert cache.stats()["entries"] == 4
+    cache.close()
+
+
+def test_title_cache_expires_entries(tmp_path):
+    cache = RsFsTitleCache(tmp_path / "titles.sqlite3", ttl_s=0.05, blocked_ttl_s=0)
+    cache.put("target", "1", "Thing", None)
+    cache.put("target", "2", "", BLOCKED_ERROR)  # ttl 0: not stored
+    assert cache.get("target", "1") == ("Thing", None)
+    time.sleep(0.1)
+    assert cache.get("target", "1") is None
+    assert cache.get("target", "2") is None
+    cache.close()
+    # Expired rows are swept on open.
+    assert RsFsTitleCache(tmp_path / "titles.sqlite3").stats()["entries"] == 0
+
+
+def test_governor_caps_concurrency_per_store_and_total():
+    async def run():
+        gov = StoreFetchGovernor(total=3, per_store=2, min_interval_s=0.0)
+        active: dict = {}
+        peak: dict = {}
+
+        async def fetch(store: str) -> None:
+            async with gov.slot(store):
+                active[store] = active.get(store, 0) + 1
+                active["*"] = active.get("*", 0) + 1
+                for k in (store, "*"):
+                    peak[k] = max(peak.get(k, 0), active[k])
+                await asyncio.sleep(0.01)
+                active[store] -= 1
+                active["*"] -= 1
+
+        await asyncio.gather(*(fetch(s) for s in ["walmart"] * 6 + ["target"] * 6 + ["costco"] * 6))
+        return peak
+
+    peak = asyncio.run(run())
+    assert peak["walmart"] <= 2 and peak["target"] <= 2 and peak["costco"] <= 2
+    assert peak["*"] <= 3
+
+
+def test_governor_spaces_fetch_starts_and_honours_overrides_and_blocks():
+    async def run():
+        gov = StoreFetchGovernor(
+            total=8,
+            per_store=4,
+            min_interval_s=0.0,
+            blocked_backoff_s=0.1,
+            overrides={"walmart": {"concurrency": 1, "min_interval_s": 0.05}},
+        )
+        starts: list = []
+
+        async def fetch() -> None:
+            async with gov.slot("www.walmart.com"):
+                starts.append(time.monotonic())
+
+        await asyncio.gather(fetch(), fetch(), fetch())
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+
+        gov.blocked("target")
+        t0 = time.monotonic()
+        async with gov.slot("target"):
+            held = time.monotonic() - t0
+        return gaps, held
+
+    gaps, held = asyncio.run(run())
+    assert all(g >= 0.04 for g in gaps)
+    assert held >= 0.08
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+
+from conftest import add_bot_dir
+
+add_bot_dir("RSOnboarding")
+
+from ticket_store import TicketStore  # noqa: E402
+
+
+def _store(path, **kw) -> TicketStore:
+    # Long timers: the tests drive flush()/close() explicitly.
+    kw.setdefault("flush_interval_ms", 0)
+    kw.setdefault("compact_ops", 1000)
+    kw.setdefault("compact_seconds", 3600)
+    return TicketStore(path, **kw)
+
+
+def test_journal_replay_restores_puts_and_deletes(tmp_path):
+    path = tmp_path / "tickets.json"
+    st = _store(path)
+    st["1"] = {"channel_id": 10, "opened_at": 100.0}
+    st["2"] = {"channel_id": 20, "opened_at": 200.0}
+    del st["1"]
+    assert st.flush() == 3
+    assert not path.exists()  # not compacted yet: only the journal has the changes
+
+    # Simulate a crash (no close): a fresh store replays the journal.
+    again = _store(path)
+    assert dict(again) == {"2": {"channel_id": 20, "opened_at": 200.0}}
+    assert again.user_for_channel(20) == "2"
+    assert again.user_for_channel(10) is None
+    again.close()
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    path = tmp_path / "tickets.json"
+    journal = path.with_suffix(".journal.jsonl")
+    journal.write_text(
+        json.dumps({"op": "put", "uid": "1", "ticket": {"channel_id": 10, "opened_at": 1.0}}) + "\n" + '{"op": "put", "ui',
+        encoding="utf-8",
+    )
+    st = _store(path)
+    assert list(st) == ["1"]
+    st.close()
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = tmp_path / "tickets.json"
+    st = _store(path, compact_ops=2)
+    st["1"] = {"channel_id": 10, "opened_at": 1.0}
+    st["2"] = {"channel_id": 20, "opened_at": 2.0}
+    st.flush()
+    assert json.loads(path.read_text(encoding="utf-8")) == {
+        "1": {"channel_id": 10, "opened_at": 1.0},
+        "2": {"channel_id": 20, "opened_at": 2.0},
+    }
+    assert path.with_suffix(".journal.jsonl").read_text(encoding="utf-8") == ""
+    st.close()
+
+
+def test_close_writes_snapshot_and_reopen_matches(tmp_path):
+    path = tmp_path / "tickets.json"
+    st = _store(path)
+    st["1"] = {"channel_id": 10, "opened_at": 1.0}
+    st.close()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"1": {"channel_id": 10, "opened_at": 1.0}}
+    reopened = _store(path)
+    assert dict(reopened) == {"1": {"channel_id": 10, "opened_at": 1.0}}
+    reopened.close()
+
+
+def test_opened_before_and_channel_index_follow_updates(tmp_path):
+    st = _store(tmp_path / "tickets.json")
+    st["a"] = {"channel_id": 1, "opened_at": 30.0}
+    st["b"] = {"channel_id": 2, "opened_at": 10.0}
+    st["c"] = {"channel_id": 3}
+    assert st.opened_before(31.0) == ["b", "a"]
+    st["a"] = {"channel_id": 4, "opened_at": 5.0}
+    assert st.opened_before(20.0) == ["a", "b"]
+    assert st.user_for_channel(1) is None
+    assert st.user_for_channel(4) == "a"
+    del st["b"]
+    assert st.opened_before(100.0) == ["a"]
+    st.close()
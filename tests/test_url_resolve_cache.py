@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from conftest import add_bot_dir
+
+add_bot_dir("RSForwarder")
+
+from url_resolve_cache import UrlResolveCache  # noqa: E402
+
+
+def test_memory_then_disk_tier(tmp_path):
+    path = tmp_path / "resolve.sqlite3"
+    cache = UrlResolveCache(path)
+    cache.put("https://bit.ly/abc", "https://www.amazon.com/dp/B0", ["https://bit.ly/abc"], ok=True)
+    assert cache.get("https://bit.ly/abc") == ("https://www.amazon.com/dp/B0", ["https://bit.ly/abc"], True)
+    assert cache.counters["memory_hits"] == 1
+    cache.close()
+
+    # A fresh process reads the entry back from SQLite and promotes it to memory.
+    warm = UrlResolveCache(path)
+    assert warm.get("https://bit.ly/abc")[0] == "https://www.amazon.com/dp/B0"
+    assert warm.get("https://bit.ly/abc")[0] == "https://www.amazon.com/dp/B0"
+    assert (warm.counters["disk_hits"], warm.counters["memory_hits"]) == (1, 1)
+    warm.close()
+
+
+def test_lru_evicts_oldest_untouched_entry():
+    cache = UrlResolveCache(None, memory_entries=2)
+    cache.put("a", "https://x/a", ok=True)
+    cache.put("b", "https://x/b", ok=True)
+    cache.get("a")  # bump a
+    cache.put("c", "https://x/c", ok=True)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.counters["evictions"] == 1
+
+
+def test_host_ttl_suffix_match_and_negative_ttl():
+    cache = UrlResolveCache(None, ttl_s=100, negative_ttl_s=5, host_ttl_s={"www.amzn.to": 10})
+    assert cache.ttl_for("https://amzn.to/x", ok=True) == 10
+    assert cache.ttl_for("https://go.amzn.to/x", ok=True) == 10
+    assert cache.ttl_for("https://bit.ly/x", ok=True) == 100
+    assert cache.ttl_for("https://amzn.to/x", ok=False) == 5
+
+
+def test_expired_and_negative_entries(tmp_path):
+    cache = UrlResolveCache(tmp_path / "resolve.sqlite3", ttl_s=0.05, negative_ttl_s=60)
+    cache.put("https://dead.link/x", "https://dead.link/x", ok=False)
+    cache.put("https://bit.ly/y", "https://shop.example/y", ok=True)
+    assert cache.get("https://dead.link/x")[2] is False
+    assert cache.counters["negative_hits"] == 1
+    time.sleep(0.1)
+    assert not cache.contains("https://bit.ly/y")
+    assert cache.get("https://bit.ly/y") is None
+    assert cache.counters["expired"] >= 1
+    cache.close()
+
+
+def test_claim_serializes_same_url_and_cleans_up():
+    async def run():
+        cache = UrlResolveCache(None)
+        resolves = 0
+
+        async def resolve_once(url: str) -> str:
+            nonlocal resolves
+            async with cache.claim(url):
+                hit = cache.get(url)
+                if hit is not None:
+                    return hit[0]
+                resolves += 1
+                await asyncio.sleep(0.01)
+                cache.put(url, "https://shop.example/final", ok=True)
+                return "https://shop.example/final"
+
+        out = await asyncio.gather(*(resolve_once("https://bit.ly/z") for _ in range(5)))
+        return cache, resolves, out
+
+    cache, resolves, out = asyncio.run(run())
+    assert resolves == 1
+    assert set(out) == {"https://shop.example/final"}
+    assert cache._claims == {}